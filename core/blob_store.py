@@ -0,0 +1,198 @@
+"""
+Blob Store - Content-addressed storage for large job results.
+=============================================================
+
+Large results used to be stored inline in ``jobs.result_data``, so every
+``SELECT *`` over jobs (agent state, snapshots, restore) dragged them
+along. Results above ``inline_max_bytes`` are now written once to
+``<root>/<aa>/<bb>/<sha256>.gz`` (gzip, so the file can be served as-is
+with ``Content-Encoding: gzip``) and the row only keeps a small reference:
+
+    {"$blob": "<sha256>", "size": 123456, "content_type": "application/json"}
+
+Inline values that could be mistaken for a reference (a dict with a
+``$blob`` or ``$inline`` key) are wrapped as ``{"$inline": value}``, so a
+column is always unambiguous.
+
+The name is the hash of the uncompressed bytes: identical results are
+stored once. Readers resolve references lazily (``resolve``) or stream
+the blob (``iter_chunks`` / ``path``). Blobs no row references any more
+are removed by ``sweep`` (see ``JobManager.collect_blobs``).
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set
+
+from core.serialization import dumps, dumps_str, loads
+
+logger = logging.getLogger(__name__)
+
+REF_KEY = "$blob"
+INLINE_KEY = "$inline"
+
+
+class BlobNotFound(Exception):
+    """No blob stored under the given digest."""
+
+
+class BlobStore:
+    """Hash-named, gzip-compressed files under one root directory."""
+
+    def __init__(self, root: Optional[str] = None, inline_max_bytes: int = 16384):
+        self.root = Path(root) if root else Path.home() / ".vertice" / "blobs"
+        self.inline_max_bytes = inline_max_bytes
+        self.written = 0
+        self.deduplicated = 0
+        self.removed = 0
+
+    def path(self, digest: str) -> Path:
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise BlobNotFound(f"Invalid blob digest: {digest!r}")
+        return self.root / digest[:2] / digest[2:4] / f"{digest}.gz"
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` (idempotent); returns its sha256 digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        target = self.path(digest)
+        if target.exists():
+            # Fresh mtime: the sweep grace period covers the row about to reference it
+            try:
+                os.utime(target)
+                self.deduplicated += 1
+                return digest
+            except FileNotFoundError:
+                pass  # swept meanwhile: write it again
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename: readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                gz.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.written += 1
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        try:
+            with gzip.open(self.path(digest), "rb") as gz:
+                return gz.read()
+        except FileNotFoundError:
+            raise BlobNotFound(digest)
+
+    def iter_chunks(self, digest: str, chunk_size: int = 65536, compressed: bool = False) -> Iterator[bytes]:
+        """Stream a blob, decompressed unless ``compressed`` (raw gzip bytes)."""
+        path = self.path(digest)
+        if not path.exists():
+            raise BlobNotFound(digest)
+        return self._iter(path, chunk_size, compressed)
+
+    @staticmethod
+    def _iter(path: Path, chunk_size: int, compressed: bool) -> Iterator[bytes]:
+        if compressed:
+            with open(path, "rb") as raw:
+                while chunk := raw.read(chunk_size):
+                    yield chunk
+            return
+        decompressor = zlib.decompressobj(wbits=31)
+        with open(path, "rb") as raw:
+            while chunk := raw.read(chunk_size):
+                if data := decompressor.decompress(chunk):
+                    yield data
+        if tail := decompressor.flush():
+            yield tail
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def sweep(self, live: Set[str], min_age: float = 600.0) -> int:
+        """
+        Delete blobs not in ``live`` (and leftover temp files). Files younger
+        than ``min_age`` seconds are kept: their row may not be written yet.
+        """
+        if not self.root.exists():
+            return 0
+        cutoff = time.time() - min_age
+        removed = 0
+        for path in self.root.glob("*/*/*"):
+            if path.name.endswith(".gz") and path.name[:-3] in live:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        self.removed += removed
+        return removed
+
+    # ------------------------------------------------------------------
+    # JSON values stored in SQLite columns
+    # ------------------------------------------------------------------
+
+    def externalize(self, value: Any, content_type: str = "application/json") -> str:
+        """JSON text for a column: inline when small, a blob reference otherwise."""
+        encoded = dumps(value)
+        if len(encoded) <= self.inline_max_bytes:
+            if isinstance(value, dict) and (REF_KEY in value or INLINE_KEY in value):
+                return dumps_str({INLINE_KEY: value})
+            return encoded.decode("utf-8")
+        digest = self.put(encoded)
+        return dumps_str({REF_KEY: digest, "size": len(encoded), "content_type": content_type})
+
+    def resolve(self, column: Optional[str]) -> Any:
+        """Decode a column written by ``externalize``, loading blobs on demand."""
+        if column is None:
+            return None
+        value = loads(column)
+        ref = blob_ref(value)
+        if ref is not None:
+            return loads(self.get(ref[REF_KEY]))
+        return inline_value(value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "inline_max_bytes": self.inline_max_bytes,
+            "written": self.written,
+            "deduplicated": self.deduplicated,
+            "removed": self.removed,
+        }
+
+
+def blob_ref(value: Any) -> Optional[Dict[str, Any]]:
+    """The reference dict if ``value`` (a decoded column) is one, else None."""
+    if isinstance(value, dict) and isinstance(value.get(REF_KEY), str):
+        return value
+    return None
+
+
+def inline_value(value: Any) -> Any:
+    """A decoded inline column without its ``$inline`` wrapper, if any."""
+    if isinstance(value, dict) and len(value) == 1 and INLINE_KEY in value:
+        return value[INLINE_KEY]
+    return value
+
+
+# Singleton
+_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        from core.settings import get_settings
+
+        settings = get_settings().blobs
+        _store = BlobStore(settings.root, settings.inline_max_bytes)
+    return _store
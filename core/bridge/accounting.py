@@ -0,0 +1,283 @@
+"""
+Bridge Accounting - Per-Agent Resource Usage.
+============================================
+
+Attributes every tool execution to an agent through a context variable and
+meters the CPU time, wall time and allocations of its coroutine steps.
+A background sampler folds the cumulative totals into a rolling window so
+metrics endpoints never measure anything on the request path.
+
+Only the steps of the metered coroutine itself are charged: tasks it spawns
+and work handed to threads (``asyncio.to_thread``, executors) inherit the
+agent id but are not metered. ``METERING_SCOPE`` states this in the API
+responses so the figures are read as a lower bound.
+"""
+
+import asyncio
+import logging
+import time
+import tracemalloc
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Deque,
+    Dict,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from core.settings import get_settings
+
+logger = logging.getLogger("mcp_bridge.accounting")
+
+T = TypeVar("T")
+
+# Agent currently being served by this task (inherited by child tasks).
+# Calls made outside any agent stay on "system" (unattributed).
+current_agent_id: ContextVar[str] = ContextVar("current_agent_id", default="system")
+
+METERING_SCOPE = {
+    "cpu": "event-loop steps of the tool coroutine; child tasks and threads are not metered",
+    "memory": "peak traced allocation of each step, summed (requires tracemalloc)",
+}
+
+
+@dataclass
+class AgentUsage:
+    """Cumulative (or windowed) resource usage of one agent."""
+
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    alloc_bytes: int = 0
+    tasks: int = 0
+
+    def minus(self, other: "AgentUsage") -> "AgentUsage":
+        return AgentUsage(
+            cpu_seconds=self.cpu_seconds - other.cpu_seconds,
+            wall_seconds=self.wall_seconds - other.wall_seconds,
+            alloc_bytes=self.alloc_bytes - other.alloc_bytes,
+            tasks=self.tasks - other.tasks,
+        )
+
+    def add(self, other: "AgentUsage") -> None:
+        self.cpu_seconds += other.cpu_seconds
+        self.wall_seconds += other.wall_seconds
+        self.alloc_bytes += other.alloc_bytes
+        self.tasks += other.tasks
+
+
+class _MeteredCoroutine:
+    """
+    Awaitable proxy that measures each step of the wrapped coroutine.
+
+    Only the time spent inside ``send``/``throw`` is charged, so other tasks
+    interleaved on the event loop are never billed to this agent. Memory is
+    the peak growth of each step, so a step that frees more than it
+    allocates costs zero instead of a negative amount.
+    """
+
+    def __init__(self, coro: Awaitable[Any], usage: AgentUsage, trace_memory: bool):
+        self._coro = coro.__await__()
+        self._usage = usage
+        self._trace_memory = trace_memory
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def send(self, value: Any) -> Any:
+        return self._step(self._coro.send, value)
+
+    def throw(self, *args: Any) -> Any:
+        return self._step(self._coro.throw, *args)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def _step(self, fn, *args: Any) -> Any:
+        if self._trace_memory:
+            tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+        cpu_before = time.thread_time()
+        try:
+            return fn(*args)
+        finally:
+            self._usage.cpu_seconds += time.thread_time() - cpu_before
+            if self._trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                self._usage.alloc_bytes += max(peak - mem_before, 0)
+
+
+class ResourceAccountant:
+    """Collects per-task usage and exposes rolling per-agent aggregates."""
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        sample_interval: float = 5.0,
+        trace_memory: bool = False,
+    ):
+        self.window_seconds = window_seconds
+        self.sample_interval = sample_interval
+        self.trace_memory = trace_memory
+        self._totals: Dict[str, AgentUsage] = {}
+        self._active: Dict[str, int] = {}
+        self._last_totals: Dict[str, AgentUsage] = {}
+        self._last_sample_at = time.monotonic()
+        self._window: Deque[Tuple[float, float, Dict[str, AgentUsage]]] = deque()
+        self._process: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self, agent_id: str, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable`` attributed to ``agent_id``."""
+        usage = AgentUsage(tasks=1)
+        token = current_agent_id.set(agent_id)
+        self._active[agent_id] = self._active.get(agent_id, 0) + 1
+        started = time.perf_counter()
+        try:
+            return await _MeteredCoroutine(awaitable, usage, self.trace_memory)
+        finally:
+            current_agent_id.reset(token)
+            self._finish(agent_id, usage, started)
+
+    async def stream(
+        self, agent_id: str, iterator: AsyncIterator[T]
+    ) -> AsyncIterator[T]:
+        """Re-yield ``iterator`` metering every step as one task of ``agent_id``."""
+        usage = AgentUsage(tasks=1)
+        self._active[agent_id] = self._active.get(agent_id, 0) + 1
+        started = time.perf_counter()
+        try:
+            while True:
+                # Attribution is scoped to each step so the consumer, which
+                # runs between yields, is never billed to this agent.
+                token = current_agent_id.set(agent_id)
+                try:
+                    item = await _MeteredCoroutine(
+                        iterator.__anext__(), usage, self.trace_memory
+                    )
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_agent_id.reset(token)
+                yield item
+        finally:
+            self._finish(agent_id, usage, started)
+
+    def _finish(self, agent_id: str, usage: AgentUsage, started: float) -> None:
+        usage.wall_seconds = time.perf_counter() - started
+        self._active[agent_id] -= 1
+        self._totals.setdefault(agent_id, AgentUsage()).add(usage)
+
+    def sample(self) -> None:
+        """Fold totals accumulated since the last sample into the window."""
+        now = time.monotonic()
+        span = now - self._last_sample_at
+        deltas = {
+            agent_id: totals.minus(self._last_totals.get(agent_id, AgentUsage()))
+            for agent_id, totals in self._totals.items()
+        }
+        self._last_totals = {k: AgentUsage(**asdict(v)) for k, v in self._totals.items()}
+        self._last_sample_at = now
+        self._window.append((now, span, deltas))
+
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+
+        self._sample_process()
+
+    def _sample_process(self) -> None:
+        try:
+            import psutil
+        except ImportError:
+            return
+        proc = psutil.Process()
+        self._process = {
+            # interval=None compares against the previous call: never blocks
+            "cpu_percent": proc.cpu_percent(interval=None),
+            "rss_mb": round(proc.memory_info().rss / (1024 * 1024), 1),
+        }
+
+    def rolling(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent usage over the sampled window."""
+        window_span = sum(span for _, span, _ in self._window)
+        aggregated: Dict[str, AgentUsage] = {}
+        for _, _, deltas in self._window:
+            for agent_id, delta in deltas.items():
+                aggregated.setdefault(agent_id, AgentUsage()).add(delta)
+
+        report = {}
+        for agent_id in set(aggregated) | {a for a, n in self._active.items() if n}:
+            usage = aggregated.get(agent_id, AgentUsage())
+            report[agent_id] = {
+                "cpu_percent": round(
+                    usage.cpu_seconds / window_span * 100, 2
+                ) if window_span else 0.0,
+                "cpu_seconds": round(usage.cpu_seconds, 4),
+                "wall_seconds": round(usage.wall_seconds, 4),
+                "alloc_mb": round(usage.alloc_bytes / (1024 * 1024), 3),
+                "tasks": usage.tasks,
+                "active_tasks": self._active.get(agent_id, 0),
+            }
+        return report
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Rolling usage plus process-wide figures from the last sample."""
+        return {
+            "window_seconds": round(sum(span for _, span, _ in self._window), 2),
+            "memory_tracking": self.trace_memory,
+            "metering": METERING_SCOPE,
+            "process": dict(self._process),
+            "agents": self.rolling(),
+        }
+
+    async def _sampler_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"Resource sampling failed: {e}")
+
+    def start(self) -> None:
+        """Start the background sampler on the running loop."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._task is None or self._task.done():
+            self._sample_process()  # primes psutil's cpu_percent baseline
+            self._task = asyncio.create_task(self._sampler_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton
+_accountant: Optional[ResourceAccountant] = None
+
+
+def get_resource_accountant() -> ResourceAccountant:
+    global _accountant
+    if _accountant is None:
+        cfg = get_settings().bridge
+        _accountant = ResourceAccountant(
+            window_seconds=cfg.accounting_window_seconds,
+            sample_interval=cfg.accounting_sample_interval,
+            trace_memory=cfg.accounting_trace_memory,
+        )
+    return _accountant
@@ -0,0 +1,132 @@
+"""
+Bridge Bulkheads - Per-Tool Admission Control.
+==============================================
+
+Each tool gets its own concurrency limit and bounded wait queue so a flood
+of expensive calls (media uploads, AI generation) cannot starve cheap tools.
+Requests beyond the queue are shed immediately with a Retry-After estimate.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from .models import DEFAULT_TOOL_CONCURRENCY, DEFAULT_TOOL_QUEUE, ToolInfo
+
+logger = logging.getLogger("mcp_bridge.bulkhead")
+
+
+class BulkheadFull(Exception):
+    """Tool queue is at capacity; the caller should retry later."""
+
+    def __init__(self, tool_name: str, retry_after: float):
+        super().__init__(f"Tool {tool_name} is overloaded, retry in {retry_after:.1f}s")
+        self.tool_name = tool_name
+        self.retry_after = retry_after
+
+
+class Permit:
+    """An admitted execution slot. Releasing twice is a no-op."""
+
+    def __init__(self, bulkhead: "Bulkhead", queue_wait: float):
+        self.bulkhead = bulkhead
+        self.queue_wait = queue_wait
+        self._started = time.perf_counter()
+        self._released = False
+
+    @property
+    def queue_wait_ms(self) -> float:
+        return self.queue_wait * 1000
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.bulkhead._release(time.perf_counter() - self._started)
+
+
+class Bulkhead:
+    """Semaphore with a bounded number of waiters and load-shedding."""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._active = 0
+        self._waiting = 0
+        self._avg_exec_seconds = 1.0  # EWMA, seeds the first Retry-After
+        self.admitted = 0
+        self.rejected = 0
+
+    def retry_after(self) -> float:
+        """Estimated seconds until a queue position frees up."""
+        backlog = (self._waiting + 1) / self.max_concurrency
+        return max(1.0, backlog * self._avg_exec_seconds)
+
+    async def acquire(self) -> Permit:
+        """Wait for a slot, or raise BulkheadFull if the queue is full."""
+        if self._active >= self.max_concurrency and self._waiting >= self.max_queue:
+            self.rejected += 1
+            logger.warning(f"Shedding {self.name}: {self._waiting} queued")
+            raise BulkheadFull(self.name, self.retry_after())
+
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+        self.admitted += 1
+        return Permit(self, time.perf_counter() - started)
+
+    def _release(self, exec_seconds: float) -> None:
+        self._active -= 1
+        self._semaphore.release()
+        self._avg_exec_seconds = 0.8 * self._avg_exec_seconds + 0.2 * exec_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queued": self._waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_exec_ms": round(self._avg_exec_seconds * 1000, 2),
+        }
+
+
+class BulkheadRegistry:
+    """Bulkheads keyed by tool name, configured from tool metadata."""
+
+    def __init__(self, tools: Iterable[ToolInfo]):
+        self._bulkheads: Dict[str, Bulkhead] = {
+            tool.name: Bulkhead(tool.name, tool.max_concurrency, tool.max_queue)
+            for tool in tools
+        }
+
+    def get(self, tool_name: str) -> Bulkhead:
+        if tool_name not in self._bulkheads:
+            self._bulkheads[tool_name] = Bulkhead(
+                tool_name, DEFAULT_TOOL_CONCURRENCY, DEFAULT_TOOL_QUEUE
+            )
+        return self._bulkheads[tool_name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: b.stats() for name, b in self._bulkheads.items()}
+
+
+# Singleton
+_registry: Optional[BulkheadRegistry] = None
+
+
+def get_bulkheads() -> BulkheadRegistry:
+    global _registry
+    if _registry is None:
+        from .registry import TOOL_METADATA
+
+        _registry = BulkheadRegistry(TOOL_METADATA)
+    return _registry
@@ -8,6 +8,10 @@ Defines request and response schemas for tool execution and metadata.
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
+# Bulkhead defaults for tools that do not declare their own limits
+DEFAULT_TOOL_CONCURRENCY = 16
+DEFAULT_TOOL_QUEUE = 64
+
 
 class ToolInfo(BaseModel):
     """Metadata about an MCP tool."""
@@ -17,6 +21,9 @@ class ToolInfo(BaseModel):
     category: str
     description: str
     parameters: Dict[str, str]
+    streaming: bool = False
+    max_concurrency: int = DEFAULT_TOOL_CONCURRENCY
+    max_queue: int = DEFAULT_TOOL_QUEUE
 
 
 class ToolExecuteRequest(BaseModel):
@@ -24,6 +31,7 @@ class ToolExecuteRequest(BaseModel):
 
     tool_name: str
     arguments: Dict[str, Any] = {}
+    agent_id: Optional[str] = None
 
 
 class ToolExecuteResponse(BaseModel):
@@ -34,6 +42,7 @@ class ToolExecuteResponse(BaseModel):
     error: Optional[str] = None
     logs: List[Dict[str, Any]] = []
     execution_time_ms: Optional[float] = None
+    queue_time_ms: Optional[float] = None
 
 
 class ToolListResponse(BaseModel):
@@ -5,44 +5,52 @@ Bridge Registry - Tool Registration and Metadata.
 Maps tool names to their implementation functions and provides metadata.
 """
 
-from typing import Any, Callable, Coroutine, Dict, List
+import importlib
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Tuple
 from .models import ToolInfo
 
-# Governance
-from tools.magistrate import ethical_validate, ethical_audit
+logger = logging.getLogger("mcp_bridge.registry")
+
+ToolFunction = Callable[..., Coroutine[Any, Any, Any]]
+StreamingToolFunction = Callable[..., AsyncIterator[Any]]
+
+# Tool modules pull in google.genai, PIL, httpx clients and provider settings.
+# Entries are (module, attribute) pairs imported on first call (or by
+# preload_tools() in the background), so importing the registry is cheap.
+_resolved: Dict[Tuple[str, str], Callable[..., Any]] = {}
+
+
+def _resolve(module: str, attr: str) -> Callable[..., Any]:
+    func = _resolved.get((module, attr))
+    if func is None:
+        func = getattr(importlib.import_module(module), attr)
+        _resolved[(module, attr)] = func
+    return func
 
-# OSINT
-from tools.osint import osint_investigate, osint_breach_check, osint_google_dork
 
-# Threat
-from tools.threat import threat_analyze, threat_intelligence, threat_predict
+def lazy_tool(module: str, attr: str) -> ToolFunction:
+    """Async proxy that imports ``module.attr`` on first call."""
 
-# Compliance
-from tools.compliance import compliance_assess, compliance_report, compliance_check
+    async def tool(*args, **kwargs):
+        return await _resolve(module, attr)(*args, **kwargs)
 
-# Offensive
-from tools.wargame import wargame_list_scenarios, wargame_run_simulation
-from tools.patch_ml import patch_validate
+    tool.__name__ = tool.__qualname__ = attr
+    tool.lazy_target = (module, attr)
+    return tool
 
-# Multimodal
-from tools.visionary import visionary_analyze
-from tools.deepfake_scanner import scan_media
 
-# CyberSec
-from tools.cybersec_basic import cybersec_recon
+def lazy_stream(module: str, attr: str) -> StreamingToolFunction:
+    """Async-generator proxy that imports ``module.attr`` on first call."""
 
-# Health
-from tools.health_check import provider_health_check
-from core.metrics import provider_metrics_tool
+    async def stream(*args, **kwargs):
+        async for chunk in _resolve(module, attr)(*args, **kwargs):
+            yield chunk
 
-# AI
-from tools.mcp_ai_tools import (
-    ai_threat_analysis,
-    ai_compliance_assessment,
-    ai_osint_analysis,
-    ai_stream_analysis,
-    ai_integrated_assessment,
-)
+    stream.__name__ = stream.__qualname__ = attr
+    stream.lazy_target = (module, attr)
+    return stream
 
 
 # Dynamic Import Wrapper
@@ -55,38 +63,81 @@ async def set_ai_model_wrapper(ctx, model_alias: str) -> Dict[str, Any]:
     return {"status": "success", "active_model": new_model}
 
 
-ToolFunction = Callable[..., Coroutine[Any, Any, Any]]
-
 # Mapping Name -> Function
 TOOL_REGISTRY: Dict[str, ToolFunction] = {
-    "ethical_validate": ethical_validate,
-    "ethical_audit": ethical_audit,
-    "osint_investigate": osint_investigate,
-    "osint_breach_check": osint_breach_check,
-    "osint_google_dork": osint_google_dork,
-    "threat_analyze": threat_analyze,
-    "threat_intelligence": threat_intelligence,
-    "threat_predict": threat_predict,
-    "compliance_assess": compliance_assess,
-    "compliance_report": compliance_report,
-    "compliance_check": compliance_check,
-    "wargame_list_scenarios": wargame_list_scenarios,
-    "wargame_run_simulation": wargame_run_simulation,
-    "patch_validate": patch_validate,
-    "visionary_analyze": visionary_analyze,
-    "deepfake_scan_tool": scan_media,
-    "cybersec_recon": cybersec_recon,
-    "provider_health_check": provider_health_check,
-    "provider_metrics": provider_metrics_tool,
-    "ai_threat_analysis": ai_threat_analysis,
-    "ai_compliance_assessment": ai_compliance_assessment,
-    "ai_osint_analysis": ai_osint_analysis,
-    "ai_stream_analysis": ai_stream_analysis,
-    "ai_integrated_assessment": ai_integrated_assessment,
+    # Governance
+    "ethical_validate": lazy_tool("tools.magistrate", "ethical_validate"),
+    "ethical_audit": lazy_tool("tools.magistrate", "ethical_audit"),
+    # OSINT
+    "osint_investigate": lazy_tool("tools.osint", "osint_investigate"),
+    "osint_breach_check": lazy_tool("tools.osint", "osint_breach_check"),
+    "osint_google_dork": lazy_tool("tools.osint", "osint_google_dork"),
+    # Threat
+    "threat_analyze": lazy_tool("tools.threat", "threat_analyze"),
+    "threat_intelligence": lazy_tool("tools.threat", "threat_intelligence"),
+    "threat_predict": lazy_tool("tools.threat", "threat_predict"),
+    "threat_enrich_bulk": lazy_tool("tools.enrichment", "threat_enrich_bulk"),
+    # Compliance
+    "compliance_assess": lazy_tool("tools.compliance", "compliance_assess"),
+    "compliance_report": lazy_tool("tools.compliance", "compliance_report"),
+    "compliance_check": lazy_tool("tools.compliance", "compliance_check"),
+    # Offensive
+    "wargame_list_scenarios": lazy_tool("tools.wargame", "wargame_list_scenarios"),
+    "wargame_run_simulation": lazy_tool("tools.wargame", "wargame_run_simulation"),
+    "patch_validate": lazy_tool("tools.patch_ml", "patch_validate"),
+    # Multimodal
+    "visionary_analyze": lazy_tool("tools.visionary", "visionary_analyze"),
+    "deepfake_scan_tool": lazy_tool("tools.deepfake_scanner", "scan_media"),
+    # CyberSec
+    "cybersec_recon": lazy_tool("tools.cybersec_basic", "cybersec_recon"),
+    # Health
+    "provider_health_check": lazy_tool("tools.health_check", "provider_health_check"),
+    "provider_metrics": lazy_tool("core.metrics", "provider_metrics_tool"),
+    # AI
+    "ai_threat_analysis": lazy_tool("tools.mcp_ai_tools", "ai_threat_analysis"),
+    "ai_compliance_assessment": lazy_tool(
+        "tools.mcp_ai_tools", "ai_compliance_assessment"
+    ),
+    "ai_osint_analysis": lazy_tool("tools.mcp_ai_tools", "ai_osint_analysis"),
+    "ai_stream_analysis": lazy_tool("tools.mcp_ai_tools", "ai_stream_analysis"),
+    "ai_integrated_assessment": lazy_tool(
+        "tools.mcp_ai_tools", "ai_integrated_assessment"
+    ),
     "set_ai_model": set_ai_model_wrapper,
 }
 
+# Streaming implementations (chunks yielded as produced) for tools that
+# declare streaming=True in their metadata.
+STREAMING_REGISTRY: Dict[str, StreamingToolFunction] = {
+    "ai_stream_analysis": lazy_stream("tools.mcp_ai_tools", "ai_stream_analysis_chunks"),
+    "threat_enrich_bulk": lazy_stream("tools.enrichment", "threat_enrich_bulk_chunks"),
+}
+
+
+def preload_tools() -> Dict[str, float]:
+    """
+    Import every registered tool module, returning seconds spent per module.
+
+    Blocking: the bridge runs it in a thread after startup so the first
+    request to each tool does not pay for the import.
+    """
+    timings: Dict[str, float] = {}
+    for func in [*TOOL_REGISTRY.values(), *STREAMING_REGISTRY.values()]:
+        module, attr = getattr(func, "lazy_target", (None, None))
+        if module is None or module in timings:
+            continue
+        started = time.perf_counter()
+        try:
+            _resolve(module, attr)
+        except Exception as e:
+            logger.warning(f"Preload of {module} failed: {e}")
+        timings[module] = time.perf_counter() - started
+    return timings
+
+
 # Metadata Registry
+# max_concurrency / max_queue size each tool's bulkhead (core/bridge/bulkhead.py);
+# heavy media and AI tools get tight limits so they cannot starve cheap ones.
 TOOL_METADATA: List[ToolInfo] = [
     ToolInfo(
         name="deepfake_scan_tool",
@@ -98,6 +149,8 @@ TOOL_METADATA: List[ToolInfo] = [
             "mime_type": "string",
             "filename": "string",
         },
+        max_concurrency=2,
+        max_queue=4,
     ),
     ToolInfo(
         name="ethical_validate",
@@ -119,6 +172,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="intelligence",
         description="OSINT investigation on target",
         parameters={"target": "string", "depth": "string"},
+        max_concurrency=8,
+        max_queue=32,
     ),
     ToolInfo(
         name="osint_breach_check",
@@ -140,6 +195,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="intelligence",
         description="Complete threat analysis",
         parameters={"target": "string", "include_predictions": "boolean"},
+        max_concurrency=8,
+        max_queue=32,
     ),
     ToolInfo(
         name="threat_intelligence",
@@ -155,6 +212,16 @@ TOOL_METADATA: List[ToolInfo] = [
         description="Predict future threats",
         parameters={"target": "string"},
     ),
+    ToolInfo(
+        name="threat_enrich_bulk",
+        agent="Threat Prophet",
+        category="intelligence",
+        description="Bulk IOC enrichment (OTX + VirusTotal), resumable by run_id",
+        parameters={"indicators": "list", "run_id": "string"},
+        streaming=True,
+        max_concurrency=2,
+        max_queue=8,
+    ),
     ToolInfo(
         name="compliance_assess",
         agent="Compliance Guardian",
@@ -189,6 +256,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="offensive",
         description="Executes attack simulation",
         parameters={"scenario_id": "string", "target": "string"},
+        max_concurrency=1,
+        max_queue=2,
     ),
     ToolInfo(
         name="patch_validate",
@@ -203,6 +272,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="recon",
         description="Performs basic reconnaissance (ports, web)",
         parameters={"target": "string", "scan_ports": "boolean", "scan_web": "boolean"},
+        max_concurrency=4,
+        max_queue=16,
     ),
     ToolInfo(
         name="ai_threat_analysis",
@@ -210,6 +281,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="ai",
         description="AI-powered threat analysis",
         parameters={"target": "string", "context": "object"},
+        max_concurrency=4,
+        max_queue=16,
     ),
     ToolInfo(
         name="ai_compliance_assessment",
@@ -217,6 +290,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="ai",
         description="AI-powered compliance assessment",
         parameters={"target": "string", "framework": "string"},
+        max_concurrency=4,
+        max_queue=16,
     ),
     ToolInfo(
         name="ai_osint_analysis",
@@ -224,6 +299,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="ai",
         description="AI-powered OSINT analysis",
         parameters={"target": "string", "findings": "list"},
+        max_concurrency=4,
+        max_queue=16,
     ),
     ToolInfo(
         name="ai_stream_analysis",
@@ -231,6 +308,9 @@ TOOL_METADATA: List[ToolInfo] = [
         category="ai",
         description="Stream AI analysis",
         parameters={"analysis_type": "string", "data": "object"},
+        streaming=True,
+        max_concurrency=4,
+        max_queue=16,
     ),
     ToolInfo(
         name="ai_integrated_assessment",
@@ -238,6 +318,8 @@ TOOL_METADATA: List[ToolInfo] = [
         category="ai",
         description="Integrated AI assessment",
         parameters={"target": "string"},
+        max_concurrency=2,
+        max_queue=8,
     ),
     ToolInfo(
         name="visionary_analyze",
@@ -250,6 +332,8 @@ TOOL_METADATA: List[ToolInfo] = [
             "mime_type": "string",
             "mode": "string",
         },
+        max_concurrency=2,
+        max_queue=4,
     ),
     ToolInfo(
         name="provider_health_check",
@@ -0,0 +1,21 @@
+"""
+Bridge Responses - Fast-path JSON response class.
+=================================================
+
+Default response class of the bridge app. Renders through
+``core.serialization`` so tool results (datetimes, Enums, pydantic models)
+are encoded in one pass, without ``jsonable_encoder``.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from core.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the shared fast encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
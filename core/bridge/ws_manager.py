@@ -14,6 +14,7 @@ from typing import List, Dict, Set
 from fastapi import WebSocket, WebSocketDisconnect
 
 from core.events.event_bus import get_event_bus
+from core.serialization import dumps_str
 
 logger = logging.getLogger("mcp_bridge.ws")
 
@@ -63,16 +64,18 @@ class ConnectionManager:
     async def broadcast(self, message: dict) -> None:
         """
         Send a message to all connected clients.
+        The frame is encoded once and the same text is sent to every socket.
         Future optimization: Implement granular room filtering based on message topic.
         """
         disconnected = []
+        frame = dumps_str(message)
         
         # For Phase 1, we broadcast "global" events to everyone.
         # Future: Filter by message['topic'] vs subscribed rooms.
         async with self._lock:
             for connection in self.active_connections:
                 try:
-                    await connection.send_json(message)
+                    await connection.send_text(frame)
                 except Exception as e:
                     logger.error(f"Broadcast packet loss: {e}")
                     disconnected.append(connection)
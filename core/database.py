@@ -3,6 +3,8 @@ import sqlite3
 import logging
 from typing import Any, List, Optional, Tuple, Dict
 
+from core.tracing import span
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = "vertice.db"
@@ -33,11 +35,30 @@ CREATE TABLE IF NOT EXISTS jobs (
     result_data JSON,
     error_message TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    params JSON,
+    priority TEXT,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    attempts INTEGER DEFAULT 0
 );
-CREATE INDEX IF NOT EXISTS idx_jobs_agent ON jobs(agent_id);
+-- (agent_id, status) serves both "jobs of an agent" and "active job of an agent"
+DROP INDEX IF EXISTS idx_jobs_agent;
+CREATE INDEX IF NOT EXISTS idx_jobs_agent_status ON jobs(agent_id, status);
 CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
 
+-- Incremental checkpoints: a base snapshot followed by append-only deltas
+-- (clustered on the key: one b-tree write per checkpoint, no separate PK index)
+CREATE TABLE IF NOT EXISTS job_checkpoints (
+    job_id TEXT NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK(kind IN ('base', 'delta')),
+    codec TEXT NOT NULL CHECK(codec IN ('json', 'zlib')),
+    data BLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+
 -- SYSTEM EVENTS (Circular Buffer Audit Trail attempt - implementing as standard table for now)
 CREATE TABLE IF NOT EXISTS events (
     event_id TEXT PRIMARY KEY,
@@ -75,14 +96,48 @@ CREATE TABLE IF NOT EXISTS memory_store (
     PRIMARY KEY (agent_name, key)
 );
 
--- TRIGGERS (Recreating validation to prevent errors if they exist)
+-- SHARED RUNTIME STATE (multi-worker bridge; rate limit usage survives restarts)
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    service TEXT NOT NULL,
+    bucket TEXT NOT NULL,  -- janela: second, minute, hour, day
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (service, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS state_versions (
+    kind TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (kind, entity_id)
+);
+CREATE INDEX IF NOT EXISTS idx_state_versions_version ON state_versions(version);
+
+-- BULK IOC ENRICHMENT (resumable runs)
+CREATE TABLE IF NOT EXISTS enrichment_cursors (
+    run_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    stats JSON,
+    complete INTEGER DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+
+-- The former update_jobs_timestamp trigger rewrote every updated jobs row a
+-- second time; writers now set updated_at in the same UPDATE.
 DROP TRIGGER IF EXISTS update_jobs_timestamp;
-CREATE TRIGGER update_jobs_timestamp AFTER UPDATE ON jobs
-BEGIN
-    UPDATE jobs SET updated_at = CURRENT_TIMESTAMP WHERE job_id = NEW.job_id;
-END;
 """
 
+# Columns added after a table was first shipped: (table, column, declaration).
+# CREATE TABLE IF NOT EXISTS leaves existing tables alone, so they are
+# added to older database files at startup.
+MIGRATIONS = [
+    ("jobs", "params", "JSON"),
+    ("jobs", "priority", "TEXT"),
+    ("jobs", "lease_owner", "TEXT"),
+    ("jobs", "lease_expires_at", "REAL"),
+    ("jobs", "attempts", "INTEGER DEFAULT 0"),
+]
+
 class Database:
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
@@ -92,12 +147,23 @@ class Database:
         """Initialize database schema."""
         try:
             with sqlite3.connect(self.db_path) as conn:
+                # WAL lets bridge workers read while another process writes
+                conn.execute("PRAGMA journal_mode=WAL")
                 conn.executescript(SCHEMA)
+                self._migrate(conn)
             logger.info(f"Database initialized at {self.db_path}")
         except Exception as e:
             logger.critical(f"Failed to initialize database: {e}")
             raise
 
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        for table, column, decl in MIGRATIONS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+                logger.info(f"Migrated {table}: added column {column}")
+
     def get_connection(self) -> sqlite3.Connection:
         """Get a raw sqlite3 connection."""
         conn = sqlite3.connect(self.db_path)
@@ -113,7 +179,10 @@ class Database:
         # The plan didn't strictly mandate aiosqlite, just "SQLite".
         # We will use sync execution for now as it's robust and simple for file-based DB.
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with (
+                span("db.execute", {"db.statement": query}),
+                sqlite3.connect(self.db_path) as conn,
+            ):
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 return cursor
@@ -121,10 +190,25 @@ class Database:
             logger.error(f"DB Execute Error: {e} | Query: {query}")
             raise
 
+    async def execute_many(self, statements: List[Tuple[str, Tuple]]) -> List[int]:
+        """Run several statements in one transaction; returns each rowcount."""
+        try:
+            with (
+                span("db.execute_many", {"db.statements": len(statements)}),
+                sqlite3.connect(self.db_path) as conn,
+            ):
+                return [conn.execute(query, params).rowcount for query, params in statements]
+        except Exception as e:
+            logger.error(f"DB ExecuteMany Error: {e}")
+            raise
+
     async def fetch_one(self, query: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
         """Fetch single row."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with (
+                span("db.fetch_one", {"db.statement": query}),
+                sqlite3.connect(self.db_path) as conn,
+            ):
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute(query, params)
@@ -137,7 +221,10 @@ class Database:
     async def fetch_all(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
         """Fetch all rows."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with (
+                span("db.fetch_all", {"db.statement": query}),
+                sqlite3.connect(self.db_path) as conn,
+            ):
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 cursor.execute(query, params)
@@ -0,0 +1,76 @@
+"""
+Request deadlines propagated through a ContextVar.
+
+The bridge sets a deadline per tool call (``X-Request-Timeout`` header or
+the per-tool default) and the code underneath checks it cooperatively:
+provider chains stop before calling the next provider, rate-limiter
+waits that would outlive the caller fail immediately instead of
+sleeping, and HTTP/AI calls get their timeout capped to what is left.
+Tasks created inside the request copy the context, so the whole task
+tree shares the deadline.
+
+    with deadline(30):
+        ...
+        check("virustotal")                # raises DeadlineExceeded when past it
+        timeout = budget(15.0)             # min(15, remaining)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Absolute time.monotonic() value; None = no deadline
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The caller's deadline passed (or would pass before the work is done)."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Bound the enclosed work to ``seconds``; an outer, earlier deadline wins."""
+    current = _deadline.get()
+    if seconds is None:
+        yield current
+        return
+    at = time.monotonic() + seconds
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # Exited from another context (async generator finalized elsewhere)
+            pass
+
+
+def remaining() -> Optional[float]:
+    """Seconds left (may be negative), or None without a deadline."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def check(what: str = "operation") -> None:
+    """Raise DeadlineExceeded if the deadline already passed."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {what}")
+
+
+def budget(default: float) -> float:
+    """Timeout for a blocking call: ``default`` capped to the time left."""
+    check()
+    left = remaining()
+    return default if left is None else min(default, left)
+
+
+def ensure_can_wait(seconds: float, what: str = "wait") -> None:
+    """Fail now rather than sleep ``seconds`` past the deadline."""
+    left = remaining()
+    if left is not None and seconds >= left:
+        raise DeadlineExceeded(f"{what} of {seconds:.2f}s exceeds the {max(left, 0):.2f}s left")
@@ -2,10 +2,11 @@
 import asyncio
 import logging
 import re
-import json
 from typing import Callable, Dict, Set, Pattern
 from core.events.types import Event
 from core.database import get_db
+from core.serialization import dumps_str
+from core.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +18,14 @@ class EventBus:
         self._subscribers: Dict[Pattern, Set[EventHandler]] = {}
         self._db = get_db()
         self._ws_manager = None  # To be injected
+        self._relay = None  # Cross-worker relay (multi-worker bridge only)
 
     def set_ws_manager(self, ws_manager):
         self._ws_manager = ws_manager
 
+    def set_relay(self, relay):
+        self._relay = relay
+
     def subscribe(self, pattern: str, handler: EventHandler):
         """Subscribe to events matching regex pattern."""
         regex = re.compile(pattern)
@@ -36,27 +41,38 @@ class EventBus:
         2. Broadcast via WebSocket
         3. Notify internal subscribers
         """
-        # 1. Persist
-        try:
-            await self._persist_event(event)
-        except Exception as e:
-            logger.error(f"Failed to persist event {event.event_id}: {e}")
-
-        # 2. WebSocket Broadcast
-        if self._ws_manager:
+        with span("event.emit", {"event.type": event.event_type}):
+            # 1. Persist (marked local first so the relay won't echo it back)
+            if self._relay:
+                self._relay.mark_local(event.event_id)
             try:
-                # We can implement room filtering here if needed
-                await self._ws_manager.broadcast(event.to_dict())
+                await self._persist_event(event)
             except Exception as e:
-                logger.error(f"WS Broadcast failed: {e}")
+                logger.error(f"Failed to persist event {event.event_id}: {e}")
 
-        # 3. Internal Subscribers
+            # 2. WebSocket Broadcast
+            if self._ws_manager:
+                try:
+                    # We can implement room filtering here if needed
+                    with span("event.broadcast"):
+                        await self._ws_manager.broadcast(event.to_dict())
+                except Exception as e:
+                    logger.error(f"WS Broadcast failed: {e}")
+
+            # 3. Internal Subscribers
+            await self._notify(event)
+
+    async def dispatch(self, event: Event):
+        """Notify internal subscribers of an event another process already persisted and broadcast."""
+        await self._notify(event)
+
+    async def _notify(self, event: Event):
         tasks = []
         for pattern, handlers in self._subscribers.items():
             if pattern.match(event.event_type):
                 for handler in handlers:
                     tasks.append(asyncio.create_task(self._safe_handle(handler, event)))
-        
+
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -72,7 +88,7 @@ class EventBus:
                 event.correlation_id,
                 event.event_type,
                 event.source,
-                json.dumps(event.payload),
+                dumps_str(event.payload),
                 event.level,
                 event.timestamp
             )
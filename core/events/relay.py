@@ -0,0 +1,138 @@
+"""
+Event Relay - Cross-worker WebSocket fan-out.
+=============================================
+
+In multi-process mode (several uvicorn workers, or several bridge
+instances sharing the job queue) each process holds its own WebSocket
+connections, but every EventBus persists its events to the shared SQLite
+``events`` table. The relay tails that table and broadcasts the events
+written by *other* workers to this worker's sockets, so a client sees the
+whole mesh regardless of which process accepted it. Foreign events are
+also dispatched to this worker's EventBus subscribers (e.g. checkpoint
+progress reaches the local agent registry), and job status events are
+applied to this worker's job signals, so a tool parked here is resumed or
+cancelled by a request that landed on another worker.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Set
+
+from core.database import Database
+from core.events.types import Event
+from core.jobs.signals import get_job_signals
+from core.serialization import loads
+
+logger = logging.getLogger(__name__)
+
+
+class EventRelay:
+    """Polls the events table by rowid and re-broadcasts foreign events."""
+
+    def __init__(self, db: Database, ws_manager, poll_interval: float = 0.1, event_bus=None):
+        self.db = db
+        self.ws_manager = ws_manager
+        # Local bus whose subscribers also receive foreign events
+        self.event_bus = event_bus
+        self.poll_interval = poll_interval
+        self.batch_size = 500
+        self._last_rowid = 0
+        # Event IDs emitted by this process (already broadcast locally)
+        self._local_ids: Set[str] = set()
+        self._local_order: Deque[str] = deque()
+        self._max_local = 10000
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_local(self, event_id: str) -> None:
+        """Remember an event this worker broadcasts itself."""
+        self._local_ids.add(event_id)
+        self._local_order.append(event_id)
+        if len(self._local_order) > self._max_local:
+            self._local_ids.discard(self._local_order.popleft())
+
+    async def poll_once(self) -> int:
+        """Broadcast and dispatch foreign events persisted since the last poll."""
+        rows = await self.db.fetch_all(
+            """
+            SELECT rowid, event_id, correlation_id, event_type, source, payload, level, timestamp
+            FROM events WHERE rowid > ? ORDER BY rowid LIMIT ?
+            """,
+            (self._last_rowid, self.batch_size),
+        )
+        relayed = 0
+        for row in rows:
+            self._last_rowid = row["rowid"]
+            if row["event_id"] in self._local_ids:
+                self._local_ids.discard(row["event_id"])
+                continue
+            message = self._to_message(row)
+            self._apply_job_status(message)
+            await self.ws_manager.broadcast(message)
+            if self.event_bus is not None:
+                await self.event_bus.dispatch(self._to_event(message))
+            relayed += 1
+        return relayed
+
+    @staticmethod
+    def _apply_job_status(message: Dict[str, Any]) -> None:
+        """Mirror another worker's job status change into the local signals."""
+        payload = message["payload"]
+        if message["type"].startswith("job.") and isinstance(payload, dict):
+            status = payload.get("status")
+            job_ids = payload.get("job_ids") or [payload.get("job_id")]
+            for job_id in job_ids if status else ():
+                if job_id:
+                    get_job_signals().set_status(job_id, status)
+
+    @staticmethod
+    def _to_message(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild the Event.to_dict() wire format from a stored row."""
+        return {
+            "type": row["event_type"],
+            "id": row["event_id"],
+            "timestamp": str(row["timestamp"]).replace(" ", "T"),
+            "source": row["source"],
+            "level": row["level"],
+            "correlation_id": row["correlation_id"],
+            "payload": loads(row["payload"]),
+        }
+
+    @staticmethod
+    def _to_event(message: Dict[str, Any]) -> Event:
+        return Event(
+            event_type=message["type"],
+            source=message["source"],
+            payload=message["payload"],
+            level=message["level"],
+            correlation_id=message["correlation_id"],
+            event_id=message["id"],
+            timestamp=datetime.fromisoformat(message["timestamp"]),
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.poll_once() < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Event relay poll failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        """Start tailing from the current end of the table."""
+        row = await self.db.fetch_one("SELECT MAX(rowid) AS last FROM events")
+        self._last_rowid = (row or {}).get("last") or 0
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        logger.info(f"Event relay tailing events after rowid {self._last_rowid}")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,135 @@
+"""
+HTTP Clients - One long-lived, pooled httpx client per upstream.
+================================================================
+
+Providers, health checks and tools used to open an ``httpx.AsyncClient``
+per call, paying a TCP + TLS handshake on every lookup. They now borrow
+the shared client of their upstream:
+
+    client = get_http_clients().get("virustotal")
+    response = await client.get(url, timeout=budget(15.0))
+
+Clients keep connections alive (pool limits in ``VERTICE_HTTP_*``), speak
+HTTP/2 when the optional ``h2`` package is installed, and are closed by
+the bridge lifespan. Each request carries an httpcore trace hook, so the
+registry can tell how many requests reused a pooled connection and how
+many paid for a new connection / TLS handshake.
+
+Per-call settings (timeouts, headers) go on the request, not the client.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without h2
+    HTTP2_AVAILABLE = False
+
+
+class UpstreamStats:
+    """Connection reuse counters of one upstream client."""
+
+    __slots__ = ("requests", "connections", "tls_handshakes", "http2_responses")
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.http2_responses = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        reused = max(self.requests - self.connections, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": reused,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "http2_responses": self.http2_responses,
+        }
+
+
+class HTTPClientRegistry:
+    """Lazily created clients keyed by upstream name (and TLS verification)."""
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, bool], Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._stats: Dict[str, UpstreamStats] = {}
+
+    def get(self, upstream: str, verify: bool = True) -> httpx.AsyncClient:
+        """The pooled client for ``upstream``; created on first use."""
+        loop = asyncio.get_running_loop()
+        key = (upstream, verify)
+        entry = self._clients.get(key)
+        if entry is not None and entry[1] is loop and not entry[0].is_closed:
+            return entry[0]
+        # Connections are bound to the loop that opened them (a loop only
+        # changes in tests or scripts that call asyncio.run repeatedly)
+        client = self._create(upstream, verify)
+        self._clients[key] = (client, loop)
+        return client
+
+    def _create(self, upstream: str, verify: bool) -> httpx.AsyncClient:
+        settings = get_settings().http
+        stats = self._stats.setdefault(upstream, UpstreamStats())
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats.connections += 1
+            elif event == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+
+        async def on_request(request: httpx.Request) -> None:
+            stats.requests += 1
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response) -> None:
+            if response.http_version == "HTTP/2":
+                stats.http2_responses += 1
+
+        logger.debug(f"Opening pooled HTTP client for {upstream}")
+        return httpx.AsyncClient(
+            http2=settings.http2 and HTTP2_AVAILABLE,
+            verify=verify,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(10.0, connect=settings.connect_timeout),
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    async def aclose(self) -> None:
+        """Close every client (bridge shutdown)."""
+        clients, self._clients = self._clients, {}
+        for client, loop in clients.values():
+            if loop is asyncio.get_running_loop():
+                await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": get_settings().http.http2 and HTTP2_AVAILABLE,
+            "open_clients": len(self._clients),
+            "upstreams": {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
+
+
+# Singleton
+_registry: Optional[HTTPClientRegistry] = None
+
+
+def get_http_clients() -> HTTPClientRegistry:
+    global _registry
+    if _registry is None:
+        _registry = HTTPClientRegistry()
+    return _registry
@@ -1,16 +1,42 @@
+"""
+Incremental job checkpoints.
 
-import logging
+Checkpoints live in ``job_checkpoints`` as a base snapshot followed by
+append-only deltas (top-level keys of ``accumulated_results`` and
+``memory_snapshot`` that were set or removed since the previous save), so
+the cost of a save follows what changed, not the size of the job's state.
+Saves closer together than ``min_interval`` are coalesced: only the latest
+one is written when the interval elapses. After ``compact_every`` deltas,
+or once the deltas outweigh the base, a new base replaces the chain.
+A row is only appended while the stored chain still ends at this
+process's last row; if another worker wrote in between (the job's lease
+moved), this process starts over from a base on top of that worker's rows.
+"""
+
+import asyncio
+import copy
 import json
-from typing import Optional, Dict, Any
+import logging
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field, ValidationError
 
 from core.database import get_db
 from core.events.event_bus import get_event_bus
 from core.events.types import Event
+from core.serialization import dumps, loads
+from core.settings import get_settings
+from core.state.versioning import get_state_versions
 
 logger = logging.getLogger(__name__)
 
+# Fields diffed key by key; everything else is replaced on each delta
+_MAP_FIELDS = ("accumulated_results", "memory_snapshot")
+
+
 class CheckpointData(BaseModel):
     step_index: int = 0
     accumulated_results: Dict[str, Any] = Field(default_factory=dict)
@@ -23,101 +49,360 @@ class CheckpointSaveFailed(Exception):
 class CheckpointCorruptedError(Exception):
     pass
 
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Delta turning ``old`` into ``new``; None when nothing but the timestamp changed."""
+    delta: Dict[str, Any] = {
+        "step_index": new["step_index"],
+        "last_updated": new["last_updated"],
+    }
+    for field in _MAP_FIELDS:
+        before, after = old.get(field, {}), new.get(field, {})
+        changed = {k: v for k, v in after.items() if k not in before or before[k] != v}
+        removed = [k for k in before if k not in after]
+        if changed:
+            delta.setdefault("set", {})[field] = changed
+        if removed:
+            delta.setdefault("unset", {})[field] = removed
+    if "set" not in delta and "unset" not in delta and old["step_index"] == new["step_index"]:
+        return None
+    return delta
+
+
+def _apply(state: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    state["step_index"] = delta["step_index"]
+    state["last_updated"] = delta["last_updated"]
+    for field, values in delta.get("set", {}).items():
+        state.setdefault(field, {}).update(values)
+    for field, keys in delta.get("unset", {}).items():
+        for key in keys:
+            state.get(field, {}).pop(key, None)
+
+
+class _JobState:
+    """What this process last wrote for a job, plus the coalesced save."""
+
+    __slots__ = ("last", "seq", "deltas", "base_bytes", "delta_bytes", "last_write", "pending", "timer")
+
+    def __init__(self):
+        self.last: Optional[Dict[str, Any]] = None
+        self.seq = 0
+        self.deltas = 0
+        self.base_bytes = 0
+        self.delta_bytes = 0
+        self.last_write = float("-inf")
+        self.pending: Optional[CheckpointData] = None
+        self.timer: Optional[asyncio.Task] = None
+
+
 class CheckpointManager:
     """Handles versioned checkpoint save/load/cleanup"""
-    
-    def __init__(self):
+
+    def __init__(self, max_tracked: int = 1024):
         self.db = get_db()
-        self.checkpoint_version = "v1"
+        self.checkpoint_version = "v2"
         self.event_bus = get_event_bus()
-    
+        settings = get_settings().checkpoints
+        self.min_interval = settings.min_interval
+        self.compress = settings.compress
+        self.compress_min_bytes = settings.compress_min_bytes
+        self.compact_every = settings.compact_every
+        self.max_tracked = max_tracked
+        self._jobs: "OrderedDict[str, _JobState]" = OrderedDict()
+        self.counters = {
+            "base": 0, "delta": 0, "coalesced": 0, "unchanged": 0, "rebased": 0, "bytes": 0
+        }
+
+    def _state(self, job_id: str) -> _JobState:
+        state = self._jobs.get(job_id)
+        if state is None:
+            state = self._jobs[job_id] = _JobState()
+            # Forget idle jobs beyond the bound (never one with a save pending)
+            for old_id in list(self._jobs)[: max(0, len(self._jobs) - self.max_tracked)]:
+                if self._jobs[old_id].pending is None:
+                    del self._jobs[old_id]
+        self._jobs.move_to_end(job_id)
+        return state
+
+    def _encode(self, payload: Dict[str, Any]) -> Tuple[str, bytes]:
+        raw = dumps(payload)
+        if self.compress and len(raw) >= self.compress_min_bytes:
+            return "zlib", zlib.compress(raw)
+        return "json", raw
+
+    @staticmethod
+    def _decode(codec: str, data: bytes) -> Dict[str, Any]:
+        if codec == "zlib":
+            data = zlib.decompress(data)
+        return loads(data)
+
     async def save_checkpoint(
         self,
         job_id: str,
-        checkpoint: CheckpointData
+        checkpoint: CheckpointData,
+        force: bool = False,
     ) -> bool:
         """
-        Save checkpoint with versioning.
+        Save checkpoint, coalescing saves that arrive within ``min_interval``.
+
+        A coalesced save is written when the interval elapses (or on
+        ``flush``); ``force`` writes immediately.
         """
+        state = self._state(job_id)
+        wait = state.last_write + self.min_interval - time.monotonic()
+        if not force and wait > 0:
+            if state.pending is not None:
+                self.counters["coalesced"] += 1
+            state.pending = checkpoint
+            if state.timer is None or state.timer.done():
+                state.timer = asyncio.create_task(self._flush_later(job_id, wait))
+            return True
+
+        state.pending = None
+        await self._write(job_id, state, checkpoint)
+        return True
+
+    async def _flush_later(self, job_id: str, delay: float) -> None:
+        await asyncio.sleep(delay)
         try:
-            # Add version to checkpoint
-            versioned_data = {
-                "version": self.checkpoint_version,
-                "data": checkpoint.dict(),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-            # Serialize
-            # Pydantic's .json() is deprecated in v2, use model_dump_json() if v2, or .json() if v1.
-            # Assuming v1 compat based on legacy context, but standard is dict() generally safer for json.dumps
-            # Using verify convert of datetime manually if needed, but Pydantic handles it.
-            json_data = json.dumps(versioned_data, default=str)
-            
-            # Atomic update
-            # We use the sync execute wrapper but in a real scenario this might be blocking.
-            # Phase 0 requires functionality.
-            cursor = await self.db.execute(
-                """
-                UPDATE jobs 
-                SET checkpoint_data = ?,
-                    progress = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE job_id = ?
-                """,
-                (json_data, checkpoint.step_index, job_id)
-            )
-            
-            if cursor.rowcount == 0:
-                raise CheckpointSaveFailed(f"Job {job_id} not found")
-            
+            await self.flush(job_id)
+        except CheckpointSaveFailed as e:
+            logger.error(f"Deferred checkpoint for {job_id} lost: {e}")
+
+    async def flush(self, job_id: Optional[str] = None) -> None:
+        """Write coalesced saves now (one job, or all)."""
+        for jid in [job_id] if job_id else list(self._jobs):
+            state = self._jobs.get(jid)
+            if state is None or state.pending is None:
+                continue
+            if state.timer is not None and state.timer is not asyncio.current_task():
+                state.timer.cancel()
+            state.timer = None
+            pending, state.pending = state.pending, None
+            await self._write(jid, state, pending)
+
+    def discard(self, job_id: str) -> None:
+        """Drop in-memory state (and any coalesced save) of a finished job."""
+        state = self._jobs.pop(job_id, None)
+        if state is not None and state.timer is not None:
+            state.timer.cancel()
+
+    async def _write(self, job_id: str, state: _JobState, checkpoint: CheckpointData) -> None:
+        try:
+            new = checkpoint.model_dump(mode="json")
+            for _ in range(3):
+                if state.last is None:
+                    # First save seen by this process: continue the stored chain
+                    row = await self.db.fetch_one(
+                        "SELECT (SELECT MAX(seq) FROM job_checkpoints WHERE job_id = ?) AS seq "
+                        "FROM jobs WHERE job_id = ?",
+                        (job_id, job_id),
+                    )
+                    if row is None:
+                        raise CheckpointSaveFailed(f"Job {job_id} not found")
+                    state.seq = row["seq"] or 0
+
+                compact = (
+                    state.last is None
+                    or state.deltas >= self.compact_every
+                    or state.delta_bytes > state.base_bytes
+                )
+                if compact:
+                    kind = "base"
+                    payload = {"version": self.checkpoint_version, "data": new}
+                else:
+                    kind = "delta"
+                    payload = _diff(state.last, new)
+                    if payload is None:
+                        self.counters["unchanged"] += 1
+                        state.last_write = time.monotonic()
+                        return
+
+                codec, data = self._encode(payload)
+                seq = state.seq + 1
+                # Appended only while the stored chain still ends where this
+                # process left it, so deltas never land on another writer's state
+                statements: List[Tuple[str, Tuple]] = [(
+                    "INSERT INTO job_checkpoints (job_id, seq, kind, codec, data) "
+                    "SELECT ?, ?, ?, ?, ? WHERE (SELECT COALESCE(MAX(seq), 0) "
+                    "FROM job_checkpoints WHERE job_id = ?) = ?",
+                    (job_id, seq, kind, codec, data, job_id, state.seq),
+                )]
+                if kind == "base":
+                    # changes(): rows inserted by the statement above
+                    statements.append((
+                        "DELETE FROM job_checkpoints WHERE job_id = ? AND seq < ? AND changes() = 1",
+                        (job_id, seq),
+                    ))
+                if state.last is None or state.last["step_index"] != new["step_index"]:
+                    statements.insert(0, (
+                        "UPDATE jobs SET progress = ?, updated_at = CURRENT_TIMESTAMP "
+                        "WHERE job_id = ? AND (SELECT COALESCE(MAX(seq), 0) "
+                        "FROM job_checkpoints WHERE job_id = ?) = ?",
+                        (max(0, min(100, checkpoint.step_index)), job_id, job_id, state.seq),
+                    ))
+                counts = await self.db.execute_many(statements)
+                if counts[-2 if kind == "base" else -1]:
+                    break
+                # Another worker extended the chain (e.g. after a lease
+                # handoff): start over from a base on top of its rows
+                self.counters["rebased"] += 1
+                state.last = None
+            else:
+                raise CheckpointSaveFailed(f"Checkpoint chain of {job_id} keeps moving")
+
+            state.seq = seq
+            state.last = new
+            state.last_write = time.monotonic()
+            if kind == "base":
+                state.deltas, state.base_bytes, state.delta_bytes = 0, len(data), 0
+            else:
+                state.deltas += 1
+                state.delta_bytes += len(data)
+            self.counters[kind] += 1
+            self.counters["bytes"] += len(data)
+            get_state_versions().bump_job(job_id)
+
             # Emit event
             await self.event_bus.emit(Event(
                 event_type="job.checkpoint_saved",
                 source="checkpoint_manager",
-                payload={"job_id": job_id, "progress": checkpoint.step_index}
+                payload={"job_id": job_id, "progress": checkpoint.step_index, "kind": kind, "bytes": len(data)}
             ))
-            
-            return True
-            
+
+        except CheckpointSaveFailed:
+            raise
         except Exception as e:
             logger.error(f"Checkpoint save failed for {job_id}: {e}")
             raise CheckpointSaveFailed(str(e))
-    
+
     async def load_checkpoint(
         self,
         job_id: str
     ) -> Optional[CheckpointData]:
         """
-        Load and validate checkpoint.
+        Load and validate checkpoint (latest base plus the deltas after it).
+        """
+        state = self._jobs.get(job_id)
+        if state is not None and state.pending is not None:
+            return state.pending.model_copy(deep=True)
+        if state is not None and state.last is not None:
+            return CheckpointData(**copy.deepcopy(state.last))
+
+        rows = await self.db.fetch_all(
+            """
+            SELECT kind, codec, data FROM job_checkpoints
+            WHERE job_id = ?
+              AND seq >= (SELECT MAX(seq) FROM job_checkpoints WHERE job_id = ? AND kind = 'base')
+            ORDER BY seq
+            """,
+            (job_id, job_id),
+        )
+        if not rows:
+            return await self._load_legacy(job_id)
+        return self._assemble(rows)
+
+    def _assemble(self, rows: List[Dict[str, Any]]) -> CheckpointData:
+        """Base row followed by its deltas -> CheckpointData."""
+        try:
+            base = self._decode(rows[0]['codec'], rows[0]['data'])
+            if base.get('version') != self.checkpoint_version:
+                logger.warning(f"Checkpoint version mismatch: {base.get('version')} vs {self.checkpoint_version}")
+            data = base['data']
+            for row in rows[1:]:
+                _apply(data, self._decode(row['codec'], row['data']))
+            return CheckpointData(**data)
+        except (zlib.error, ValueError, KeyError, ValidationError) as e:
+            raise CheckpointCorruptedError(f"Invalid checkpoint: {e}")
+
+    def _assemble_many(self, rows: List[Dict[str, Any]]) -> Dict[str, CheckpointData]:
+        chains: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            chains.setdefault(row['job_id'], []).append(row)
+        loaded = {}
+        for job_id, chain in chains.items():
+            try:
+                loaded[job_id] = self._assemble(chain)
+            except CheckpointCorruptedError as e:
+                logger.error(f"Skipping checkpoint of {job_id}: {e}")
+        return loaded
+
+    async def load_many(self, job_ids: List[str], chunk_size: int = 500) -> Dict[str, CheckpointData]:
         """
+        Checkpoints of many jobs (e.g. at restore): one query per chunk of
+        ``chunk_size`` jobs, chunks decoded concurrently in worker threads.
+        Jobs without a checkpoint, or with a corrupted one, are left out.
+        """
+        async def load_chunk(chunk: List[str]) -> Dict[str, CheckpointData]:
+            marks = ",".join("?" * len(chunk))
+            rows = await self.db.fetch_all(
+                f"""
+                SELECT c.job_id, c.kind, c.codec, c.data FROM job_checkpoints c
+                WHERE c.job_id IN ({marks})
+                  AND c.seq >= (SELECT MAX(b.seq) FROM job_checkpoints b
+                                WHERE b.job_id = c.job_id AND b.kind = 'base')
+                ORDER BY c.job_id, c.seq
+                """,
+                tuple(chunk),
+            )
+            return await asyncio.to_thread(self._assemble_many, rows)
+
+        chunks = [job_ids[i:i + chunk_size] for i in range(0, len(job_ids), chunk_size)]
+        loaded: Dict[str, CheckpointData] = {}
+        for part in await asyncio.gather(*(load_chunk(chunk) for chunk in chunks)):
+            loaded.update(part)
+
+        # v1 checkpoints stored inline in the jobs row
+        missing = [job_id for job_id in job_ids if job_id not in loaded]
+        for i in range(0, len(missing), chunk_size):
+            chunk = missing[i:i + chunk_size]
+            rows = await self.db.fetch_all(
+                f"""
+                SELECT job_id, checkpoint_data FROM jobs
+                WHERE job_id IN ({",".join("?" * len(chunk))})
+                  AND checkpoint_data IS NOT NULL AND checkpoint_data != '{{}}'
+                """,
+                tuple(chunk),
+            )
+            for row in rows:
+                try:
+                    loaded[row['job_id']] = CheckpointData(**json.loads(row['checkpoint_data'])['data'])
+                except (json.JSONDecodeError, KeyError, ValidationError) as e:
+                    logger.error(f"Skipping checkpoint of {row['job_id']}: {e}")
+        return loaded
+
+    async def _load_legacy(self, job_id: str) -> Optional[CheckpointData]:
+        """Checkpoints written inline in ``jobs.checkpoint_data`` (v1)."""
         row = await self.db.fetch_one(
             "SELECT checkpoint_data FROM jobs WHERE job_id = ?",
             (job_id,)
         )
-        
-        if not row or not row['checkpoint_data']:
+
+        if not row or not row['checkpoint_data'] or row['checkpoint_data'] == '{}':
             return None
-        
+
         try:
             versioned_data = json.loads(row['checkpoint_data'])
-            
-            # Version migration logic could go here
-            if versioned_data.get('version') != self.checkpoint_version:
-                logger.warning(f"Checkpoint version mismatch: {versioned_data.get('version')} vs {self.checkpoint_version}")
-                # For now, simplistic backward compat if keys allow
-            
             return CheckpointData(**versioned_data['data'])
-            
-        except (json.JSONDecodeError, ValidationError) as e:
+        except (json.JSONDecodeError, KeyError, ValidationError) as e:
             raise CheckpointCorruptedError(f"Invalid checkpoint: {e}")
-    
+
     async def cleanup_old_checkpoints(self, days: int = 7):
         """Delete checkpoints from completed jobs older than N days"""
-        await self.db.execute(
-            """
-            UPDATE jobs 
-            SET checkpoint_data = NULL
+        finished = """
+            SELECT job_id FROM jobs
             WHERE status IN ('COMPLETED', 'FAILED', 'CANCELLED')
-              AND updated_at < datetime('now', '-{} days')
-            """.format(days)
-        )
+              AND updated_at < datetime('now', ?)
+        """
+        cutoff = f"-{int(days)} days"
+        await self.db.execute_many([
+            (f"DELETE FROM job_checkpoints WHERE job_id IN ({finished})", (cutoff,)),
+            (f"UPDATE jobs SET checkpoint_data = NULL WHERE job_id IN ({finished})", (cutoff,)),
+        ])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "tracked_jobs": len(self._jobs),
+            "pending": sum(1 for s in self._jobs.values() if s.pending is not None),
+        }
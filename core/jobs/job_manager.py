@@ -1,12 +1,16 @@
 import asyncio
 import uuid
 import logging
-import json
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Tuple
+from core.blob_store import REF_KEY, blob_ref, get_blob_store
 from core.database import get_db
 from core.events.event_bus import get_event_bus
 from core.events.types import Event
+from core.serialization import dumps_str, loads
+from core.settings import get_settings
 from core.jobs.checkpoint import CheckpointManager, CheckpointData
+from core.jobs.signals import JobControl, TERMINAL_STATUSES, YIELD_STATUSES, get_job_signals
+from core.state.versioning import get_state_versions
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +21,27 @@ class JobManager:
         self.db = get_db()
         self.event_bus = get_event_bus()
         self.checkpoint_manager = CheckpointManager()
+        self.versions = get_state_versions()
+        self.signals = get_job_signals()
+        self.blobs = get_blob_store()
 
-    async def create_job(self, agent_id: str, job_type: str) -> str:
+    async def create_job(
+        self,
+        agent_id: str,
+        job_type: str,
+        params: Optional[Dict] = None,
+        priority: Optional[str] = None,
+    ) -> str:
+        """Record a PENDING job; params/priority are kept so restore can respawn it."""
         job_id = str(uuid.uuid4())
         await self.db.execute(
-            "INSERT INTO jobs (job_id, agent_id, job_type, status) VALUES (?, ?, ?, ?)",
-            (job_id, agent_id, job_type, "PENDING")
+            # Checkpoints live in job_checkpoints; keep the row itself small
+            "INSERT INTO jobs (job_id, agent_id, job_type, status, checkpoint_data, params, priority) "
+            "VALUES (?, ?, ?, ?, NULL, ?, ?)",
+            (job_id, agent_id, job_type, "PENDING", dumps_str(params) if params else None, priority)
         )
+        self.versions.bump_job(job_id)
+        self.signals.set_status(job_id, "PENDING")
         
         await self.event_bus.emit(Event(
             event_type="job.created",
@@ -39,8 +57,9 @@ class JobManager:
         params = [status]
         
         if result:
+            # Large results go to the blob store; the row keeps a reference
             query += ", result_data = ?"
-            params.append(json.dumps(result, default=str))
+            params.append(await asyncio.to_thread(self.blobs.externalize, result))
         
         if error:
             query += ", error_message = ?"
@@ -49,7 +68,12 @@ class JobManager:
         query += " WHERE job_id = ?"
         params.append(job_id)
         
-        await self.db.execute(query, tuple(params))
+        cursor = await self.db.execute(query, tuple(params))
+        self.versions.bump_job(job_id)
+        # Wakes tools parked in wait_for_resume; the row above stays the durable record
+        self.signals.set_status(job_id, status if cursor.rowcount else None)
+        if status in TERMINAL_STATUSES:
+            self.checkpoint_manager.discard(job_id)
         
         await self.event_bus.emit(Event(
             event_type=f"job.{status.lower()}",
@@ -57,35 +81,109 @@ class JobManager:
             payload={"job_id": job_id, "status": status, "error": error}
         ))
 
+    async def set_status_many(self, job_ids: List[str], status: str, error: Optional[str] = None):
+        """Move several jobs to ``status`` in one UPDATE and one event."""
+        if not job_ids:
+            return
+        await self.db.execute_many([
+            self.status_statement(job_ids, status, error),
+            *self.versions.bump_statements(job_ids=job_ids),
+        ])
+        await self.publish_status_many(job_ids, status, error, versioned=True)
+
+    @staticmethod
+    def status_statement(job_ids: List[str], status: str, error: Optional[str] = None) -> Tuple[str, Tuple]:
+        """The batch UPDATE of ``set_status_many``, for callers running it in their own transaction."""
+        marks = ",".join("?" * len(job_ids))
+        return (
+            f"UPDATE jobs SET status = ?, error_message = COALESCE(?, error_message), "
+            f"updated_at = CURRENT_TIMESTAMP WHERE job_id IN ({marks})",
+            (status, error, *job_ids),
+        )
+
+    async def publish_status_many(
+        self, job_ids: List[str], status: str, error: Optional[str] = None, versioned: bool = False
+    ):
+        """
+        In-memory state and the batch event for jobs already moved to ``status``.
+        ``versioned`` callers stamped the batch in their own transaction
+        (``versions.bump_statements``); otherwise it is stamped here, once.
+        """
+        if not versioned:
+            self.versions.bump_many(job_ids=job_ids)
+        for job_id in job_ids:
+            self.signals.set_status(job_id, status)
+            if status in TERMINAL_STATUSES:
+                self.checkpoint_manager.discard(job_id)
+
+        await self.event_bus.emit(Event(
+            event_type=f"job.{status.lower()}",
+            source="job_manager",
+            payload={"job_ids": list(job_ids), "status": status, "error": error}
+        ))
+
+    async def collect_blobs(self, min_age: Optional[float] = None) -> int:
+        """Delete blobs no job result references any more; returns how many."""
+        rows = await self.db.fetch_all(
+            "SELECT result_data FROM jobs WHERE result_data LIKE ?", (f'%"{REF_KEY}"%',)
+        )
+        live = set()
+        for row in rows:
+            if ref := blob_ref(loads(row['result_data'])):
+                live.add(ref[REF_KEY])
+        if min_age is None:
+            min_age = get_settings().blobs.gc_min_age
+        return await asyncio.to_thread(self.blobs.sweep, live, min_age)
+
+    async def collect_blobs_forever(self, interval: float) -> None:
+        """Background blob GC, every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self.collect_blobs()
+                if removed:
+                    logger.info(f"Removed {removed} unreferenced result blobs")
+            except Exception as e:
+                logger.error(f"Blob collection failed: {e}")
+
+    async def get_result(self, job_id: str) -> Optional[Dict]:
+        """Job result, loading it from the blob store if it was externalized."""
+        row = await self.db.fetch_one("SELECT result_data FROM jobs WHERE job_id = ?", (job_id,))
+        if row is None:
+            raise ValueError(f"Job {job_id} not found")
+        return await asyncio.to_thread(self.blobs.resolve, row['result_data'])
+
+    async def _control(self, job_id: str) -> JobControl:
+        """In-memory control state, loaded from the database on first sight."""
+        control = self.signals.get(job_id)
+        if control is None:
+            row = await self.db.fetch_one("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
+            control = self.signals.track(job_id, row['status'] if row else None)
+        return control
+
     async def should_yield(self, job_id: str) -> bool:
         """
         Cooperative multitasking check.
         Returns True if PAUSE or CANCEL signal received.
         """
-        row = await self.db.fetch_one("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
-        if not row:
-            return False
-        return row['status'] in ['PAUSED', 'CANCELLED']
+        return (await self._control(job_id)).status in YIELD_STATUSES
 
     async def wait_for_resume(self, job_id: str):
-        """Blocks until status becomes RUNNING."""
+        """Blocks until status becomes RUNNING (woken by set_status, no polling)."""
+        control = await self._control(job_id)
         while True:
-            row = await self.db.fetch_one("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
-            if not row:
+            status = control.status
+            if status is None:
                 raise ValueError(f"Job {job_id} vanished")
-            
-            status = row['status']
             if status == 'RUNNING':
                 return
             if status == 'CANCELLED':
                 raise asyncio.CancelledError("Job cancelled by operator")
-            
-            # Exponential backoff or simpler sleep? Simple sleep is fine for Phase 0.
-            await asyncio.sleep(1)
+            await control.wait_changed()
 
     # Proxy to CheckpointManager
-    async def save_checkpoint(self, job_id: str, data: CheckpointData):
-        await self.checkpoint_manager.save_checkpoint(job_id, data)
+    async def save_checkpoint(self, job_id: str, data: CheckpointData, force: bool = False):
+        await self.checkpoint_manager.save_checkpoint(job_id, data, force=force)
 
     async def load_checkpoint(self, job_id: str) -> Optional[CheckpointData]:
         return await self.checkpoint_manager.load_checkpoint(job_id)
@@ -0,0 +1,274 @@
+"""
+Job Queue - SQLite leases so several bridge processes share job execution.
+==========================================================================
+
+The ``jobs`` table is the queue. A worker claims runnable jobs with one
+``UPDATE ... RETURNING`` (SQLite serializes writers, so a job is claimed by
+exactly one process), which stamps ``lease_owner`` / ``lease_expires_at``.
+While it holds them the worker renews the leases (heartbeat); a job whose
+lease expired (its worker crashed or hung) is reclaimed: RUNNING goes back
+to PENDING for another worker, after ``max_attempts`` claims it FAILS.
+
+Claimable: PENDING jobs, and RUNNING jobs without an owner (left by a
+single-process bridge, or paused jobs resumed after their lease was
+reclaimed). Lease columns of finished jobs are simply ignored.
+
+Execution is at-least-once: a worker that loses a lease abandons the
+job, but work done before it noticed may be repeated by the new owner.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from core.database import get_db
+from core.jobs.job_manager import JobManager
+from core.jobs.scheduler import PRIORITY_CLASSES
+from core.settings import get_settings
+
+if TYPE_CHECKING:
+    from core.state.orchestrator import AgentOrchestrator
+
+logger = logging.getLogger(__name__)
+
+_PRIORITY_ORDER = " ".join(f"WHEN '{name}' THEN {rank}" for name, rank in PRIORITY_CLASSES.items())
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class JobQueue:
+    """Lease operations on the jobs table."""
+
+    def __init__(self, job_manager: Optional[JobManager] = None, lease_seconds: float = 30.0, max_attempts: int = 3):
+        self.db = get_db()
+        self.job_manager = job_manager or JobManager()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    async def claim(self, worker_id: str, limit: int, job_types: Iterable[str]) -> List[Dict[str, Any]]:
+        """Atomically lease up to ``limit`` runnable jobs, most urgent first."""
+        job_types = list(job_types)
+        if limit <= 0 or not job_types:
+            return []
+        marks = ",".join("?" * len(job_types))
+        # UPDATE ... RETURNING: the select and the lease happen in one write transaction
+        rows = await self.db.fetch_all(
+            f"""
+            UPDATE jobs
+            SET status = 'RUNNING', lease_owner = ?, lease_expires_at = ?,
+                attempts = COALESCE(attempts, 0) + 1, updated_at = CURRENT_TIMESTAMP
+            WHERE job_id IN (
+                SELECT job_id FROM jobs
+                WHERE lease_owner IS NULL AND status IN ('PENDING', 'RUNNING') AND job_type IN ({marks})
+                ORDER BY CASE priority {_PRIORITY_ORDER} ELSE {PRIORITY_CLASSES['normal']} END, created_at
+                LIMIT ?
+            )
+            RETURNING job_id, agent_id, job_type, status, params, priority, attempts,
+                (SELECT agent_type FROM agents WHERE agents.agent_id = jobs.agent_id) AS agent_type
+            """,
+            (worker_id, time.time() + self.lease_seconds, *job_types, limit),
+        )
+        # RETURNING rows come back in no particular order
+        rows.sort(key=lambda row: PRIORITY_CLASSES.get(row['priority'], PRIORITY_CLASSES['normal']))
+        return rows
+
+    async def heartbeat(self, worker_id: str, job_ids: List[str]) -> List[str]:
+        """Renew the leases; returns the jobs still owned by ``worker_id``."""
+        if not job_ids:
+            return []
+        marks = ",".join("?" * len(job_ids))
+        rows = await self.db.fetch_all(
+            f"""
+            UPDATE jobs SET lease_expires_at = ?
+            WHERE lease_owner = ? AND job_id IN ({marks})
+            RETURNING job_id
+            """,
+            (time.time() + self.lease_seconds, worker_id, *job_ids),
+        )
+        return [row['job_id'] for row in rows]
+
+    async def release(self, worker_id: str, job_ids: List[str]) -> int:
+        """Give unfinished jobs back (graceful shutdown): claimable right away."""
+        if not job_ids:
+            return 0
+        marks = ",".join("?" * len(job_ids))
+        rows = await self.db.fetch_all(
+            f"""
+            UPDATE jobs
+            SET status = CASE status WHEN 'RUNNING' THEN 'PENDING' ELSE status END,
+                lease_owner = NULL, lease_expires_at = NULL, attempts = MAX(COALESCE(attempts, 1) - 1, 0)
+            WHERE lease_owner = ? AND job_id IN ({marks}) AND status IN ('RUNNING', 'PAUSED')
+            RETURNING job_id, status
+            """,
+            (worker_id, *job_ids),
+        )
+        await self._publish(rows)
+        return len(rows)
+
+    async def reclaim_expired(self) -> Dict[str, int]:
+        """Free expired leases: RUNNING -> PENDING, or FAILED after ``max_attempts``."""
+        now = time.time()
+        failed = await self.db.fetch_all(
+            """
+            UPDATE jobs
+            SET status = 'FAILED', error_message = 'Lease expired after ' || attempts || ' attempts',
+                lease_owner = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE lease_owner IS NOT NULL AND lease_expires_at < ?
+              AND status IN ('RUNNING', 'PAUSED') AND attempts >= ?
+            RETURNING job_id, status
+            """,
+            (now, self.max_attempts),
+        )
+        reclaimed = await self.db.fetch_all(
+            """
+            UPDATE jobs
+            SET status = CASE status WHEN 'RUNNING' THEN 'PENDING' ELSE status END,
+                lease_owner = NULL, lease_expires_at = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE lease_owner IS NOT NULL AND lease_expires_at < ? AND status IN ('RUNNING', 'PAUSED')
+            RETURNING job_id, status
+            """,
+            (now,),
+        )
+        await self._publish(failed + reclaimed, error="Lease expired")
+        if failed or reclaimed:
+            logger.warning(f"Reclaimed {len(reclaimed)} expired job leases ({len(failed)} failed)")
+        return {"reclaimed": len(reclaimed), "failed": len(failed)}
+
+    async def _publish(self, rows: List[Dict[str, Any]], error: Optional[str] = None) -> None:
+        by_status: Dict[str, List[str]] = {}
+        for row in rows:
+            by_status.setdefault(row['status'], []).append(row['job_id'])
+        for status, job_ids in by_status.items():
+            await self.job_manager.publish_status_many(job_ids, status, error if status == "FAILED" else None)
+
+
+class QueueWorker:
+    """
+    Claims jobs from the queue into the local scheduler and keeps their
+    leases alive. At most ``scheduler.max_workers`` jobs are held at once.
+    """
+
+    def __init__(
+        self,
+        orchestrator: "AgentOrchestrator",
+        worker_id: Optional[str] = None,
+        queue: Optional[JobQueue] = None,
+        claim_batch: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+    ):
+        settings = get_settings().scheduler
+        self.orchestrator = orchestrator
+        self.worker_id = worker_id or default_worker_id()
+        self.queue = queue or JobQueue(
+            orchestrator.job_manager, settings.lease_seconds, settings.lease_max_attempts
+        )
+        self.claim_batch = claim_batch or settings.claim_batch
+        self.poll_interval = settings.queue_poll_interval if poll_interval is None else poll_interval
+        self.heartbeat_interval = (
+            settings.heartbeat_interval if heartbeat_interval is None else heartbeat_interval
+        )
+        self._owned: Dict[str, asyncio.Future] = {}
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._next_heartbeat = 0.0
+        self.counters = {"claimed": 0, "lost": 0, "reclaimed": 0, "failed": 0, "heartbeats": 0}
+
+    def capacity(self) -> int:
+        return self.orchestrator.scheduler.max_workers - len(self._owned)
+
+    def wake(self) -> None:
+        """A job may be claimable now (e.g. just created by this process)."""
+        self._wake.set()
+
+    async def tick(self) -> int:
+        """Heartbeat/reclaim when due, then claim up to the free capacity."""
+        if time.monotonic() >= self._next_heartbeat:
+            self._next_heartbeat = time.monotonic() + self.heartbeat_interval
+            await self._heartbeat()
+            for key, count in (await self.queue.reclaim_expired()).items():
+                self.counters[key] += count
+
+        limit = min(self.capacity(), self.claim_batch)
+        jobs = await self.queue.claim(self.worker_id, limit, self.orchestrator.job_handlers)
+        if not jobs:
+            return 0
+        checkpoints = await self.orchestrator.job_manager.checkpoint_manager.load_many(
+            [job['job_id'] for job in jobs]
+        )
+        for job in jobs:
+            future = self.orchestrator.submit_stored_job(job, checkpoints.get(job['job_id']))
+            self._owned[job['job_id']] = future
+            future.add_done_callback(lambda _, job_id=job['job_id']: self._finished(job_id))
+        self.counters["claimed"] += len(jobs)
+        return len(jobs)
+
+    def _finished(self, job_id: str) -> None:
+        self._owned.pop(job_id, None)
+        self._wake.set()
+
+    async def _heartbeat(self) -> None:
+        owned = list(self._owned)
+        kept = set(await self.queue.heartbeat(self.worker_id, owned))
+        self.counters["heartbeats"] += 1
+        for job_id in owned:
+            if job_id not in kept and job_id in self._owned:
+                logger.warning(f"Lease of job {job_id} lost; abandoning it")
+                self.counters["lost"] += 1
+                self._owned.pop(job_id)
+                self.orchestrator.scheduler.abandon(job_id)
+
+    async def _loop(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self.tick()
+            except Exception as e:
+                logger.error(f"Job queue tick failed: {e}")
+                claimed = 0
+            if claimed and claimed == self.claim_batch and self.capacity() > 0:
+                continue  # more may be waiting
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop claiming and hand the unfinished jobs back to the queue."""
+        if self._task is not None:
+            # The flag ends the loop even if wait_for swallows the cancellation
+            # (it can on Python < 3.12 when the wake-up races the cancel)
+            self._stopping = True
+            self._wake.set()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        owned = list(self._owned)
+        for job_id in owned:
+            self._owned.pop(job_id, None)
+            self.orchestrator.scheduler.abandon(job_id)
+        await self.queue.release(self.worker_id, owned)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "owned": len(self._owned),
+            "capacity": self.capacity(),
+            "lease_seconds": self.queue.lease_seconds,
+            **self.counters,
+        }
@@ -0,0 +1,318 @@
+"""
+Job Scheduler - Bounded pool with priorities and fair share.
+============================================================
+
+``AgentOrchestrator.start_job`` hands runnable jobs to a ``JobScheduler``:
+
+- a bounded pool: at most ``max_workers`` jobs execute at once;
+- per-agent-type caps (e.g. at most 4 ``osint_hunter`` jobs), so one agent
+  type cannot take the whole pool;
+- priority classes, dispatched strictly in order: an ``incident`` job is
+  always started before a queued ``background`` compliance sweep;
+- weighted fair queuing across agents within a class (start-time fair
+  queuing on virtual finish tags): an agent that floods the queue with
+  hundreds of jobs is interleaved with the others instead of served first.
+
+Each class keeps one heap per agent type, so a dispatch only looks at the
+head of the types that still have room: a flood of jobs of a capped type
+costs nothing to the jobs queued behind it.
+
+Queued jobs stay ``PENDING`` in the ``jobs`` table; the scheduler moves them
+to RUNNING and then COMPLETED/FAILED through the JobManager. Jobs cancelled
+while queued (via the job signals) are dropped at dispatch; a job whose
+status became terminal while it ran (agent terminated) keeps that status.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from core.jobs.signals import TERMINAL_STATUSES, get_job_signals
+
+logger = logging.getLogger(__name__)
+
+# Lower value = dispatched first
+PRIORITY_CLASSES: Dict[str, int] = {
+    "incident": 0,
+    "high": 1,
+    "normal": 2,
+    "background": 3,
+}
+DEFAULT_PRIORITY = "normal"
+
+JobRunner = Callable[[], Awaitable[Any]]
+
+
+class ScheduledJob:
+    """A job waiting for (or holding) a pool slot."""
+
+    __slots__ = (
+        "job_id",
+        "agent_id",
+        "agent_type",
+        "priority",
+        "runner",
+        "start_tag",
+        "finish_tag",
+        "enqueued_at",
+        "future",
+        "task",
+        "abandoned",
+    )
+
+    def __init__(
+        self,
+        job_id: str,
+        agent_id: str,
+        agent_type: str,
+        priority: str,
+        runner: JobRunner,
+    ):
+        self.job_id = job_id
+        self.agent_id = agent_id
+        self.agent_type = agent_type
+        self.priority = priority
+        self.runner = runner
+        self.start_tag = 0.0
+        self.finish_tag = 0.0
+        self.enqueued_at = time.perf_counter()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Callers may never await the result; mark exceptions as retrieved
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.task: Optional[asyncio.Task] = None
+        self.abandoned = False
+
+
+class JobScheduler:
+    """Dispatches submitted jobs onto a bounded pool of asyncio tasks."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        type_caps: Optional[Dict[str, int]] = None,
+        default_type_cap: Optional[int] = None,
+        job_manager=None,
+    ):
+        self.max_workers = max_workers
+        self.type_caps = dict(type_caps or {})
+        self.default_type_cap = default_type_cap or max_workers
+        self.job_manager = job_manager
+        self.signals = get_job_signals()
+
+        # Priority class -> agent type -> heap of (finish tag, seq, job)
+        self._queues: Dict[str, Dict[str, List[Tuple[float, int, ScheduledJob]]]] = {
+            name: {} for name in PRIORITY_CLASSES
+        }
+        self._order = sorted(PRIORITY_CLASSES, key=PRIORITY_CLASSES.get)
+        self._seq = itertools.count()
+        self._jobs: Dict[str, ScheduledJob] = {}
+        # Fair queuing state, per priority class
+        self._virtual_time: Dict[str, float] = defaultdict(float)
+        self._agent_finish: Dict[Tuple[str, str], float] = {}
+        self._weights: Dict[str, float] = {}
+
+        self._running = 0
+        self._running_by_type: Dict[str, int] = defaultdict(int)
+        self._waits: Dict[str, Deque[float]] = {
+            name: deque(maxlen=1000) for name in PRIORITY_CLASSES
+        }
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def set_weight(self, agent_id: str, weight: float) -> None:
+        """Share of its priority class an agent gets relative to others (default 1)."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weights[agent_id] = weight
+
+    def cap_for(self, agent_type: str) -> int:
+        return min(self.type_caps.get(agent_type, self.default_type_cap), self.max_workers)
+
+    def submit(
+        self,
+        job_id: str,
+        agent_id: str,
+        agent_type: str,
+        runner: JobRunner,
+        priority: str = DEFAULT_PRIORITY,
+        cost: float = 1.0,
+    ) -> asyncio.Future:
+        """Queue a job; the returned future resolves with the runner's result."""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(
+                f"Unknown priority {priority!r} (expected one of {', '.join(self._order)})"
+            )
+        entry = ScheduledJob(job_id, agent_id, agent_type, priority, runner)
+        key = (priority, agent_id)
+        entry.start_tag = max(self._virtual_time[priority], self._agent_finish.get(key, 0.0))
+        entry.finish_tag = entry.start_tag + cost / self._weights.get(agent_id, 1.0)
+        self._agent_finish[key] = entry.finish_tag
+
+        queue = self._queues[priority].setdefault(agent_type, [])
+        heapq.heappush(queue, (entry.finish_tag, next(self._seq), entry))
+        self._jobs[job_id] = entry
+        self.submitted += 1
+        self._pump()
+        return entry.future
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a queued job or cancel a running one."""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return False
+        if entry.task is not None:
+            entry.task.cancel()
+        else:
+            self._drop(entry)
+            self._pump()
+        return True
+
+    def abandon(self, job_id: str) -> bool:
+        """
+        Stop a job this process no longer owns (lost lease): like ``cancel``,
+        but the job status is left to its new owner.
+        """
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return False
+        entry.abandoned = True
+        return self.cancel(job_id)
+
+    def _drop(self, entry: ScheduledJob) -> None:
+        queue = self._queues[entry.priority].get(entry.agent_type, [])
+        queue[:] = [item for item in queue if item[2] is not entry]
+        heapq.heapify(queue)
+        self._jobs.pop(entry.job_id, None)
+        self.cancelled += 1
+        entry.future.cancel()
+
+    def _is_cancelled(self, entry: ScheduledJob) -> bool:
+        control = self.signals.get(entry.job_id)
+        return control is not None and control.status == "CANCELLED"
+
+    def _is_finished(self, entry: ScheduledJob) -> bool:
+        """Status already terminal (e.g. CANCELLED by a terminate while running)."""
+        control = self.signals.get(entry.job_id)
+        return control is not None and control.status in TERMINAL_STATUSES
+
+    def _head(self, queue: List[Tuple[float, int, ScheduledJob]]) -> Optional[ScheduledJob]:
+        """First job of ``queue`` still wanted, dropping cancelled ones on the way."""
+        while queue:
+            entry = queue[0][2]
+            if not self._is_cancelled(entry):
+                return entry
+            heapq.heappop(queue)
+            self._jobs.pop(entry.job_id, None)
+            self.cancelled += 1
+            entry.future.cancel()
+        return None
+
+    def _next(self) -> Optional[ScheduledJob]:
+        """Lowest finish tag of the most urgent class whose agent type has room."""
+        for priority in self._order:
+            chosen = None
+            for agent_type, queue in self._queues[priority].items():
+                # Types at their cap are never scanned
+                if self._running_by_type[agent_type] >= self.cap_for(agent_type):
+                    continue
+                head = self._head(queue)
+                if head is not None and (chosen is None or head.finish_tag < chosen.finish_tag):
+                    chosen = head
+            if chosen is not None:
+                heapq.heappop(self._queues[priority][chosen.agent_type])
+                self._virtual_time[priority] = max(
+                    self._virtual_time[priority], chosen.start_tag
+                )
+                return chosen
+        return None
+
+    def _pump(self) -> None:
+        while self._running < self.max_workers:
+            entry = self._next()
+            if entry is None:
+                return
+            self._running += 1
+            self._running_by_type[entry.agent_type] += 1
+            self._waits[entry.priority].append(time.perf_counter() - entry.enqueued_at)
+            entry.task = asyncio.create_task(self._run(entry))
+
+    async def _run(self, entry: ScheduledJob) -> None:
+        try:
+            if self.job_manager:
+                await self.job_manager.set_status(entry.job_id, "RUNNING")
+            result = await entry.runner()
+            if self._is_finished(entry):
+                # Terminated while running: the CANCELLED row stays
+                self.cancelled += 1
+                entry.future.cancel()
+                return
+            if self.job_manager:
+                await self.job_manager.set_status(
+                    entry.job_id,
+                    "COMPLETED",
+                    result=result if isinstance(result, dict) else {"result": result},
+                )
+            self.completed += 1
+            entry.future.set_result(result)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if self.job_manager and not entry.abandoned and not self._is_finished(entry):
+                await self.job_manager.set_status(entry.job_id, "CANCELLED")
+            entry.future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Job {entry.job_id} failed: {e}")
+            if self._is_finished(entry):
+                self.cancelled += 1
+                entry.future.cancel()
+                return
+            self.failed += 1
+            if self.job_manager:
+                await self.job_manager.set_status(entry.job_id, "FAILED", error=str(e))
+            entry.future.set_exception(e)
+        finally:
+            self._running -= 1
+            self._running_by_type[entry.agent_type] -= 1
+            self._jobs.pop(entry.job_id, None)
+            self._pump()
+
+    def stats(self) -> Dict[str, Any]:
+        queued_by_type: Dict[str, int] = defaultdict(int)
+        queued_by_priority: Dict[str, int] = {}
+        for priority, queues in self._queues.items():
+            queued_by_priority[priority] = sum(len(q) for q in queues.values())
+            for agent_type, queue in queues.items():
+                if queue:
+                    queued_by_type[agent_type] += len(queue)
+
+        wait_ms = {}
+        for priority, samples in self._waits.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            wait_ms[priority] = {
+                "avg": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p95": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2),
+            }
+
+        return {
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "running_by_type": {k: v for k, v in self._running_by_type.items() if v},
+            "queued": sum(queued_by_priority.values()),
+            "queued_by_priority": queued_by_priority,
+            "queued_by_type": dict(queued_by_type),
+            "type_caps": self.type_caps,
+            "wait_ms": wait_ms,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
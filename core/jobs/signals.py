@@ -0,0 +1,96 @@
+"""
+Job Signals - In-memory pause/resume/cancel control state.
+==========================================================
+
+Tools check in with ``JobManager.should_yield`` between steps and park in
+``wait_for_resume`` while paused. Both used to hit SQLite (one SELECT per
+check-in, plus a 1s polling loop per paused job). The control state now
+lives here, updated by ``JobManager.set_status`` (and, in multi-worker
+mode, by the event relay for status changes made by other workers); the
+``jobs`` table stays the durable record and is only read for jobs this
+process has not seen yet.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional
+
+YIELD_STATUSES = frozenset({"PAUSED", "CANCELLED"})
+TERMINAL_STATUSES = frozenset({"COMPLETED", "FAILED", "CANCELLED"})
+
+
+class JobControl:
+    """Current status of one job plus a wake-up for its waiters."""
+
+    __slots__ = ("status", "_changed")
+
+    def __init__(self, status: Optional[str]):
+        self.status = status
+        self._changed = asyncio.Event()
+
+    def update(self, status: Optional[str]) -> None:
+        """Record the new status and wake everyone waiting on the old one."""
+        self.status = status
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_changed(self) -> None:
+        await self._changed.wait()
+
+
+class JobSignals:
+    """Process-wide map of job_id -> JobControl."""
+
+    def __init__(self, max_finished: int = 1024):
+        self._jobs: Dict[str, JobControl] = {}
+        # Finished jobs are kept a little while (late check-ins), then evicted
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self.max_finished = max_finished
+
+    def get(self, job_id: str) -> Optional[JobControl]:
+        return self._jobs.get(job_id)
+
+    def track(self, job_id: str, status: Optional[str]) -> JobControl:
+        """Register a job loaded from the database (no wake-up)."""
+        control = self._jobs.get(job_id)
+        if control is None:
+            control = self._jobs[job_id] = JobControl(status)
+            self._note_finished(job_id, status)
+        return control
+
+    def set_status(self, job_id: str, status: Optional[str]) -> None:
+        """Apply a status change; ``None`` means the job no longer exists."""
+        control = self._jobs.get(job_id)
+        if control is None:
+            self._jobs[job_id] = JobControl(status)
+        else:
+            control.update(status)
+        self._note_finished(job_id, status)
+
+    def _note_finished(self, job_id: str, status: Optional[str]) -> None:
+        if status is not None and status not in TERMINAL_STATUSES:
+            self._finished.pop(job_id, None)
+            return
+        self._finished[job_id] = None
+        self._finished.move_to_end(job_id)
+        while len(self._finished) > self.max_finished:
+            evicted, _ = self._finished.popitem(last=False)
+            self._jobs.pop(evicted, None)
+
+    def stats(self) -> Dict[str, int]:
+        by_status: Dict[str, int] = {}
+        for control in self._jobs.values():
+            key = control.status or "UNKNOWN"
+            by_status[key] = by_status.get(key, 0) + 1
+        return {"tracked": len(self._jobs), **by_status}
+
+
+# Singleton
+_signals: Optional[JobSignals] = None
+
+
+def get_job_signals() -> JobSignals:
+    global _signals
+    if _signals is None:
+        _signals = JobSignals()
+    return _signals
@@ -1,54 +1,388 @@
 """
-Rate Limiter client-side usando asyncio.
+Rate Limiter client-side usando token buckets.
 
-HIBP limita 1 request a cada 1.5 segundos.
+Cada serviço tem um ou mais baldes ("janelas"): o de segundo vem do ``rps``
+(com ``burst`` de capacidade) e os de minuto/hora/dia das cotas do plano
+(VirusTotal free: 4/min e 500/dia). Um request consome um token de cada
+balde; sem token, espera o balde mais lento reabastecer.
+
+    @rate_limit("virustotal", rps=4 / 60, burst=4, per_day=500)
+    async def lookup(...): ...
+
+    limiter = get_rate_limiter("virustotal")
+    if limiter.try_acquire():           # não bloqueia
+        ...
+    limiter.wait_estimates()            # {"second": 0.0, "day": 3600.0}
+
+A reserva é síncrona (sem await entre ler e consumir), então nenhum lock é
+segurado durante a espera. O consumo é persistido em ``rate_limit_buckets``
+e sobrevive a restarts: a reserva acontece em memória e a gravação vai
+para uma thread (write-behind, reservas seguidas viram uma escrita só).
+Com o bridge multi-processo (workers > 1 ou a fila de jobs) os baldes
+vivem só no SQLite e cada reserva é uma transação, também feita numa
+thread por ``acquire``. Limites podem ser sobrescritos em
+``VERTICE_RATELIMIT_*``. Esperas que passariam do deadline do request
+falham na hora (DeadlineExceeded) para o provider cair no fallback, e
+quem é cancelado durante a espera devolve o token reservado.
 """
 
 import asyncio
 import logging
 import time
+from contextlib import contextmanager
 from functools import wraps
-from typing import Callable, TypeVar, Any
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from core.deadline import ensure_can_wait, remaining
+from core.tracing import span
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+WINDOWS = {"second": 1.0, "minute": 60.0, "hour": 3600.0, "day": 86400.0}
+
+
+class Bucket:
+    """Token bucket de uma janela: ``capacity`` tokens, reabastece ``rate``/s."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(
+        self,
+        capacity: float,
+        rate: float,
+        tokens: Optional[float] = None,
+        updated: float = 0.0,
+    ):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity if tokens is None else min(tokens, capacity)
+        self.updated = updated
+
+    def refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait(self, tokens: float = 1.0) -> float:
+        """Segundos até haver ``tokens`` (após refill)."""
+        return max(tokens - self.tokens, 0.0) / self.rate
+
+
+class _Buckets(dict):
+    """Baldes de um serviço por janela; ``dirty`` = houve consumo a gravar."""
+
+    dirty = False
+
 
 class RateLimiter:
-    """Rate limiter baseado em token bucket."""
+    """Rate limiter de token buckets (um por janela) de um processo."""
+
+    def __init__(
+        self,
+        requests_per_second: float = 0.67,  # 1/1.5s
+        burst: int = 1,
+        limits: Optional[Dict[str, float]] = None,
+        service: Optional[str] = None,
+    ):
+        self.service = service
+        # Janela -> (capacidade, tokens/s)
+        self.windows: Dict[str, tuple] = {"second": (float(burst), requests_per_second)}
+        for window, limit in (limits or {}).items():
+            self.windows[window] = (float(limit), limit / WINDOWS[window])
+        self._buckets: Optional[_Buckets] = None
+        self._flushing: Optional[asyncio.Task] = None
+
+    # -- estado -------------------------------------------------------------
+
+    def _new_buckets(self, rows: Dict[str, Dict[str, float]], now: float) -> _Buckets:
+        buckets = _Buckets()
+        for window, (capacity, rate) in self.windows.items():
+            row = rows.get(window)
+            if row is None:
+                buckets[window] = Bucket(capacity, rate, updated=now)
+            else:
+                buckets[window] = Bucket(capacity, rate, row["tokens"], row["updated_at"])
+        return buckets
+
+    def _load_rows(self, conn) -> Dict[str, Dict[str, float]]:
+        rows = conn.execute(
+            "SELECT bucket, tokens, updated_at FROM rate_limit_buckets WHERE service = ?",
+            (self.service,),
+        ).fetchall()
+        return {row["bucket"]: dict(row) for row in rows}
+
+    def _save_rows(self, conn, buckets: Dict[str, Bucket]) -> None:
+        conn.executemany(
+            """
+            INSERT INTO rate_limit_buckets (service, bucket, tokens, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(service, bucket) DO UPDATE SET
+                tokens = excluded.tokens, updated_at = excluded.updated_at
+            """,
+            [(self.service, w, b.tokens, b.updated) for w, b in buckets.items()],
+        )
+
+    def _persists(self) -> bool:
+        if self.service is None:
+            return False
+        from core.settings import get_settings
+
+        return get_settings().ratelimit.persist
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        from core.database import get_db
+
+        conn = get_db().get_connection()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if not self._persists():
+            return {}
+        with self._connection() as conn:
+            return self._load_rows(conn)
+
+    def _write(self, buckets: Dict[str, Bucket]) -> None:
+        with self._connection() as conn:
+            self._save_rows(conn, buckets)
+
+    @contextmanager
+    def _state(self) -> Iterator[_Buckets]:
+        """Baldes em memória (carregados do SQLite no primeiro uso)."""
+        if self._buckets is None:
+            self._buckets = self._new_buckets(self._load(), time.time())
+        yield self._buckets
+        if self._buckets.dirty:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Grava o consumo numa thread; sem event loop, grava na hora."""
+        if not self._persists():
+            self._buckets.dirty = False
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.create_task(self._flush_behind())
+
+    async def _flush_behind(self) -> None:
+        # Reservas feitas enquanto a thread grava saem na próxima volta
+        while self._buckets.dirty:
+            self._buckets.dirty = False
+            snapshot = {
+                window: Bucket(b.capacity, b.rate, b.tokens, b.updated)
+                for window, b in self._buckets.items()
+            }
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except Exception as e:
+                logger.error(f"Rate limit persist failed ({self.service}): {e}")
+
+    def flush(self) -> None:
+        """Grava já o consumo pendente (síncrono)."""
+        if self._buckets is not None and self._buckets.dirty:
+            self._buckets.dirty = False
+            self._write(self._buckets)
 
-    def __init__(self, requests_per_second: float = 0.67):  # 1/1.5s
-        self.min_interval = 1.0 / requests_per_second
-        self._last_request = 0.0
-        self._lock = asyncio.Lock()
+    # -- API ----------------------------------------------------------------
+
+    def _reserve_slot(self, max_wait: Optional[float] = None, tokens: float = 1.0) -> float:
+        """
+        Consome ``tokens`` de cada janela e retorna quanto esperar (segundos).
+
+        O saldo pode ficar negativo: é a fila de quem já reservou. Se a
+        espera for >= ``max_wait`` nada é consumido (o token fica para quem
+        ainda pode esperar) e a espera é retornada mesmo assim.
+        """
+        with self._state() as buckets:
+            now = time.time()
+            for bucket in buckets.values():
+                bucket.refill(now)
+            wait = max(bucket.wait(tokens) for bucket in buckets.values())
+            if max_wait is None or wait < max_wait:
+                for bucket in buckets.values():
+                    bucket.tokens -= tokens
+                buckets.dirty = True
+        return wait
+
+    def wait_estimates(self, tokens: float = 1.0) -> Dict[str, float]:
+        """Espera (s) imposta por cada janela para ``tokens``, sem consumir."""
+        with self._state() as buckets:
+            now = time.time()
+            for bucket in buckets.values():
+                bucket.refill(now)
+            return {window: bucket.wait(tokens) for window, bucket in buckets.items()}
+
+    def estimate_wait(self, tokens: float = 1.0) -> float:
+        return max(self.wait_estimates(tokens).values())
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Consome e retorna True se há tokens agora; nunca espera."""
+        return self._reserve_slot(max_wait=1e-9, tokens=tokens) < 1e-9
+
+    def _refund(self, tokens: float = 1.0) -> None:
+        """Devolve a cada janela ``tokens`` reservados e não usados."""
+        with self._state() as buckets:
+            for bucket in buckets.values():
+                bucket.tokens = min(bucket.capacity, bucket.tokens + tokens)
+            buckets.dirty = True
+
+    async def _aload(self) -> None:
+        """Carga inicial dos baldes numa thread."""
+        if self._buckets is None:
+            rows = await asyncio.to_thread(self._load)
+            if self._buckets is None:
+                self._buckets = self._new_buckets(rows, time.time())
+
+    async def _areserve(self, max_wait: Optional[float], tokens: float = 1.0) -> float:
+        """``_reserve_slot`` sem I/O no event loop."""
+        await self._aload()
+        return self._reserve_slot(max_wait, tokens)
+
+    async def _arefund(self, tokens: float = 1.0) -> None:
+        self._refund(tokens)
+
+    async def await_estimates(self, tokens: float = 1.0) -> Dict[str, float]:
+        """``wait_estimates`` sem I/O no event loop."""
+        await self._aload()
+        return self.wait_estimates(tokens)
 
     async def acquire(self) -> None:
-        """Aguarda até poder fazer próximo request."""
-        async with self._lock:
+        """
+        Aguarda até poder fazer próximo request.
+
+        Falha com DeadlineExceeded (sem esperar nem consumir) se a espera
+        passar do deadline. Cancelado durante a espera, devolve o token.
+        """
+        wait_time = await self._areserve(max_wait=remaining())
+        ensure_can_wait(wait_time, f"Rate limit wait ({self.service or 'local'})")
+        with span(
+            "ratelimit.wait",
+            {"ratelimit.service": self.service or "local", "ratelimit.sleep_s": wait_time},
+        ):
+            if wait_time > 0:
+                logger.debug(f"Rate limit ({self.service}): waiting {wait_time:.2f}s")
+                try:
+                    await asyncio.sleep(wait_time)
+                except asyncio.CancelledError:
+                    await self._arefund()
+                    raise
+
+    def report(self) -> Dict[str, Any]:
+        """Capacidade, tokens disponíveis e espera estimada por janela."""
+        with self._state() as buckets:
             now = time.time()
-            elapsed = now - self._last_request
+            windows = {}
+            for window, bucket in buckets.items():
+                bucket.refill(now)
+                windows[window] = {
+                    "capacity": bucket.capacity,
+                    "tokens": round(bucket.tokens, 3),
+                    "refill_per_s": bucket.rate,
+                    "wait_s": round(bucket.wait(), 3),
+                }
+        return {
+            "service": self.service,
+            "shared": isinstance(self, SharedRateLimiter),
+            "wait_s": max(w["wait_s"] for w in windows.values()),
+            "windows": windows,
+        }
 
-            if elapsed < self.min_interval:
-                wait_time = self.min_interval - elapsed
-                logger.debug(f"Rate limit: waiting {wait_time:.2f}s")
-                await asyncio.sleep(wait_time)
 
-            self._last_request = time.time()
+class SharedRateLimiter(RateLimiter):
+    """
+    Rate limiter compartilhado entre processos (bridge multi-worker).
 
+    Os baldes vivem só no SQLite: cada reserva lê, reabastece e grava os
+    baldes do serviço numa transação IMMEDIATE, feita numa thread pelos
+    métodos async, e dorme fora dela.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        requests_per_second: float = 0.67,
+        burst: int = 1,
+        limits: Optional[Dict[str, float]] = None,
+    ):
+        super().__init__(requests_per_second, burst, limits, service=service)
+
+    async def _areserve(self, max_wait: Optional[float], tokens: float = 1.0) -> float:
+        return await asyncio.to_thread(self._reserve_slot, max_wait, tokens)
+
+    async def _arefund(self, tokens: float = 1.0) -> None:
+        await asyncio.to_thread(self._refund, tokens)
+
+    async def await_estimates(self, tokens: float = 1.0) -> Dict[str, float]:
+        return await asyncio.to_thread(self.wait_estimates, tokens)
+
+    @contextmanager
+    def _state(self) -> Iterator[_Buckets]:
+        from core.database import get_db
+
+        conn = get_db().get_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            buckets = self._new_buckets(self._load_rows(conn), time.time())
+            yield buckets
+            if buckets.dirty:
+                self._save_rows(conn, buckets)
+            conn.execute("COMMIT")
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.close()
 
-# Rate limiters por serviço
+
+# Rate limiters por serviço e os limites declarados por @rate_limit
 _limiters: dict[str, RateLimiter] = {}
+_specs: Dict[str, Dict[str, Any]] = {}
 
 
 def get_rate_limiter(service: str, rps: float = 0.67) -> RateLimiter:
-    """Retorna rate limiter para serviço."""
+    """
+    Retorna rate limiter para serviço (compartilhado se multi-processo).
+
+    Os limites vêm do ``@rate_limit`` que declarou o serviço (senão de
+    ``rps``), sobrescritos por ``VERTICE_RATELIMIT_LIMITS``/``BURSTS``.
+    """
     if service not in _limiters:
-        _limiters[service] = RateLimiter(rps)
+        from core.settings import get_settings
+
+        settings = get_settings()
+        declared = _specs.get(service, {"rps": rps})
+        limits = {**declared.get("limits", {}), **settings.ratelimit.limits.get(service, {})}
+        burst = settings.ratelimit.bursts.get(service, declared.get("burst", 1))
+        if settings.bridge.multi_process:
+            _limiters[service] = SharedRateLimiter(service, declared["rps"], burst, limits)
+        else:
+            _limiters[service] = RateLimiter(declared["rps"], burst, limits, service=service)
     return _limiters[service]
 
 
-def rate_limit(service: str, rps: float = 0.67) -> Callable:
+def rate_limit_report() -> Dict[str, Any]:
+    """Estado e esperas estimadas de todos os serviços já usados."""
+    return {service: limiter.report() for service, limiter in _limiters.items()}
+
+
+def rate_limit(
+    service: str,
+    rps: float = 0.67,
+    burst: int = 1,
+    per_minute: Optional[int] = None,
+    per_hour: Optional[int] = None,
+    per_day: Optional[int] = None,
+) -> Callable:
     """
     Decorator para aplicar rate limiting.
 
@@ -57,13 +391,18 @@ def rate_limit(service: str, rps: float = 0.67) -> Callable:
         async def call_hibp(email: str):
             ...
     """
+    limits = {
+        window: limit
+        for window, limit in (("minute", per_minute), ("hour", per_hour), ("day", per_day))
+        if limit is not None
+    }
+    _specs[service] = {"rps": rps, "burst": burst, "limits": limits}
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
             limiter = get_rate_limiter(service, rps)
             await limiter.acquire()
-            import asyncio
 
             if asyncio.iscoroutinefunction(func):
                 return await func(*args, **kwargs)
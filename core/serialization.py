@@ -0,0 +1,67 @@
+"""
+Serialization - Fast JSON encoding shared by bridge, event bus and WebSockets.
+==============================================================================
+
+Uses orjson when installed (falls back to the stdlib ``json``). datetime,
+Enum and dataclasses are handled natively by orjson; pydantic models and
+anything else unknown go through ``_default``, so callers can hand over
+tool results as they come without a ``model_dump``/``jsonable_encoder``
+pass first.
+"""
+
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types the encoder does not know."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` to compact JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def loads(data: Any) -> Any:
+        return orjson.loads(data)
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` to compact JSON bytes."""
+        return json.dumps(
+            obj, default=_default, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+
+    def loads(data: Any) -> Any:
+        return json.loads(data)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode ``obj`` to a JSON string (SQLite columns, WebSocket text frames)."""
+    return dumps(obj).decode("utf-8")
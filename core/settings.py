@@ -4,7 +4,7 @@ Usa Pydantic Settings v2 para configuração type-safe.
 """
 
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -53,6 +53,265 @@ class ServerSettings(BaseSettings):
     log_level: str = Field(default="INFO")
 
 
+class BridgeSettings(BaseSettings):
+    """Configurações do HTTP Bridge (runtime e observabilidade)."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_BRIDGE_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    workers: int = Field(
+        default=1,
+        description="Processos uvicorn; >1 ativa o estado compartilhado via SQLite",
+    )
+    warmup: bool = Field(
+        default=True,
+        description="Pré-carrega datasets MITRE/compliance e clients em background",
+    )
+    preload_tools: bool = Field(
+        default=True,
+        description="Importa os módulos das tools em background após o startup",
+    )
+    event_relay_interval: float = Field(
+        default=0.1, description="Intervalo (s) do relay de eventos entre workers"
+    )
+    accounting_sample_interval: float = Field(
+        default=5.0, description="Intervalo (s) do sampler de recursos por agente"
+    )
+    accounting_window_seconds: float = Field(
+        default=60.0, description="Janela (s) do uso de recursos rolling"
+    )
+    # Desligado por padrão: tracemalloc encarece toda alocação do processo
+    accounting_trace_memory: bool = Field(
+        default=False,
+        description="Ativa tracemalloc para o memoryMB por agente (null nas métricas sem ele)",
+    )
+    tool_timeout: float = Field(
+        default=120.0, description="Deadline padrão (s) de uma execução de tool"
+    )
+    tool_timeouts: Dict[str, float] = Field(
+        # Enriquecimento em lote espera o rate limit do VT (4 req/min, 500/dia)
+        default={"threat_enrich_bulk": 3600.0},
+        description="Deadline (s) por tool, sobrepõe tool_timeout (JSON)",
+    )
+    disconnect_poll_interval: float = Field(
+        default=0.5, description="Intervalo (s) de verificação de cliente desconectado"
+    )
+    job_queue: bool = Field(
+        default=False,
+        description="Executa jobs pela fila com lease no SQLite (sempre ativa com workers > 1)",
+    )
+    restore_on_startup: bool = Field(
+        default=True,
+        description="Retoma em background os jobs ativos a partir dos checkpoints",
+    )
+    max_bulk_agents: int = Field(
+        default=1000, description="Máximo de agentes por chamada das APIs em lote"
+    )
+    state_version_history: int = Field(
+        default=50_000,
+        description="Carimbos de versão mantidos em memória; deltas mais antigos viram snapshot completo",
+    )
+
+    @property
+    def multi_process(self) -> bool:
+        """Outros processos (workers ou instâncias com a fila) usam o mesmo SQLite."""
+        return self.job_queue or self.workers > 1
+
+
+class TracingSettings(BaseSettings):
+    """Configurações de tracing in-process (spans por tool call)."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_TRACING_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    enabled: bool = Field(default=False, description="Registra spans (custo ~zero se off)")
+    buffer_size: int = Field(default=4096, description="Spans mantidos no ring buffer")
+    otlp_dump_path: Optional[str] = Field(
+        default=None, description="Arquivo OTLP/JSON gravado no shutdown do bridge"
+    )
+
+
+class SchedulerSettings(BaseSettings):
+    """Configurações do scheduler de jobs dos agentes orquestrados."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_SCHEDULER_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    max_workers: int = Field(default=8, description="Jobs executando ao mesmo tempo (pool)")
+    type_caps: Dict[str, int] = Field(
+        default_factory=lambda: {"osint_hunter": 4},
+        description="Limite de jobs simultâneos por tipo de agente (JSON)",
+    )
+    default_type_cap: Optional[int] = Field(
+        default=None, description="Limite para tipos sem cap explícito (None = pool)"
+    )
+    restore_ramp_batch: int = Field(
+        default=25, description="Jobs reenfileirados por onda ao restaurar o universo"
+    )
+    restore_ramp_interval: float = Field(
+        default=1.0, description="Intervalo (s) entre ondas da restauração"
+    )
+    lease_seconds: float = Field(
+        default=30.0, description="Duração (s) do lease de um job reivindicado da fila"
+    )
+    heartbeat_interval: float = Field(
+        default=10.0, description="Intervalo (s) de renovação dos leases e de reclaim"
+    )
+    lease_max_attempts: int = Field(
+        default=3, description="Leases expirados até o job ser marcado FAILED"
+    )
+    claim_batch: int = Field(default=16, description="Jobs reivindicados por consulta")
+    queue_poll_interval: float = Field(
+        default=0.5, description="Intervalo (s) de polling da fila quando ociosa"
+    )
+
+
+class CheckpointSettings(BaseSettings):
+    """Configurações dos checkpoints incrementais de jobs."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_CHECKPOINT_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    min_interval: float = Field(
+        default=2.0, description="Intervalo mínimo (s) entre gravações; saves no meio são agrupados"
+    )
+    compress: bool = Field(default=True, description="Comprime (zlib) payloads grandes")
+    compress_min_bytes: int = Field(
+        default=1024, description="Tamanho mínimo (bytes) para comprimir um payload"
+    )
+    compact_every: int = Field(
+        default=20, description="Deltas acumulados antes de gravar uma nova base"
+    )
+
+
+class BlobStoreSettings(BaseSettings):
+    """Configurações do blob store (resultados grandes fora do SQLite)."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_BLOBS_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    root: Optional[str] = Field(
+        default=None, description="Diretório dos blobs (padrão: ~/.vertice/blobs)"
+    )
+    inline_max_bytes: int = Field(
+        default=16384, description="Resultados maiores que isso vão para o blob store"
+    )
+    gc_interval: float = Field(
+        default=3600.0, description="Intervalo (s) da coleta de blobs sem referência (0 desliga)"
+    )
+    gc_min_age: float = Field(
+        default=600.0, description="Idade mínima (s) de um blob sem referência para ser apagado"
+    )
+
+
+class HTTPClientSettings(BaseSettings):
+    """Configurações dos clientes HTTP compartilhados (um por upstream)."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_HTTP_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    http2: bool = Field(
+        default=True, description="Usa HTTP/2 quando o pacote h2 está instalado"
+    )
+    max_connections: int = Field(default=20, description="Conexões por upstream")
+    max_keepalive_connections: int = Field(
+        default=10, description="Conexões ociosas mantidas abertas por upstream"
+    )
+    keepalive_expiry: float = Field(
+        default=30.0, description="Tempo (s) até fechar uma conexão ociosa"
+    )
+    connect_timeout: float = Field(default=5.0, description="Timeout (s) de conexão")
+
+
+class ProviderCacheSettings(BaseSettings):
+    """Configurações do cache na frente das chains de providers."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_PROVIDER_CACHE_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    enabled: bool = Field(
+        default=True, description="Consulta o cache antes da API (cache-first)"
+    )
+    ttls: Dict[str, int] = Field(
+        default={"virustotal": 86400, "otx": 21600, "hibp": 86400},
+        description="TTL fresco (s) por provider; ausente = FF_OSINT_CACHE_TTL_SECONDS",
+    )
+    stale_ttls: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Janela (s) após o TTL em que a resposta é servida enquanto revalida",
+    )
+    default_stale_ttl: int = Field(
+        default=86400, description="Janela stale (s) dos providers sem entrada em stale_ttls"
+    )
+
+
+class RateLimitSettings(BaseSettings):
+    """Configurações dos rate limiters (token buckets) por serviço."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_RATELIMIT_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    limits: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description='Cotas por serviço e janela (minute/hour/day), ex: {"hibp": {"minute": 10}}',
+    )
+    bursts: Dict[str, int] = Field(
+        default_factory=dict, description="Rajada (capacidade do balde por segundo) por serviço"
+    )
+    persist: bool = Field(
+        default=True, description="Persiste o consumo no SQLite (sobrevive a restarts)"
+    )
+
+
+class EnrichmentSettings(BaseSettings):
+    """Configurações do enriquecimento de IOCs em lote (OTX + VirusTotal)."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="VERTICE_ENRICH_",
+        env_file=".env",
+        extra="ignore",
+    )
+
+    window: int = Field(
+        default=256, description="Indicadores em andamento por execução (limita memória)"
+    )
+    lane_workers: Dict[str, int] = Field(
+        default={"otx": 4, "virustotal": 1},
+        description="Chamadas upstream simultâneas por provider",
+    )
+    checkpoint_every: int = Field(
+        default=100, description="Persiste o cursor a cada N indicadores concluídos"
+    )
+    dedup_window: int = Field(
+        default=100_000,
+        description="Indicadores distintos lembrados para deduplicar (LRU; limita memória)",
+    )
+
+
 class EthicalSettings(BaseSettings):
     """Configurações do Ethical Magistrate."""
 
@@ -109,6 +368,15 @@ class Settings(BaseSettings):
 
     api_keys: APIKeysSettings = Field(default_factory=APIKeysSettings)
     server: ServerSettings = Field(default_factory=ServerSettings)
+    bridge: BridgeSettings = Field(default_factory=BridgeSettings)
+    tracing: TracingSettings = Field(default_factory=TracingSettings)
+    scheduler: SchedulerSettings = Field(default_factory=SchedulerSettings)
+    checkpoints: CheckpointSettings = Field(default_factory=CheckpointSettings)
+    blobs: BlobStoreSettings = Field(default_factory=BlobStoreSettings)
+    http: HTTPClientSettings = Field(default_factory=HTTPClientSettings)
+    provider_cache: ProviderCacheSettings = Field(default_factory=ProviderCacheSettings)
+    ratelimit: RateLimitSettings = Field(default_factory=RateLimitSettings)
+    enrichment: EnrichmentSettings = Field(default_factory=EnrichmentSettings)
     ethics: EthicalSettings = Field(default_factory=EthicalSettings)
 
 
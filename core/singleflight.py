@@ -0,0 +1,85 @@
+"""
+Singleflight - one upstream call for identical concurrent lookups.
+
+Correlated incidents make several investigations ask OTX / VirusTotal
+about the same indicator at the same time. With VirusTotal limited to
+4 calls a minute and 500 a day, each duplicate used to spend quota and
+queue behind the others. Callers now share the in-flight call of their key:
+
+    result, shared = await flights.do(("virustotal", "vt:ip:1.2.3.4"), lookup)
+
+The first caller (the leader) starts ``lookup`` as a task; callers that
+arrive before it finishes await the same task. The task runs in a clean
+context, so it does not inherit the leader's deadline: each caller applies
+only its own deadline to its wait. The task is also shielded, so a caller
+that is cancelled (client disconnect) or whose own deadline runs out leaves
+without cancelling the call the others are waiting for. The shared result
+is the same object for every caller: treat it as read-only.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from core.deadline import DeadlineExceeded, remaining
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """In-flight calls keyed by an arbitrary hashable key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def inflight(self, key: Hashable) -> bool:
+        task = self._calls.get(key)
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Run ``fn`` once per key at a time; returns (result, shared with a leader)."""
+        left = remaining()
+        shared = self.inflight(key)
+        if not shared and left is not None and left <= 0:
+            # The shared call runs without a deadline: never start one for a caller already late
+            raise DeadlineExceeded(f"Deadline exceeded before {key}")
+        if shared:
+            self.coalesced += 1
+            task = self._calls[key]
+        else:
+            self.executions += 1
+            # Clean context: the shared call must not inherit the leader's deadline
+            task = asyncio.create_task(self._call(fn), context=contextvars.Context())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        try:
+            if left is None:
+                result = await asyncio.shield(task)
+            else:
+                result = await asyncio.wait_for(asyncio.shield(task), max(left, 0))
+        except asyncio.TimeoutError as e:
+            if task.done():
+                raise
+            raise DeadlineExceeded(f"Deadline exceeded waiting for {key}") from e
+        return result, shared
+
+    @staticmethod
+    async def _call(fn: Callable[[], Awaitable[T]]) -> T:
+        return await fn()
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Retrieved here so an unawaited failure is not logged as lost
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": sum(1 for task in self._calls.values() if not task.done()),
+        }
@@ -1,16 +1,46 @@
 
+import asyncio
 import logging
 import json
+import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from core.database import get_db
 from core.events.event_bus import get_event_bus
 from core.events.types import Event, EventType
+from core.jobs.checkpoint import CheckpointData
 from core.jobs.job_manager import JobManager
+from core.jobs.scheduler import DEFAULT_PRIORITY, PRIORITY_CLASSES, JobScheduler
+from core.serialization import dumps_str
+from core.settings import get_settings
+from core.state.registry import AgentRegistry, new_job_row
+from core.state.versioning import get_state_versions
 
 logger = logging.getLogger(__name__)
 
+# job_type -> coroutine(job_id, agent_id, params, checkpoint=None) executed by
+# the scheduler; ``checkpoint`` is only passed when a job is restored.
+JobHandler = Callable[..., Awaitable[Any]]
+
+
+async def _run_osint_investigation(
+    job_id: str,
+    agent_id: str,
+    params: Dict[str, Any],
+    checkpoint: Optional[CheckpointData] = None,
+) -> Dict[str, Any]:
+    # Investigations are short and do not checkpoint: a restored one restarts
+    from tools.osint import InvestigationDepth, get_osint_hunter
+
+    result = await get_osint_hunter().investigate(
+        params["target"],
+        InvestigationDepth(params.get("depth", InvestigationDepth.BASIC.value)),
+        job_id=job_id,
+    )
+    return result.model_dump()
+
+
 class AgentOrchestrator:
     """God-mode controller for all agents."""
     
@@ -18,6 +48,69 @@ class AgentOrchestrator:
         self.db = get_db()
         self.event_bus = get_event_bus()
         self.job_manager = JobManager()
+        self.versions = get_state_versions()
+        # Agents and their open jobs, written through; other processes write too in multi-process mode
+        self.registry = AgentRegistry(
+            self.db, self.job_manager.signals, authoritative=not get_settings().bridge.multi_process
+        )
+        self.event_bus.subscribe(r"job\.checkpoint_saved$", self._on_checkpoint_saved)
+        scheduler_settings = get_settings().scheduler
+        self.scheduler = JobScheduler(
+            max_workers=scheduler_settings.max_workers,
+            type_caps=scheduler_settings.type_caps,
+            default_type_cap=scheduler_settings.default_type_cap,
+            job_manager=self.job_manager,
+        )
+        self.job_handlers: Dict[str, JobHandler] = {
+            "osint.investigate": _run_osint_investigation,
+            "workflow.run": self._run_workflow,
+        }
+        self.restore_stats: Dict[str, Any] = {}
+        # Set when jobs are shared by several processes through the leased queue
+        self.queue_worker = None
+        # Restored PAUSED jobs waiting (outside the pool) to be resumed
+        self._restore_waiters: Set[asyncio.Task] = set()
+
+    def register_job_handler(self, job_type: str, handler: JobHandler) -> None:
+        """Make ``job_type`` runnable by the scheduler."""
+        self.job_handlers[job_type] = handler
+
+    async def _on_checkpoint_saved(self, event: Event) -> None:
+        self.registry.set_progress(event.payload["job_id"], event.payload["progress"])
+
+    async def _run_workflow(
+        self,
+        job_id: str,
+        agent_id: str,
+        params: Dict[str, Any],
+        checkpoint: Optional[CheckpointData] = None,
+    ) -> Dict[str, Any]:
+        # Finished steps are memoized in the job checkpoint: a restored run skips them
+        from core.workflows import WORKFLOWS
+
+        workflow = WORKFLOWS[params["workflow_id"]]
+        return await workflow.run(
+            params.get("inputs", {}),
+            job_id=job_id,
+            job_manager=self.job_manager,
+            checkpoint=checkpoint,
+        )
+
+    async def ensure_agent(self, agent_id: str, agent_type: str) -> None:
+        """Register a long-lived system agent (e.g. the workflow engine) once."""
+        if await self.registry.get(agent_id):
+            return
+        row = await self.db.fetch_one(
+            """
+            INSERT OR IGNORE INTO agents (agent_id, agent_type, state, config, spawned_at)
+            VALUES (?, ?, ?, ?, ?)
+            RETURNING *
+            """,
+            (agent_id, agent_type, "SPAWNED", "{}", datetime.utcnow())
+        )
+        if row:
+            self.registry.put_agent(row)
+        self.versions.bump_agent(agent_id)
         
     async def spawn_agent(self, agent_type: str, config: Dict[str, Any]) -> str:
         """
@@ -32,13 +125,16 @@ class AgentOrchestrator:
         
         # Validation of config (Phase 4 Gap 4 handled by Pydantic usage in API layer, here we take dict)
         
-        await self.db.execute(
+        row = await self.db.fetch_one(
             """
             INSERT INTO agents (agent_id, agent_type, state, config, spawned_at)
             VALUES (?, ?, ?, ?, ?)
+            RETURNING *
             """,
             (agent_id, agent_type, "SPAWNED", json.dumps(config), datetime.utcnow())
         )
+        self.registry.put_agent(row)
+        self.versions.bump_agent(agent_id)
         
         await self.event_bus.emit(Event(
             event_type=EventType.AGENT_SPAWNED, # Using the string value from Enum
@@ -48,37 +144,67 @@ class AgentOrchestrator:
         
         return agent_id
 
-    async def start_job(self, agent_id: str, job_type: str, params: Dict[str, Any]) -> str:
-        """Propagate start command to JobManager."""
+    async def start_job(
+        self,
+        agent_id: str,
+        job_type: str,
+        params: Dict[str, Any],
+        priority: str = DEFAULT_PRIORITY,
+    ) -> str:
+        """
+        Create the job and, if ``job_type`` has a handler, queue it on the scheduler.
+
+        Jobs without a handler are only recorded; the caller runs them. With
+        a queue worker attached the job is left PENDING for whichever bridge
+        process claims it.
+        """
+        if not job_type or not isinstance(job_type, str):
+            raise ValueError("job_type is required")
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority {priority}")
         # Check agent state
-        row = await self.db.fetch_one("SELECT state FROM agents WHERE agent_id = ?", (agent_id,))
+        row = await self.registry.get(agent_id)
         if not row:
             raise ValueError(f"Agent {agent_id} not found")
         
         # Update agent state to RUNNING
-        await self.db.execute("UPDATE agents SET state = 'RUNNING' WHERE agent_id = ?", (agent_id,))
-        
-        job_id = await self.job_manager.create_job(agent_id, job_type)
-        
-        # Here we would actually "trigger" the implementation logic.
-        # Since this is the Orchestrator, we might return the job_ID to the caller (API) 
-        # which then executes the logic, OR the Orchestrator dispatches it.
-        # For Phase 0, we return the structure.
+        if row['state'] != 'RUNNING':
+            await self.db.execute("UPDATE agents SET state = 'RUNNING' WHERE agent_id = ?", (agent_id,))
+            self.registry.set_state([agent_id], 'RUNNING')
+            self.versions.bump_agent(agent_id)
         
+        job_id = await self.job_manager.create_job(agent_id, job_type, params, priority)
+        self.registry.add_job(
+            new_job_row(job_id, agent_id, job_type, dumps_str(params) if params else None, priority)
+        )
+
+        handler = self.job_handlers.get(job_type)
+        if handler is not None and self.queue_worker is not None:
+            # Any process may claim it; this one looks first
+            self.queue_worker.wake()
+        elif handler is not None:
+            self.scheduler.submit(
+                job_id,
+                agent_id,
+                row['agent_type'],
+                lambda: handler(job_id, agent_id, params),
+                priority=priority,
+            )
+
         return job_id
 
     async def pause_agent(self, agent_id: str):
         """Freeze agent execution."""
         # Find active job
-        row = await self.db.fetch_one(
-            "SELECT job_id FROM jobs WHERE agent_id = ? AND status = 'RUNNING'", 
-            (agent_id,)
-        )
-        if row:
+        await self.registry.get(agent_id)
+        running = self.registry.jobs(agent_id, ("RUNNING",))
+        if running:
             # Set job status to PAUSED (signal)
-            await self.job_manager.set_status(row['job_id'], "PAUSED")
+            await self.job_manager.set_status(running[0]['job_id'], "PAUSED")
         
         await self.db.execute("UPDATE agents SET state = 'PAUSED' WHERE agent_id = ?", (agent_id,))
+        self.registry.set_state([agent_id], 'PAUSED')
+        self.versions.bump_agent(agent_id)
         await self.event_bus.emit(Event(
             event_type="agent.lifecycle.paused",
             source="orchestrator",
@@ -88,14 +214,14 @@ class AgentOrchestrator:
     async def resume_agent(self, agent_id: str):
         """Unfreeze agent."""
         # Find paused job
-        row = await self.db.fetch_one(
-            "SELECT job_id FROM jobs WHERE agent_id = ? AND status = 'PAUSED'", 
-            (agent_id,)
-        )
-        if row:
-            await self.job_manager.set_status(row['job_id'], "RUNNING")
+        await self.registry.get(agent_id)
+        paused = self.registry.jobs(agent_id, ("PAUSED",))
+        if paused:
+            await self.job_manager.set_status(paused[0]['job_id'], "RUNNING")
             
         await self.db.execute("UPDATE agents SET state = 'RUNNING' WHERE agent_id = ?", (agent_id,))
+        self.registry.set_state([agent_id], 'RUNNING')
+        self.versions.bump_agent(agent_id)
         await self.event_bus.emit(Event(
             event_type="agent.lifecycle.resumed",
             source="orchestrator",
@@ -104,15 +230,20 @@ class AgentOrchestrator:
 
     async def terminate_agent(self, agent_id: str):
         """Graceful shutdown."""
-        # Cancel any running jobs
-        rows = await self.db.fetch_all(
-            "SELECT job_id FROM jobs WHERE agent_id = ? AND status IN ('RUNNING', 'PAUSED')", 
-            (agent_id,)
-        )
-        for row in rows:
-            await self.job_manager.set_status(row['job_id'], "CANCELLED")
-            
-        await self.db.execute("UPDATE agents SET state = 'TERMINATED' WHERE agent_id = ?", (agent_id,))
+        # Cancel any running or queued jobs
+        await self.registry.get(agent_id)
+        jobs = self.registry.jobs(agent_id)
+        job_ids = [job['job_id'] for job in jobs]
+        statements = [("UPDATE agents SET state = 'TERMINATED' WHERE agent_id = ?", (agent_id,))]
+        if job_ids:
+            statements.append(self.job_manager.status_statement(job_ids, "CANCELLED"))
+        statements += self.versions.bump_statements(agent_ids=[agent_id], job_ids=job_ids)
+        await self.db.execute_many(statements)
+
+        if job_ids:
+            await self.job_manager.publish_status_many(job_ids, "CANCELLED", versioned=True)
+            self._cancel_scheduled(job_ids)
+        self.registry.set_state([agent_id], 'TERMINATED')
         await self.event_bus.emit(Event(
             event_type="agent.lifecycle.terminated",
             source="orchestrator",
@@ -120,47 +251,313 @@ class AgentOrchestrator:
         ))
 
     async def get_agent_state(self, agent_id: str) -> Dict[str, Any]:
-        """Full introspection."""
-        agent = await self.db.fetch_one("SELECT * FROM agents WHERE agent_id = ?", (agent_id,))
+        """Full introspection (served from the registry)."""
+        agent = await self.registry.get(agent_id)
         if not agent:
             raise ValueError(f"Agent {agent_id} not found")
             
-        active_job = await self.db.fetch_one(
-            "SELECT * FROM jobs WHERE agent_id = ? AND status IN ('RUNNING', 'PAUSED')", 
-            (agent_id,)
-        )
+        active_jobs = self.registry.jobs(agent_id, ("RUNNING", "PAUSED"))
         
         return {
             "agent": dict(agent),
-            "active_job": dict(active_job) if active_job else None
+            "active_job": active_jobs[0] if active_jobs else None
         }
 
-    async def restore_universe(self):
-        """Resurrect agents from cryosleep."""
-        logger.info("🌌 Initiating Universe Restoration Protocol...")
-        
-        # Find RUNNING/PAUSED agents
-        agents = await self.db.fetch_all("SELECT * FROM agents WHERE state IN ('RUNNING', 'PAUSED')")
-        
-        count = 0
-        for agent in agents:
-            logger.info(f"♻️ Resurrecting agent {agent['agent_id']} ({agent['agent_type']})")
-            
-            # Find active jobs
+    # --- Fleet operations: one transaction and one aggregated event per batch ---
+
+    async def spawn_agents(self, specs: List[Dict[str, Any]], per_agent_events: bool = False) -> List[str]:
+        """
+        Create many agents at once; ``specs`` items look like the spawn request
+        (``{"type": ..., "config": {...}}``).
+
+        All rows are inserted in one transaction (all or nothing) and a single
+        ``AGENT_SPAWNED`` event carries the ``agent_ids``; ``per_agent_events``
+        also emits the usual per-agent event for each of them.
+        """
+        import uuid
+        now = datetime.utcnow()
+        rows = []
+        for spec in specs:
+            agent_type = spec.get("type")
+            if not agent_type:
+                raise ValueError("Every agent needs a type")
+            rows.append({
+                "agent_id": f"{agent_type}-{str(uuid.uuid4())[:8]}",
+                "agent_type": agent_type,
+                "state": "SPAWNED",
+                "config": json.dumps(spec.get("config") or {}),
+                "spawned_at": now.isoformat(" "),
+                "last_heartbeat": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "metadata": "{}",
+            })
+        if not rows:
+            return []
+
+        agent_ids = [row['agent_id'] for row in rows]
+        await self.db.execute_many([
+            *(
+                (
+                    "INSERT INTO agents (agent_id, agent_type, state, config, spawned_at, last_heartbeat, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    tuple(row.values()),
+                )
+                for row in rows
+            ),
+            *self.versions.bump_statements(agent_ids=agent_ids),
+        ])
+        for row in rows:
+            self.registry.put_agent(row)
+
+        await self._emit_batch(
+            EventType.AGENT_SPAWNED,
+            agent_ids,
+            per_agent_events,
+            per_agent=lambda i: {"agent_id": agent_ids[i], "type": rows[i]['agent_type'], "config": specs[i].get("config") or {}},
+            types=sorted({row['agent_type'] for row in rows}),
+        )
+        return agent_ids
+
+    async def pause_agents(self, agent_ids: List[str], per_agent_events: bool = False) -> List[str]:
+        """Bulk ``pause_agent``; returns the agents that exist."""
+        return await self._control_agents(
+            agent_ids, "PAUSED", ("RUNNING",), "PAUSED", EventType.AGENT_PAUSED, per_agent_events
+        )
+
+    async def resume_agents(self, agent_ids: List[str], per_agent_events: bool = False) -> List[str]:
+        """Bulk ``resume_agent``; returns the agents that exist."""
+        return await self._control_agents(
+            agent_ids, "RUNNING", ("PAUSED",), "RUNNING", EventType.AGENT_RESUMED, per_agent_events
+        )
+
+    async def terminate_agents(self, agent_ids: List[str], per_agent_events: bool = False) -> List[str]:
+        """Bulk ``terminate_agent``: every open job of every agent is cancelled."""
+        return await self._control_agents(
+            agent_ids, "TERMINATED", ("PENDING", "RUNNING", "PAUSED"), "CANCELLED",
+            EventType.AGENT_TERMINATED, per_agent_events, all_jobs=True,
+        )
+
+    async def _control_agents(
+        self,
+        agent_ids: List[str],
+        state: str,
+        job_from: Tuple[str, ...],
+        job_to: str,
+        event_type: EventType,
+        per_agent_events: bool,
+        all_jobs: bool = False,
+    ) -> List[str]:
+        # Same rules as the single-agent calls: pause/resume move the first
+        # matching job of each agent, terminate cancels all of them
+        known = [agent_id for agent_id in dict.fromkeys(agent_ids) if await self.registry.get(agent_id)]
+        if not known:
+            return []
+        job_ids = []
+        for agent_id in known:
+            jobs = self.registry.jobs(agent_id, job_from)
+            job_ids += [job['job_id'] for job in (jobs if all_jobs else jobs[:1])]
+
+        marks = ",".join("?" * len(known))
+        statements = [(f"UPDATE agents SET state = ? WHERE agent_id IN ({marks})", (state, *known))]
+        if job_ids:
+            statements.append(self.job_manager.status_statement(job_ids, job_to))
+        statements += self.versions.bump_statements(agent_ids=known, job_ids=job_ids)
+        await self.db.execute_many(statements)
+
+        self.registry.set_state(known, state)
+        if job_ids:
+            await self.job_manager.publish_status_many(job_ids, job_to, versioned=True)
+            if job_to == "CANCELLED":
+                self._cancel_scheduled(job_ids)
+        await self._emit_batch(event_type, known, per_agent_events)
+        return known
+
+    def _cancel_scheduled(self, job_ids: List[str]) -> None:
+        """Stop the queued or running tasks of jobs already marked CANCELLED."""
+        for job_id in job_ids:
+            self.scheduler.cancel(job_id)
+
+    async def _emit_batch(
+        self,
+        event_type: EventType,
+        agent_ids: List[str],
+        per_agent_events: bool,
+        per_agent: Optional[Callable[[int], Dict[str, Any]]] = None,
+        **fields: Any,
+    ) -> None:
+        if per_agent_events:
+            for i, agent_id in enumerate(agent_ids):
+                await self.event_bus.emit(Event(
+                    event_type=event_type,
+                    source="orchestrator",
+                    payload=per_agent(i) if per_agent else {"agent_id": agent_id},
+                ))
+        await self.event_bus.emit(Event(
+            event_type=event_type,
+            source="orchestrator",
+            payload={"agent_ids": list(agent_ids), "count": len(agent_ids), **fields},
+        ))
+
+    async def get_universe_snapshot(self, since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Agents with their active job, optionally only those changed since a version.
+
+        A delta is answered from the in-memory version stamps; unknown or
+        pre-restart versions degrade to a full snapshot.
+        """
+        version = self.versions.version
+        changed = self.versions.changed_since(since) if since is not None else None
+
+        if changed is None:
+            agents = await self.db.fetch_all("SELECT * FROM agents")
             jobs = await self.db.fetch_all(
-                "SELECT * FROM jobs WHERE agent_id = ? AND status IN ('RUNNING', 'PAUSED')",
-                (agent['agent_id'],)
+                "SELECT * FROM jobs WHERE status IN ('RUNNING', 'PAUSED')"
+            )
+        else:
+            agent_ids, job_ids = changed
+            if not agent_ids and not job_ids:
+                return {"agents": [], "version": version, "delta": True, "since": since}
+            agent_marks = ",".join("?" * len(agent_ids)) or "NULL"
+            job_marks = ",".join("?" * len(job_ids)) or "NULL"
+            agents = await self.db.fetch_all(
+                f"""
+                SELECT * FROM agents
+                WHERE agent_id IN ({agent_marks})
+                   OR agent_id IN (SELECT agent_id FROM jobs WHERE job_id IN ({job_marks}))
+                """,
+                (*agent_ids, *job_ids),
+            )
+            agent_marks = ",".join("?" * len(agents)) or "NULL"
+            jobs = await self.db.fetch_all(
+                f"""
+                SELECT * FROM jobs
+                WHERE agent_id IN ({agent_marks}) AND status IN ('RUNNING', 'PAUSED')
+                """,
+                tuple(a['agent_id'] for a in agents),
+            )
+
+        active_jobs = {job['agent_id']: job for job in jobs}
+        results = []
+        for agent in agents:
+            agent['active_job'] = active_jobs.get(agent['agent_id'])
+            results.append(agent)
+
+        snapshot: Dict[str, Any] = {"agents": results, "version": version}
+        if changed is not None:
+            snapshot.update({"delta": True, "since": since})
+        return snapshot
+
+    async def restore_universe(
+        self,
+        ramp_batch: Optional[int] = None,
+        ramp_interval: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Resurrect agents from cryosleep.
+
+        Active jobs of RUNNING/PAUSED agents are read in one query and their
+        checkpoints loaded in bulk. RUNNING/PENDING jobs are re-queued on the
+        scheduler ``ramp_batch`` at a time every ``ramp_interval`` seconds so a
+        restart does not hit every provider at once; PAUSED jobs wait for
+        their resume without holding a pool slot. ``restore_stats`` reports
+        progress, including ``time_to_restore_ms`` once every re-queued job
+        has been dispatched.
+        """
+        settings = get_settings().scheduler
+        ramp_batch = max(1, ramp_batch or settings.restore_ramp_batch)
+        ramp_interval = settings.restore_ramp_interval if ramp_interval is None else ramp_interval
+        started = time.monotonic()
+        logger.info("🌌 Initiating Universe Restoration Protocol...")
+
+        jobs = await self.db.fetch_all(
+            """
+            SELECT j.job_id, j.agent_id, j.job_type, j.status, j.params, j.priority, a.agent_type
+            FROM jobs j JOIN agents a ON a.agent_id = j.agent_id
+            WHERE j.status IN ('PENDING', 'RUNNING', 'PAUSED')
+              AND a.state IN ('RUNNING', 'PAUSED')
+            ORDER BY j.created_at
+            """
+        )
+        runnable = [job for job in jobs if job['job_type'] in self.job_handlers]
+        for job in jobs:
+            if job['job_type'] not in self.job_handlers:
+                logger.warning(f"   ↳ No handler for job {job['job_id']} ({job['job_type']}), left as is")
+
+        checkpoints = await self.job_manager.checkpoint_manager.load_many(
+            [job['job_id'] for job in runnable]
+        )
+        active = [job for job in runnable if job['status'] != 'PAUSED']
+        paused = [job for job in runnable if job['status'] == 'PAUSED']
+
+        stats = self.restore_stats = {
+            "jobs": len(jobs),
+            "resumed": len(active),
+            "deferred_paused": len(paused),
+            "unrunnable": len(jobs) - len(runnable),
+            "checkpoints_loaded": len(checkpoints),
+            "load_ms": round((time.monotonic() - started) * 1000, 2),
+            "dispatched": 0,
+            "time_to_restore_ms": None,
+        }
+
+        def dispatched() -> None:
+            stats["dispatched"] += 1
+            if stats["dispatched"] == len(active):
+                stats["time_to_restore_ms"] = round((time.monotonic() - started) * 1000, 2)
+
+        if not active:
+            stats["time_to_restore_ms"] = stats["load_ms"]
+
+        for job in runnable:
+            self.job_manager.signals.track(job['job_id'], job['status'])
+        for job in paused:
+            task = asyncio.create_task(self._submit_on_resume(job, checkpoints.get(job['job_id'])))
+            self._restore_waiters.add(task)
+            task.add_done_callback(self._restore_waiters.discard)
+
+        for start in range(0, len(active), ramp_batch):
+            if start:
+                await asyncio.sleep(ramp_interval)
+            for job in active[start:start + ramp_batch]:
+                self.submit_stored_job(job, checkpoints.get(job['job_id']), dispatched)
+
+        if jobs:
+            logger.info(
+                f"✅ Restored {len(active)} neural pathways from stasis "
+                f"({len(paused)} paused, {stats['unrunnable']} without handler)."
             )
-            
-            for job in jobs:
-                count += 1
-                logger.info(f"   ↳ Found persistence trace for job {job['job_id']}")
-                # In a full implementation, we would respawn the background task here using the checkpoint.
-                
-        if count > 0:
-            logger.info(f"✅ Restored {count} neural pathways from stasis.")
         else:
             logger.info("✨ Universe is clean. No active entities found.")
+        return stats
+
+    def submit_stored_job(
+        self,
+        job: Dict[str, Any],
+        checkpoint: Optional[CheckpointData],
+        on_dispatch: Optional[Callable[[], None]] = None,
+    ) -> asyncio.Future:
+        """Queue a job row (restore, queue claim) on the scheduler, resuming from ``checkpoint``."""
+        handler = self.job_handlers[job['job_type']]
+        params = json.loads(job['params']) if job['params'] else {}
+        priority = job['priority'] if job['priority'] in PRIORITY_CLASSES else DEFAULT_PRIORITY
+
+        async def run():
+            if on_dispatch is not None:
+                on_dispatch()
+            return await handler(job['job_id'], job['agent_id'], params, checkpoint=checkpoint)
+
+        return self.scheduler.submit(job['job_id'], job['agent_id'], job['agent_type'], run, priority=priority)
+
+    async def _submit_on_resume(self, job: Dict[str, Any], checkpoint: Optional[CheckpointData]) -> None:
+        try:
+            await self.job_manager.wait_for_resume(job['job_id'])
+        except (asyncio.CancelledError, ValueError):
+            return  # job cancelled/deleted while paused, or shutdown
+        self.submit_stored_job(job, checkpoint)
+
+    def cancel_restore(self) -> None:
+        """Drop the waiters of restored PAUSED jobs (shutdown)."""
+        for task in list(self._restore_waiters):
+            task.cancel()
 
 # Singleton
 _orchestrator = None
@@ -0,0 +1,176 @@
+"""
+Agent Registry - In-memory agents and their unfinished jobs.
+============================================================
+
+Every control operation (start_job, pause/resume/terminate, state
+introspection) used to SELECT the agent and its active job before
+writing. The orchestrator now keeps them here: the registry is loaded
+from SQLite on first use (the bridge loads it at startup) and written
+through on every lifecycle change, so lookups never touch the database.
+The ``agents``/``jobs`` tables stay the durable record.
+
+Job statuses are not copied: each tracked job holds its ``JobControl``
+from the job signals, which every status write (``JobManager``,
+scheduler, queue) already updates. Finished jobs drop out lazily.
+
+In multi-process mode (several workers, or bridge instances sharing the
+job queue) other processes change agents too, so the registry is not
+authoritative there and re-reads the agent on each lookup.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.database import Database
+from core.jobs.signals import TERMINAL_STATUSES, JobControl, JobSignals
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("PENDING", "RUNNING", "PAUSED")
+
+
+def _now() -> str:
+    # Same format as SQLite's CURRENT_TIMESTAMP
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def new_job_row(
+    job_id: str,
+    agent_id: str,
+    job_type: str,
+    params: Optional[str],
+    priority: Optional[str],
+) -> Dict[str, Any]:
+    """The ``jobs`` row ``JobManager.create_job`` just inserted."""
+    now = _now()
+    return {
+        "job_id": job_id,
+        "agent_id": agent_id,
+        "job_type": job_type,
+        "status": "PENDING",
+        "progress": 0,
+        "checkpoint_data": None,
+        "result_data": None,
+        "error_message": None,
+        "created_at": now,
+        "updated_at": now,
+        "params": params,
+        "priority": priority,
+        "lease_owner": None,
+        "lease_expires_at": None,
+        "attempts": 0,
+    }
+
+
+class AgentRegistry:
+    """Agent rows plus their PENDING/RUNNING/PAUSED jobs, keyed by agent."""
+
+    def __init__(self, db: Database, signals: JobSignals, authoritative: bool = True):
+        self.db = db
+        self.signals = signals
+        self.authoritative = authoritative
+        self._agents: Dict[str, Dict[str, Any]] = {}
+        # agent_id -> job_id -> row (in creation order); status lives in _controls
+        self._jobs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._controls: Dict[str, JobControl] = {}
+        self._job_agents: Dict[str, str] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self.counters = {"hits": 0, "refreshes": 0, "loads": 0}
+
+    async def load(self, only_if_needed: bool = False) -> int:
+        """(Re)load every agent and unfinished job from the database."""
+        async with self._load_lock:
+            if only_if_needed and self._loaded:
+                return len(self._agents)
+            agents = await self.db.fetch_all("SELECT * FROM agents ORDER BY spawned_at")
+            jobs = await self.db.fetch_all(
+                f"SELECT * FROM jobs WHERE status IN {OPEN_STATUSES} ORDER BY created_at"
+            )
+            self._agents, self._jobs, self._controls, self._job_agents = {}, {}, {}, {}
+            for agent in agents:
+                self._agents[agent['agent_id']] = agent
+            for job in jobs:
+                self.add_job(job)
+            self._loaded = True
+            self.counters["loads"] += 1
+        logger.info(f"Agent registry loaded {len(agents)} agents, {len(jobs)} open jobs")
+        return len(agents)
+
+    async def get(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """The agent row, or None if it does not exist."""
+        if not self.authoritative:
+            await self._refresh(agent_id)
+        elif not self._loaded:
+            await self.load(only_if_needed=True)
+        else:
+            self.counters["hits"] += 1
+        return self._agents.get(agent_id)
+
+    async def _refresh(self, agent_id: str) -> None:
+        agent = await self.db.fetch_one("SELECT * FROM agents WHERE agent_id = ?", (agent_id,))
+        jobs = await self.db.fetch_all(
+            f"SELECT * FROM jobs WHERE agent_id = ? AND status IN {OPEN_STATUSES} ORDER BY created_at",
+            (agent_id,),
+        )
+        self.counters["refreshes"] += 1
+        for job_id in self._jobs.pop(agent_id, {}):
+            self._controls.pop(job_id, None)
+            self._job_agents.pop(job_id, None)
+        if agent is None:
+            self._agents.pop(agent_id, None)
+            return
+        self._agents[agent_id] = agent
+        for job in jobs:
+            # The row is newer than whatever the relay applied so far
+            if (control := self.signals.get(job['job_id'])) and control.status != job['status']:
+                self.signals.set_status(job['job_id'], job['status'])
+            self.add_job(job)
+
+    def put_agent(self, agent: Dict[str, Any]) -> None:
+        self._agents[agent['agent_id']] = agent
+
+    def set_state(self, agent_ids: Iterable[str], state: str) -> None:
+        for agent_id in agent_ids:
+            agent = self._agents.get(agent_id)
+            if agent is not None:
+                agent['state'] = state
+
+    def add_job(self, job: Dict[str, Any]) -> None:
+        job_id, agent_id = job['job_id'], job['agent_id']
+        self._jobs.setdefault(agent_id, {})[job_id] = job
+        self._controls[job_id] = self.signals.track(job_id, job['status'])
+        self._job_agents[job_id] = agent_id
+
+    def set_progress(self, job_id: str, progress: int) -> None:
+        agent_id = self._job_agents.get(job_id)
+        if agent_id is not None:
+            self._jobs[agent_id][job_id]['progress'] = max(0, min(100, progress))
+
+    def jobs(self, agent_id: str, statuses: Iterable[str] = OPEN_STATUSES) -> List[Dict[str, Any]]:
+        """Copies of the agent's jobs currently in ``statuses``, oldest first."""
+        statuses = set(statuses)
+        jobs = self._jobs.get(agent_id)
+        if not jobs:
+            return []
+        found = []
+        for job_id, job in list(jobs.items()):
+            status = self._controls[job_id].status
+            if status is None or status in TERMINAL_STATUSES:
+                del jobs[job_id]
+                del self._controls[job_id]
+                del self._job_agents[job_id]
+            elif status in statuses:
+                found.append({**job, "status": status})
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "authoritative": self.authoritative,
+            "loaded": self._loaded,
+            "agents": len(self._agents),
+            "open_jobs": len(self._controls),
+            **self.counters,
+        }
@@ -0,0 +1,199 @@
+"""
+State Versioning - Global change counter for the agent universe.
+================================================================
+
+Every lifecycle change (agent spawn/pause/resume/terminate, job creation,
+status transition or checkpoint) bumps a monotonic version and stamps the
+touched entity with it. Snapshot readers use the version as an ETag and ask
+for the entities changed since a version they already hold.
+
+Bulk operations stamp their whole batch with one version, inside their own
+transaction when the stamps live in SQLite.
+
+The counter starts at the boot time in microseconds, so versions handed out
+before a restart are always lower than ``base`` and force a full snapshot.
+Multi-worker bridges use the SQLite-backed tracker instead.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.database import get_db
+from core.settings import get_settings
+
+# Entities stamped per INSERT in SharedStateVersionTracker (2 parameters each)
+_STAMP_CHUNK = 400
+
+_GLOBAL_VERSION = "SELECT version FROM state_versions WHERE kind = 'global' AND entity_id = ''"
+
+
+class StateVersionTracker:
+    """
+    In-memory version stamps for agents and jobs.
+
+    Only the ``history`` most recent stamps of each kind are kept (oldest
+    first, so pruning and delta scans stop early). ``floor`` is the newest
+    pruned stamp: a delta since an older version could miss it, so it is
+    answered with a full snapshot instead.
+    """
+
+    def __init__(self, history: Optional[int] = None):
+        self.base = time.time_ns() // 1000
+        self.floor = self.base
+        self.history = history if history is not None else get_settings().bridge.state_version_history
+        self._version = self.base
+        self._agents: Dict[str, int] = {}
+        self._jobs: Dict[str, int] = {}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump_agent(self, agent_id: str) -> int:
+        return self.bump_many(agent_ids=(agent_id,))
+
+    def bump_job(self, job_id: str) -> int:
+        return self.bump_many(job_ids=(job_id,))
+
+    def bump_many(self, agent_ids: Iterable[str] = (), job_ids: Iterable[str] = ()) -> int:
+        """Stamp a whole batch with one new version."""
+        agent_ids, job_ids = list(agent_ids), list(job_ids)
+        if not agent_ids and not job_ids:
+            return self.version
+        self._version += 1
+        for agent_id in agent_ids:
+            self._stamp(self._agents, agent_id)
+        for job_id in job_ids:
+            self._stamp(self._jobs, job_id)
+        return self._version
+
+    def bump_statements(
+        self, agent_ids: Iterable[str] = (), job_ids: Iterable[str] = ()
+    ) -> List[Tuple[str, Tuple]]:
+        """
+        Statements stamping a batch inside the caller's transaction
+        (``Database.execute_many``). Stamps kept in memory need none: the
+        batch is stamped right away.
+        """
+        self.bump_many(agent_ids, job_ids)
+        return []
+
+    def _stamp(self, stamps: Dict[str, int], entity_id: str) -> None:
+        # Re-inserted so the dict stays ordered by version
+        stamps.pop(entity_id, None)
+        stamps[entity_id] = self._version
+        while len(stamps) > self.history:
+            self.floor = max(self.floor, stamps.pop(next(iter(stamps))))
+
+    @staticmethod
+    def _newer(stamps: Dict[str, int], since: int) -> List[str]:
+        changed = []
+        for entity_id, version in reversed(stamps.items()):
+            if version <= since:
+                break
+            changed.append(entity_id)
+        return changed
+
+    def changed_since(self, since: int) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Agent and job IDs changed after ``since``.
+
+        Returns None when ``since`` predates this process or the kept
+        history (or is from the future), meaning the caller must fall back
+        to a full snapshot.
+        """
+        if since < self.floor or since > self._version:
+            return None
+        return self._newer(self._agents, since), self._newer(self._jobs, since)
+
+
+class SharedStateVersionTracker(StateVersionTracker):
+    """
+    Version stamps kept in SQLite so every bridge worker agrees on them.
+
+    Used in multi-worker mode: an ETag handed out by one worker must be
+    understood by the next worker the load balancer picks. The counter is
+    durable, so versions survive restarts and ``base`` is 0.
+    """
+
+    def __init__(self):
+        self.base = 0
+
+    @staticmethod
+    @contextmanager
+    def _connection() -> Iterator[Any]:
+        # sqlite3's own context manager commits but never closes
+        conn = get_db().get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @property
+    def version(self) -> int:
+        with self._connection() as conn:
+            row = conn.execute(_GLOBAL_VERSION).fetchone()
+        return row["version"] if row else 0
+
+    def bump_statements(
+        self, agent_ids: Iterable[str] = (), job_ids: Iterable[str] = ()
+    ) -> List[Tuple[str, Tuple]]:
+        entities = [("agent", a) for a in agent_ids] + [("job", j) for j in job_ids]
+        if not entities:
+            return []
+        statements: List[Tuple[str, Tuple]] = [(
+            """
+            INSERT INTO state_versions (kind, entity_id, version) VALUES ('global', '', 1)
+            ON CONFLICT(kind, entity_id) DO UPDATE SET version = version + 1
+            """,
+            (),
+        )]
+        for i in range(0, len(entities), _STAMP_CHUNK):
+            chunk = entities[i:i + _STAMP_CHUNK]
+            values = ",".join("(?, ?)" for _ in chunk)
+            statements.append((
+                "INSERT OR REPLACE INTO state_versions (kind, entity_id, version) "
+                f"SELECT column1, column2, ({_GLOBAL_VERSION}) FROM (VALUES {values})",
+                tuple(value for entity in chunk for value in entity),
+            ))
+        return statements
+
+    def bump_many(self, agent_ids: Iterable[str] = (), job_ids: Iterable[str] = ()) -> int:
+        statements = self.bump_statements(agent_ids, job_ids)
+        if not statements:
+            return self.version
+        with self._connection() as conn:
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            for query, params in statements:
+                conn.execute(query, params)
+            version = conn.execute(_GLOBAL_VERSION).fetchone()["version"]
+            conn.execute("COMMIT")
+        return version
+
+    def changed_since(self, since: int) -> Optional[Tuple[List[str], List[str]]]:
+        if since < self.base or since > self.version:
+            return None
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT kind, entity_id FROM state_versions WHERE version > ? AND kind != 'global'",
+                (since,),
+            ).fetchall()
+        agents = [r["entity_id"] for r in rows if r["kind"] == "agent"]
+        jobs = [r["entity_id"] for r in rows if r["kind"] == "job"]
+        return agents, jobs
+
+
+# Singleton
+_tracker: Optional[StateVersionTracker] = None
+
+
+def get_state_versions() -> StateVersionTracker:
+    global _tracker
+    if _tracker is None:
+        if get_settings().bridge.multi_process:
+            _tracker = SharedStateVersionTracker()
+        else:
+            _tracker = StateVersionTracker()
+    return _tracker
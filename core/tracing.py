@@ -0,0 +1,269 @@
+"""
+Tracing - Lightweight in-process spans for tool calls.
+======================================================
+
+``execute_tool`` opens a root span per request; providers, rate-limiter
+waits, Database calls, event emits and Vertex AI calls open child spans
+under whatever span is current (a ContextVar, so concurrent requests do
+not mix). Finished spans go to a bounded ring buffer that the bridge
+exposes for querying and as OTLP/JSON (``ExportTraceServiceRequest``
+shape) for any OpenTelemetry collector or viewer.
+
+When tracing is disabled, or when there is no root span in the current
+context, ``span()`` returns a shared no-op context manager: a flag check,
+no Span object, no clock reads.
+"""
+
+import hashlib
+import json
+import time
+from collections import deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+from uuid import UUID, uuid4
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    """Stand-in returned when nothing is recorded."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed operation; use as a (sync) context manager, also in async code."""
+
+    __slots__ = (
+        "tracer",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "attributes",
+        "start_ns",
+        "duration_ns",
+        "error",
+        "_t0",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        trace_id: str,
+        parent_id: Optional[str],
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes or {}
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration_ns = time.perf_counter_ns() - self._t0
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in another context (e.g. an async generator finalized
+            # elsewhere); the span is still recorded.
+            pass
+        self.tracer._record(self)
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Span factory plus the ring buffer of finished spans."""
+
+    def __init__(self, enabled: bool = False, buffer_size: int = 4096):
+        self.enabled = enabled
+        self._spans: Deque[Span] = deque(maxlen=buffer_size)
+
+    def start_trace(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        trace_id: Optional[str] = None,
+    ):
+        """Root span; ``trace_id`` accepts a request UUID (any format)."""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, _normalize_trace_id(trace_id), None, name, attributes)
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Child of the current span; no-op outside a trace."""
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(self, parent.trace_id, parent.span_id, name, attributes)
+
+    def _record(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def query(
+        self,
+        trace_id: Optional[str] = None,
+        name: Optional[str] = None,
+        min_duration_ms: Optional[float] = None,
+        limit: int = 200,
+    ) -> List[Span]:
+        """Most recent matching spans first."""
+        if trace_id:
+            trace_id = _normalize_trace_id(trace_id)
+        matches = []
+        for span in reversed(self._spans):
+            if trace_id and span.trace_id != trace_id:
+                continue
+            if name and not span.name.startswith(name):
+                continue
+            if min_duration_ms is not None and span.duration_ms < min_duration_ms:
+                continue
+            matches.append(span)
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def traces(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Summary of the most recent root spans."""
+        roots = [s for s in reversed(self._spans) if s.parent_id is None][:limit]
+        counts: Dict[str, int] = {}
+        for span in self._spans:
+            counts[span.trace_id] = counts.get(span.trace_id, 0) + 1
+        return [
+            {**root.to_dict(), "span_count": counts.get(root.trace_id, 0)}
+            for root in roots
+        ]
+
+    def to_otlp(self, spans: Optional[List[Span]] = None) -> Dict[str, Any]:
+        """OTLP/JSON ExportTraceServiceRequest for ``spans`` (default: all)."""
+        spans = list(self._spans) if spans is None else spans
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attr("service.name", "vertice-cyber")]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "core.tracing"},
+                            "spans": [_otlp_span(s) for s in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def dump_otlp(self, path: str) -> int:
+        """Write the buffer as OTLP/JSON; returns the number of spans."""
+        payload = self.to_otlp()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(payload))
+        return len(payload["resourceSpans"][0]["scopeSpans"][0]["spans"])
+
+
+def _normalize_trace_id(trace_id: Optional[str]) -> str:
+    """32-hex trace IDs (OTLP); request UUIDs map onto their hex form."""
+    if not trace_id:
+        return uuid4().hex
+    try:
+        return UUID(trace_id).hex
+    except ValueError:
+        # Deterministic, so the original ID can still be queried
+        return hashlib.md5(trace_id.encode()).hexdigest()
+
+
+def _otlp_attr(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 2 if span.parent_id is None else 1,  # SERVER / INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.start_ns + span.duration_ns),
+        "attributes": [_otlp_attr(k, v) for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+# Singleton
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        from core.settings import get_settings
+
+        tracing = get_settings().tracing
+        _tracer = Tracer(enabled=tracing.enabled, buffer_size=tracing.buffer_size)
+    return _tracer
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """Child span of the current trace (no-op when disabled or untraced)."""
+    return get_tracer().span(name, attributes)
@@ -0,0 +1,164 @@
+"""
+Warm-up - Background preloading of datasets and clients at startup.
+===================================================================
+
+The first MITRE or compliance call used to pay for reading and parsing
+the dataset caches, giving p100 spikes right after every deploy. Entry
+points now start a ``Warmup`` in their lifecycle hook; its steps run
+concurrently in the background while the server already accepts traffic.
+
+``SharedLoad`` is the single in-flight load future used by the dataset
+clients: a request that arrives mid warm-up awaits the same load instead
+of starting a duplicate one.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+StepFactory = Callable[[], Awaitable[Any]]
+
+
+class SharedLoad:
+    """One load in flight at a time, awaited by every concurrent caller."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self, factory: StepFactory) -> None:
+        """
+        Await the in-flight load, starting one via ``factory`` if none is.
+
+        A finished task is never reused: callers only get here while the
+        data is still missing, so a completed load that left it missing
+        (failed) is retried. Tasks from another event loop (tests, worker
+        respawn) are ignored for the same reason.
+        """
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._task = loop.create_task(factory())
+        # Shielded: a cancelled request must not abort the shared load
+        await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+
+class Warmup:
+    """Named warm-up steps run concurrently, with per-step status."""
+
+    def __init__(self):
+        self._steps: Dict[str, StepFactory] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def register(self, name: str, factory: StepFactory) -> None:
+        self._steps[name] = factory
+        self._status[name] = {"state": "pending", "duration_ms": None, "error": None}
+
+    async def _run_step(self, name: str, factory: StepFactory) -> None:
+        status = self._status[name]
+        status["state"] = "running"
+        started = time.perf_counter()
+        try:
+            await factory()
+            status["state"] = "done"
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e}")
+            status["state"] = "failed"
+            status["error"] = str(e)
+        status["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _run(self) -> None:
+        await asyncio.gather(
+            *(self._run_step(name, factory) for name, factory in self._steps.items())
+        )
+        self._finished_at = time.time()
+        logger.info(
+            f"Warm-up finished in {(self._finished_at - self._started_at) * 1000:.0f}ms"
+        )
+
+    def start(self) -> asyncio.Task:
+        """Start the steps in the background (idempotent)."""
+        if self._task is None:
+            self._started_at = time.time()
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for warm-up to finish; False on timeout or if never started."""
+        if self._task is None:
+            return False
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def ready(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "steps": {name: dict(s) for name, s in self._status.items()},
+        }
+
+
+async def _warm_mitre() -> None:
+    from tools.mitre_client import get_mitre_client
+
+    await get_mitre_client()._ensure_data_loaded()
+
+
+async def _warm_compliance() -> None:
+    from tools.compliance.client import get_compliance_api
+
+    await get_compliance_api()._ensure_data_loaded()
+
+
+async def _warm_providers() -> None:
+    """Build provider singletons (cache backends, Vertex AI client)."""
+    from tools.providers.cache import get_cache
+    from tools.vertex_ai import get_vertex_ai
+
+    await asyncio.to_thread(get_cache)
+    await asyncio.to_thread(get_vertex_ai)
+
+
+def build_warmup(
+    preload_tools: Optional[Callable[[], Any]] = None, datasets: bool = True
+) -> Warmup:
+    """
+    Standard warm-up: MITRE and compliance datasets plus provider clients.
+
+    ``preload_tools`` (blocking) adds a step importing the tool modules in
+    a worker thread, for entry points that resolve tools lazily; it is
+    independent of ``datasets``, which can turn the standard steps off.
+    """
+    warmup = Warmup()
+    if datasets:
+        warmup.register("mitre", _warm_mitre)
+        warmup.register("compliance", _warm_compliance)
+        warmup.register("providers", _warm_providers)
+    if preload_tools is not None:
+        warmup.register("tools", lambda: asyncio.to_thread(preload_tools))
+    return warmup
@@ -1,6 +1,20 @@
 
-from .red_team import red_team_auto_pilot
-from .code_audit import code_audit_patch
-from .insider import insider_threat_hunter
+from .engine import Step, Workflow, WorkflowStop
+from .red_team import RED_TEAM_WORKFLOW, red_team_auto_pilot
+from .code_audit import CODE_AUDIT_WORKFLOW, code_audit_patch
+from .insider import INSIDER_WORKFLOW, insider_threat_hunter
 
-__all__ = ["red_team_auto_pilot", "code_audit_patch", "insider_threat_hunter"]
+# workflow_id -> Workflow (served by /api/v1/workflows)
+WORKFLOWS = {
+    wf.workflow_id: wf for wf in (RED_TEAM_WORKFLOW, CODE_AUDIT_WORKFLOW, INSIDER_WORKFLOW)
+}
+
+__all__ = [
+    "Step",
+    "Workflow",
+    "WorkflowStop",
+    "WORKFLOWS",
+    "red_team_auto_pilot",
+    "code_audit_patch",
+    "insider_threat_hunter",
+]
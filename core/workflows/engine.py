@@ -0,0 +1,225 @@
+"""
+Workflow Engine - Declarative DAG workflows.
+============================================
+
+A workflow is a set of ``Step``s. Each step is an async function whose
+keyword arguments are its declared ``inputs``: names of workflow inputs or
+of other steps (a step's output is published under its own name). The
+engine starts every step whose inputs are available, so independent
+steps run concurrently.
+
+When the run belongs to a job, every finished step's output is saved in
+the job checkpoint (``accumulated_results``); a resumed run gets that
+checkpoint back and skips the steps already done. Step outputs must
+therefore be JSON-serializable.
+
+A step that declares the reserved input ``ctx`` receives the MCP context
+of the run (or None) to report progress and findings to the caller; it is
+not a dependency and is never checkpointed.
+
+A step ends the run early by raising ``WorkflowStop`` (e.g. governance
+blocked the plan). Step timings are emitted as ``workflow.step.*`` events.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.events.event_bus import get_event_bus
+from core.events.types import Event
+from core.jobs.checkpoint import CheckpointData
+
+if TYPE_CHECKING:
+    from core.jobs.job_manager import JobManager
+
+logger = logging.getLogger(__name__)
+
+# Reserved step input: the MCP context of the run (None outside MCP)
+CONTEXT = "ctx"
+
+
+class WorkflowStop(Exception):
+    """Raised by a step to end the run with ``status`` and extra report fields."""
+
+    def __init__(self, status: str, **fields: Any):
+        super().__init__(status)
+        self.status = status
+        self.fields = fields
+
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    inputs: Tuple[str, ...] = ()
+    # Logged to the MCP context when the step starts; formatted with the workflow inputs
+    message: Optional[str] = None
+
+
+@dataclass
+class Workflow:
+    workflow_id: str
+    name: str
+    description: str
+    inputs: Tuple[str, ...]
+    steps: List[Step]
+    # Builds the report from the values available when the run ended
+    report: Callable[[Dict[str, Any]], Dict[str, Any]]
+    _by_name: Dict[str, Step] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._by_name = {}
+        for step in self.steps:
+            if step.name in self._by_name or step.name in self.inputs or step.name == CONTEXT:
+                raise ValueError(f"Duplicate name {step.name} in workflow {self.workflow_id}")
+            self._by_name[step.name] = step
+        for step in self.steps:
+            for name in step.inputs:
+                if name not in self._by_name and name not in self.inputs and name != CONTEXT:
+                    raise ValueError(f"Step {step.name} depends on unknown {name}")
+        self.order()  # rejects cycles
+
+    def order(self) -> List[str]:
+        """Step names in a topological order."""
+        ordered: List[str] = []
+        done = {*self.inputs, CONTEXT}
+        remaining = list(self.steps)
+        while remaining:
+            ready = [s for s in remaining if all(name in done for name in s.inputs)]
+            if not ready:
+                raise ValueError(f"Cycle in workflow {self.workflow_id}: {[s.name for s in remaining]}")
+            for step in ready:
+                ordered.append(step.name)
+                done.add(step.name)
+                remaining.remove(step)
+        return ordered
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "id": self.workflow_id,
+            "name": self.name,
+            "description": self.description,
+            "inputs": [{"name": name, "type": "string"} for name in self.inputs],
+            "steps": [
+                {"name": s.name, "inputs": [n for n in s.inputs if n != CONTEXT]} for s in self.steps
+            ],
+        }
+
+    async def run(
+        self,
+        inputs: Dict[str, Any],
+        ctx: Optional[Any] = None,
+        job_id: Optional[str] = None,
+        job_manager: Optional["JobManager"] = None,
+        checkpoint: Optional[CheckpointData] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute the DAG and return the report (with ``status``).
+
+        A failing step cancels the steps still running and re-raises.
+        """
+        missing = [name for name in self.inputs if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing workflow inputs: {missing}")
+
+        run = _Run(self, inputs, ctx, job_id, job_manager, checkpoint)
+        return await run.execute()
+
+
+class _Run:
+    """State of one workflow execution."""
+
+    def __init__(self, workflow, inputs, ctx, job_id, job_manager, checkpoint):
+        self.workflow = workflow
+        self.inputs = {name: inputs[name] for name in workflow.inputs}
+        self.ctx = ctx
+        self.job_id = job_id
+        self.job_manager = job_manager
+        self.outputs: Dict[str, Any] = dict(checkpoint.accumulated_results) if checkpoint else {}
+        self.timings: Dict[str, float] = {}
+        self.event_bus = get_event_bus()
+
+    async def _emit(self, event_type: str, **payload: Any) -> None:
+        await self.event_bus.emit(Event(
+            event_type=event_type,
+            source="workflow_engine",
+            payload={"workflow_id": self.workflow.workflow_id, "job_id": self.job_id, **payload},
+        ))
+
+    async def _step(self, step: Step) -> Any:
+        if self.job_manager and self.job_id and await self.job_manager.should_yield(self.job_id):
+            await self.job_manager.wait_for_resume(self.job_id)
+        if self.ctx and step.message:
+            await self.ctx.info(f"[Workflow] {step.message.format(**self.inputs)}")
+        values = {**self.inputs, **self.outputs, CONTEXT: self.ctx}
+        started = time.perf_counter()
+        try:
+            return await step.run(**{name: values[name] for name in step.inputs})
+        finally:
+            self.timings[step.name] = round((time.perf_counter() - started) * 1000, 2)
+
+    def _available(self, name: str) -> bool:
+        return name in self.inputs or name in self.outputs or name == CONTEXT
+
+    async def _checkpoint(self) -> None:
+        if self.job_manager and self.job_id:
+            await self.job_manager.save_checkpoint(
+                self.job_id,
+                CheckpointData(step_index=len(self.outputs), accumulated_results=dict(self.outputs)),
+                force=True,
+            )
+
+    def _report(self, status: str, **fields: Any) -> Dict[str, Any]:
+        report = self.workflow.report({**self.inputs, **self.outputs})
+        report.update(fields)
+        report["status"] = status
+        report["step_timings_ms"] = dict(self.timings)
+        return report
+
+    async def execute(self) -> Dict[str, Any]:
+        workflow = self.workflow
+        skipped = [name for name in workflow.order() if name in self.outputs]
+        await self._emit("workflow.started", inputs=self.inputs, skipped=skipped)
+
+        pending = [s for s in workflow.steps if s.name not in self.outputs]
+        running: Dict[asyncio.Task, Step] = {}
+        try:
+            while pending or running:
+                for step in [s for s in pending if all(self._available(n) for n in s.inputs)]:
+                    pending.remove(step)
+                    running[asyncio.create_task(self._step(step))] = step
+                if not running:
+                    break  # unreachable steps (already validated, kept as a guard)
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step = running.pop(task)
+                    try:
+                        self.outputs[step.name] = task.result()
+                    except WorkflowStop:
+                        await self._emit("workflow.step.completed", step=step.name,
+                                         duration_ms=self.timings.get(step.name), stopped=True)
+                        raise
+                    except Exception as e:
+                        await self._emit("workflow.step.failed", step=step.name,
+                                         duration_ms=self.timings.get(step.name), error=str(e))
+                        raise
+                    await self._emit("workflow.step.completed", step=step.name,
+                                     duration_ms=self.timings[step.name])
+                await self._checkpoint()
+        except WorkflowStop as stop:
+            if self.ctx:
+                await self.ctx.warning(f"[Workflow] Stopped ({stop.status}): {stop.fields}")
+            report = self._report(stop.status, **stop.fields)
+            await self._emit("workflow.completed", status=stop.status, step_timings_ms=self.timings)
+            return report
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        await self._emit("workflow.completed", status="completed", step_timings_ms=self.timings)
+        return self._report("completed")
@@ -8,107 +8,122 @@ from tools.magistrate import get_magistrate
 from tools.wargame import get_wargame_executor
 from fastmcp import Context
 
+from core.workflows.engine import Step, Workflow, WorkflowStop
+
 logger = logging.getLogger(__name__)
 
+
+# --- Step 1: Reconnaissance (OSINT Hunter) ---
+async def recon(target_domain: str) -> Dict[str, Any]:
+    # Using deep depth as requested in workflow
+    osint_result = await get_osint_hunter().investigate(target=target_domain, depth=InvestigationDepth.DEEP)
+    return osint_result.model_dump(mode="json")
+
+
+# --- Step 2: Analysis (Threat Prophet) ---
+# Deterministic analysis of the target; independent of the recon, so both run concurrently.
+# A real scenario would enrich it with ai_threat_analysis(osint_findings=..., threat_indicators=...).
+async def analyze(target_domain: str) -> Dict[str, Any]:
+    threat_analysis = await get_threat_prophet().analyze_threats(target=target_domain)
+    return {
+        "attack_vectors": [v.value for v in threat_analysis.attack_vectors],
+        "risk_score": threat_analysis.overall_risk_score,
+    }
+
+
+# --- Step 3: Strategy (Simulation) ---
+# Real implementation would call Vertex AI here. For this refined draft, we construct a plan object.
+async def plan(target_domain: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "target": target_domain,
+        "vectors": analysis["attack_vectors"],
+        "techniques": ["T1595", "T1059"],  # Mock techniques based on vectors
+        "severity": "HIGH",
+    }
+
+
+# --- Step 4: Governance Check (Ethical Magistrate) ---
+async def governance(
+    target_domain: str, attack_plan: Dict[str, Any], ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    approval = await get_magistrate().validate(
+        action=f"Execute Attack Plan on {target_domain}",
+        context={"plan": attack_plan, "target": target_domain},
+    )
+    if not approval.is_approved:
+        if ctx:
+            await ctx.error(f"[Workflow] BLOCKED: {approval.reasoning}")
+        raise WorkflowStop("blocked", block_reason=approval.reasoning)
+    return {"approved": True}
+
+
+# --- Step 5: Execution (Wargame Executor) ---
+async def execute(
+    target_domain: str, governance: Dict[str, Any], ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    wargame = get_wargame_executor()
+    # Finding a scenario that matches our plan/techniques (Mock logic for selection)
+    scenarios = await wargame.list_scenarios()
+    selected_scenario = scenarios[0].id if scenarios else "scenario_001"
+    simulation_result = await wargame.run_simulation(scenario_id=selected_scenario, target=target_domain)
+    if ctx:
+        await ctx.info(
+            f"[Workflow] Red Team Auto-Pilot Completed. Detection Rate: {simulation_result.detection_rate}"
+        )
+    return simulation_result.model_dump(mode="json")
+
+
+# --- Step 6: Reporting ---
+def report(values: Dict[str, Any]) -> Dict[str, Any]:
+    state: Dict[str, Any] = {"target_domain": values["target_domain"]}
+    if "recon" in values:
+        state["osint_report"] = values["recon"]
+    if "analysis" in values:
+        state["attack_vectors"] = values["analysis"]["attack_vectors"]
+    if "attack_plan" in values:
+        state["attack_plan"] = values["attack_plan"]
+    if "execution" in values:
+        simulation = values["execution"]
+        state["wargame_result"] = simulation
+        state["final_report_summary"] = {
+            "target": values["target_domain"],
+            "success": simulation["success"],
+            "detection_rate": simulation["detection_rate"],
+            "risk_score": values["analysis"]["risk_score"],
+        }
+    return state
+
+
+RED_TEAM_WORKFLOW = Workflow(
+    workflow_id="wf-red-team-autopilot",
+    name="Red Team Auto-Pilot",
+    description="Recon -> Analysis -> Strategy -> Governance -> Execution -> Reporting.",
+    inputs=("target_domain",),
+    steps=[
+        Step("recon", recon, ("target_domain",), "Starting OSINT Recon on {target_domain}"),
+        Step("analysis", analyze, ("target_domain",), "Analyzing Threats"),
+        Step("attack_plan", plan, ("target_domain", "analysis")),
+        Step("governance", governance, ("target_domain", "attack_plan", "ctx"), "Requesting Ethical Approval"),
+        Step("execution", execute, ("target_domain", "governance", "ctx"), "Executing Wargame Simulation"),
+    ],
+    report=report,
+)
+
+
 async def red_team_auto_pilot(target_domain: str, ctx: Optional[Context] = None) -> Dict[str, Any]:
     """
     Workflow 1: Red Team Auto-Pilot
     Simulates a full attack lifecycle: Recon -> Analysis -> Strategy -> Governance -> Execution -> Reporting.
-    
+
     Args:
         target_domain (str): Target domain e.g. 'company.com'
         ctx (Context): MCP context for logging (optional)
-        
+
     Returns:
         Dict: Final report summary or error state.
     """
-    state = {"target_domain": target_domain, "status": "running"}
-    
     try:
-        # --- Step 1: Reconnaissance (OSINT Hunter) ---
-        if ctx:
-            await ctx.info(f"[Workflow] Starting OSINT Recon on {target_domain}")
-        osint_hunter = get_osint_hunter()
-        # Using deep depth as requested in workflow
-        osint_result = await osint_hunter.investigate(target=target_domain, depth=InvestigationDepth.DEEP)
-        state["osint_report"] = osint_result.model_dump()
-        
-        # --- Step 2: Analysis (Threat Prophet + AI) ---
-        if ctx:
-            await ctx.info("[Workflow] Analyzing Threats")
-        threat_prophet = get_threat_prophet()
-        # Initial deterministic analysis
-        threat_analysis = await threat_prophet.analyze_threats(target=target_domain)
-        
-        # AI Enrichment (using mcp_ai_tools wrapper logic, simulating calling the tool directly)
-        # Context construction for AI - omitted as we don't call the AI tool directly here yet
-        
-        # In a real scenario we would call:
-        # ai_analysis = await ai_threat_analysis(osint_findings=..., threat_indicators=...)
-        
-        # Hypothetically calling Vertex AI for vector identification
-        # Since we don't have a direct class for 'VertexAI' in the user snippet sense, 
-        # we can use the 'threat_prophet' which has AI capabilities or the mcp_ai_tools function if adaptable.
-        # For now, we trust Threat Prophet's predictions as the "AI Analysis" output or call the tool fn explicitly if needed.
-        # However, ai_threat_analysis requires a Context. We can simulate or pass generic one if ctx is None.
-        
-        # Taking attack vectors from Threat Analysis
-        state["attack_vectors"] = [v.value for v in threat_analysis.attack_vectors]
-        
-        # --- Step 3: Strategy (Simulation) ---
-        # Transforming vectors into a "Plan". 
-        # Real implementation would call Vertex AI here. For this refined draft, we construct a plan object.
-        state["attack_plan"] = {
-            "target": target_domain,
-            "vectors": state["attack_vectors"],
-            "techniques": ["T1595", "T1059"], # Mock techniques based on vectors
-            "severity": "HIGH"
-        }
-        
-        # --- Step 4: Governance Check (Ethical Magistrate) ---
-        if ctx:
-            await ctx.info("[Workflow] Requesting Ethical Approval")
-        magistrate = get_magistrate()
-        approval = await magistrate.validate(
-            action=f"Execute Attack Plan on {target_domain}", 
-            context={"plan": state["attack_plan"], "target": target_domain}
-        )
-        
-        if not approval.is_approved:
-            state["status"] = "blocked"
-            state["block_reason"] = approval.reasoning
-            if ctx:
-                await ctx.error(f"[Workflow] BLOCKED: {approval.reasoning}")
-            return state
-
-        # --- Step 5: Execution (Wargame Executor) ---
-        if ctx:
-            await ctx.info("[Workflow] Executing Wargame Simulation")
-        wargame = get_wargame_executor()
-        # Finding a scenario that matches our plan/techniques (Mock logic for selection)
-        scenarios = await wargame.list_scenarios()
-        selected_scenario = scenarios[0].id if scenarios else "scenario_001"
-        
-        simulation_result = await wargame.run_simulation(scenario_id=selected_scenario, target=target_domain)
-        state["wargame_result"] = simulation_result.model_dump()
-        
-        # --- Step 6: Reporting (AI Analyst) ---
-        # We can use ai_integrated_assessment to finalize
-        # Note: This would typically be an AI call.
-        state["final_report_summary"] = {
-            "target": target_domain,
-            "success": simulation_result.success,
-            "detection_rate": simulation_result.detection_rate,
-            "risk_score": threat_analysis.overall_risk_score
-        }
-        state["status"] = "completed"
-        
-        if ctx:
-            await ctx.info(f"[Workflow] Red Team Auto-Pilot Completed. Detection Rate: {simulation_result.detection_rate}")
-        
+        return await RED_TEAM_WORKFLOW.run({"target_domain": target_domain}, ctx=ctx)
     except Exception as e:
         logger.error(f"Red Team Workflow Failed: {e}")
-        state["status"] = "error"
-        state["error"] = str(e)
-        
-    return state
+        return {"target_domain": target_domain, "status": "error", "error": str(e)}
@@ -71,8 +71,10 @@ export const AgentStateProvider: React.FC<{ children: React.ReactNode }> = ({ ch
   useEffect(() => {
     // Subscribe to Lifecycle Events
     const unsubLifecycle = eventStream.on('agent.lifecycle.*', (event: any) => {
-      const { agent_id } = event.payload || event.data || {};
-      if (!agent_id) return;
+      const { agent_id, agent_ids } = event.payload || event.data || {};
+      // Bulk operations send one event for the whole batch
+      const ids: string[] = agent_ids || (agent_id ? [agent_id] : []);
+      if (!ids.length) return;
 
       let newState: AgentStatus = AgentStatus.IDLE;
       const type = event.type || '';
@@ -83,7 +85,7 @@ export const AgentStateProvider: React.FC<{ children: React.ReactNode }> = ({ ch
       else if (type.includes('error')) newState = AgentStatus.ERROR;
 
       setAgents(prev => prev.map(agent => {
-        if (agent.id === agent_id) {
+        if (ids.includes(agent.id)) {
             return { 
                 ...agent, 
                 status: newState,
@@ -37,8 +37,8 @@ export function useAgentControl(agentId: string) {
     // Subscribe to real-time state changes
     useEffect(() => {
         const unsub = eventStream.on('agent.lifecycle.*', (event: any) => {
-            const { agent_id } = event.payload || event.data || {};
-            if (agent_id !== agentId) return;
+            const { agent_id, agent_ids } = event.payload || event.data || {};
+            if (agent_id !== agentId && !(agent_ids || []).includes(agentId)) return;
 
             let newState: AgentState = 'IDLE';
             if (event.type.includes('resumed') || event.type.includes('spawned')) newState = 'IDLE'; // Pending RUNNING map
@@ -166,8 +166,10 @@ export function useMCPAgents(): UseMCPAgentsReturn {
 
         // Handle Real-Time Agent State Updates
         const unsubAgentState = eventStream.on('agent.lifecycle.*', (event: any) => {
-            const { agent_id } = event.payload || event.data || {};
-            if (!agent_id) return;
+            const { agent_id, agent_ids } = event.payload || event.data || {};
+            // Bulk operations send one event for the whole batch
+            const ids: string[] = agent_ids || (agent_id ? [agent_id] : []);
+            if (!ids.length) return;
 
             let newState: AgentStatus = AgentStatus.IDLE;
             if (event.type.includes('resumed') || event.type.includes('spawned')) newState = AgentStatus.IDLE;
@@ -176,9 +178,9 @@ export function useMCPAgents(): UseMCPAgentsReturn {
             if (event.type.includes('terminated')) newState = AgentStatus.TERMINATED;
 
             setAgents(prev => prev.map(a =>
-                a.id === agent_id ? { ...a, status: newState } : a
+                ids.includes(a.id) ? { ...a, status: newState } : a
             ));
-            addLog(`🔄 Agent ${agent_id} is now ${newState}`, 'info', 'ORCHESTRATOR');
+            addLog(`🔄 Agent ${ids.length === 1 ? ids[0] : `batch (${ids.length})`} is now ${newState}`, 'info', 'ORCHESTRATOR');
         });
 
         // Handle agent status changes
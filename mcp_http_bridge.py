@@ -6,11 +6,17 @@ Exposes Vértice Cyber tools via REST API and WebSockets.
 Adheres to Maximus 2.0 Code Constitution (Modular & Semantic).
 """
 
+import asyncio
 import logging
+import math
 import time
+from contextlib import asynccontextmanager
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException, WebSocket
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 import uvicorn
 
 # Bridge Modules
@@ -20,9 +26,29 @@ from core.bridge.models import (
     ToolListResponse,
     HealthResponse,
 )
-from core.bridge.registry import TOOL_REGISTRY, TOOL_METADATA
+from core.bridge.registry import (
+    TOOL_REGISTRY,
+    TOOL_METADATA,
+    STREAMING_REGISTRY,
+    preload_tools,
+)
 from core.bridge.context import create_mock_context
-from core.bridge.ws_manager import websocket_event_stream
+from core.bridge.accounting import METERING_SCOPE, current_agent_id, get_resource_accountant
+from core.bridge.bulkhead import BulkheadFull, Permit, get_bulkheads
+from core.bridge.responses import FastJSONResponse
+from core.bridge.ws_manager import connection_manager, websocket_event_stream
+from core.blob_store import BlobNotFound, blob_ref, get_blob_store, inline_value
+from core.database import get_db
+from core.deadline import DeadlineExceeded, deadline, remaining
+from core.events.event_bus import get_event_bus
+from core.events.relay import EventRelay
+from core.http_clients import get_http_clients
+from core.jobs.queue import QueueWorker
+from core.rate_limiter import rate_limit_report
+from core.serialization import dumps_str, loads
+from core.settings import get_settings
+from core.tracing import get_tracer, span
+from core.warmup import Warmup, build_warmup
 from core.state.orchestrator import get_orchestrator
 
 # Logging Setup
@@ -32,9 +58,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp_bridge")
 
+def _tool_agent(request: ToolExecuteRequest, http_request: Request) -> str:
+    """
+    Agent a tool call is billed to: the body's ``agent_id``, else the
+    ``X-Agent-Id`` header, else the agent of the calling context. Untagged
+    calls stay on "system" rather than being guessed from the tool.
+    """
+    return (
+        request.agent_id
+        or http_request.headers.get("x-agent-id")
+        or current_agent_id.get()
+    )
+
+
+_warmup: Optional[Warmup] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start/stop background services bound to the bridge event loop."""
+    accountant = get_resource_accountant()
+    accountant.start()
+
+    relay = None
+    bridge_settings = get_settings().bridge
+    if bridge_settings.multi_process:
+        relay = EventRelay(
+            get_db(), connection_manager, bridge_settings.event_relay_interval,
+            event_bus=get_event_bus(),
+        )
+        get_event_bus().set_relay(relay)
+        await relay.start()
+
+    # Datasets, provider clients and (lazily resolved) tool modules load in
+    # the background; the bridge accepts requests immediately and /ready
+    # reports when warm-up is over.
+    global _warmup
+    _warmup = build_warmup(
+        preload_tools if bridge_settings.preload_tools else None,
+        datasets=bridge_settings.warmup,
+    )
+    _warmup.start()
+
+    # Several workers (or bridge instances with the job queue on) share jobs
+    # through the leased queue: each claims what it can run, and jobs of a
+    # crashed worker are reclaimed when their lease expires. A single process
+    # instead resumes its active jobs from their checkpoints through the
+    # scheduler ramp.
+    orchestrator = get_orchestrator()
+    await orchestrator.registry.load()
+    queue_worker = restore = None
+    if bridge_settings.multi_process:
+        queue_worker = QueueWorker(orchestrator)
+        orchestrator.queue_worker = queue_worker
+        await queue_worker.start()
+    elif bridge_settings.restore_on_startup:
+        restore = asyncio.create_task(orchestrator.restore_universe())
+    blob_gc = None
+    if get_settings().blobs.gc_interval > 0:
+        blob_gc = asyncio.create_task(
+            orchestrator.job_manager.collect_blobs_forever(get_settings().blobs.gc_interval)
+        )
+
+    yield
+
+    if blob_gc:
+        blob_gc.cancel()
+    if restore:
+        restore.cancel()
+        orchestrator.cancel_restore()
+    if queue_worker:
+        await queue_worker.stop()
+        orchestrator.queue_worker = None
+    await _warmup.stop()
+    await get_http_clients().aclose()
+    dump_path = get_settings().tracing.otlp_dump_path
+    if dump_path and get_tracer().enabled:
+        logger.info(f"Dumped {get_tracer().dump_otlp(dump_path)} spans to {dump_path}")
+    if relay:
+        await relay.stop()
+    await accountant.stop()
+
+
 app = FastAPI(
     title="Vertice Cyber Bridge",
     version="2.4.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # CORS Configuration
@@ -57,6 +167,15 @@ async def health_check():
     )
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once the startup warm-up finished, 503 before."""
+    if _warmup is None:
+        return FastJSONResponse({"ready": False, "steps": {}}, status_code=503)
+    status = _warmup.status()
+    return FastJSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
 @app.get("/mcp/tools/list", response_model=ToolListResponse)
 async def list_tools():
     """List available MCP tools."""
@@ -64,29 +183,317 @@ async def list_tools():
 
 
 @app.post("/mcp/tools/execute", response_model=ToolExecuteResponse)
-async def execute_tool(request: ToolExecuteRequest):
-    """Execute requested tool via internal registry."""
-    start_time = time.perf_counter()
+async def execute_tool(request: ToolExecuteRequest, http_request: Request):
+    """
+    Execute requested tool via internal registry (behind its bulkhead).
 
+    The call is bounded by a deadline (``X-Request-Timeout`` seconds, at most
+    the tool's configured timeout) visible to providers, rate limiters and
+    AI calls; it is cancelled with its task tree when the deadline passes
+    (504) or the client disconnects.
+    """
     tool_func = TOOL_REGISTRY.get(request.tool_name)
     if not tool_func:
         raise HTTPException(
             status_code=404, detail=f"Tool {request.tool_name} not found"
         )
 
-    ctx = create_mock_context()
+    timeout = _request_timeout(request.tool_name, http_request)
+    agent_id = _tool_agent(request, http_request)
+    ctx = create_mock_context(agent_id=agent_id)
+    root = get_tracer().start_trace(
+        "tool.execute",
+        {"tool.name": request.tool_name, "agent.id": agent_id, "deadline.s": timeout},
+        trace_id=ctx.request_id,
+    )
+    with root, deadline(timeout):
+        with span("bulkhead.admit"):
+            permit = await _admit(request.tool_name, http_request)
+        start_time = time.perf_counter()
+        try:
+            async with asyncio.timeout(max(remaining(), 0)):
+                result = await _cancel_on_disconnect(
+                    http_request,
+                    get_resource_accountant().run(agent_id, tool_func(ctx, **request.arguments)),
+                )
+            latency = (time.perf_counter() - start_time) * 1000
+
+            return _tool_response(
+                success=True,
+                result=result,
+                logs=ctx.get_logs(),
+                execution_time_ms=latency,
+                queue_time_ms=permit.queue_wait_ms,
+                request_id=ctx.request_id,
+            )
+        except (TimeoutError, DeadlineExceeded) as e:
+            # asyncio.timeout raises a bare TimeoutError; DeadlineExceeded is one too
+            error = str(e) or f"Deadline of {timeout:.1f}s exceeded"
+            logger.warning(f"Tool {request.tool_name} stopped: {error}")
+            root.set_attribute("error", error)
+            return _tool_response(
+                success=False,
+                error=error,
+                logs=ctx.get_logs(),
+                queue_time_ms=permit.queue_wait_ms,
+                request_id=ctx.request_id,
+                status_code=504,
+            )
+        except ClientDisconnected:
+            logger.info(f"Client gone, cancelled {request.tool_name}")
+            root.set_attribute("error", "client disconnected")
+            # Nobody reads it; 499 (nginx's "client closed request") for the access log
+            return Response(status_code=499)
+        except Exception as e:
+            logger.error(f"Execution failed: {e}")
+            root.set_attribute("error", str(e))
+            return _tool_response(
+                success=False,
+                error=str(e),
+                logs=ctx.get_logs(),
+                queue_time_ms=permit.queue_wait_ms,
+                request_id=ctx.request_id,
+            )
+        finally:
+            permit.release()
+
+
+class ClientDisconnected(Exception):
+    """The HTTP client went away while its tool call was running."""
+
+
+def _request_timeout(tool_name: str, http_request: Request) -> float:
+    """Deadline for a tool call: the client's X-Request-Timeout, capped by the tool's."""
+    settings = get_settings().bridge
+    timeout = settings.tool_timeouts.get(tool_name, settings.tool_timeout)
+    header = http_request.headers.get("x-request-timeout")
+    if header:
+        try:
+            requested = float(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid X-Request-Timeout")
+        if requested <= 0:
+            raise HTTPException(status_code=400, detail="Invalid X-Request-Timeout")
+        timeout = min(timeout, requested)
+    return timeout
+
+
+async def _cancel_on_disconnect(http_request: Request, coro):
+    """Await ``coro`` as a task, cancelling it if the client disconnects."""
+    task = asyncio.ensure_future(coro)
+    interval = get_settings().bridge.disconnect_poll_interval
+    disconnected = False
+
+    async def watch():
+        nonlocal disconnected
+        while not task.done():
+            if await http_request.is_disconnected():
+                disconnected = True
+                task.cancel()
+                return
+            await asyncio.sleep(interval)
+
+    watcher = asyncio.create_task(watch())
     try:
-        result = await tool_func(ctx, **request.arguments)
-        latency = (time.perf_counter() - start_time) * 1000
+        return await task
+    except asyncio.CancelledError:
+        if disconnected:
+            raise ClientDisconnected()
+        raise
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+
+
+def _tool_response(
+    success: bool,
+    result=None,
+    error: Optional[str] = None,
+    logs=None,
+    execution_time_ms: Optional[float] = None,
+    queue_time_ms: Optional[float] = None,
+    request_id: Optional[str] = None,
+    status_code: int = 200,
+) -> FastJSONResponse:
+    """
+    ToolExecuteResponse body encoded directly.
+
+    Returning a Response skips FastAPI's response_model validation and
+    jsonable_encoder pass over ``result``, which tools already built with
+    ``model_dump()``; the schema still documents the endpoint.
+    """
+    body = {
+        "success": success,
+        "result": result,
+        "error": error,
+        "logs": logs or [],
+        "execution_time_ms": execution_time_ms,
+        "queue_time_ms": queue_time_ms,
+    }
+    # The request ID doubles as trace ID for /api/v1/traces/spans
+    headers = {"X-Request-Id": request_id} if request_id else None
+    return FastJSONResponse(body, status_code=status_code, headers=headers)
 
-        return ToolExecuteResponse(
-            success=True, result=result, logs=ctx.get_logs(), execution_time_ms=latency
+
+async def _admit(tool_name: str, http_request: Request) -> Permit:
+    """
+    Take a slot in the tool's bulkhead. A full queue sheds the request with
+    429; the wait for a slot is bounded by the request deadline (504) and
+    abandoned if the client disconnects (499).
+    """
+    bulkhead = get_bulkheads().get(tool_name)
+    try:
+        return await _cancel_on_disconnect(
+            http_request, asyncio.wait_for(bulkhead.acquire(), max(remaining(), 0))
         )
-    except Exception as e:
-        logger.error(f"Execution failed: {e}")
-        return ToolExecuteResponse(success=False, error=str(e), logs=ctx.get_logs())
+    except BulkheadFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504, detail=f"Deadline exceeded waiting for a {tool_name} slot"
+        )
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="Client closed request")
 
 
+@app.post("/mcp/tools/stream")
+async def stream_tool(request: ToolExecuteRequest, http_request: Request):
+    """
+    Execute a tool streaming its output as NDJSON (or SSE on request).
+
+    Tools declared ``streaming`` yield ``chunk`` frames as they are produced;
+    other tools emit a single ``result`` frame. A final ``done`` (or
+    ``error``) frame carries the logs and timing.
+    """
+    tool_func = TOOL_REGISTRY.get(request.tool_name)
+    if not tool_func:
+        raise HTTPException(
+            status_code=404, detail=f"Tool {request.tool_name} not found"
+        )
+
+    timeout = _request_timeout(request.tool_name, http_request)
+    agent_id = _tool_agent(request, http_request)
+    ctx = create_mock_context(agent_id=agent_id)
+    # Same root span as execute_tool; entered by the body, which runs the tool
+    root = get_tracer().start_trace(
+        "tool.execute",
+        {"tool.name": request.tool_name, "agent.id": agent_id, "deadline.s": timeout, "stream": True},
+        trace_id=ctx.request_id,
+    )
+    with deadline(timeout):
+        permit = await _admit(request.tool_name, http_request)
+    root.set_attribute("bulkhead.queue_ms", permit.queue_wait_ms)
+    start_time = time.perf_counter()
+    accountant = get_resource_accountant()
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    def encode(frame: dict) -> str:
+        payload = dumps_str(frame)
+        if use_sse:
+            return f"event: {frame['type']}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    async def frames():
+        # Starlette cancels the body on disconnect; the deadline stops the
+        # tool's providers cooperatively between chunks.
+        try:
+            # The time spent queued for the slot counts against the deadline
+            with root, deadline(timeout - permit.queue_wait):
+                stream_func = STREAMING_REGISTRY.get(request.tool_name)
+                if stream_func:
+                    chunks = stream_func(ctx, **request.arguments)
+                    async for chunk in accountant.stream(agent_id, chunks):
+                        yield encode({"type": "chunk", "data": chunk})
+                else:
+                    result = await accountant.run(
+                        agent_id, tool_func(ctx, **request.arguments)
+                    )
+                    yield encode({"type": "result", "data": result})
+
+                latency = (time.perf_counter() - start_time) * 1000
+                yield encode({
+                    "type": "done",
+                    "logs": ctx.get_logs(),
+                    "execution_time_ms": latency,
+                    "queue_time_ms": permit.queue_wait_ms,
+                })
+        except DeadlineExceeded as e:
+            logger.warning(f"Streaming execution of {request.tool_name} timed out: {e}")
+            root.set_attribute("error", str(e))
+            yield encode({"type": "timeout", "error": str(e), "logs": ctx.get_logs()})
+        except Exception as e:
+            logger.error(f"Streaming execution failed: {e}")
+            root.set_attribute("error", str(e))
+            yield encode({"type": "error", "error": str(e), "logs": ctx.get_logs()})
+        finally:
+            permit.release()
+
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Request-Id": ctx.request_id},
+        # Releases the slot even if the body iterator never starts
+        background=BackgroundTask(permit.release),
+    )
+
+
+@app.get("/api/v1/bulkheads")
+async def bulkhead_stats():
+    """Per-tool concurrency, queue depth and shed counters."""
+    return {"bulkheads": get_bulkheads().stats(), "timestamp": time.time()}
+
+
+@app.get("/api/v1/http/clients")
+async def http_client_stats():
+    """Pooled upstream HTTP clients: requests, new connections, TLS handshakes, reuse."""
+    return {**get_http_clients().stats(), "timestamp": time.time()}
+
+
+@app.get("/api/v1/providers/cache")
+async def provider_cache_stats():
+    """Cache-first provider chains: fresh hits, stale hits, misses, refreshes."""
+    from tools.providers.cached import cache_stats
+
+    return {**cache_stats(), "timestamp": time.time()}
+
+
+@app.get("/api/v1/ratelimits")
+async def rate_limit_stats():
+    """Token buckets per service: tokens left and estimated wait per window."""
+    return {"services": rate_limit_report(), "timestamp": time.time()}
+
+
+@app.get("/api/v1/traces")
+async def list_traces(limit: int = 50):
+    """Most recent root spans (one per tool call) with their span counts."""
+    tracer = get_tracer()
+    return {"enabled": tracer.enabled, "traces": tracer.traces(limit)}
+
+
+@app.get("/api/v1/traces/spans")
+async def query_spans(
+    trace_id: Optional[str] = None,
+    name: Optional[str] = None,
+    min_duration_ms: Optional[float] = None,
+    limit: int = 200,
+):
+    """Spans from the ring buffer; ``trace_id`` also accepts the X-Request-Id."""
+    spans = get_tracer().query(trace_id, name, min_duration_ms, limit)
+    return {"spans": [s.to_dict() for s in spans], "total": len(spans)}
+
+
+@app.get("/api/v1/traces/otlp")
+async def export_traces_otlp(trace_id: Optional[str] = None):
+    """OTLP/JSON export (ExportTraceServiceRequest) of the buffer or one trace."""
+    tracer = get_tracer()
+    spans = tracer.query(trace_id, limit=10**9) if trace_id else None
+    return tracer.to_otlp(spans)
+
 
 @app.websocket("/mcp/events")
 async def websocket_endpoint(websocket: WebSocket):
@@ -106,49 +513,46 @@ async def websocket_endpoint(websocket: WebSocket):
 
 @app.get("/api/v1/agents/metrics")
 async def get_agent_metrics():
-    """Get real-time metrics for all agents."""
-    from core.database import get_db
-    import psutil
-    import random
-    
+    """Get real-time metrics for all agents (rolling window from the sampler)."""
     db = get_db()
-    agents = await db.fetch_all("SELECT * FROM agents")
-    
+    agents = await db.fetch_all("SELECT agent_id, agent_type, state FROM agents")
+    completed = await db.fetch_all(
+        "SELECT agent_id, COUNT(*) as count FROM jobs WHERE status = 'COMPLETED' GROUP BY agent_id"
+    )
+    task_counts = {row['agent_id']: row['count'] for row in completed}
+    accountant = get_resource_accountant()
+    usage = accountant.rolling()
+
     results = []
-    system_cpu = psutil.cpu_percent()
-    
     for agent in agents:
         agent_id = agent['agent_id']
         state = agent['state']
-        
-        # Calculate localized metrics
-        # If running, assign a slice of system CPU + jitter
-        # If idle, low usage
-        if state == "RUNNING":
-            cpu_load = min(system_cpu + random.randint(5, 15), 100)
-            memory_mb = 128 + random.randint(0, 64)
-        else:
-            cpu_load = random.randint(0, 2)
-            memory_mb = 64
-            
-        # Count completed tasks
-        completed = await db.fetch_one(
-            "SELECT COUNT(*) as count FROM jobs WHERE agent_id = ? AND status = 'COMPLETED'",
-            (agent_id,)
-        )
-        task_count = completed['count'] if completed else 0
-        
+        agent_usage = usage.get(agent_id, {})
+
         results.append({
             "id": agent_id,
             "name": agent['agent_type'].replace('_', ' ').title(),
             "status": state,
-            "cpuLoad": round(cpu_load, 1),
-            "memoryMB": memory_mb,
-            "tasksCompleted": task_count,
+            "cpuLoad": agent_usage.get("cpu_percent", 0.0),
+            # Allocations need tracemalloc (VERTICE_BRIDGE_ACCOUNTING_TRACE_MEMORY)
+            "memoryMB": agent_usage.get("alloc_mb", 0.0) if accountant.trace_memory else None,
+            "cpuSeconds": agent_usage.get("cpu_seconds", 0.0),
+            "wallSeconds": agent_usage.get("wall_seconds", 0.0),
+            "tasksCompleted": task_counts.get(agent_id, 0),
             "health": 100 if state != "ERROR" else 50
         })
-        
-    return {"agents": results, "timestamp": time.time()}
+
+    return {
+        "agents": results,
+        "memoryTracking": accountant.trace_memory,
+        "metering": METERING_SCOPE,
+        "timestamp": time.time(),
+    }
+
+@app.get("/api/v1/agents/usage")
+async def get_agent_usage():
+    """Rolling per-agent resource usage (CPU, wall time, allocations)."""
+    return {**get_resource_accountant().snapshot(), "timestamp": time.time()}
 
 @app.post("/api/v1/agents/spawn")
 async def spawn_agent(request: dict):
@@ -157,6 +561,115 @@ async def spawn_agent(request: dict):
     agent_id = await orchestrator.spawn_agent(request.get("type"), request.get("config", {}))
     return {"agent_id": agent_id, "status": "SPAWNED"}
 
+def _bulk_size(count: int) -> None:
+    limit = get_settings().bridge.max_bulk_agents
+    if count > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} agents per bulk call")
+
+@app.post("/api/v1/agents/spawn/bulk")
+async def spawn_agents(request: dict):
+    """
+    Spawn a fleet in one transaction: ``{"agents": [{"type", "config"}, ...]}``
+    or ``{"type", "config", "count"}``. One aggregated AGENT_SPAWNED event;
+    ``per_agent_events`` adds the per-agent ones.
+    """
+    specs = request.get("agents")
+    if specs is None:
+        spec = {"type": request.get("type"), "config": request.get("config", {})}
+        specs = [spec] * int(request.get("count", 1))
+    _bulk_size(len(specs))
+    try:
+        agent_ids = await get_orchestrator().spawn_agents(
+            specs, per_agent_events=bool(request.get("per_agent_events", False))
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"agent_ids": agent_ids, "count": len(agent_ids), "status": "SPAWNED"}
+
+@app.post("/api/v1/agents/control/bulk")
+async def control_agents(request: dict):
+    """PAUSE, RESUME, TERMINATE several agents in one transaction."""
+    action = request.get("action")
+    agent_ids = request.get("agent_ids") or []
+    _bulk_size(len(agent_ids))
+    orchestrator = get_orchestrator()
+    operations = {
+        "PAUSE": orchestrator.pause_agents,
+        "RESUME": orchestrator.resume_agents,
+        "CANCEL": orchestrator.terminate_agents,
+        "TERMINATE": orchestrator.terminate_agents,
+    }
+    if action not in operations:
+        raise HTTPException(status_code=400, detail="Invalid action")
+    applied = await operations[action](
+        agent_ids, per_agent_events=bool(request.get("per_agent_events", False))
+    )
+    return {"success": True, "action": action, "agent_ids": applied, "count": len(applied)}
+
+@app.post("/api/v1/agents/{agent_id}/jobs")
+async def start_agent_job(agent_id: str, request: dict):
+    """Start a job on an agent; runnable job types are queued on the scheduler."""
+    orchestrator = get_orchestrator()
+    try:
+        job_id = await orchestrator.start_job(
+            agent_id,
+            request.get("job_type"),
+            request.get("params", {}),
+            priority=request.get("priority", "normal"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "job_id": job_id,
+        "status": "PENDING",
+        "scheduled": request.get("job_type") in orchestrator.job_handlers,
+    }
+
+@app.get("/api/v1/agents/{agent_id}")
+async def get_agent_state(agent_id: str):
+    """Agent row and its active job, from the in-memory registry."""
+    try:
+        return await get_orchestrator().get_agent_state(agent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/api/v1/scheduler")
+async def get_scheduler_stats():
+    """Job scheduler pool usage, queue depths and wait times."""
+    orchestrator = get_orchestrator()
+    return {
+        **orchestrator.scheduler.stats(),
+        "restore": orchestrator.restore_stats,
+        "queue": orchestrator.queue_worker.stats() if orchestrator.queue_worker else None,
+        "registry": orchestrator.registry.stats(),
+        "timestamp": time.time(),
+    }
+
+@app.get("/api/v1/jobs/{job_id}/result")
+async def get_job_result(job_id: str, request: Request):
+    """
+    Job result. Externalized (large) results are streamed from the blob
+    store, gzip-encoded as stored when the client accepts it.
+    """
+    row = await get_db().fetch_one("SELECT result_data FROM jobs WHERE job_id = ?", (job_id,))
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    value = loads(row["result_data"]) if row["result_data"] else None
+    ref = blob_ref(value)
+    if ref is None:
+        return Response(dumps_str(inline_value(value)), media_type="application/json")
+
+    store = get_blob_store()
+    gzip_ok = "gzip" in request.headers.get("accept-encoding", "")
+    try:
+        chunks = store.iter_chunks(ref["$blob"], compressed=gzip_ok)
+    except BlobNotFound:
+        raise HTTPException(status_code=410, detail=f"Result blob of job {job_id} is missing")
+    headers = {"ETag": f'"{ref["$blob"]}"', "X-Result-Size": str(ref["size"])}
+    if gzip_ok:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=ref.get("content_type", "application/json"), headers=headers)
+
 @app.post("/api/v1/jobs/{job_id}/control")
 async def control_job(job_id: str, request: dict):
     """
@@ -228,97 +741,101 @@ async def control_agent(agent_id: str, request: dict):
     return {"success": True, "action": action}
 
 @app.get("/api/v1/snapshot")
-async def get_snapshot():
-    """Get full system state snapshot for God Mode."""
-    # This should be implemented in Orchestrator to gather all data efficiently
-    # For now, we query DB directly or add get_all_agents method to Orchestrator
-    
-    # We'll use DB directly here for speed as Orchestrator methods are granular
-    # But adhering to code structure, let's ask Orchestrator.
-    # logic: orchestrator.get_universe_snapshot()
-    # Since I can't easily add method to Orchestrator file in this same step without context switch,
-    # and I just modified it in step 522... I can probably assume I should have added it.
-    
-    # I'll just query DB here via get_db(). 
-    from core.database import get_db
-    db = get_db()
-    
-    agents = await db.fetch_all("SELECT * FROM agents")
-    # Enrich with active jobs
-    results = []
-    for agent in agents:
-        a_dict = dict(agent)
-        job = await db.fetch_one("SELECT * FROM jobs WHERE agent_id = ? AND status IN ('RUNNING', 'PAUSED')", (agent['agent_id'],))
-        if job:
-            a_dict['active_job'] = dict(job)
-        results.append(a_dict)
-        
-    return {"agents": results, "timestamp": time.time()}
+async def get_snapshot(request: Request, since: Optional[int] = None):
+    """
+    Get system state snapshot for God Mode.
+
+    The ETag is the global state version: a matching If-None-Match answers
+    304 without touching the database, and ``since=<version>`` returns only
+    the agents (with their active job) changed after that version.
+    """
+    orchestrator = get_orchestrator()
+    etag = f'"{orchestrator.versions.version}"'
+
+    client_tags = request.headers.get("if-none-match", "").split(",")
+    if etag in [tag.strip().removeprefix("W/") for tag in client_tags]:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    snapshot = await orchestrator.get_universe_snapshot(since)
+    snapshot["timestamp"] = time.time()
+    return FastJSONResponse(snapshot, headers={"ETag": f'"{snapshot["version"]}"'})
 
 
 # =============================================================================
 # WORKFLOW ENDPOINTS
 # =============================================================================
 
+WORKFLOW_AGENT_ID = "workflow-engine"
+
+
 @app.get("/api/v1/workflows")
 async def list_workflows():
     """List available automated workflows."""
-    return {
-        "workflows": [
-            {
-                "id": "wf-incident-response",
-                "name": "Incident Response Protocol",
-                "description": "Automated containment and analysis of detected threats.",
-                "inputs": [{"name": "incident_id", "type": "string"}]
-            },
-            {
-                "id": "wf-vulnerability-scan",
-                "name": "Full Vulnerability Scan",
-                "description": "Deep scan of target infrastructure using all available tools.",
-                "inputs": [{"name": "target_ip", "type": "string"}]
-            },
-            {
-                "id": "wf-compliance-audit",
-                "name": "Compliance Audit Cycle",
-                "description": "End-to-end compliance verification against GDPR/HIPAA.",
-                "inputs": [{"name": "scope", "type": "string"}]
-            }
-        ]
-    }
+    # Imported on demand: workflows pull in their tool modules
+    from core.workflows import WORKFLOWS
+
+    return {"workflows": [wf.describe() for wf in WORKFLOWS.values()]}
+
 
 @app.post("/api/v1/workflows/run")
 async def run_workflow(request: dict):
-    """Execute a workflow."""
+    """
+    Queue a workflow run as a job of the workflow engine agent.
+
+    Steps report progress as ``workflow.*`` events; the job result is the
+    workflow report (GET /api/v1/jobs/{job_id}/result).
+    """
+    from core.workflows import WORKFLOWS
+
     workflow_id = request.get("workflow_id")
     inputs = request.get("inputs", {})
-    
-    # In a real implementation, this would trigger a WorkflowEngine
-    # For now, we simulate a job via Orchestrator (conceptually)
-    
-    # We use a dedicated "Workflow Agent" or just spawn a job on the 'workflows-manager' agent
-    
-    import uuid
-    job_id = f"job-{str(uuid.uuid4())[:8]}"
-    
-    # Emit event to show activity in terminal
-    from core.bridge.ws_manager import manager
-    await manager.broadcast({
-        "type": "workflow.started",
-        "source": "workflow_engine",
-        "payload": {
-            "workflow_id": workflow_id,
-            "job_id": job_id,
-            "inputs": inputs
-        }
-    })
-    
-    return {"job_id": job_id, "status": "RUNNING"}
+    workflow = WORKFLOWS.get(workflow_id)
+    if workflow is None:
+        raise HTTPException(status_code=404, detail=f"Workflow {workflow_id} not found")
+    missing = [name for name in workflow.inputs if name not in inputs]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing inputs: {missing}")
 
+    orchestrator = get_orchestrator()
+    await orchestrator.ensure_agent(WORKFLOW_AGENT_ID, "workflow_engine")
+    try:
+        job_id = await orchestrator.start_job(
+            WORKFLOW_AGENT_ID,
+            "workflow.run",
+            {"workflow_id": workflow_id, "inputs": inputs},
+            priority=request.get("priority", "normal"),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-if __name__ == "__main__":
+    return {"job_id": job_id, "workflow_id": workflow_id, "status": "PENDING"}
+
+
+def main():
     import argparse
+    import os
 
     parser = argparse.ArgumentParser(description="Vértice Bridge")
+    parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=get_settings().bridge.workers,
+        help="Worker processes (0 = one per CPU core)",
+    )
     args = parser.parse_args()
-    uvicorn.run(app, host="0.0.0.0", port=args.port)
+
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        # Workers re-import this module: the env var switches them to the
+        # SQLite-shared rate limiters, state versions and event relay.
+        os.environ["VERTICE_BRIDGE_WORKERS"] = str(workers)
+        logger.info(f"Starting bridge with {workers} workers")
+        uvicorn.run("mcp_http_bridge:app", host=args.host, port=args.port, workers=workers)
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
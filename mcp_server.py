@@ -5,31 +5,22 @@ Expõe 11 Meta-Agents como MCP Tools.
 
 import argparse
 import logging
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List
 
 from fastmcp import FastMCP, Context
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from core.settings import settings
 from core.memory import get_memory_pool
 from core.database import get_db
 from core.state.orchestrator import get_orchestrator
-from tools.magistrate import ethical_validate
-from tools.osint import osint_investigate, osint_breach_check, osint_google_dork
-from tools.threat import threat_analyze, threat_intelligence, threat_predict
-from tools.compliance import compliance_assess, compliance_report, compliance_check
-from tools.wargame import wargame_list_scenarios, wargame_run_simulation
-from tools.patch_ml import patch_validate
-from tools.cybersec_basic import cybersec_recon
-from tools.deepfake_scanner import scan_media
-from tools.mcp_ai_tools import (
-    ai_threat_analysis,
-    ai_compliance_assessment,
-    ai_osint_analysis,
-    ai_stream_analysis,
-    ai_integrated_assessment,
-)
+from core.warmup import build_warmup
 
-# Import AI tools module to register tools
+# Tool implementations are imported inside each wrapper: the tool modules pull
+# in google.genai, PIL and provider clients, which would otherwise be paid on
+# every server start even if the tool is never called.
 
 logging.basicConfig(
     level=getattr(logging, settings.server.log_level),
@@ -42,7 +33,21 @@ logger = logging.getLogger("vertice_cyber")
 # MCP SERVER INSTANCE
 # =============================================================================
 
-mcp = FastMCP(name="vertice-cyber", version="2.0.0")
+# MITRE/compliance datasets and provider clients load in the background at
+# startup; first calls made meanwhile await the same load.
+warmup = build_warmup()
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Startup/shutdown hook: runs the background warm-up."""
+    if settings.bridge.warmup:
+        warmup.start()
+    yield
+    await warmup.stop()
+
+
+mcp = FastMCP(name="vertice-cyber", version="2.0.0", lifespan=server_lifespan)
 
 
 # =============================================================================
@@ -61,6 +66,19 @@ async def get_system_status() -> str:
 """
 
 
+@mcp.resource("vertice://ready")
+async def get_readiness() -> Dict[str, Any]:
+    """Estado do warm-up de startup (datasets e clients)."""
+    return warmup.status()
+
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def readiness_route(request: Request) -> JSONResponse:
+    """Readiness HTTP (modo --http): 200 após o warm-up, 503 antes."""
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+
 @mcp.resource("vertice://agents")
 async def get_agents_list() -> str:
     """Lista de agentes disponíveis."""
@@ -99,6 +117,8 @@ async def threat_analyze_tool(
     ctx: Context, target: str, deep_analysis: bool = False
 ) -> Dict[str, Any]:
     """Analisa ameaças para um alvo específico usando Threat Prophet."""
+    from tools.threat import threat_analyze
+
     result = await threat_analyze(ctx, target, deep_analysis)
     await ctx.info(f"Threat analysis completed for {target}")
     return result
@@ -107,6 +127,8 @@ async def threat_analyze_tool(
 @mcp.tool()
 async def threat_intelligence_tool(ctx: Context, query: str) -> Dict[str, Any]:
     """Busca inteligência de ameaças baseada em consulta."""
+    from tools.threat import threat_intelligence
+
     result = await threat_intelligence(ctx, query)
     await ctx.info(f"Threat intelligence search completed for: {query}")
     return result
@@ -115,6 +137,8 @@ async def threat_intelligence_tool(ctx: Context, query: str) -> Dict[str, Any]:
 @mcp.tool()
 async def threat_predict_tool(ctx: Context, target: str) -> Dict[str, Any]:
     """Faz previsões de ameaças para um alvo."""
+    from tools.threat import threat_predict
+
     result = await threat_predict(ctx, target)
     await ctx.info(f"Threat prediction completed for {target}")
     return result
@@ -123,6 +147,8 @@ async def threat_predict_tool(ctx: Context, target: str) -> Dict[str, Any]:
 @mcp.tool()
 async def osint_investigate_tool(ctx: Context, target: str) -> Dict[str, Any]:
     """Investiga um alvo usando técnicas OSINT."""
+    from tools.osint import osint_investigate
+
     result = await osint_investigate(ctx, target)
     await ctx.info(f"OSINT investigation completed for {target}")
     return result
@@ -131,6 +157,8 @@ async def osint_investigate_tool(ctx: Context, target: str) -> Dict[str, Any]:
 @mcp.tool()
 async def osint_breach_check_tool(ctx: Context, email: str) -> Dict[str, Any]:
     """Verifica se um email foi comprometido em breaches."""
+    from tools.osint import osint_breach_check
+
     result = await osint_breach_check(ctx, email)
     await ctx.info(f"Breach check completed for {email}")
     return result
@@ -139,6 +167,8 @@ async def osint_breach_check_tool(ctx: Context, email: str) -> Dict[str, Any]:
 @mcp.tool()
 async def osint_google_dork_tool(ctx: Context, query: str) -> Dict[str, Any]:
     """Executa Google dorking para descoberta de informações."""
+    from tools.osint import osint_google_dork
+
     result = await osint_google_dork(ctx, query)
     await ctx.info(f"Google dorking completed for: {query}")
     return result
@@ -149,6 +179,8 @@ async def compliance_assess_tool(
     ctx: Context, target: str, framework: str
 ) -> Dict[str, Any]:
     """Avalia conformidade de um alvo com framework específico."""
+    from tools.compliance import compliance_assess
+
     result = await compliance_assess(ctx, target, framework)
     await ctx.info(f"Compliance assessment completed for {target} ({framework})")
     return result
@@ -159,6 +191,8 @@ async def compliance_report_tool(
     ctx: Context, target: str, frameworks: List[str]
 ) -> Dict[str, Any]:
     """Gera relatório de conformidade para múltiplos frameworks."""
+    from tools.compliance import compliance_report
+
     result = await compliance_report(ctx, target, frameworks)
     await ctx.info(f"Compliance report generated for {target}")
     return result
@@ -169,6 +203,8 @@ async def compliance_check_tool(
     ctx: Context, requirement_id: str, target: str
 ) -> Dict[str, Any]:
     """Verifica um requisito específico de conformidade."""
+    from tools.compliance import compliance_check
+
     result = await compliance_check(ctx, requirement_id, target)
     await ctx.info(f"Compliance check completed for requirement {requirement_id}")
     return result
@@ -179,6 +215,8 @@ async def ethical_validate_tool(
     ctx: Context, action: str, context: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Valida se uma ação é eticamente aceitável."""
+    from tools.magistrate import ethical_validate
+
     result = await ethical_validate(ctx, action, context)
     await ctx.info("Ethical validation completed")
     return result
@@ -192,6 +230,8 @@ async def ethical_validate_tool(
 @mcp.tool()
 async def wargame_list_scenarios_tool(ctx: Context) -> List[Dict[str, Any]]:
     """Lista cenários de ataque simulados disponíveis."""
+    from tools.wargame import wargame_list_scenarios
+
     result = await wargame_list_scenarios(ctx)
     await ctx.info("Listed wargame scenarios")
     return result
@@ -202,6 +242,8 @@ async def wargame_run_simulation_tool(
     ctx: Context, scenario_id: str, target: str = "local"
 ) -> Dict[str, Any]:
     """Executa uma simulação de ataque (Wargame)."""
+    from tools.wargame import wargame_run_simulation
+
     result = await wargame_run_simulation(ctx, scenario_id, target)
     await ctx.info(f"Wargame simulation {scenario_id} completed")
     return result
@@ -212,6 +254,8 @@ async def patch_validate_tool(
     ctx: Context, diff_content: str, language: str = "python"
 ) -> Dict[str, Any]:
     """Valida um patch de código quanto a riscos de segurança."""
+    from tools.patch_ml import patch_validate
+
     result = await patch_validate(ctx, diff_content, language)
     await ctx.info("Patch validation completed")
     return result
@@ -227,6 +271,8 @@ async def cybersec_recon_tool(
     ctx: Context, target: str, scan_ports: bool = True, scan_web: bool = True
 ) -> Dict[str, Any]:
     """Realiza reconhecimento básico (portas, web headers)."""
+    from tools.cybersec_basic import cybersec_recon
+
     result = await cybersec_recon(ctx, target, scan_ports, scan_web)
     await ctx.info(f"Recon completed for {target}")
     return result
@@ -237,6 +283,8 @@ async def deepfake_scan_tool(
     ctx: Context, file_b64: str, mime_type: str, filename: str
 ) -> Dict[str, Any]:
     """Scans media for deepfake artifacts using Gemini 3 and heuristics."""
+    from tools.deepfake_scanner import scan_media
+
     result = await scan_media(file_b64, mime_type, filename)
     await ctx.info(f"Deepfake scan completed for {filename}")
     return result
@@ -246,11 +294,64 @@ async def deepfake_scan_tool(
 # AI TOOLS (Vertex AI)
 # =============================================================================
 
-mcp.tool()(ai_threat_analysis)
-mcp.tool()(ai_compliance_assessment)
-mcp.tool()(ai_osint_analysis)
-mcp.tool()(ai_stream_analysis)
-mcp.tool()(ai_integrated_assessment)
+
+@mcp.tool()
+async def ai_threat_analysis(
+    ctx: Context,
+    target: str,
+    context_data: Dict[str, Any],
+    analysis_type: str = "comprehensive",
+) -> Dict[str, Any]:
+    """Análise inteligente de ameaças usando Vertex AI."""
+    from tools.mcp_ai_tools import ai_threat_analysis as impl
+
+    return await impl(ctx, target, context_data, analysis_type)
+
+
+@mcp.tool()
+async def ai_compliance_assessment(
+    ctx: Context, target: str, framework: str, current_state: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Avaliação de conformidade inteligente usando Vertex AI."""
+    from tools.mcp_ai_tools import ai_compliance_assessment as impl
+
+    return await impl(ctx, target, framework, current_state)
+
+
+@mcp.tool()
+async def ai_osint_analysis(
+    ctx: Context,
+    target: str,
+    findings: List[Dict[str, Any]],
+    analysis_focus: str = "risk_assessment",
+) -> Dict[str, Any]:
+    """Análise inteligente de achados OSINT usando Vertex AI."""
+    from tools.mcp_ai_tools import ai_osint_analysis as impl
+
+    return await impl(ctx, target, findings, analysis_focus)
+
+
+@mcp.tool()
+async def ai_stream_analysis(
+    ctx: Context,
+    analysis_type: str,
+    data: Dict[str, Any],
+    stream_format: str = "markdown",
+) -> str:
+    """Análise em streaming em tempo real usando Vertex AI."""
+    from tools.mcp_ai_tools import ai_stream_analysis as impl
+
+    return await impl(ctx, analysis_type, data, stream_format)
+
+
+@mcp.tool()
+async def ai_integrated_assessment(
+    ctx: Context, target: str, assessment_scope: str = "full"
+) -> Dict[str, Any]:
+    """Avaliação integrada usando todos os agentes com IA."""
+    from tools.mcp_ai_tools import ai_integrated_assessment as impl
+
+    return await impl(ctx, target, assessment_scope)
 
 
 # CONSTITUTIONAL EXEMPTION (Padrão Pagani - Artigo II):
@@ -0,0 +1,166 @@
+"""
+Job write-amplification benchmark.
+
+Counts SQLite pages written (WAL frames) per job lifecycle:
+create -> RUNNING -> N checkpoints -> COMPLETED, plus cancelling a batch of
+jobs. Each scenario runs against:
+
+- legacy: the update_jobs_timestamp trigger reinstalled, checkpoints
+  written inline into jobs.checkpoint_data, one UPDATE per cancelled job;
+- current: the shipped write path with every checkpoint written
+  (min_interval=0), i.e. the same work as legacy;
+- throttled: the shipped write path with the configured min_interval, so
+  rapid checkpoints are coalesced.
+
+SQLite writes each dirty page once per transaction, so the trigger's
+second UPDATE of the same row costs CPU rather than WAL pages; the page
+savings come from keeping the checkpoint out of the row (large states),
+from batching (cancel) and from coalescing.
+
+Usage:
+    python scripts/bench_job_writes.py --jobs 20 --checkpoints 10 --results-kb 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import core.database as database  # noqa: E402
+import core.events.event_bus as event_bus  # noqa: E402
+import core.jobs.signals as signals  # noqa: E402
+import core.state.versioning as versioning  # noqa: E402
+from core.events.types import Event  # noqa: E402
+from core.jobs.checkpoint import CheckpointData  # noqa: E402
+from core.jobs.job_manager import JobManager  # noqa: E402
+
+LEGACY_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS update_jobs_timestamp AFTER UPDATE ON jobs
+BEGIN
+    UPDATE jobs SET updated_at = CURRENT_TIMESTAMP WHERE job_id = NEW.job_id;
+END;
+"""
+
+
+def wal_frames(conn: sqlite3.Connection) -> int:
+    """Frames appended to the WAL since the last call (then reset)."""
+    _, frames, _ = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return frames
+
+
+def fresh_manager(db_path: str, mode: str) -> JobManager:
+    db = database.Database(db_path)
+    database._db = db
+    event_bus._event_bus = None
+    versioning._tracker = None
+    signals._signals = None
+    if mode == "legacy":
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(LEGACY_TRIGGER)
+    manager = JobManager()
+    if mode == "current":
+        manager.checkpoint_manager.min_interval = 0
+    return manager
+
+
+async def legacy_checkpoint(manager: JobManager, job_id: str, data: CheckpointData) -> None:
+    """The pre-incremental save: whole state inline, rewritten every time."""
+    payload = json.dumps({"version": "v1", "data": data.model_dump(mode="json")})
+    await manager.db.execute(
+        "UPDATE jobs SET checkpoint_data = ?, progress = ?, updated_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+        (payload, min(data.step_index, 100), job_id),
+    )
+    await manager.event_bus.emit(Event(
+        event_type="job.checkpoint_saved",
+        source="checkpoint_manager",
+        payload={"job_id": job_id, "progress": data.step_index},
+    ))
+
+
+async def lifecycle(manager: JobManager, legacy: bool, checkpoints: int, results_kb: int) -> None:
+    job_id = await manager.create_job("bench-agent", "bench")
+    await manager.set_status(job_id, "RUNNING")
+    results = {}
+    for step in range(1, checkpoints + 1):
+        results[f"step-{step}"] = "x" * (results_kb * 1024 // checkpoints)
+        data = CheckpointData(step_index=step, accumulated_results=dict(results))
+        if legacy:
+            await legacy_checkpoint(manager, job_id, data)
+        else:
+            await manager.save_checkpoint(job_id, data)
+    await manager.set_status(job_id, "COMPLETED", result={"steps": checkpoints})
+
+
+async def cancel_batch(manager: JobManager, legacy: bool, jobs: int, holder) -> None:
+    job_ids = [await manager.create_job("bench-agent", "bench") for _ in range(jobs)]
+    wal_frames(holder)
+    if legacy:
+        for job_id in job_ids:
+            await manager.set_status(job_id, "CANCELLED")
+    else:
+        await manager.set_status_many(job_ids, "CANCELLED")
+
+
+async def run_mode(mode: str, args) -> dict:
+    legacy = mode == "legacy"
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        manager = fresh_manager(db_path, mode)
+        # Held open for the whole run: the last connection to close would
+        # checkpoint the WAL, and the frame counts with it.
+        holder = sqlite3.connect(db_path)
+        page_size = holder.execute("PRAGMA page_size").fetchone()[0]
+
+        wal_frames(holder)
+        frames = []
+        elapsed = 0.0
+        for _ in range(args.jobs):
+            started = time.perf_counter()
+            await lifecycle(manager, legacy, args.checkpoints, args.results_kb)
+            elapsed += time.perf_counter() - started
+            frames.append(wal_frames(holder))
+
+        await cancel_batch(manager, legacy, args.jobs, holder)
+        cancel = wal_frames(holder)
+        holder.close()
+
+    return {
+        "pages_per_job": sum(frames) / len(frames),
+        "kb_per_job": sum(frames) / len(frames) * page_size / 1024,
+        "cancel_pages": cancel,
+        "ms_per_job": elapsed / args.jobs * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job write-amplification benchmark")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--results-kb", type=int, default=8, help="Results accumulated per job")
+    args = parser.parse_args()
+
+    print(
+        f"{args.jobs} jobs, {args.checkpoints} checkpoints each, "
+        f"{args.results_kb} KiB of results per job"
+    )
+    print(f"{'mode':>10} {'pages/job':>10} {'KiB/job':>9} {'ms/job':>8} {'cancel pages':>13}")
+    results = {mode: asyncio.run(run_mode(mode, args)) for mode in ("legacy", "current", "throttled")}
+    legacy = results["legacy"]
+    for name, result in results.items():
+        print(
+            f"{name:>10} {result['pages_per_job']:>10.1f} {result['kb_per_job']:>9.1f} "
+            f"{result['ms_per_job']:>8.2f} {result['cancel_pages']:>13}"
+            f"   ({legacy['pages_per_job'] / result['pages_per_job']:.1f}x pages/job, "
+            f"{legacy['cancel_pages'] / max(result['cancel_pages'], 1):.1f}x cancel)"
+        )
+
+
+if __name__ == "__main__":
+    main()
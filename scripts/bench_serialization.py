@@ -0,0 +1,125 @@
+"""
+Bridge serialization benchmark.
+
+Encodes large ``threat_analyze`` and ``compliance_report`` results the way
+the bridge used to (ToolExecuteResponse model + response_model validation +
+jsonable_encoder + json.dumps) and the way it does now (one pass through
+``core.serialization``), plus the event fan-out path (json per socket vs
+encode once).
+
+Real tool outputs are used as templates and their list fields are repeated
+``--scale`` times to reach realistic report sizes.
+
+Usage:
+    python scripts/bench_serialization.py --scale 500 --iterations 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from core.bridge.context import create_mock_context  # noqa: E402
+from core.bridge.models import ToolExecuteResponse  # noqa: E402
+from core.serialization import dumps, dumps_str  # noqa: E402
+from tools.compliance import compliance_report  # noqa: E402
+from tools.threat import threat_analyze  # noqa: E402
+
+
+def scale_lists(obj: Any, factor: int) -> Any:
+    """Repeat the outermost lists so the payload grows ~``factor`` times."""
+    if isinstance(obj, dict):
+        return {k: scale_lists(v, factor) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return obj * factor
+    return obj
+
+
+async def build_payloads(scale: int) -> Dict[str, Dict[str, Any]]:
+    threat = await threat_analyze(create_mock_context(), target="acme.example.com")
+    compliance = await compliance_report(
+        create_mock_context(),
+        target="acme",
+        frameworks=["gdpr", "hipaa", "pci_dss", "sox", "iso_27001", "nist"],
+    )
+    return {
+        "threat_analyze": scale_lists(threat, scale),
+        "compliance_report": scale_lists(compliance, scale),
+    }
+
+
+def legacy_response(result: Dict[str, Any]) -> bytes:
+    response = ToolExecuteResponse(success=True, result=result, execution_time_ms=1.0)
+    validated = ToolExecuteResponse.model_validate(response.model_dump())
+    return json.dumps(
+        jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_response(result: Dict[str, Any]) -> bytes:
+    return dumps({
+        "success": True,
+        "result": result,
+        "error": None,
+        "logs": [],
+        "execution_time_ms": 1.0,
+        "queue_time_ms": None,
+    })
+
+
+def legacy_event(payload: Dict[str, Any], sockets: int) -> None:
+    json.dumps(payload, default=str)  # _persist_event
+    for _ in range(sockets):  # send_json per connection
+        json.dumps(payload, default=str, separators=(",", ":"))
+
+
+def fast_event(payload: Dict[str, Any], sockets: int) -> None:
+    dumps_str(payload)  # _persist_event
+    dumps_str(payload)  # broadcast encodes once for every socket
+
+
+def timeit(fn: Callable[[], Any], iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge serialization benchmark")
+    parser.add_argument("--scale", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--sockets", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = asyncio.run(build_payloads(args.scale))
+
+    print(f"{'payload':<20} {'path':<10} {'size':>10} {'legacy':>10} {'fast':>10} {'speedup':>8}")
+    for name, result in payloads.items():
+        size = len(fast_response(result))
+        legacy = timeit(lambda: legacy_response(result), args.iterations)
+        fast = timeit(lambda: fast_response(result), args.iterations)
+        print(
+            f"{name:<20} {'response':<10} {size / 1024:>8.0f}KB "
+            f"{legacy:>8.2f}ms {fast:>8.2f}ms {legacy / fast:>7.1f}x"
+        )
+
+        event_payload = jsonable_encoder(result)
+        legacy = timeit(lambda: legacy_event(event_payload, args.sockets), args.iterations)
+        fast = timeit(lambda: fast_event(event_payload, args.sockets), args.iterations)
+        print(
+            f"{name:<20} {'event':<10} {f'x{args.sockets} ws':>10} "
+            f"{legacy:>8.2f}ms {fast:>8.2f}ms {legacy / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Startup benchmark and import-time budget report.
+
+Imports each entry point (HTTP bridge and MCP server) in a fresh
+interpreter several times, reports the median wall time against a budget
+and lists the heaviest imports from ``python -X importtime``. Exits 1 when
+an entry point is over budget, so it can gate CI.
+
+Usage:
+    python scripts/bench_startup.py --runs 5 --top 15
+    python scripts/bench_startup.py --budget mcp_http_bridge=1500 --budget mcp_server=2500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Median import time budgets (ms) per entry point
+DEFAULT_BUDGETS_MS = {
+    "mcp_http_bridge": 1500.0,
+    "mcp_server": 2500.0,
+}
+
+# Modules that must not be imported just by starting an entry point
+LAZY_MODULES = ["google.genai", "PIL", "tools.vertex_ai", "tools.deepfake_scanner"]
+
+
+def import_wall_ms(module: str) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=ROOT,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def import_profile(module: str) -> Tuple[List[Tuple[float, str]], List[str]]:
+    """Top-level cumulative import times (ms) and eagerly loaded lazy modules."""
+    probe = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Two spaces per nesting level: depth 1 = direct imports of the module
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            entries.append((int(cumulative) / 1000, name.strip()))
+    lines = proc.stdout.strip().splitlines() or [""]
+    eager = [m for m in lines[-1].split(",") if m]
+    return sorted(entries, reverse=True), eager
+
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for value in values:
+        module, _, ms = value.partition("=")
+        budgets[module] = float(ms)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entry point startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--budget", action="append", default=[], help="module=ms (repeatable)"
+    )
+    args = parser.parse_args()
+
+    budgets = parse_budgets(args.budget)
+    over_budget = False
+
+    for module, budget in budgets.items():
+        import_wall_ms(module)  # warm the OS file cache / bytecode
+        samples = [import_wall_ms(module) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        status = "OK" if median <= budget else "OVER BUDGET"
+        over_budget |= median > budget
+
+        print(f"\n=== {module} ===")
+        print(
+            f"median {median:.0f}ms (min {min(samples):.0f}, max {max(samples):.0f}) "
+            f"budget {budget:.0f}ms -> {status}"
+        )
+
+        entries, eager = import_profile(module)
+        print(f"{'cumulative':>12}  import")
+        for cumulative, name in entries[: args.top]:
+            print(f"{cumulative:>10.1f}ms  {name}")
+        if eager:
+            print(f"WARNING: eagerly imported: {', '.join(eager)}")
+            over_budget = True
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Bridge multi-worker throughput benchmark.
+
+Starts the bridge with increasing worker counts and hammers
+/mcp/tools/execute with a CPU-bound tool (patch_validate on a large diff),
+reporting requests/second per configuration.
+
+Usage:
+    python scripts/bench_workers.py --workers 1 2 4 --requests 400 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DIFF = "\n".join(
+    f"+    result_{i} = process(data[{i}])  # eval(input) password = 'x'"
+    for i in range(400)
+)
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.time() < deadline:
+            try:
+                if (await client.get(f"{base_url}/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Bridge at {base_url} did not become ready")
+
+
+async def hammer(base_url: str, total: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                response = await client.post(
+                    f"{base_url}/mcp/tools/execute",
+                    json={
+                        "tool_name": "patch_validate",
+                        "arguments": {"diff_content": DIFF, "language": "python"},
+                    },
+                )
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return {"rps": total / elapsed, "elapsed_s": elapsed, "errors": errors}
+
+
+def run_config(workers: int, port: int, total: int, concurrency: int) -> dict:
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    proc = subprocess.Popen(
+        [sys.executable, "mcp_http_bridge.py", "--port", str(port), "--workers", str(workers)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_ready(base_url))
+        asyncio.run(hammer(base_url, concurrency, concurrency))  # warm-up
+        return asyncio.run(hammer(base_url, total, concurrency))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bridge worker scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=8101)
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}")
+    print(f"{'workers':>8} {'req/s':>10} {'elapsed':>9} {'errors':>7} {'speedup':>8}")
+    baseline = None
+    for i, workers in enumerate(args.workers):
+        result = run_config(workers, args.port + i, args.requests, args.concurrency)
+        baseline = baseline or result["rps"]
+        print(
+            f"{workers:>8} {result['rps']:>10.1f} {result['elapsed_s']:>8.2f}s "
+            f"{result['errors']:>7} {result['rps'] / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Tests for the write-through agent registry.
+
+Run with: pytest tests/test_agent_registry.py -v
+"""
+
+import time
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+from core.jobs.checkpoint import CheckpointData
+from core.jobs.signals import JobSignals
+from core.settings import get_settings
+from core.state.orchestrator import AgentOrchestrator
+from core.state.registry import AgentRegistry
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "registry.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+def forbid_reads(monkeypatch, db):
+    async def fail(*args, **kwargs):
+        raise AssertionError("control path read the database")
+
+    monkeypatch.setattr(db, "fetch_all", fail)
+    monkeypatch.setattr(db, "fetch_one", fail)
+
+
+def allow_reads(db):
+    del db.fetch_all, db.fetch_one
+
+
+class TestAgentRegistry:
+    """Test suite for AgentRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_control_operations_are_served_from_memory(self, db, monkeypatch):
+        orchestrator = AgentOrchestrator()
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {"depth": 1})
+        job_id = await orchestrator.start_job(agent_id, "investigate", {"target": "x"})
+        forbid_reads(monkeypatch, db)
+
+        state = await orchestrator.get_agent_state(agent_id)
+        assert state["agent"]["state"] == "RUNNING" and state["active_job"] is None
+
+        await orchestrator.job_manager.set_status(job_id, "RUNNING")
+        allow_reads(db)  # the first checkpoint save reads the stored chain
+        await orchestrator.job_manager.save_checkpoint(job_id, CheckpointData(step_index=40), force=True)
+        forbid_reads(monkeypatch, db)
+        await orchestrator.pause_agent(agent_id)
+        state = await orchestrator.get_agent_state(agent_id)
+        assert (state["agent"]["state"], state["active_job"]["job_id"]) == ("PAUSED", job_id)
+        assert state["active_job"]["status"] == "PAUSED"
+
+        await orchestrator.resume_agent(agent_id)
+        state = await orchestrator.get_agent_state(agent_id)
+        assert state["active_job"]["status"] == "RUNNING" and state["active_job"]["progress"] == 40
+
+        await orchestrator.terminate_agent(agent_id)
+        state = await orchestrator.get_agent_state(agent_id)
+        assert state["agent"]["state"] == "TERMINATED" and state["active_job"] is None
+        assert orchestrator.registry.stats()["open_jobs"] == 0
+
+    @pytest.mark.asyncio
+    async def test_database_stays_the_durable_source(self, db):
+        orchestrator = AgentOrchestrator()
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {})
+        job_id = await orchestrator.start_job(agent_id, "investigate", {})
+        await orchestrator.job_manager.set_status(job_id, "RUNNING")
+        await orchestrator.pause_agent(agent_id)
+
+        # A restarted process rebuilds the same view from SQLite
+        restarted = AgentOrchestrator()
+        assert await restarted.registry.load() == 1
+        before, after = await orchestrator.get_agent_state(agent_id), await restarted.get_agent_state(agent_id)
+        assert before["agent"] == after["agent"]
+        assert {k: before["active_job"][k] for k in ("job_id", "status", "job_type", "params")} == {
+            k: after["active_job"][k] for k in ("job_id", "status", "job_type", "params")
+        }
+        with pytest.raises(ValueError):
+            await restarted.get_agent_state("nope")
+
+    @pytest.mark.asyncio
+    async def test_non_authoritative_registry_rereads_the_agent(self, db):
+        orchestrator = AgentOrchestrator()
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {})
+        shared = AgentRegistry(db, orchestrator.job_manager.signals, authoritative=False)
+
+        # Another worker pauses the agent behind this process' back
+        await db.execute("UPDATE agents SET state = 'PAUSED' WHERE agent_id = ?", (agent_id,))
+        assert (await shared.get(agent_id))["state"] == "PAUSED"
+        assert shared.stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_job_queue_instances_are_not_authoritative(self, db, monkeypatch):
+        monkeypatch.setattr(get_settings().bridge, "job_queue", True)
+        assert AgentOrchestrator().registry.authoritative is False
+
+    @pytest.mark.asyncio
+    async def test_state_lookup_is_sub_millisecond(self, db):
+        orchestrator = AgentOrchestrator()
+        agent_ids = [await orchestrator.spawn_agent("osint_hunter", {}) for _ in range(50)]
+        for agent_id in agent_ids:
+            await orchestrator.start_job(agent_id, "investigate", {})
+
+        started = time.perf_counter()
+        for _ in range(20):
+            for agent_id in agent_ids:
+                await orchestrator.get_agent_state(agent_id)
+        assert (time.perf_counter() - started) / 1000 < 0.001
@@ -0,0 +1,153 @@
+"""
+Tests for the content-addressed blob store.
+
+Run with: pytest tests/test_blob_store.py -v
+"""
+
+import gzip
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.blob_store as blob_store
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+from core.blob_store import BlobNotFound, BlobStore, blob_ref
+from core.jobs.job_manager import JobManager
+from core.jobs.signals import JobSignals
+from core.serialization import loads
+
+LARGE = {"findings": [{"id": i, "detail": "x" * 100} for i in range(500)]}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    instance = BlobStore(str(tmp_path / "blobs"), inline_max_bytes=1024)
+    monkeypatch.setattr(blob_store, "_store", instance)
+    return instance
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch, store):
+    instance = database.Database(str(tmp_path / "blobs.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+class TestBlobStore:
+    """Test suite for BlobStore."""
+
+    def test_put_is_content_addressed_and_deduplicated(self, store):
+        first = store.put(b"report")
+        second = store.put(b"report")
+        assert first == second
+        assert (store.written, store.deduplicated) == (1, 1)
+        assert store.get(first) == b"report"
+        # Stored gzip-compressed under a sharded, hash-named path
+        assert gzip.decompress(store.path(first).read_bytes()) == b"report"
+        assert store.path(first).parent.name == first[2:4]
+
+    def test_streaming(self, store):
+        data = b"".join(bytes([i % 251]) for i in range(300_000))
+        digest = store.put(data)
+        assert b"".join(store.iter_chunks(digest, chunk_size=4096)) == data
+        raw = b"".join(store.iter_chunks(digest, compressed=True))
+        assert gzip.decompress(raw) == data
+
+    def test_unknown_and_malformed_digests(self, store):
+        with pytest.raises(BlobNotFound):
+            store.get("0" * 64)
+        with pytest.raises(BlobNotFound):
+            store.path("../../etc/passwd")
+
+    def test_externalize_keeps_small_values_inline(self, store):
+        assert store.externalize({"ok": True}) == '{"ok":true}'
+        column = store.externalize(LARGE)
+        ref = blob_ref(loads(column))
+        assert ref["size"] > 1024 and len(column) < 200
+        assert store.resolve(column) == LARGE
+        assert store.resolve(None) is None
+
+    def test_inline_lookalikes_are_not_references(self, store):
+        lookalike = {"$blob": "0" * 64, "size": 1}
+        column = store.externalize(lookalike)
+        assert blob_ref(loads(column)) is None
+        assert store.resolve(column) == lookalike
+        wrapped = {"$inline": 1}
+        assert store.resolve(store.externalize(wrapped)) == wrapped
+
+    def test_sweep_keeps_live_and_recent_blobs(self, store):
+        live, dead, recent = store.put(b"live"), store.put(b"dead"), store.put(b"recent")
+        for digest in (live, dead):
+            os.utime(store.path(digest), (0, 0))
+
+        assert store.sweep({live}, min_age=60) == 1
+        assert store.exists(live) and store.exists(recent)
+        assert not store.exists(dead)
+
+
+class TestJobResults:
+    """Large job results are stored by reference."""
+
+    @pytest.mark.asyncio
+    async def test_large_result_is_externalized(self, db, store):
+        manager = JobManager()
+        job_a = await manager.create_job("visionary-1", "analyze")
+        job_b = await manager.create_job("visionary-1", "analyze")
+        await manager.set_status(job_a, "COMPLETED", result=LARGE)
+        await manager.set_status(job_b, "COMPLETED", result=LARGE)
+
+        row = await db.fetch_one("SELECT result_data FROM jobs WHERE job_id = ?", (job_a,))
+        assert len(row["result_data"]) < 200
+        assert await manager.get_result(job_b) == LARGE
+        assert store.written == 1 and store.deduplicated == 1
+
+    @pytest.mark.asyncio
+    async def test_unreferenced_blobs_are_collected(self, db, store):
+        manager = JobManager()
+        job_id = await manager.create_job("visionary-1", "analyze")
+        await manager.set_status(job_id, "COMPLETED", result=LARGE)
+        orphan = store.put(b"result of a deleted job")
+
+        assert await manager.collect_blobs(min_age=0) == 1
+        assert not store.exists(orphan)
+        assert await manager.get_result(job_id) == LARGE
+
+    def test_bridge_streams_blob_results(self, db, store):
+        import mcp_http_bridge
+
+        column = store.externalize(LARGE)
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, agent_id, job_type, status, result_data) VALUES (?, ?, ?, ?, ?)",
+                ("big", "visionary-1", "analyze", "COMPLETED", column),
+            )
+            conn.execute(
+                "INSERT INTO jobs (job_id, agent_id, job_type, status, result_data) VALUES (?, ?, ?, ?, ?)",
+                ("small", "visionary-1", "analyze", "COMPLETED", '{"ok":true}'),
+            )
+
+        client = TestClient(mcp_http_bridge.app)
+        response = client.get("/api/v1/jobs/big/result")
+        assert response.json() == LARGE
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == f'"{loads(column)["$blob"]}"'
+
+        plain = client.get("/api/v1/jobs/big/result", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == LARGE
+
+        assert client.get("/api/v1/jobs/small/result").json() == {"ok": True}
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, agent_id, job_type, status, result_data) VALUES (?, ?, ?, ?, ?)",
+                ("lookalike", "visionary-1", "analyze", "COMPLETED", store.externalize({"$blob": "x"})),
+            )
+        assert client.get("/api/v1/jobs/lookalike/result").json() == {"$blob": "x"}
+        assert client.get("/api/v1/jobs/missing/result").status_code == 404
@@ -0,0 +1,144 @@
+"""
+Tests for per-agent resource accounting in the bridge.
+
+Run with: pytest tests/test_bridge_accounting.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.bridge.accounting import ResourceAccountant, current_agent_id
+
+
+def _burn(seconds: float) -> None:
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+class TestResourceAccountant:
+    """Test suite for ResourceAccountant."""
+
+    @pytest.mark.asyncio
+    async def test_run_attributes_agent_and_returns_result(self):
+        """The context variable names the agent inside the tool."""
+        accountant = ResourceAccountant()
+
+        async def tool():
+            return current_agent_id.get()
+
+        assert await accountant.run("osint-1", tool()) == "osint-1"
+        assert current_agent_id.get() == "system"
+
+    @pytest.mark.asyncio
+    async def test_interleaved_tasks_are_billed_separately(self):
+        """CPU burned by one agent is not charged to another awaiting I/O."""
+        accountant = ResourceAccountant()
+
+        async def busy():
+            _burn(0.05)
+
+        async def idle():
+            await asyncio.sleep(0.1)
+
+        await asyncio.gather(
+            accountant.run("busy", busy()), accountant.run("idle", idle())
+        )
+        accountant.sample()
+        usage = accountant.rolling()
+
+        assert usage["busy"]["cpu_seconds"] >= 0.04
+        assert usage["idle"]["cpu_seconds"] < 0.02
+        assert usage["idle"]["wall_seconds"] >= 0.09
+        assert usage["busy"]["tasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_freed_memory_is_never_negative(self):
+        """A step that frees more than it allocates costs zero."""
+        import tracemalloc
+
+        tracemalloc.start()
+        try:
+            accountant = ResourceAccountant(trace_memory=True)
+            garbage = [bytearray(1024) for _ in range(1000)]
+
+            async def frees():
+                garbage.clear()
+
+            await accountant.run("agent", frees())
+        finally:
+            tracemalloc.stop()
+        accountant.sample()
+        assert accountant.rolling()["agent"]["alloc_mb"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_failed_tool_is_still_accounted(self):
+        """Exceptions propagate and the task is counted."""
+        accountant = ResourceAccountant()
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await accountant.run("agent", broken())
+
+        accountant.sample()
+        assert accountant.rolling()["agent"]["tasks"] == 1
+
+    def test_window_drops_old_samples(self):
+        """Samples older than the window no longer contribute."""
+        accountant = ResourceAccountant(window_seconds=0.0)
+        accountant.sample()
+        accountant.sample()
+        assert len(accountant._window) <= 1
+        assert accountant.snapshot()["agents"] == {}
+
+
+class TestAgentMetricsEndpoint:
+    """Tool executions show up in /api/v1/agents/metrics."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        from fastapi.testclient import TestClient
+
+        import core.bridge.accounting as accounting
+        import core.database as database
+        import core.events.event_bus as event_bus
+        import core.jobs.signals as signals
+        import core.state.orchestrator as orchestrator
+        import core.state.versioning as versioning
+        from core.jobs.signals import JobSignals
+        from mcp_http_bridge import app
+
+        monkeypatch.setattr(database, "_db", database.Database(str(tmp_path / "bridge.db")))
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+        monkeypatch.setattr(versioning, "_tracker", None)
+        monkeypatch.setattr(signals, "_signals", JobSignals())
+        monkeypatch.setattr(orchestrator, "_orchestrator", None)
+        monkeypatch.setattr(accounting, "_accountant", ResourceAccountant(trace_memory=True))
+        return TestClient(app)
+
+    def test_tool_call_is_billed_to_the_calling_agent(self, client):
+        from core.bridge.accounting import get_resource_accountant
+
+        agent_id = client.post(
+            "/api/v1/agents/spawn", json={"type": "wargame_executor", "config": {}}
+        ).json()["agent_id"]
+        call = {"tool_name": "wargame_list_scenarios", "arguments": {}}
+        assert client.post("/mcp/tools/execute", json=call, headers={"X-Agent-Id": agent_id}).status_code == 200
+        # Untagged calls are not guessed from the tool's agent type
+        assert client.post("/mcp/tools/execute", json=call).status_code == 200
+        accountant = get_resource_accountant()
+        accountant.sample()
+        usage = accountant.rolling()
+        assert usage[agent_id]["tasks"] == 1
+        assert usage["system"]["tasks"] == 1
+
+        data = client.get("/api/v1/agents/metrics").json()
+        metrics = {agent["id"]: agent for agent in data["agents"]}[agent_id]
+        assert metrics["name"] == "Wargame Executor"
+        assert metrics["wallSeconds"] > 0
+        assert data["memoryTracking"] and metrics["memoryMB"] >= 0
+        assert "not metered" in data["metering"]["cpu"]
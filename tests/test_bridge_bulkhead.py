@@ -0,0 +1,116 @@
+"""
+Tests for per-tool bulkheads and load shedding.
+
+Run with: pytest tests/test_bridge_bulkhead.py -v
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.bridge.bulkhead as bulkhead_module
+from core.bridge.bulkhead import Bulkhead, BulkheadFull, BulkheadRegistry
+from core.bridge.models import ToolInfo
+
+
+class TestBulkhead:
+    """Test suite for Bulkhead."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        bulkhead = Bulkhead("tool", max_concurrency=2, max_queue=10)
+        running = 0
+        peak = 0
+
+        async def call():
+            nonlocal running, peak
+            permit = await bulkhead.acquire()
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            permit.release()
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak == 2
+        assert bulkhead.stats()["admitted"] == 6
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_shed(self):
+        bulkhead = Bulkhead("tool", max_concurrency=1, max_queue=1)
+        holder = await bulkhead.acquire()
+        waiter = asyncio.create_task(bulkhead.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadFull) as exc:
+            await bulkhead.acquire()
+        assert exc.value.retry_after >= 1.0
+        assert bulkhead.rejected == 1
+
+        holder.release()
+        permit = await waiter
+        assert permit.queue_wait > 0
+        permit.release()
+
+    @pytest.mark.asyncio
+    async def test_release_is_idempotent(self):
+        bulkhead = Bulkhead("tool", max_concurrency=1, max_queue=0)
+        permit = await bulkhead.acquire()
+        permit.release()
+        permit.release()
+        assert bulkhead.stats()["active"] == 0
+
+    def test_registry_uses_metadata_limits(self):
+        registry = BulkheadRegistry([
+            ToolInfo(
+                name="heavy",
+                agent="a",
+                category="c",
+                description="d",
+                parameters={},
+                max_concurrency=3,
+                max_queue=7,
+            )
+        ])
+        assert registry.get("heavy").max_concurrency == 3
+        assert registry.get("unknown").max_queue == ToolInfo.model_fields[
+            "max_queue"
+        ].default
+
+
+class TestAdmissionEndpoint:
+    """Test suite for admission control in /mcp/tools/execute."""
+
+    def test_overloaded_tool_returns_429(self, monkeypatch):
+        import mcp_http_bridge
+
+        registry = BulkheadRegistry([])
+        saturated = Bulkhead("ethical_validate", max_concurrency=1, max_queue=0)
+        asyncio.run(saturated.acquire())
+        registry._bulkheads["ethical_validate"] = saturated
+        monkeypatch.setattr(bulkhead_module, "_registry", registry)
+
+        response = TestClient(mcp_http_bridge.app).post(
+            "/mcp/tools/execute",
+            json={"tool_name": "ethical_validate", "arguments": {"action": "x"}},
+        )
+
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+
+    def test_queue_time_reported_separately(self, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(bulkhead_module, "_registry", BulkheadRegistry([]))
+        response = TestClient(mcp_http_bridge.app).post(
+            "/mcp/tools/execute",
+            json={
+                "tool_name": "ethical_validate",
+                "arguments": {"action": "test harmless action", "context": {}},
+            },
+        )
+
+        data = response.json()
+        assert data["queue_time_ms"] is not None
+        assert data["execution_time_ms"] is not None
@@ -0,0 +1,129 @@
+"""
+Tests for streaming tool execution over NDJSON/SSE.
+
+Run with: pytest tests/test_bridge_streaming.py -v
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import mcp_http_bridge
+import tools.mcp_ai_tools as mcp_ai_tools
+from core.deadline import DeadlineExceeded
+
+
+class _FakeCtx:
+    async def info(self, message: str) -> None:
+        pass
+
+
+class _FakeVertex:
+    async def stream_analysis(self, analysis_type, data):
+        for chunk in ["Risk: ", "high", "."]:
+            yield chunk
+
+
+async def _chunks(ctx, count: int = 3):
+    for i in range(count):
+        yield f"part-{i}"
+
+
+async def _fails(ctx):
+    yield "partial"
+    raise RuntimeError("upstream closed")
+
+
+async def _times_out(ctx):
+    yield "partial"
+    raise DeadlineExceeded("Deadline exceeded at vertex stream_analysis chunk")
+
+
+class TestStreamEndpoint:
+    """Test suite for /mcp/tools/stream."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        monkeypatch.setitem(mcp_http_bridge.TOOL_REGISTRY, "fake_stream", _chunks)
+        monkeypatch.setitem(mcp_http_bridge.STREAMING_REGISTRY, "fake_stream", _chunks)
+        monkeypatch.setitem(mcp_http_bridge.TOOL_REGISTRY, "fake_fail", _fails)
+        monkeypatch.setitem(mcp_http_bridge.STREAMING_REGISTRY, "fake_fail", _fails)
+        monkeypatch.setitem(mcp_http_bridge.TOOL_REGISTRY, "fake_timeout", _times_out)
+        monkeypatch.setitem(mcp_http_bridge.STREAMING_REGISTRY, "fake_timeout", _times_out)
+        self.client = TestClient(mcp_http_bridge.app)
+
+    def test_ndjson_chunks_then_done(self):
+        response = self.client.post(
+            "/mcp/tools/stream",
+            json={"tool_name": "fake_stream", "arguments": {"count": 2}},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [f["type"] for f in frames] == ["chunk", "chunk", "done"]
+        assert [f["data"] for f in frames[:2]] == ["part-0", "part-1"]
+        assert "execution_time_ms" in frames[-1]
+
+    def test_sse_framing(self):
+        response = self.client.post(
+            "/mcp/tools/stream",
+            json={"tool_name": "fake_stream", "arguments": {"count": 1}},
+            headers={"Accept": "text/event-stream"},
+        )
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith('event: chunk\ndata: {"type":"chunk"')
+        assert "event: done" in response.text
+
+    def test_non_streaming_tool_emits_single_result(self):
+        response = self.client.post(
+            "/mcp/tools/stream",
+            json={
+                "tool_name": "ethical_validate",
+                "arguments": {"action": "test harmless action", "context": {}},
+            },
+        )
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [f["type"] for f in frames] == ["result", "done"]
+        assert "is_approved" in frames[0]["data"]
+
+    def test_error_after_partial_output(self):
+        response = self.client.post(
+            "/mcp/tools/stream", json={"tool_name": "fake_fail", "arguments": {}}
+        )
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [f["type"] for f in frames] == ["chunk", "error"]
+        assert "upstream closed" in frames[-1]["error"]
+
+    def test_deadline_emits_timeout_frame(self):
+        response = self.client.post(
+            "/mcp/tools/stream", json={"tool_name": "fake_timeout", "arguments": {}}
+        )
+        frames = [json.loads(line) for line in response.text.splitlines()]
+        assert [f["type"] for f in frames] == ["chunk", "timeout"]
+
+    def test_unknown_tool_is_404(self):
+        response = self.client.post(
+            "/mcp/tools/stream", json={"tool_name": "nope", "arguments": {}}
+        )
+        assert response.status_code == 404
+
+
+class TestAIStreamAnalysis:
+    """ai_stream_analysis aggregates the same chunks the stream endpoint yields."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_full_response_match(self, monkeypatch):
+        monkeypatch.setattr(mcp_ai_tools, "get_vertex_ai", lambda: _FakeVertex())
+
+        chunks = [
+            c
+            async for c in mcp_ai_tools.ai_stream_analysis_chunks(
+                _FakeCtx(), "threat", {}
+            )
+        ]
+        full = await mcp_ai_tools.ai_stream_analysis(_FakeCtx(), "threat", {})
+
+        assert chunks == ["Risk: ", "high", "."]
+        assert full == "Risk: high."
@@ -0,0 +1,117 @@
+"""
+Tests for bulk agent spawn and lifecycle control.
+
+Run with: pytest tests/test_bulk_agents.py -v
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.orchestrator as orchestrator_module
+import core.state.versioning as versioning
+from core.jobs.signals import JobSignals
+from core.serialization import loads
+from core.state.orchestrator import AgentOrchestrator
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "bulk.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    monkeypatch.setattr(orchestrator_module, "_orchestrator", None)
+    return instance
+
+
+async def events(db, event_type):
+    rows = await db.fetch_all("SELECT payload FROM events WHERE event_type = ? ORDER BY rowid", (event_type,))
+    return [loads(row["payload"]) for row in rows]
+
+
+class TestBulkAgents:
+    """Test suite for the orchestrator fleet operations."""
+
+    @pytest.mark.asyncio
+    async def test_spawn_is_one_transaction_and_one_event(self, db):
+        orchestrator = AgentOrchestrator()
+        agent_ids = await orchestrator.spawn_agents([{"type": "osint_hunter", "config": {"n": 1}}] * 200)
+
+        assert len(set(agent_ids)) == 200
+        assert (await db.fetch_one("SELECT COUNT(*) AS n FROM agents"))["n"] == 200
+        spawned = await events(db, "agent.lifecycle.spawned")
+        assert len(spawned) == 1
+        assert spawned[0]["count"] == 200 and spawned[0]["types"] == ["osint_hunter"]
+
+        # Rows in the registry match what a restarted process reads back
+        stored = await db.fetch_one("SELECT * FROM agents WHERE agent_id = ?", (agent_ids[0],))
+        assert (await orchestrator.get_agent_state(agent_ids[0]))["agent"] == stored
+
+    @pytest.mark.asyncio
+    async def test_batch_bumps_the_version_once(self, db):
+        orchestrator = AgentOrchestrator()
+        mark = orchestrator.versions.version
+        agent_ids = await orchestrator.spawn_agents([{"type": "osint_hunter"}] * 50)
+        assert orchestrator.versions.version == mark + 1
+
+        await orchestrator.terminate_agents(agent_ids)
+        assert orchestrator.versions.version == mark + 2
+        assert sorted(orchestrator.versions.changed_since(mark + 1)[0]) == sorted(agent_ids)
+
+    @pytest.mark.asyncio
+    async def test_invalid_spec_rolls_back_the_batch(self, db):
+        orchestrator = AgentOrchestrator()
+        with pytest.raises(ValueError):
+            await orchestrator.spawn_agents([{"type": "osint_hunter"}, {"config": {}}])
+        assert (await db.fetch_one("SELECT COUNT(*) AS n FROM agents"))["n"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_batches_move_agents_and_jobs(self, db):
+        orchestrator = AgentOrchestrator()
+        agent_ids = await orchestrator.spawn_agents([{"type": "osint_hunter"}] * 3, per_agent_events=True)
+        assert len(await events(db, "agent.lifecycle.spawned")) == 4
+        job_ids = [await orchestrator.start_job(agent_id, "investigate", {}) for agent_id in agent_ids]
+        await orchestrator.job_manager.set_status_many(job_ids, "RUNNING")
+
+        paused = await orchestrator.pause_agents(agent_ids + ["missing"])
+        assert paused == agent_ids
+        rows = await db.fetch_all("SELECT status FROM jobs")
+        assert {r["status"] for r in rows} == {"PAUSED"}
+        assert (await events(db, "job.paused"))[0]["job_ids"] == job_ids
+        assert (await events(db, "agent.lifecycle.paused"))[0]["agent_ids"] == agent_ids
+
+        await orchestrator.resume_agents(agent_ids[:2])
+        states = {r["agent_id"]: r["state"] for r in await db.fetch_all("SELECT agent_id, state FROM agents")}
+        assert [states[a] for a in agent_ids] == ["RUNNING", "RUNNING", "PAUSED"]
+        assert orchestrator.job_manager.signals.get(job_ids[0]).status == "RUNNING"
+
+        assert await orchestrator.terminate_agents(agent_ids) == agent_ids
+        rows = await db.fetch_all("SELECT status FROM jobs")
+        assert {r["status"] for r in rows} == {"CANCELLED"}
+        assert len(await events(db, "agent.lifecycle.terminated")) == 1
+        for agent_id in agent_ids:
+            assert (await orchestrator.get_agent_state(agent_id))["active_job"] is None
+
+    def test_bridge_bulk_endpoints(self, db, monkeypatch):
+        import mcp_http_bridge
+
+        client = TestClient(mcp_http_bridge.app)
+        spawned = client.post("/api/v1/agents/spawn/bulk", json={"type": "osint_hunter", "count": 3}).json()
+        assert spawned["count"] == 3
+
+        response = client.post(
+            "/api/v1/agents/control/bulk", json={"action": "TERMINATE", "agent_ids": spawned["agent_ids"]}
+        )
+        assert response.json()["count"] == 3
+        state = client.get(f"/api/v1/agents/{spawned['agent_ids'][0]}").json()
+        assert state["agent"]["state"] == "TERMINATED"
+
+        assert client.post("/api/v1/agents/control/bulk", json={"action": "NOPE"}).status_code == 400
+        assert client.post("/api/v1/agents/spawn/bulk", json={"agents": [{"config": {}}]}).status_code == 400
+        monkeypatch.setattr(mcp_http_bridge.get_settings().bridge, "max_bulk_agents", 2)
+        too_many = client.post("/api/v1/agents/spawn/bulk", json={"type": "osint_hunter", "count": 3})
+        assert too_many.status_code == 400
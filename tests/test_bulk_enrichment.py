@@ -0,0 +1,172 @@
+"""
+Tests for the bulk IOC enrichment pipeline.
+
+Run with: pytest tests/test_bulk_enrichment.py -v
+"""
+
+import asyncio
+
+import pytest
+
+import core.database as database
+import tools.providers.cache as cache_module
+import tools.providers.cached as cached_module
+from core.deadline import deadline
+from core.rate_limiter import RateLimiter
+from core.settings import get_settings
+from core.singleflight import SingleFlight
+from tools.enrichment import BulkEnricher, Lane, classify_indicator
+from tools.providers.base import BaseProvider
+from tools.providers.cache import RedisBackend, SQLiteBackend, get_cache
+from tools.providers.cached import CachedProvider
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "enrich.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(SQLiteBackend, "CACHE_FILE", tmp_path / "cache.db")
+    monkeypatch.setattr(RedisBackend, "_try_connect", lambda self: False)
+    monkeypatch.setattr(cache_module, "_cache", None)
+    monkeypatch.setattr(cached_module, "_stats", {})
+    monkeypatch.setattr(cached_module, "_refreshing", {})
+    monkeypatch.setattr(cached_module, "_flights", SingleFlight())
+    return instance
+
+
+class _Upstream(BaseProvider[dict]):
+    """Fake real provider caching its answers under ``prefix:type:value``."""
+
+    def __init__(self, name, delay=0.0, limiter=None):
+        self.name = name
+        self.delay = delay
+        self.limiter = limiter
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, value, type="ip", **kwargs):
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        self.calls.append(value)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        answer = {"source": self.name, "value": value}
+        get_cache().store(self.name, f"{self.name}:{type}:{value}", answer)
+        return answer
+
+
+def lane(upstream, types=None, workers=1, limiter=None):
+    provider = CachedProvider(
+        upstream.name, upstream, key=lambda value, type="ip", **_: f"{upstream.name}:{type}:{value}"
+    )
+    return Lane(upstream.name, provider, types or {"ip": "ip", "domain": "domain"}, workers, limiter)
+
+
+async def collect(enricher, indicators, run_id=None):
+    return [frame async for frame in enricher.run(indicators, run_id=run_id)]
+
+
+class TestBulkEnricher:
+    """Test suite for BulkEnricher."""
+
+    @pytest.mark.asyncio
+    async def test_dedup_cache_first_and_one_result_per_provider(self, db):
+        otx, vt = _Upstream("otx"), _Upstream("vt")
+        get_cache().store("vt", "vt:ip:1.1.1.1", {"cached": True})
+        feed = ["1.1.1.1", "example.com", "1.1.1.1", "d41d8cd98f00b204e9800998ecf8427e"]
+
+        frames = await collect(BulkEnricher([lane(otx), lane(vt)]), feed)
+        summary = frames.pop()
+        by_key = {(f["indicator"], f["provider"]): f for f in frames}
+
+        assert by_key[("1.1.1.1", "vt")]["status"] == "hit"
+        assert by_key[("1.1.1.1", "otx")]["status"] == "fetched"
+        assert by_key[("d41d8cd98f00b204e9800998ecf8427e", None)]["status"] == "unsupported"
+        assert sorted(otx.calls) == ["1.1.1.1", "example.com"] and vt.calls == ["example.com"]
+        assert summary["complete"] and summary["cursor"] == 4
+        assert summary["stats"]["duplicates"] == 1 and summary["stats"]["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_is_not_served(self, db, monkeypatch):
+        monkeypatch.setattr(get_settings().provider_cache, "enabled", False)
+        vt = _Upstream("vt")
+        get_cache().store("vt", "vt:ip:1.1.1.1", {"cached": True})
+
+        frames = await collect(BulkEnricher([lane(vt)]), ["1.1.1.1"])
+        assert frames[0]["status"] == "fetched" and vt.calls == ["1.1.1.1"]
+
+    @pytest.mark.asyncio
+    async def test_dedup_memory_is_bounded(self, db, monkeypatch):
+        monkeypatch.setattr(get_settings().enrichment, "dedup_window", 2)
+        otx = _Upstream("otx")
+        feed = ["10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3", "10.0.0.2"]
+
+        frames = await collect(BulkEnricher([lane(otx)]), feed)
+        # 10.0.0.2 fell out of the window, so its repetition is enriched again
+        assert frames[-1]["stats"]["duplicates"] == 1
+        assert sorted(f["position"] for f in frames[:-1]) == [0, 1, 3, 4]
+        assert frames[-1]["complete"] and frames[-1]["cursor"] == 5
+
+    @pytest.mark.asyncio
+    async def test_async_stream_with_bounded_window(self, db, monkeypatch):
+        monkeypatch.setattr(get_settings().enrichment, "window", 4)
+        otx = _Upstream("otx", delay=0.001)
+
+        async def feed():
+            for i in range(50):
+                yield f"10.0.0.{i}"
+
+        frames = await collect(BulkEnricher([lane(otx, workers=8)]), feed())
+
+        assert len(otx.calls) == 50 and frames[-1]["cursor"] == 50
+        # Only `window` indicators are between the feed and the consumer
+        assert otx.max_active <= 4
+
+    @pytest.mark.asyncio
+    async def test_daily_quota_past_deadline_is_reported_not_awaited(self, db):
+        limiter = RateLimiter(requests_per_second=1000, burst=10, limits={"day": 2})
+        vt = _Upstream("vt", limiter=limiter)
+        with deadline(5):
+            frames = await collect(
+                BulkEnricher([lane(vt, limiter=limiter)]), [f"10.0.0.{i}" for i in range(5)]
+            )
+        statuses = [f["status"] for f in frames[:-1]]
+        assert statuses.count("fetched") == 2 and statuses.count("quota_exhausted") == 3
+        assert frames[-1]["complete"] and frames[-1]["rate_limits"]["vt"]["day"] > 3600
+
+    @pytest.mark.asyncio
+    async def test_deadline_stops_and_run_resumes_from_cursor(self, db, monkeypatch):
+        monkeypatch.setattr(get_settings().enrichment, "checkpoint_every", 1)
+        feed = [f"10.0.1.{i}" for i in range(6)]
+        slow = _Upstream("otx", delay=0.04)
+
+        with deadline(0.1):
+            first = await collect(BulkEnricher([lane(slow)]), feed, run_id="run-1")
+        summary = first[-1]
+        assert not summary["complete"] and 0 < summary["cursor"] < 6
+
+        cursor = await BulkEnricher([lane(slow)]).load_cursor("run-1")
+        assert cursor["position"] == summary["cursor"]
+
+        resumed = await collect(BulkEnricher([lane(_Upstream("otx"))]), feed, run_id="run-1")
+        assert resumed[-1]["complete"] and resumed[-1]["cursor"] == 6
+        delivered = {f["indicator"] for f in first[:-1] + resumed[:-1]}
+        assert delivered == set(feed)
+        assert all(f["position"] >= summary["cursor"] for f in resumed[:-1])
+
+
+def test_classify_indicator():
+    assert classify_indicator("8.8.8.8") == "ip"
+    assert classify_indicator("2001:db8::1") == "ip"
+    assert classify_indicator("https://evil.example/x") == "url"
+    assert classify_indicator("a" * 64) == "sha256"
+    assert classify_indicator("user@example.com") == "email"
+    assert classify_indicator("evil.example") == "domain"
@@ -34,8 +34,8 @@ async def test_cybersec_recon_web_analysis():
         with patch.object(agent, "_scan_ports", new_callable=AsyncMock) as mock_scan:
             mock_scan.return_value = []
 
-            # Mock _analyze_web logic by mocking httpx
-            with patch("httpx.AsyncClient") as mock_client:
+            # Mock _analyze_web logic by mocking the shared HTTP client
+            with patch("tools.cybersec_basic.get_http_clients") as mock_clients:
                 mock_response = MagicMock()
                 mock_response.headers = {
                     "Server": "Apache",
@@ -43,9 +43,8 @@ async def test_cybersec_recon_web_analysis():
                     # Missing security headers
                 }
 
-                # Setup async context manager mock
-                mock_instance = mock_client.return_value
-                mock_instance.__aenter__.return_value.get.return_value = mock_response
+                mock_client = mock_clients.return_value.get.return_value
+                mock_client.get = AsyncMock(return_value=mock_response)
 
                 result = await agent.run_recon(
                     "example.com", scan_ports=False, scan_web=True
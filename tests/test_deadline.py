@@ -0,0 +1,223 @@
+"""
+Tests for request deadlines and cooperative cancellation.
+
+Run with: pytest tests/test_deadline.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import core.bridge.bulkhead as bulkhead_module
+import core.database as database
+from core.bridge.bulkhead import Bulkhead, BulkheadRegistry
+from core.deadline import DeadlineExceeded, budget, check, deadline, remaining
+from core.rate_limiter import RateLimiter, SharedRateLimiter
+from tools.providers.base import BaseProvider
+
+
+class TestDeadline:
+    """Test suite for the deadline context variable."""
+
+    def test_nested_deadlines_keep_the_earliest(self):
+        assert remaining() is None
+        with deadline(10):
+            with deadline(60):
+                assert 9 < remaining() <= 10
+            with deadline(1):
+                assert remaining() <= 1
+                assert budget(15.0) <= 1
+            assert budget(5.0) == 5.0
+        assert remaining() is None
+
+    def test_check_raises_once_expired(self):
+        with deadline(0):
+            with pytest.raises(DeadlineExceeded):
+                check("provider")
+        check("provider")  # no deadline: never raises
+
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_the_deadline(self):
+        async def child():
+            return remaining()
+
+        with deadline(5):
+            left = await asyncio.create_task(child())
+        assert 0 < left <= 5
+
+
+class TestRateLimiterDeadline:
+    """Rate-limiter waits that would outlive the caller fail fast."""
+
+    @pytest.mark.asyncio
+    async def test_local_limiter_fails_instead_of_sleeping(self):
+        limiter = RateLimiter(requests_per_second=1)
+        await limiter.acquire()
+        started = time.monotonic()
+        with deadline(0.2), pytest.raises(DeadlineExceeded):
+            await limiter.acquire()
+        assert time.monotonic() - started < 0.1
+
+    @pytest.mark.asyncio
+    async def test_shared_limiter_does_not_burn_a_slot(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(database, "_db", database.Database(str(tmp_path / "rl.db")))
+        limiter = SharedRateLimiter("vt-test", requests_per_second=1)
+        await limiter.acquire()
+        tokens = lambda: database.get_db().get_connection().execute(  # noqa: E731
+            "SELECT tokens FROM rate_limit_buckets WHERE service = 'vt-test'"
+        ).fetchone()[0]
+        before = tokens()
+
+        with deadline(0.2), pytest.raises(DeadlineExceeded):
+            await limiter.acquire()
+        assert tokens() == before
+
+
+class _Failing(BaseProvider[str]):
+    name = "real"
+
+    def __init__(self, error, fallback=None):
+        self.error = error
+        self.fallback = fallback
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    async def execute(self, *args, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+class _Cache(BaseProvider[str]):
+    name = "cache"
+    needs_network = False
+
+    def is_available(self):
+        return True
+
+    async def execute(self, *args, **kwargs):
+        return "cached"
+
+
+class TestProviderChainDeadline:
+    """Provider chains stop once the deadline passed."""
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_stops_before_any_network_provider(self):
+        real = _Failing(RuntimeError("x"), fallback=_Failing(RuntimeError("y")))
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            await real.execute_with_fallback("ioc")
+        assert real.calls == 0 and real.fallback.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_still_reads_the_cache(self):
+        real = _Failing(RuntimeError("x"), fallback=_Cache())
+        with deadline(0):
+            assert await real.execute_with_fallback("ioc") == "cached"
+        assert real.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_deadline_hit_in_provider_falls_back_to_cache(self):
+        real = _Failing(DeadlineExceeded("rate limit wait"), fallback=_Cache())
+        with deadline(5):
+            assert await real.execute_with_fallback("ioc") == "cached"
+
+        alone = _Failing(DeadlineExceeded("rate limit wait"))
+        with pytest.raises(DeadlineExceeded):
+            await alone.execute_with_fallback("ioc")
+
+
+class TestBridgeDeadline:
+    """The bridge enforces the deadline and cancels abandoned calls."""
+
+    def test_timeout_header_cancels_slow_tool(self, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(bulkhead_module, "_registry", BulkheadRegistry([]))
+        cancelled = []
+
+        async def slow_tool(ctx, **kwargs):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        monkeypatch.setitem(mcp_http_bridge.TOOL_REGISTRY, "slow_tool", slow_tool)
+        client = TestClient(mcp_http_bridge.app)
+        started = time.monotonic()
+        response = client.post(
+            "/mcp/tools/execute",
+            json={"tool_name": "slow_tool", "arguments": {}},
+            headers={"X-Request-Timeout": "0.2"},
+        )
+        assert response.status_code == 504
+        assert response.json()["success"] is False
+        assert time.monotonic() - started < 2
+        assert cancelled == [True]
+
+        bad = client.post(
+            "/mcp/tools/execute",
+            json={"tool_name": "slow_tool", "arguments": {}},
+            headers={"X-Request-Timeout": "soon"},
+        )
+        assert bad.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_the_call(self, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(mcp_http_bridge.get_settings().bridge, "disconnect_poll_interval", 0.01)
+        cancelled = asyncio.Event()
+
+        class GoneRequest:
+            calls = 0
+
+            async def is_disconnected(self):
+                self.calls += 1
+                return self.calls > 2
+
+        async def work():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(mcp_http_bridge.ClientDisconnected):
+            await mcp_http_bridge._cancel_on_disconnect(GoneRequest(), work())
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_bulkhead_wait_is_bounded(self, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(mcp_http_bridge.get_settings().bridge, "disconnect_poll_interval", 0.01)
+        registry = BulkheadRegistry([])
+        registry._bulkheads["busy"] = bulkhead = Bulkhead("busy", 1, 10)
+        monkeypatch.setattr(bulkhead_module, "_registry", registry)
+
+        class Request:
+            def __init__(self, gone):
+                self.gone = gone
+
+            async def is_disconnected(self):
+                return self.gone
+
+        holder = await bulkhead.acquire()
+        with deadline(0.05), pytest.raises(HTTPException) as timed_out:
+            await mcp_http_bridge._admit("busy", Request(gone=False))
+        assert timed_out.value.status_code == 504
+
+        with deadline(5), pytest.raises(HTTPException) as gone:
+            await mcp_http_bridge._admit("busy", Request(gone=True))
+        assert gone.value.status_code == 499
+
+        assert bulkhead.stats()["queued"] == 0
+        holder.release()
+        with deadline(1):
+            (await mcp_http_bridge._admit("busy", Request(gone=False))).release()
@@ -0,0 +1,86 @@
+"""
+Tests for the shared pooled HTTP clients.
+
+Run with: pytest tests/test_http_clients.py -v
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.http_clients as http_clients
+from core.http_clients import HTTPClientRegistry
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTTPClientRegistry:
+    """Test suite for HTTPClientRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_one_connection(self, upstream):
+        registry = HTTPClientRegistry()
+        for _ in range(5):
+            response = await registry.get("otx").get(f"{upstream}/x", timeout=2.0)
+            assert response.json() == {"ok": True}
+
+        stats = registry.stats()["upstreams"]["otx"]
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["reused"] == 4 and stats["tls_handshakes"] == 0
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_one_client_per_upstream_until_closed(self):
+        registry = HTTPClientRegistry()
+        client = registry.get("virustotal")
+        assert registry.get("virustotal") is client
+        assert registry.get("hibp") is not client
+        assert registry.get("virustotal", verify=False) is not client
+
+        await registry.aclose()
+        assert client.is_closed
+        assert registry.stats()["open_clients"] == 0
+        assert registry.get("virustotal") is not client
+
+    def test_new_event_loop_gets_a_new_client(self):
+        registry = HTTPClientRegistry()
+
+        async def borrow():
+            return registry.get("otx")
+
+        first = asyncio.run(borrow())
+        assert asyncio.run(borrow()) is not first
+
+    def test_bridge_exposes_stats(self, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(http_clients, "_registry", HTTPClientRegistry())
+        body = TestClient(mcp_http_bridge.app).get("/api/v1/http/clients").json()
+        assert body["upstreams"] == {} and "http2" in body
@@ -0,0 +1,174 @@
+"""
+Tests for incremental, throttled job checkpoints.
+
+Run with: pytest tests/test_incremental_checkpoints.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.state.versioning as versioning
+from core.jobs.checkpoint import CheckpointCorruptedError, CheckpointData, CheckpointManager, CheckpointSaveFailed
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "ckpt.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    return instance
+
+
+@pytest.fixture
+def job_id(db):
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO jobs (job_id, agent_id, job_type, status) VALUES ('job-1', 'osint-1', 'investigate', 'RUNNING')"
+        )
+    return "job-1"
+
+
+def manager(min_interval=0.0, compact_every=20):
+    instance = CheckpointManager()
+    instance.min_interval = min_interval
+    instance.compact_every = compact_every
+    return instance
+
+
+async def chain(db, job_id):
+    return await db.fetch_all(
+        "SELECT seq, kind, codec, length(data) AS size FROM job_checkpoints WHERE job_id = ? ORDER BY seq",
+        (job_id,),
+    )
+
+
+class TestIncrementalCheckpoints:
+    """Test suite for CheckpointManager."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_only_carry_changed_keys(self, db, job_id):
+        checkpoints = manager()
+        results = {f"finding-{i}": "x" * 500 for i in range(50)}
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=1, accumulated_results=results))
+
+        results = {**results, "finding-new": "y"}
+        del results["finding-0"]
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=2, accumulated_results=results))
+
+        base, delta = await chain(db, job_id)
+        assert (base["kind"], base["codec"]) == ("base", "zlib")
+        assert delta["kind"] == "delta" and delta["size"] < 200
+
+        loaded = await manager().load_checkpoint(job_id)
+        assert loaded.step_index == 2
+        assert loaded.accumulated_results == results
+
+        row = await db.fetch_one("SELECT progress, checkpoint_data FROM jobs WHERE job_id = ?", (job_id,))
+        assert row["progress"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_save_writes_nothing(self, db, job_id):
+        checkpoints = manager()
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=1))
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=1))
+        assert len(await chain(db, job_id)) == 1
+        assert checkpoints.stats()["unchanged"] == 1
+
+    @pytest.mark.asyncio
+    async def test_compaction_replaces_the_chain(self, db, job_id):
+        checkpoints = manager(compact_every=3)
+        results = {"report": "r" * 400}
+        for step in range(1, 7):
+            results = {**results, f"k{step}": step}
+            await checkpoints.save_checkpoint(
+                job_id, CheckpointData(step_index=step, accumulated_results=results)
+            )
+
+        rows = await chain(db, job_id)
+        # base, 3 deltas, then a fresh base at step 5 followed by one delta
+        assert [r["kind"] for r in rows] == ["base", "delta"]
+        loaded = await manager().load_checkpoint(job_id)
+        assert loaded.accumulated_results == results
+
+    @pytest.mark.asyncio
+    async def test_deltas_outweighing_the_base_trigger_compaction(self, db, job_id):
+        checkpoints = manager()
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=1))
+        await checkpoints.save_checkpoint(
+            job_id, CheckpointData(step_index=2, accumulated_results={"big": "z" * 300})
+        )
+        await checkpoints.save_checkpoint(
+            job_id, CheckpointData(step_index=3, accumulated_results={"big": "z" * 300})
+        )
+        assert [r["kind"] for r in await chain(db, job_id)] == ["base"]
+
+    @pytest.mark.asyncio
+    async def test_rapid_saves_are_coalesced(self, db, job_id):
+        checkpoints = manager(min_interval=0.05)
+        for step in range(1, 11):
+            await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=step))
+
+        # First save written, the rest collapse into one pending save
+        assert len(await chain(db, job_id)) == 1
+        assert (await checkpoints.load_checkpoint(job_id)).step_index == 10
+
+        await asyncio.sleep(0.1)
+        assert len(await chain(db, job_id)) == 2
+        assert (await manager().load_checkpoint(job_id)).step_index == 10
+        assert checkpoints.stats()["coalesced"] == 8
+
+    @pytest.mark.asyncio
+    async def test_flush_and_force(self, db, job_id):
+        checkpoints = manager(min_interval=60)
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=1))
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=2))
+        await checkpoints.flush()
+        await checkpoints.save_checkpoint(job_id, CheckpointData(step_index=3), force=True)
+        assert len(await chain(db, job_id)) == 3
+
+    @pytest.mark.asyncio
+    async def test_new_process_continues_the_stored_chain(self, db, job_id):
+        await manager().save_checkpoint(job_id, CheckpointData(step_index=1, accumulated_results={"a": 1}))
+        # e.g. after a restart: a fresh manager appends a base after seq 1
+        await manager().save_checkpoint(job_id, CheckpointData(step_index=2, accumulated_results={"a": 1, "b": 2}))
+        assert [r["seq"] for r in await chain(db, job_id)] == [2]
+
+    @pytest.mark.asyncio
+    async def test_interleaved_writers_rebase_instead_of_colliding(self, db, job_id):
+        old_owner, new_owner = manager(), manager()
+        await old_owner.save_checkpoint(job_id, CheckpointData(step_index=1, accumulated_results={"a": 1}))
+        await new_owner.save_checkpoint(job_id, CheckpointData(step_index=2, accumulated_results={"b": 2}))
+        await old_owner.save_checkpoint(job_id, CheckpointData(step_index=3, accumulated_results={"a": 3}))
+        await new_owner.save_checkpoint(job_id, CheckpointData(step_index=4, accumulated_results={"b": 4}))
+
+        assert [row["kind"] for row in await chain(db, job_id)] == ["base"]
+        assert (old_owner.stats()["rebased"], new_owner.stats()["rebased"]) == (1, 1)
+        loaded = await manager().load_checkpoint(job_id)
+        assert loaded.step_index == 4 and loaded.accumulated_results == {"b": 4}
+
+    @pytest.mark.asyncio
+    async def test_errors(self, db, job_id):
+        with pytest.raises(CheckpointSaveFailed):
+            await manager().save_checkpoint("missing", CheckpointData())
+
+        await db.execute(
+            "INSERT INTO job_checkpoints (job_id, seq, kind, codec, data) VALUES (?, 1, 'base', 'zlib', ?)",
+            (job_id, b"not zlib"),
+        )
+        with pytest.raises(CheckpointCorruptedError):
+            await manager().load_checkpoint(job_id)
+
+    @pytest.mark.asyncio
+    async def test_legacy_inline_checkpoint_still_loads(self, db, job_id):
+        legacy = {"version": "v1", "data": {"step_index": 4, "accumulated_results": {"a": 1}}}
+        await db.execute(
+            "UPDATE jobs SET checkpoint_data = ? WHERE job_id = ?", (json.dumps(legacy), job_id)
+        )
+        loaded = await manager().load_checkpoint(job_id)
+        assert loaded.step_index == 4
+        assert await manager().load_checkpoint("missing") is None
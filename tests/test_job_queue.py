@@ -0,0 +1,163 @@
+"""
+Tests for the SQLite leased job queue.
+
+Run with: pytest tests/test_job_queue.py -v
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+from core.jobs.queue import JobQueue, QueueWorker
+from core.jobs.signals import JobSignals
+from core.state.orchestrator import AgentOrchestrator
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "queue.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+def seed(db, count, job_type="scan", priority="normal", status="PENDING"):
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO agents (agent_id, agent_type, state, config) VALUES ('a-1', 'osint_hunter', 'RUNNING', '{}')"
+        )
+        for i in range(count):
+            conn.execute(
+                "INSERT INTO jobs (job_id, agent_id, job_type, status, priority, params) VALUES (?, 'a-1', ?, ?, ?, '{}')",
+                (f"{job_type}-{priority}-{i}", job_type, status, priority),
+            )
+
+
+class TestJobQueue:
+    """Test suite for JobQueue."""
+
+    def test_concurrent_claims_never_overlap(self, db):
+        seed(db, 40)
+
+        def claim_all(worker_id):
+            async def run():
+                queue = JobQueue()
+                claimed = []
+                while batch := await queue.claim(worker_id, 3, ["scan"]):
+                    claimed += [row["job_id"] for row in batch]
+                return claimed
+
+            return asyncio.run(run())
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(claim_all, ["w1", "w2", "w3", "w4"]))
+        claimed = [job_id for result in results for job_id in result]
+        assert len(claimed) == len(set(claimed)) == 40
+
+    @pytest.mark.asyncio
+    async def test_claim_order_and_filter(self, db):
+        seed(db, 2, priority="background")
+        seed(db, 1, priority="incident")
+        seed(db, 2, job_type="manual")
+
+        batch = await JobQueue().claim("w1", 2, ["scan"])
+        assert [row["job_id"] for row in batch] == ["scan-incident-0", "scan-background-0"]
+        assert batch[0]["agent_type"] == "osint_hunter" and batch[0]["attempts"] == 1
+        row = await db.fetch_one("SELECT status, lease_owner FROM jobs WHERE job_id = 'scan-incident-0'")
+        assert (row["status"], row["lease_owner"]) == ("RUNNING", "w1")
+
+    @pytest.mark.asyncio
+    async def test_expired_leases_are_reclaimed_then_failed(self, db):
+        seed(db, 1)
+        expired = JobQueue(lease_seconds=-1, max_attempts=2)
+
+        await expired.claim("w1", 1, ["scan"])
+        assert await expired.reclaim_expired() == {"reclaimed": 1, "failed": 0}
+        assert signals.get_job_signals().get("scan-normal-0").status == "PENDING"
+        assert await expired.heartbeat("w1", ["scan-normal-0"]) == []
+
+        await expired.claim("w2", 1, ["scan"])
+        assert await expired.reclaim_expired() == {"reclaimed": 0, "failed": 1}
+        row = await db.fetch_one("SELECT status, error_message FROM jobs")
+        assert row["status"] == "FAILED" and "2 attempts" in row["error_message"]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_renews_only_owned_leases(self, db):
+        seed(db, 2)
+        queue = JobQueue()
+        await queue.claim("w1", 1, ["scan"])
+        await queue.claim("w2", 1, ["scan"])
+        assert await queue.heartbeat("w1", ["scan-normal-0", "scan-normal-1"]) == ["scan-normal-0"]
+
+        assert await queue.release("w1", ["scan-normal-0"]) == 1
+        row = await db.fetch_one("SELECT status, lease_owner, attempts FROM jobs WHERE job_id = 'scan-normal-0'")
+        assert (row["status"], row["lease_owner"], row["attempts"]) == ("PENDING", None, 0)
+
+
+class TestQueueWorker:
+    """Workers claim into their scheduler and keep leases alive."""
+
+    @pytest.mark.asyncio
+    async def test_two_workers_run_every_job_once(self, db):
+        runs = []
+
+        async def handler(job_id, agent_id, params, checkpoint=None):
+            runs.append(job_id)
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+
+        workers = []
+        for name in ("w1", "w2"):
+            orchestrator = AgentOrchestrator()
+            orchestrator.scheduler.max_workers = 2
+            orchestrator.register_job_handler("scan", handler)
+            worker = QueueWorker(orchestrator, worker_id=name, claim_batch=2, poll_interval=0.01)
+            orchestrator.queue_worker = worker
+            workers.append(worker)
+
+        agent_id = await workers[0].orchestrator.spawn_agent("osint_hunter", {})
+        job_ids = [await workers[0].orchestrator.start_job(agent_id, "scan", {}) for _ in range(8)]
+        for worker in workers:
+            await worker.start()
+
+        for _ in range(200):
+            rows = await db.fetch_all("SELECT status FROM jobs")
+            if {r["status"] for r in rows} == {"COMPLETED"}:
+                break
+            await asyncio.sleep(0.01)
+        for worker in workers:
+            await worker.stop()
+
+        assert sorted(runs) == sorted(job_ids)
+        assert sum(w.counters["claimed"] for w in workers) == 8
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_is_abandoned_without_status_write(self, db):
+        seed(db, 1)
+        started = asyncio.Event()
+
+        async def handler(job_id, agent_id, params, checkpoint=None):
+            started.set()
+            await asyncio.sleep(10)
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.register_job_handler("scan", handler)
+        worker = QueueWorker(orchestrator, worker_id="w1", heartbeat_interval=0)
+        assert await worker.tick() == 1
+        await asyncio.wait_for(started.wait(), timeout=1)
+
+        # Another worker took the job over after our lease expired
+        await db.execute("UPDATE jobs SET lease_owner = 'w2'")
+        await worker.tick()
+        await asyncio.sleep(0.01)
+
+        assert worker.counters["lost"] == 1 and worker.stats()["owned"] == 0
+        row = await db.fetch_one("SELECT status, lease_owner FROM jobs")
+        assert (row["status"], row["lease_owner"]) == ("RUNNING", "w2")
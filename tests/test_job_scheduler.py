@@ -0,0 +1,261 @@
+"""
+Tests for the priority / fair-share job scheduler.
+
+Run with: pytest tests/test_job_scheduler.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+from core.jobs.scheduler import JobScheduler
+from core.jobs.signals import JobSignals
+from core.state.orchestrator import AgentOrchestrator
+
+
+@pytest.fixture(autouse=True)
+def isolated_signals(monkeypatch):
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+
+
+def recorder(order, name, gate=None):
+    async def run():
+        order.append(name)
+        if gate is not None:
+            await gate.wait()
+        return name
+
+    return run
+
+
+class TestJobScheduler:
+    """Test suite for JobScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_pool_is_bounded(self):
+        scheduler = JobScheduler(max_workers=2)
+        gate = asyncio.Event()
+        order = []
+        futures = [
+            scheduler.submit(f"j{i}", "a", "osint_hunter", recorder(order, i, gate))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["running"] == 2
+        assert scheduler.stats()["queued"] == 3
+
+        gate.set()
+        assert await asyncio.gather(*futures) == [0, 1, 2, 3, 4]
+        assert scheduler.stats()["completed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_incident_jumps_background_backlog(self):
+        scheduler = JobScheduler(max_workers=1)
+        gate = asyncio.Event()
+        order = []
+        scheduler.submit("blocker", "a", "osint", recorder(order, "blocker", gate))
+        for i in range(10):
+            scheduler.submit(f"bg{i}", "a", "osint", recorder(order, f"bg{i}"), priority="background")
+        urgent = scheduler.submit("ir", "b", "osint", recorder(order, "ir"), priority="incident")
+
+        gate.set()
+        await urgent
+        assert order[:2] == ["blocker", "ir"]
+
+    @pytest.mark.asyncio
+    async def test_fair_share_across_agents(self):
+        scheduler = JobScheduler(max_workers=1)
+        gate = asyncio.Event()
+        order = []
+        scheduler.submit("blocker", "x", "t", recorder(order, "blocker", gate))
+        for i in range(6):
+            scheduler.submit(f"flood{i}", "flooder", "t", recorder(order, "flooder"))
+        last = scheduler.submit("quiet", "quiet", "t", recorder(order, "quiet"))
+
+        gate.set()
+        await last
+        # The quiet agent is served after the flooder's first job, not its sixth
+        assert order.index("quiet") <= 2
+
+    @pytest.mark.asyncio
+    async def test_weights_shape_share(self):
+        scheduler = JobScheduler(max_workers=1)
+        scheduler.set_weight("heavy", 3)
+        gate = asyncio.Event()
+        order = []
+        scheduler.submit("blocker", "x", "t", recorder(order, "blocker", gate))
+        futures = []
+        for i in range(6):
+            futures.append(scheduler.submit(f"h{i}", "heavy", "t", recorder(order, "heavy")))
+            futures.append(scheduler.submit(f"l{i}", "light", "t", recorder(order, "light")))
+
+        gate.set()
+        await asyncio.gather(*futures)
+        assert order[1:9].count("heavy") == 6
+
+    @pytest.mark.asyncio
+    async def test_type_cap_leaves_room_for_other_types(self):
+        scheduler = JobScheduler(max_workers=4, type_caps={"osint_hunter": 1})
+        gate = asyncio.Event()
+        order = []
+        for i in range(3):
+            scheduler.submit(f"o{i}", "o", "osint_hunter", recorder(order, f"o{i}", gate))
+        scheduler.submit("c", "c", "compliance_guardian", recorder(order, "c", gate))
+        await asyncio.sleep(0)
+
+        stats = scheduler.stats()
+        assert stats["running_by_type"] == {"osint_hunter": 1, "compliance_guardian": 1}
+        assert stats["queued_by_type"] == {"osint_hunter": 2}
+        gate.set()
+
+    @pytest.mark.asyncio
+    async def test_capped_backlog_keeps_order(self):
+        scheduler = JobScheduler(max_workers=2, type_caps={"osint_hunter": 1})
+        gate = asyncio.Event()
+        order = []
+        futures = [
+            scheduler.submit(f"o{i}", "o", "osint_hunter", recorder(order, f"o{i}", gate))
+            for i in range(500)
+        ]
+        other = scheduler.submit("c", "c", "compliance_guardian", recorder(order, "c"))
+        assert await other == "c"
+        assert order == ["o0", "c"]
+
+        gate.set()
+        await asyncio.gather(*futures)
+        assert [name for name in order if name != "c"] == [f"o{i}" for i in range(500)]
+
+    @pytest.mark.asyncio
+    async def test_finished_status_is_not_overwritten(self):
+        scheduler = JobScheduler(max_workers=1)
+        gate = asyncio.Event()
+        future = scheduler.submit("j", "a", "t", recorder([], "j", gate))
+        await asyncio.sleep(0)
+        signals.get_job_signals().set_status("j", "CANCELLED")
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert future.cancelled()
+        assert scheduler.stats()["completed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_and_cancellation(self):
+        scheduler = JobScheduler(max_workers=1)
+        gate = asyncio.Event()
+
+        async def broken():
+            raise RuntimeError("provider down")
+
+        scheduler.submit("blocker", "a", "t", recorder([], "b", gate))
+        failing = scheduler.submit("bad", "a", "t", broken)
+        queued = scheduler.submit("dropped", "a", "t", recorder([], "d"))
+        signals.get_job_signals().set_status("dropped", "CANCELLED")
+
+        gate.set()
+        with pytest.raises(RuntimeError):
+            await failing
+        await asyncio.sleep(0)
+        assert queued.cancelled()
+        stats = scheduler.stats()
+        assert (stats["failed"], stats["cancelled"]) == (1, 1)
+        assert set(stats["wait_ms"]["normal"]) == {"avg", "p95", "max"}
+
+    def test_unknown_priority_is_rejected(self):
+        async def submit():
+            JobScheduler().submit("j", "a", "t", recorder([], "j"), priority="urgent")
+
+        with pytest.raises(ValueError):
+            asyncio.run(submit())
+
+
+class TestOrchestratorScheduling:
+    """start_job runs registered job types through the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_start_job_runs_handler_and_records_status(self, tmp_path, monkeypatch):
+        db = database.Database(str(tmp_path / "sched.db"))
+        monkeypatch.setattr(database, "_db", db)
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+        monkeypatch.setattr(versioning, "_tracker", None)
+
+        orchestrator = AgentOrchestrator()
+        done = asyncio.Event()
+
+        async def handler(job_id, agent_id, params):
+            done.set()
+            return {"echo": params["value"]}
+
+        orchestrator.register_job_handler("echo", handler)
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {})
+        job_id = await orchestrator.start_job(agent_id, "echo", {"value": 7}, priority="high")
+
+        await asyncio.wait_for(done.wait(), timeout=1)
+        for _ in range(50):
+            row = await db.fetch_one("SELECT status, result_data FROM jobs WHERE job_id = ?", (job_id,))
+            if row["status"] == "COMPLETED":
+                break
+            await asyncio.sleep(0.01)
+        assert row["status"] == "COMPLETED"
+        assert json.loads(row["result_data"]) == {"echo": 7}
+
+        with pytest.raises(ValueError):
+            await orchestrator.start_job(agent_id, "echo", {}, priority="urgent")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("bulk", [False, True])
+    async def test_terminate_cancels_running_job(self, tmp_path, monkeypatch, bulk):
+        db = database.Database(str(tmp_path / "sched.db"))
+        monkeypatch.setattr(database, "_db", db)
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+        monkeypatch.setattr(versioning, "_tracker", None)
+
+        orchestrator = AgentOrchestrator()
+        started = asyncio.Event()
+        stopped = asyncio.Event()
+
+        async def handler(job_id, agent_id, params):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+            return {}
+
+        orchestrator.register_job_handler("slow", handler)
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {})
+        job_id = await orchestrator.start_job(agent_id, "slow", {})
+        await asyncio.wait_for(started.wait(), timeout=1)
+
+        if bulk:
+            await orchestrator.terminate_agents([agent_id])
+        else:
+            await orchestrator.terminate_agent(agent_id)
+        await asyncio.wait_for(stopped.wait(), timeout=1)
+        await asyncio.sleep(0.01)
+
+        row = await db.fetch_one("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
+        assert row["status"] == "CANCELLED"
+        assert orchestrator.scheduler.stats()["running"] == 0
+
+    def test_bridge_rejects_job_without_type(self, tmp_path, monkeypatch):
+        import core.state.orchestrator as orchestrator_module
+        import mcp_http_bridge
+        from fastapi.testclient import TestClient
+
+        monkeypatch.setattr(database, "_db", database.Database(str(tmp_path / "sched.db")))
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+        monkeypatch.setattr(versioning, "_tracker", None)
+        monkeypatch.setattr(orchestrator_module, "_orchestrator", None)
+
+        client = TestClient(mcp_http_bridge.app)
+        agent_id = client.post("/api/v1/agents/spawn", json={"type": "osint_hunter"}).json()["agent_id"]
+        response = client.post(f"/api/v1/agents/{agent_id}/jobs", json={"params": {}})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "job_type is required"
+        assert client.get(f"/api/v1/agents/{agent_id}").json()["agent"]["state"] == "SPAWNED"
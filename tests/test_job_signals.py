@@ -0,0 +1,125 @@
+"""
+Tests for in-memory job pause/resume signalling.
+
+Run with: pytest tests/test_job_signals.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+from core.events.relay import EventRelay
+from core.jobs.job_manager import JobManager
+from core.jobs.signals import JobSignals
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+@pytest.fixture
+def count_selects(db, monkeypatch):
+    """Number of SELECTs against the jobs table issued so far."""
+    calls = []
+    original = db.fetch_one
+
+    async def counting(query, params=()):
+        if "FROM jobs" in query:
+            calls.append(query)
+        return await original(query, params)
+
+    monkeypatch.setattr(db, "fetch_one", counting)
+    return calls
+
+
+class TestJobSignals:
+    """Test suite for JobManager signalling."""
+
+    @pytest.mark.asyncio
+    async def test_paused_job_checks_in_without_queries(self, db, count_selects):
+        manager = JobManager()
+        job_id = await manager.create_job("osint-1", "investigate")
+        await manager.set_status(job_id, "PAUSED")
+
+        for _ in range(100):
+            assert await manager.should_yield(job_id) is True
+        assert count_selects == []
+
+    @pytest.mark.asyncio
+    async def test_resume_wakes_waiter_immediately(self, db):
+        manager = JobManager()
+        job_id = await manager.create_job("osint-1", "investigate")
+        await manager.set_status(job_id, "PAUSED")
+
+        waiter = asyncio.create_task(manager.wait_for_resume(job_id))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        started = time.perf_counter()
+        # A different JobManager (e.g. the orchestrator's) drives the change
+        await JobManager().set_status(job_id, "RUNNING")
+        await asyncio.wait_for(waiter, timeout=0.5)
+        assert time.perf_counter() - started < 0.2
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_paused_raises(self, db):
+        manager = JobManager()
+        job_id = await manager.create_job("osint-1", "investigate")
+        await manager.set_status(job_id, "PAUSED")
+
+        waiter = asyncio.create_task(manager.wait_for_resume(job_id))
+        await asyncio.sleep(0)
+        await manager.set_status(job_id, "CANCELLED")
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_is_loaded_once_from_database(self, db, count_selects):
+        await db.execute(
+            "INSERT INTO jobs (job_id, agent_id, job_type, status) VALUES (?, ?, ?, ?)",
+            ("restored", "osint-1", "investigate", "PAUSED"),
+        )
+        manager = JobManager()
+        assert await manager.should_yield("restored") is True
+        assert await manager.should_yield("restored") is True
+        assert len(count_selects) == 1
+
+        with pytest.raises(ValueError):
+            await manager.wait_for_resume("missing")
+
+    def test_finished_jobs_are_evicted(self):
+        tracker = JobSignals(max_finished=2)
+        for i in range(4):
+            tracker.set_status(f"job-{i}", "COMPLETED")
+        tracker.set_status("live", "RUNNING")
+        assert tracker.get("job-0") is None
+        assert tracker.get("job-3").status == "COMPLETED"
+        assert tracker.stats() == {"tracked": 3, "COMPLETED": 2, "RUNNING": 1}
+
+    @pytest.mark.asyncio
+    async def test_relay_applies_foreign_status_changes(self, db):
+        class Sink:
+            async def broadcast(self, message):
+                pass
+
+        manager = JobManager()
+        job_id = await manager.create_job("osint-1", "investigate")
+        await manager.set_status(job_id, "PAUSED")
+
+        relay = EventRelay(db, Sink())
+        # Another worker resumes the job: only the events row reaches us
+        await db.execute(
+            "INSERT INTO events (event_id, event_type, source, payload) VALUES (?, ?, ?, ?)",
+            ("e1", "job.running", "job_manager", f'{{"job_id": "{job_id}", "status": "RUNNING"}}'),
+        )
+        await relay.poll_once()
+        assert await manager.should_yield(job_id) is False
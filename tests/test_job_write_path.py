@@ -0,0 +1,88 @@
+"""
+Tests for the single-write job update path.
+
+Run with: pytest tests/test_job_write_path.py -v
+"""
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+from core.events.relay import EventRelay
+from core.jobs.job_manager import JobManager
+from core.jobs.signals import JobSignals
+from core.state.orchestrator import AgentOrchestrator
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "writes.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+class TestJobWritePath:
+    """Test suite for the job write path."""
+
+    @pytest.mark.asyncio
+    async def test_schema_has_no_update_trigger(self, db):
+        triggers = await db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        assert triggers == []
+        indexes = {
+            r["name"]
+            for r in await db.fetch_all(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'jobs' AND sql IS NOT NULL"
+            )
+        }
+        assert indexes == {"idx_jobs_agent_status", "idx_jobs_status"}
+
+    @pytest.mark.asyncio
+    async def test_new_rows_carry_no_inline_checkpoint(self, db):
+        job_id = await JobManager().create_job("osint-1", "investigate")
+        row = await db.fetch_one("SELECT checkpoint_data FROM jobs WHERE job_id = ?", (job_id,))
+        assert row["checkpoint_data"] is None
+
+    @pytest.mark.asyncio
+    async def test_status_batch_is_one_update_and_one_event(self, db):
+        manager = JobManager()
+        job_ids = [await manager.create_job("osint-1", "investigate") for _ in range(5)]
+        before = (await db.fetch_one("SELECT COUNT(*) AS n FROM events"))["n"]
+
+        await manager.set_status_many(job_ids, "CANCELLED", error="operator")
+
+        rows = await db.fetch_all("SELECT status, error_message FROM jobs")
+        assert {(r["status"], r["error_message"]) for r in rows} == {("CANCELLED", "operator")}
+        assert (await db.fetch_one("SELECT COUNT(*) AS n FROM events"))["n"] == before + 1
+        assert all(signals.get_job_signals().get(j).status == "CANCELLED" for j in job_ids)
+
+    @pytest.mark.asyncio
+    async def test_terminate_agent_cancels_all_jobs_in_one_batch(self, db):
+        orchestrator = AgentOrchestrator()
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {})
+        for _ in range(3):
+            await orchestrator.start_job(agent_id, "investigate", {})
+
+        await orchestrator.terminate_agent(agent_id)
+
+        events = await db.fetch_all("SELECT payload FROM events WHERE event_type = 'job.cancelled'")
+        assert len(events) == 1
+        rows = await db.fetch_all("SELECT status FROM jobs WHERE agent_id = ?", (agent_id,))
+        assert {r["status"] for r in rows} == {"CANCELLED"}
+
+    @pytest.mark.asyncio
+    async def test_relay_applies_batched_status(self, db):
+        class Sink:
+            async def broadcast(self, message):
+                pass
+
+        await db.execute(
+            "INSERT INTO events (event_id, event_type, source, payload) VALUES (?, ?, ?, ?)",
+            ("e1", "job.paused", "job_manager", '{"job_ids": ["a", "b"], "status": "PAUSED"}'),
+        )
+        await EventRelay(db, Sink()).poll_once()
+        assert signals.get_job_signals().get("b").status == "PAUSED"
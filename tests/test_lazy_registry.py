@@ -0,0 +1,89 @@
+"""
+Tests for lazy tool resolution in the bridge registry.
+
+Run with: pytest tests/test_lazy_registry.py -v
+"""
+
+import asyncio
+import subprocess
+import sys
+import types
+
+import pytest
+
+import core.bridge.registry as registry
+from core.bridge.registry import lazy_stream, lazy_tool
+
+
+@pytest.fixture
+def fake_module(monkeypatch):
+    """A tool module whose import is observable."""
+    module = types.ModuleType("fake_tool_module")
+    calls = []
+
+    async def echo(ctx, value):
+        calls.append(value)
+        return {"echo": value}
+
+    async def chunks(ctx, count):
+        for i in range(count):
+            yield i
+
+    module.echo = echo
+    module.chunks = chunks
+    monkeypatch.setitem(sys.modules, "fake_tool_module", module)
+    monkeypatch.setattr(registry, "_resolved", {})
+    return calls
+
+
+class TestLazyTools:
+    """Test suite for lazy_tool / lazy_stream."""
+
+    @pytest.mark.asyncio
+    async def test_resolves_on_first_call_and_caches(self, fake_module):
+        tool = lazy_tool("fake_tool_module", "echo")
+        assert asyncio.iscoroutinefunction(tool)
+        assert registry._resolved == {}
+
+        assert await tool(None, value=1) == {"echo": 1}
+        assert await tool(None, 2) == {"echo": 2}
+        assert list(registry._resolved) == [("fake_tool_module", "echo")]
+        assert fake_module == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_stream_proxy_yields_chunks(self, fake_module):
+        stream = lazy_stream("fake_tool_module", "chunks")
+        assert [c async for c in stream(None, count=3)] == [0, 1, 2]
+
+    def test_missing_module_fails_at_call_time(self):
+        tool = lazy_tool("tools.does_not_exist", "nope")
+        with pytest.raises(ImportError):
+            asyncio.run(tool(None))
+
+
+class TestStartupImports:
+    """Importing the entry points must not pull in heavy tool modules."""
+
+    def test_registry_import_is_lazy(self):
+        probe = (
+            "import sys, core.bridge.registry; "
+            "print([m for m in ('google.genai', 'PIL', 'tools.threat', "
+            "'tools.deepfake_scanner') if m in sys.modules])"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.strip() == "[]"
+
+    def test_preload_imports_every_tool_module(self):
+        timings = registry.preload_tools()
+        assert "tools.threat" in timings
+        assert "tools.mcp_ai_tools" in timings
+        assert all(seconds >= 0 for seconds in timings.values())
+
+    def test_deepfake_scanner_not_built_at_import(self):
+        import tools.deepfake_scanner as scanner_module
+
+        scanner_module._scanner = None
+        scanner = scanner_module.get_deepfake_scanner()
+        assert scanner is scanner_module.get_deepfake_scanner()
@@ -28,7 +28,7 @@ class TestMCPHttpBridge:
         assert data["status"] == "healthy"
         assert data["service"] == "mcp-bridge-modular" # Updated expected service name
         assert data["version"] == "2.4.0" # Updated version
-        assert data["tools_available"] == 25 # Updated tool count
+        assert data["tools_available"] == 26 # Updated tool count
 
     def test_list_tools(self):
         """Test listing all available tools."""
@@ -39,7 +39,7 @@ class TestMCPHttpBridge:
 
         assert "tools" in data
         assert "total" in data
-        assert data["total"] == 25 # Updated count
+        assert data["total"] == 26 # Updated count
 
         # Validate tool structure
         assert len(data["tools"]) > 0
@@ -191,7 +191,7 @@ class TestToolRegistry:
         """Test that registry has correct number of tools."""
         from core.bridge.registry import TOOL_REGISTRY
 
-        assert len(TOOL_REGISTRY) == 25
+        assert len(TOOL_REGISTRY) == 26
 
     def test_metadata_count(self):
         """Test that metadata matches registry."""
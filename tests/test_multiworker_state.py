@@ -0,0 +1,205 @@
+"""
+Tests for the state shared between bridge workers (SQLite-backed).
+
+Run with: pytest tests/test_multiworker_state.py -v
+"""
+
+import sqlite3
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.rate_limiter as rate_limiter
+from core.events.event_bus import EventBus
+from core.events.relay import EventRelay
+from core.events.types import Event
+from core.jobs.job_manager import JobManager
+from core.jobs.signals import JobSignals
+from core.rate_limiter import SharedRateLimiter, get_rate_limiter
+from core.settings import get_settings
+from core.state.versioning import SharedStateVersionTracker
+from tools.providers.cache import SQLiteBackend
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Isolated database standing in for the file all workers share."""
+    instance = database.Database(str(tmp_path / "shared.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    return instance
+
+
+class FakeWSManager:
+    def __init__(self):
+        self.messages = []
+
+    async def broadcast(self, message):
+        self.messages.append(message)
+
+
+class TestSharedRateLimiter:
+    """Test suite for SharedRateLimiter."""
+
+    def test_limiters_in_different_workers_share_slots(self, db):
+        worker_a = SharedRateLimiter("nvd", requests_per_second=10)
+        worker_b = SharedRateLimiter("nvd", requests_per_second=10)
+
+        assert worker_a._reserve_slot() == 0
+        # Second worker must queue behind the slot the first one reserved
+        assert worker_b._reserve_slot() == pytest.approx(0.1, abs=0.02)
+        assert worker_a._reserve_slot() == pytest.approx(0.2, abs=0.02)
+
+    def test_services_are_independent(self, db):
+        SharedRateLimiter("nvd", requests_per_second=1)._reserve_slot()
+        assert SharedRateLimiter("otx", requests_per_second=1)._reserve_slot() == 0
+
+
+class TestSQLiteBackend:
+    """Test suite for the SQLite cache backend."""
+
+    @pytest.fixture
+    def backend(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SQLiteBackend, "CACHE_FILE", tmp_path / "cache.db")
+        return SQLiteBackend()
+
+    def test_set_is_visible_to_other_instances(self, backend):
+        backend.set("k", '{"v": 1}', ttl=60)
+        assert SQLiteBackend().get("k") == '{"v": 1}'
+
+    def test_expired_entries_are_misses(self, backend):
+        backend.set("k", "v", ttl=-1)
+        assert backend.get("k") is None
+
+
+class TestSharedStateVersionTracker:
+    """Test suite for SharedStateVersionTracker."""
+
+    def test_versions_are_shared(self, db):
+        worker_a = SharedStateVersionTracker()
+        worker_b = SharedStateVersionTracker()
+
+        worker_a.bump_agent("a")
+        mark = worker_b.version
+        worker_b.bump_job("j")
+
+        assert worker_a.version == mark + 1
+        assert worker_a.changed_since(mark) == ([], ["j"])
+        assert worker_a.changed_since(mark + 5) is None
+
+    @pytest.mark.asyncio
+    async def test_batch_is_stamped_in_callers_transaction(self, db):
+        tracker = SharedStateVersionTracker()
+        mark = tracker.version
+        agents = [f"a{i}" for i in range(1000)]
+        await db.execute_many([
+            ("CREATE TABLE IF NOT EXISTS probe (x)", ()),
+            *tracker.bump_statements(agent_ids=agents, job_ids=["j"]),
+        ])
+
+        assert tracker.version == mark + 1
+        changed_agents, changed_jobs = tracker.changed_since(mark)
+        assert sorted(changed_agents) == sorted(agents) and changed_jobs == ["j"]
+        assert tracker.bump_statements() == []
+
+    def test_connections_are_closed(self, db, monkeypatch):
+        opened = []
+        original = db.get_connection
+
+        def recording():
+            opened.append(original())
+            return opened[-1]
+
+        monkeypatch.setattr(db, "get_connection", recording)
+        tracker = SharedStateVersionTracker()
+        tracker.bump_agent("a")
+        tracker.changed_since(tracker.version - 1)
+
+        assert len(opened) == 4
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+
+class TestEventRelay:
+    """Test suite for EventRelay."""
+
+    @pytest.mark.asyncio
+    async def test_relays_only_foreign_events(self, db):
+        local_ws = FakeWSManager()
+        relay = EventRelay(db, local_ws)
+        await relay.start()
+        await relay.stop()
+
+        local_bus = EventBus()
+        local_bus.set_ws_manager(local_ws)
+        local_bus.set_relay(relay)
+        foreign_bus = EventBus()  # Another worker: no sockets here
+
+        await local_bus.emit(Event("agent.log", "local", {"n": 1}))
+        await foreign_bus.emit(Event("agent.log", "foreign", {"n": 2}))
+
+        assert await relay.poll_once() == 1
+        assert [m["source"] for m in local_ws.messages] == ["local", "foreign"]
+        assert local_ws.messages[1]["payload"] == {"n": 2}
+        assert await relay.poll_once() == 0
+
+    @pytest.mark.asyncio
+    async def test_foreign_events_reach_local_subscribers(self, db, monkeypatch):
+        import core.state.orchestrator as orchestrator_module
+        import core.state.versioning as versioning
+        from core.state.orchestrator import AgentOrchestrator
+
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+        monkeypatch.setattr(versioning, "_tracker", None)
+        monkeypatch.setattr(signals, "_signals", JobSignals())
+        monkeypatch.setattr(orchestrator_module, "_orchestrator", None)
+        orchestrator = AgentOrchestrator()
+        agent_id = await orchestrator.spawn_agent("osint_hunter", {})
+        job_id = await orchestrator.start_job(agent_id, "investigate", {})
+
+        local_bus = event_bus.get_event_bus()
+        relay = EventRelay(db, FakeWSManager(), event_bus=local_bus)
+        await relay.start()
+        await relay.stop()
+        local_bus.set_relay(relay)
+
+        # Another worker saves a checkpoint of the job
+        await EventBus().emit(Event("job.checkpoint_saved", "checkpoint_manager", {"job_id": job_id, "progress": 40}))
+        assert await relay.poll_once() == 1
+        assert orchestrator.registry.jobs(agent_id)[0]["progress"] == 40
+
+
+class TestJobQueueInstances:
+    """Single-worker bridge instances sharing the job queue are multi-process too."""
+
+    @pytest.fixture
+    def queue_mode(self, db, monkeypatch):
+        monkeypatch.setattr(get_settings().bridge, "job_queue", True)
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+        monkeypatch.setattr(signals, "_signals", JobSignals())
+        monkeypatch.setattr(rate_limiter, "_limiters", {})
+
+    def test_job_queue_shares_rate_limits(self, queue_mode):
+        assert get_settings().bridge.workers == 1
+        assert isinstance(get_rate_limiter("nvd"), SharedRateLimiter)
+
+    @pytest.mark.asyncio
+    async def test_cancel_on_other_instance_is_seen(self, db, queue_mode):
+        # Instance B runs the job; instance A only shares the database
+        running = JobManager()
+        job_id = await running.create_job("osint-1", "investigate")
+        await running.set_status(job_id, "RUNNING")
+        relay = EventRelay(db, FakeWSManager())
+        await relay.start()
+        await relay.stop()
+
+        other = JobManager()
+        other.signals = JobSignals()
+        other.event_bus = EventBus()
+        await other.set_status(job_id, "CANCELLED")
+
+        assert await running.should_yield(job_id) is False
+        await relay.poll_once()
+        assert await running.should_yield(job_id) is True
@@ -0,0 +1,170 @@
+"""
+Tests for the cache-first (stale-while-revalidate) provider chains.
+
+Run with: pytest tests/test_provider_cache.py -v
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import tools.providers.cache as cache_module
+import tools.providers.cached as cached_module
+from core.deadline import deadline, remaining
+from core.settings import get_settings
+from tools.providers.base import BaseProvider
+from tools.providers.cache import RedisBackend, SQLiteBackend, get_cache, provider_ttls
+from tools.providers.cached import CachedProvider, cache_stats
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(SQLiteBackend, "CACHE_FILE", tmp_path / "cache.db")
+    monkeypatch.setattr(RedisBackend, "_try_connect", lambda self: False)
+    monkeypatch.setattr(cache_module, "_cache", None)
+    monkeypatch.setattr(cached_module, "_stats", {})
+    monkeypatch.setattr(cached_module, "_refreshing", {})
+    return get_cache()
+
+
+class _Upstream(BaseProvider[dict]):
+    """Fake real provider: counts calls and caches its answer like the real ones."""
+
+    name = "upstream"
+
+    def __init__(self, answer=None, delay=0.0):
+        self.calls = 0
+        self.answer = answer or {"pulse_count": 3}
+        self.delay = delay
+        self.deadlines = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, indicator, type="ip", **kwargs):
+        self.calls += 1
+        self.deadlines.append(remaining())
+        await asyncio.sleep(self.delay)
+        get_cache().store("otx", f"otx:{type}:{indicator}", self.answer)
+        return self.answer
+
+
+def chain(upstream):
+    return CachedProvider("otx", upstream, key=lambda indicator, type="ip", **_: f"otx:{type}:{indicator}")
+
+
+def write_aged(cache, key, value, age, ttl=60, stale_ttl=600):
+    now = time.time()
+    real_time = cache_module.time.time
+    cache_module.time.time = lambda: now - age
+    try:
+        cache.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+    finally:
+        cache_module.time.time = real_time
+
+
+class TestCachedProvider:
+    """Test suite for CachedProvider."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_fresh_hits_skip_upstream(self, cache):
+        upstream = _Upstream()
+        for _ in range(5):
+            assert await chain(upstream).execute_with_fallback("1.2.3.4") == {"pulse_count": 3}
+
+        assert upstream.calls == 1
+        stats = cache_stats()["providers"]["otx"]
+        assert (stats["hits"], stats["stale_hits"], stats["misses"], stats["refreshes"]) == (4, 0, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_stale_served_immediately_and_refreshed_once(self, cache):
+        write_aged(cache, "otx:ip:1.2.3.4", {"pulse_count": 1}, age=120)
+        upstream = _Upstream(answer={"pulse_count": 9}, delay=0.05)
+
+        results = await asyncio.gather(*(chain(upstream).execute_with_fallback("1.2.3.4") for _ in range(3)))
+        assert results == [{"pulse_count": 1}] * 3
+        assert upstream.calls == 1 and cache_stats()["refreshing"] == 1
+
+        await asyncio.sleep(0.1)
+        entry = cache.lookup("otx:ip:1.2.3.4")
+        assert entry.fresh and entry.value == {"pulse_count": 9}
+        assert cache_stats()["refreshing"] == 0
+        assert cache_stats()["providers"]["otx"]["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_are_per_provider(self, cache):
+        # Same cache key in two providers: each one revalidates its own entry
+        write_aged(cache, "shared:1.2.3.4", {"pulse_count": 1}, age=120)
+        otx, vt = _Upstream(delay=0.05), _Upstream(delay=0.05)
+        key = lambda indicator, **_: f"shared:{indicator}"
+        await CachedProvider("otx", otx, key=key).execute_with_fallback("1.2.3.4")
+        await CachedProvider("virustotal", vt, key=key).execute_with_fallback("1.2.3.4")
+
+        assert cache_stats()["refreshing"] == 2
+        await asyncio.sleep(0.1)
+        assert (otx.calls, vt.calls) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_lookups_run_off_the_event_loop(self, cache, monkeypatch):
+        threads = []
+        backend_get = SQLiteBackend.get
+
+        def recording(self, key):
+            threads.append(threading.current_thread())
+            return backend_get(self, key)
+
+        monkeypatch.setattr(SQLiteBackend, "get", recording)
+        await chain(_Upstream()).execute_with_fallback("1.2.3.4")
+        assert threads and threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_refresh_does_not_inherit_caller_deadline(self, cache):
+        write_aged(cache, "otx:ip:5.6.7.8", {"pulse_count": 1}, age=120)
+        upstream = _Upstream()
+        with deadline(5):
+            await chain(upstream).execute_with_fallback("5.6.7.8")
+        await asyncio.sleep(0.01)
+        assert upstream.deadlines == [None]
+
+    @pytest.mark.asyncio
+    async def test_expired_past_stale_window_is_a_miss(self, cache):
+        # The backend drops entries once ttl + stale_ttl passed
+        cache._backend.set("otx:ip:9.9.9.9", '{"pulse_count": 1}', -1)
+        upstream = _Upstream()
+        assert await chain(upstream).execute_with_fallback("9.9.9.9") == {"pulse_count": 3}
+        assert upstream.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_goes_straight_to_the_chain(self, cache, monkeypatch):
+        monkeypatch.setattr(get_settings().provider_cache, "enabled", False)
+        upstream = _Upstream()
+        await chain(upstream).execute_with_fallback("1.1.1.1")
+        await chain(upstream).execute_with_fallback("1.1.1.1")
+        assert upstream.calls == 2
+
+
+class TestSmartCacheEntries:
+    """Test suite for the timestamped cache entries."""
+
+    def test_expired_rows_are_purged_on_write(self, cache):
+        cache._backend.set("old", "v", -1)
+        cache._backend.set("new", "v", 60)
+        with sqlite3.connect(SQLiteBackend.CACHE_FILE) as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM cache")]
+        assert keys == ["new"]
+
+    def test_per_provider_ttls(self, cache, monkeypatch):
+        settings = get_settings().provider_cache
+        monkeypatch.setattr(settings, "ttls", {"virustotal": 7200})
+        monkeypatch.setattr(settings, "stale_ttls", {"virustotal": 60})
+        assert provider_ttls("virustotal") == (7200, 60)
+        assert provider_ttls("hibp")[1] == settings.default_stale_ttl
+
+    def test_legacy_entry_is_served_as_stale(self, cache):
+        cache._backend.set("vt:file:abc", '{"status": "old"}', 60)
+        entry = cache.lookup("vt:file:abc")
+        assert entry.value == {"status": "old"} and not entry.fresh
+        assert cache.get("vt:file:abc") == {"status": "old"}
@@ -0,0 +1,143 @@
+"""
+Tests for the token-bucket rate limiter.
+
+Run with: pytest tests/test_rate_limiter.py -v
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.database as database
+import core.rate_limiter as rate_limiter
+from core.deadline import DeadlineExceeded, deadline
+from core.rate_limiter import RateLimiter, SharedRateLimiter, get_rate_limiter, rate_limit
+from core.settings import get_settings
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "rl.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    monkeypatch.setattr(rate_limiter, "_specs", {})
+    return instance
+
+
+class TestTokenBucket:
+    """Test suite for RateLimiter."""
+
+    def test_burst_then_steady_rate(self):
+        limiter = RateLimiter(requests_per_second=10, burst=3)
+        assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+        assert limiter.estimate_wait() == pytest.approx(0.1, abs=0.02)
+
+    def test_slowest_window_wins(self):
+        limiter = RateLimiter(requests_per_second=100, burst=5, limits={"minute": 2, "day": 100})
+        assert limiter.try_acquire() and limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+        waits = limiter.wait_estimates()
+        assert waits["second"] == 0 and waits["minute"] == pytest.approx(30, abs=0.1)
+        assert waits["day"] == 0
+        report = limiter.report()
+        assert report["wait_s"] == pytest.approx(30, abs=0.1)
+        assert report["windows"]["minute"]["capacity"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_queue_without_a_lock(self):
+        limiter = RateLimiter(requests_per_second=20, burst=1)
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(4)))
+        # Slots 0, 50, 100, 150ms reserved up front and slept in parallel
+        assert 0.13 <= time.monotonic() - started < 0.3
+
+    @pytest.mark.asyncio
+    async def test_wait_past_deadline_fails_without_spending(self):
+        limiter = RateLimiter(requests_per_second=1, burst=1, limits={"day": 10})
+        await limiter.acquire()
+        with deadline(0.2), pytest.raises(DeadlineExceeded):
+            await limiter.acquire()
+        assert limiter.report()["windows"]["day"]["tokens"] == pytest.approx(9, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_refunds_its_token(self):
+        limiter = RateLimiter(requests_per_second=1, burst=1, limits={"day": 10})
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.report()["windows"]["day"]["tokens"] == pytest.approx(9, abs=0.01)
+
+
+class TestPersistedUsage:
+    """Usage survives restarts and is shared by bridge workers."""
+
+    def test_daily_usage_survives_restart(self, db):
+        before = RateLimiter(requests_per_second=100, burst=5, limits={"day": 3}, service="vt")
+        for _ in range(3):
+            assert before.try_acquire()
+
+        restarted = RateLimiter(requests_per_second=100, burst=5, limits={"day": 3}, service="vt")
+        assert not restarted.try_acquire()
+        assert restarted.wait_estimates()["day"] > 3600
+
+    @pytest.mark.asyncio
+    async def test_reservations_are_written_behind_in_a_thread(self, db, monkeypatch):
+        limiter = RateLimiter(requests_per_second=100, burst=5, limits={"day": 3}, service="vt")
+        writers = []
+        write = limiter._write
+        monkeypatch.setattr(
+            limiter, "_write", lambda buckets: writers.append(threading.get_ident()) or write(buckets)
+        )
+        for _ in range(3):
+            await limiter.acquire()
+        await limiter._flushing
+
+        assert writers and threading.get_ident() not in writers
+        assert len(writers) < 3
+        restarted = RateLimiter(requests_per_second=100, burst=5, limits={"day": 3}, service="vt")
+        assert not restarted.try_acquire()
+
+    def test_shared_limiters_share_buckets(self, db):
+        worker_a = SharedRateLimiter("otx", requests_per_second=100, burst=2)
+        worker_b = SharedRateLimiter("otx", requests_per_second=100, burst=2)
+        assert worker_a.try_acquire() and worker_b.try_acquire()
+        assert not worker_a.try_acquire()
+
+    @pytest.mark.asyncio
+    async def test_shared_limiter_refunds_cancelled_waiters(self, db):
+        limiter = SharedRateLimiter("otx", requests_per_second=1, burst=1, limits={"day": 10})
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert (await limiter.await_estimates())["day"] == 0
+        assert limiter.report()["windows"]["day"]["tokens"] == pytest.approx(9, abs=0.01)
+
+    def test_declared_limits_and_settings_overrides(self, db, monkeypatch):
+        settings = get_settings().ratelimit
+        monkeypatch.setattr(settings, "limits", {"vt": {"minute": 2}})
+        monkeypatch.setattr(settings, "bursts", {"vt": 8})
+
+        @rate_limit("vt", rps=4 / 60, burst=4, per_day=500)
+        async def lookup():
+            return "ok"
+
+        limiter = get_rate_limiter("vt")
+        assert limiter.windows["second"][0] == 8
+        assert set(limiter.windows) == {"second", "minute", "day"}
+
+    def test_bridge_reports_limiters(self, db):
+        import mcp_http_bridge
+
+        get_rate_limiter("hibp").try_acquire()
+        body = TestClient(mcp_http_bridge.app).get("/api/v1/ratelimits").json()
+        assert body["services"]["hibp"]["windows"]["second"]["capacity"] == 1
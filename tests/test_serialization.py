@@ -0,0 +1,103 @@
+"""
+Tests for the fast JSON serialization layer.
+
+Run with: pytest tests/test_serialization.py -v
+"""
+
+from datetime import datetime
+from enum import Enum
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from core.bridge.responses import FastJSONResponse
+from core.bridge.ws_manager import ConnectionManager
+from core.serialization import dumps, dumps_str, loads
+
+
+class Severity(str, Enum):
+    HIGH = "high"
+
+
+class Finding(BaseModel):
+    title: str
+    severity: Severity
+    seen_at: datetime
+
+
+class FakeSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_text(self, data):
+        self.frames.append(data)
+
+
+class TestDumps:
+    """Test suite for core.serialization."""
+
+    def test_native_and_pydantic_types(self):
+        seen = datetime(2026, 1, 2, 3, 4, 5)
+        payload = {
+            "finding": Finding(title="x", severity=Severity.HIGH, seen_at=seen),
+            "tags": {"a"},
+            "when": seen,
+            1: "int key",
+        }
+
+        decoded = loads(dumps(payload))
+
+        assert decoded["finding"] == {
+            "title": "x",
+            "severity": "high",
+            "seen_at": "2026-01-02T03:04:05",
+        }
+        assert decoded["tags"] == ["a"]
+        assert decoded["when"] == "2026-01-02T03:04:05"
+        assert decoded["1"] == "int key"
+
+    def test_unknown_objects_fall_back_to_str(self):
+        assert dumps_str({"v": object}) == '{"v":"<class \'object\'>"}'
+
+    def test_response_class_renders_with_fast_encoder(self):
+        response = FastJSONResponse({"when": datetime(2026, 1, 1)})
+        assert response.body == b'{"when":"2026-01-01T00:00:00"}'
+        assert response.media_type == "application/json"
+
+
+class TestBridgeSerialization:
+    """Test suite for serialization on the bridge paths."""
+
+    def test_execute_response_keeps_schema_shape(self):
+        import mcp_http_bridge
+
+        response = TestClient(mcp_http_bridge.app).post(
+            "/mcp/tools/execute",
+            json={
+                "tool_name": "ethical_validate",
+                "arguments": {"action": "test harmless action", "context": {}},
+            },
+        )
+
+        assert response.status_code == 200
+        assert set(response.json()) == {
+            "success",
+            "result",
+            "error",
+            "logs",
+            "execution_time_ms",
+            "queue_time_ms",
+        }
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once_for_all_sockets(self):
+        manager = ConnectionManager()
+        sockets = [FakeSocket(), FakeSocket()]
+        manager.active_connections.extend(sockets)
+
+        await manager.broadcast({"type": "agent.log", "at": datetime(2026, 1, 1)})
+
+        frames = [s.frames[0] for s in sockets]
+        assert frames[0] is frames[1]
+        assert loads(frames[0])["at"] == "2026-01-01T00:00:00"
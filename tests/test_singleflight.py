@@ -0,0 +1,169 @@
+"""
+Tests for singleflight coalescing of provider lookups.
+
+Run with: pytest tests/test_singleflight.py -v
+"""
+
+import asyncio
+
+import pytest
+
+import tools.providers.cache as cache_module
+import tools.providers.cached as cached_module
+from core.deadline import DeadlineExceeded, deadline, remaining
+from core.singleflight import SingleFlight
+from tools.providers.base import BaseProvider
+from tools.providers.cache import RedisBackend, SQLiteBackend
+from tools.providers.cached import CachedProvider, cache_stats
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(SQLiteBackend, "CACHE_FILE", tmp_path / "cache.db")
+    monkeypatch.setattr(RedisBackend, "_try_connect", lambda self: False)
+    monkeypatch.setattr(cache_module, "_cache", None)
+    monkeypatch.setattr(cached_module, "_stats", {})
+    monkeypatch.setattr(cached_module, "_refreshing", {})
+    monkeypatch.setattr(cached_module, "_flights", SingleFlight())
+
+
+class _SlowVT(BaseProvider[dict]):
+    """Fake rate-limited upstream that does not cache its answers."""
+
+    name = "slow_vt"
+
+    def __init__(self):
+        self.calls = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, resource, type="file", **kwargs):
+        self.calls.append((resource, type))
+        await asyncio.sleep(0.05)
+        return {"resource": resource, "type": type}
+
+
+def vt(upstream):
+    return CachedProvider("virustotal", upstream, key=lambda resource, type="file", **_: f"vt:{type}:{resource}")
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def lookup():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"n": len(calls)}
+
+        results = await asyncio.gather(*(flights.do("k", lookup) for _ in range(10)))
+        assert calls == [1]
+        assert [shared for _, shared in results].count(False) == 1
+        assert all(result is results[0][0] for result, _ in results)
+        assert flights.stats() == {"executions": 1, "coalesced": 9, "inflight": 0}
+
+        # Finished calls are forgotten: the next lookup runs again
+        await flights.do("k", lookup)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_is_shared(self):
+        flights = SingleFlight()
+
+        async def lookup():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flights.do("k", lookup) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flights.executions == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        flights = SingleFlight()
+
+        async def lookup():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        leader = asyncio.create_task(flights.do("k", lookup))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", lookup))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await follower == ("ok", True)
+
+    @pytest.mark.asyncio
+    async def test_follower_deadline_bounds_its_wait(self):
+        flights = SingleFlight()
+
+        async def lookup():
+            await asyncio.sleep(0.2)
+            return "ok"
+
+        leader = asyncio.create_task(flights.do("k", lookup))
+        await asyncio.sleep(0)
+        with deadline(0.02):
+            with pytest.raises(DeadlineExceeded):
+                await flights.do("k", lookup)
+        assert await leader == ("ok", False)
+
+    @pytest.mark.asyncio
+    async def test_leader_deadline_does_not_fail_followers(self):
+        flights = SingleFlight()
+        seen = []
+
+        async def lookup():
+            seen.append(remaining())
+            await asyncio.sleep(0.2)
+            return "ok"
+
+        async def leader():
+            with deadline(0.1):
+                return await flights.do("k", lookup)
+
+        leading = asyncio.create_task(leader())
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", lookup))
+        with pytest.raises(DeadlineExceeded):
+            await leading
+        assert await follower == ("ok", True)
+        # The shared call ran without the leader's deadline
+        assert seen == [None]
+
+    @pytest.mark.asyncio
+    async def test_late_leader_starts_no_call(self):
+        flights = SingleFlight()
+        calls = []
+
+        async def lookup():
+            calls.append(1)
+            return "ok"
+
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            await flights.do("k", lookup)
+        assert calls == [] and flights.stats()["executions"] == 0
+
+
+class TestProviderCoalescing:
+    """Test suite for coalesced provider chains."""
+
+    @pytest.mark.asyncio
+    async def test_same_indicator_and_type_coalesce(self, cache):
+        upstream = _SlowVT()
+        await asyncio.gather(
+            *(vt(upstream).execute_with_fallback("1.2.3.4", type="ip") for _ in range(5)),
+            vt(upstream).execute_with_fallback("1.2.3.4", type="domain"),
+            vt(upstream).execute_with_fallback("5.6.7.8", type="ip"),
+        )
+        assert sorted(upstream.calls) == [("1.2.3.4", "domain"), ("1.2.3.4", "ip"), ("5.6.7.8", "ip")]
+
+        stats = cache_stats()
+        assert stats["providers"]["virustotal"]["upstream_calls"] == 3
+        assert stats["providers"]["virustotal"]["coalesced"] == 4
+        assert stats["singleflight"]["inflight"] == 0
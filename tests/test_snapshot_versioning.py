@@ -0,0 +1,123 @@
+"""
+Tests for versioned snapshots (ETag / delta mode).
+
+Run with: pytest tests/test_snapshot_versioning.py -v
+"""
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.state.versioning as versioning
+from core.state.orchestrator import AgentOrchestrator
+from core.state.versioning import StateVersionTracker
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator bound to an isolated database and fresh singletons."""
+    monkeypatch.setattr(database, "_db", database.Database(str(tmp_path / "test.db")))
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    return AgentOrchestrator()
+
+
+class TestStateVersionTracker:
+    """Test suite for StateVersionTracker."""
+
+    def test_bumps_are_monotonic(self):
+        tracker = StateVersionTracker()
+        v1 = tracker.bump_agent("a")
+        v2 = tracker.bump_job("j")
+        assert tracker.base < v1 < v2 == tracker.version
+
+    def test_changed_since(self):
+        tracker = StateVersionTracker()
+        tracker.bump_agent("a")
+        mark = tracker.version
+        tracker.bump_agent("b")
+        tracker.bump_job("j")
+        assert tracker.changed_since(mark) == (["b"], ["j"])
+
+    def test_pre_boot_version_requires_full_snapshot(self):
+        tracker = StateVersionTracker()
+        assert tracker.changed_since(tracker.base - 1) is None
+        assert tracker.changed_since(tracker.version + 1) is None
+
+    def test_batch_gets_one_version(self):
+        tracker = StateVersionTracker()
+        mark = tracker.version
+        assert tracker.bump_many(agent_ids=["a", "b"], job_ids=["j"]) == mark + 1
+        assert tracker.bump_statements(agent_ids=["c"]) == []
+        assert tracker.changed_since(mark) == (["c", "b", "a"], ["j"])
+
+    def test_history_is_bounded(self):
+        tracker = StateVersionTracker(history=3)
+        for i in range(5):
+            tracker.bump_job(f"j{i}")
+        mark = tracker.version
+        tracker.bump_job("j0")
+
+        assert len(tracker._jobs) == 3
+        assert tracker.changed_since(mark) == ([], ["j0"])
+        # Pruned stamps make older versions unanswerable as a delta
+        assert tracker.changed_since(tracker.base) is None
+
+
+class TestUniverseSnapshot:
+    """Test suite for AgentOrchestrator.get_universe_snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_full_snapshot_embeds_active_job(self, orchestrator):
+        agent_id = await orchestrator.spawn_agent("osint", {})
+        job_id = await orchestrator.start_job(agent_id, "investigate", {})
+        await orchestrator.job_manager.set_status(job_id, "RUNNING")
+
+        snapshot = await orchestrator.get_universe_snapshot()
+
+        assert snapshot["version"] == orchestrator.versions.version
+        (agent,) = snapshot["agents"]
+        assert agent["active_job"]["job_id"] == job_id
+        assert "delta" not in snapshot
+
+    @pytest.mark.asyncio
+    async def test_delta_returns_only_changed_agents(self, orchestrator):
+        quiet = await orchestrator.spawn_agent("osint", {})
+        busy = await orchestrator.spawn_agent("threat", {})
+        mark = orchestrator.versions.version
+
+        job_id = await orchestrator.job_manager.create_job(busy, "scan")
+        await orchestrator.job_manager.set_status(job_id, "PAUSED")
+
+        delta = await orchestrator.get_universe_snapshot(since=mark)
+
+        assert delta["delta"] is True
+        assert [a["agent_id"] for a in delta["agents"]] == [busy]
+        assert delta["agents"][0]["active_job"]["status"] == "PAUSED"
+        assert quiet not in [a["agent_id"] for a in delta["agents"]]
+
+    @pytest.mark.asyncio
+    async def test_delta_without_changes_is_empty(self, orchestrator):
+        await orchestrator.spawn_agent("osint", {})
+        snapshot = await orchestrator.get_universe_snapshot(
+            since=orchestrator.versions.version
+        )
+        assert snapshot["agents"] == []
+
+
+class TestSnapshotEndpoint:
+    """Test suite for /api/v1/snapshot conditional requests."""
+
+    def test_if_none_match_returns_304(self, orchestrator, monkeypatch):
+        from fastapi.testclient import TestClient
+        import mcp_http_bridge
+
+        monkeypatch.setattr(mcp_http_bridge, "get_orchestrator", lambda: orchestrator)
+        client = TestClient(mcp_http_bridge.app)
+
+        first = client.get("/api/v1/snapshot")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = client.get("/api/v1/snapshot", headers={"If-None-Match": etag})
+        assert second.status_code == 304
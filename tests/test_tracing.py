@@ -0,0 +1,177 @@
+"""
+Tests for in-process tracing spans.
+
+Run with: pytest tests/test_tracing.py -v
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.tracing as tracing
+from core.rate_limiter import RateLimiter
+from core.tracing import NOOP_SPAN, Tracer
+from tools.providers.base import BaseProvider
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Enabled tracer installed as the process singleton."""
+    instance = Tracer(enabled=True, buffer_size=100)
+    monkeypatch.setattr(tracing, "_tracer", instance)
+    return instance
+
+
+class EchoProvider(BaseProvider):
+    name = "echo"
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, value):
+        return value
+
+
+class TestTracer:
+    """Test suite for Tracer."""
+
+    def test_disabled_tracer_returns_shared_noop(self):
+        tracer = Tracer(enabled=False)
+        assert tracer.start_trace("root") is NOOP_SPAN
+        assert tracer.span("child") is NOOP_SPAN
+
+    def test_children_outside_a_trace_are_not_recorded(self, tracer):
+        assert tracing.span("db.execute") is NOOP_SPAN
+        assert tracer.query() == []
+
+    def test_nesting_and_errors(self, tracer):
+        with tracer.start_trace("root") as root:
+            with tracing.span("child") as child:
+                pass
+            with pytest.raises(ValueError):
+                with tracing.span("broken"):
+                    raise ValueError("boom")
+
+        assert child.parent_id == root.span_id
+        assert child.trace_id == root.trace_id
+        broken = tracer.query(name="broken")[0]
+        assert broken.error == "ValueError: boom"
+        assert tracer.query(name="root")[0].duration_ns >= child.duration_ns
+
+    def test_ring_buffer_is_bounded(self):
+        tracer = Tracer(enabled=True, buffer_size=3)
+        for i in range(5):
+            with tracer.start_trace(f"t{i}"):
+                pass
+        assert [s.name for s in tracer.query()] == ["t4", "t3", "t2"]
+
+    def test_request_id_maps_to_trace_id(self, tracer):
+        request_id = str(uuid.uuid4())
+        with tracer.start_trace("root", trace_id=request_id):
+            pass
+        assert tracer.query(trace_id=request_id)[0].trace_id == uuid.UUID(request_id).hex
+        assert len(tracer.query(trace_id="not-a-uuid")) == 0
+
+    def test_otlp_export_shape(self, tracer):
+        with tracer.start_trace("root", {"tool.name": "x", "attempt": 2}):
+            with tracing.span("child"):
+                pass
+
+        otlp = tracer.to_otlp()
+        spans = otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        child, root = spans
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert child["parentSpanId"] == root["spanId"]
+        assert "parentSpanId" not in root
+        assert {"key": "attempt", "value": {"intValue": "2"}} in root["attributes"]
+        assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+    def test_dump_otlp(self, tracer, tmp_path):
+        with tracer.start_trace("root"):
+            pass
+        assert tracer.dump_otlp(str(tmp_path / "traces.json")) == 1
+
+
+class TestInstrumentation:
+    """Child spans recorded by providers, rate limiters, DB and events."""
+
+    @pytest.mark.asyncio
+    async def test_provider_and_rate_limiter_spans(self, tracer):
+        limiter = RateLimiter(requests_per_second=100)
+        with tracer.start_trace("root"):
+            await limiter.acquire()
+            await limiter.acquire()
+            await EchoProvider().execute_with_fallback("v")
+
+        names = [s.name for s in tracer.query()]
+        assert names.count("ratelimit.wait") == 2
+        assert "provider.echo.execute" in names
+        assert "ratelimit.sleep_s" in tracer.query(name="ratelimit.wait")[0].attributes
+
+    def test_execute_tool_trace(self, tracer, tmp_path, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(database, "_db", database.Database(str(tmp_path / "t.db")))
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+
+        client = TestClient(mcp_http_bridge.app)
+        response = client.post(
+            "/mcp/tools/execute",
+            json={
+                "tool_name": "ethical_validate",
+                "arguments": {"action": "test harmless action", "context": {}},
+            },
+        )
+        request_id = response.headers["x-request-id"]
+
+        spans = client.get(
+            "/api/v1/traces/spans", params={"trace_id": request_id}
+        ).json()["spans"]
+        names = {s["name"] for s in spans}
+        assert {"tool.execute", "bulkhead.admit", "event.emit", "db.execute"} <= names
+
+        root = next(s for s in spans if s["name"] == "tool.execute")
+        assert root["attributes"]["tool.name"] == "ethical_validate"
+        assert client.get("/api/v1/traces").json()["traces"][0]["span_count"] == len(spans)
+
+        otlp = client.get("/api/v1/traces/otlp", params={"trace_id": request_id}).json()
+        assert len(otlp["resourceSpans"][0]["scopeSpans"][0]["spans"]) == len(spans)
+
+    def test_stream_tool_trace(self, tracer, tmp_path, monkeypatch):
+        import mcp_http_bridge
+
+        monkeypatch.setattr(database, "_db", database.Database(str(tmp_path / "t.db")))
+        monkeypatch.setattr(event_bus, "_event_bus", None)
+
+        client = TestClient(mcp_http_bridge.app)
+        response = client.post(
+            "/mcp/tools/stream",
+            json={
+                "tool_name": "ethical_validate",
+                "arguments": {"action": "test harmless action", "context": {}},
+            },
+        )
+        spans = client.get(
+            "/api/v1/traces/spans", params={"trace_id": response.headers["x-request-id"]}
+        ).json()["spans"]
+        root = next(s for s in spans if s["name"] == "tool.execute")
+        assert root["attributes"]["stream"] is True
+        assert "bulkhead.queue_ms" in root["attributes"]
+        assert {"event.emit", "db.execute"} <= {s["name"] for s in spans}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_traces_do_not_mix(self, tracer):
+        async def call(name):
+            with tracer.start_trace(name) as root:
+                await asyncio.sleep(0.01)
+                with tracing.span(f"{name}.child") as child:
+                    await asyncio.sleep(0)
+                return root, child
+
+        (root_a, child_a), (root_b, child_b) = await asyncio.gather(call("a"), call("b"))
+        assert child_a.parent_id == root_a.span_id
+        assert child_b.parent_id == root_b.span_id
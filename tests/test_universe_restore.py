@@ -0,0 +1,126 @@
+"""
+Tests for concurrent job restoration from checkpoints.
+
+Run with: pytest tests/test_universe_restore.py -v
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+from core.jobs.checkpoint import CheckpointData, CheckpointManager
+from core.jobs.signals import JobSignals
+from core.state.orchestrator import AgentOrchestrator
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "restore.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+def seed(db, jobs, agent_state="RUNNING"):
+    """Rows left behind by a previous process: (job_id, job_type, status)."""
+    with db.get_connection() as conn:
+        conn.execute(
+            "INSERT INTO agents (agent_id, agent_type, state, config) VALUES (?, ?, ?, ?)",
+            ("hunter-1", "osint_hunter", agent_state, "{}"),
+        )
+        for job_id, job_type, status in jobs:
+            conn.execute(
+                "INSERT INTO jobs (job_id, agent_id, job_type, status, params, priority) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, "hunter-1", job_type, status, json.dumps({"target": job_id}), "high"),
+            )
+
+
+class TestLoadMany:
+    """Bulk checkpoint loading."""
+
+    @pytest.mark.asyncio
+    async def test_loads_chains_and_legacy_rows_in_chunks(self, db):
+        seed(db, [(f"j{i}", "scan", "RUNNING") for i in range(5)])
+        writer = CheckpointManager()
+        for i in range(4):
+            for step in range(3):
+                await writer.save_checkpoint(f"j{i}", CheckpointData(step_index=step + i), force=True)
+        await db.execute(
+            "UPDATE jobs SET checkpoint_data = ? WHERE job_id = 'j4'",
+            (json.dumps({"version": "v1", "data": {"step_index": 9}}),),
+        )
+
+        loaded = await CheckpointManager().load_many([f"j{i}" for i in range(5)] + ["nope"], chunk_size=2)
+        assert {job_id: c.step_index for job_id, c in loaded.items()} == {
+            "j0": 2, "j1": 3, "j2": 4, "j3": 5, "j4": 9,
+        }
+
+
+class TestRestoreUniverse:
+    """Test suite for AgentOrchestrator.restore_universe."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_jobs_from_checkpoints_through_ramp(self, db):
+        seed(db, [(f"j{i}", "scan", "RUNNING" if i % 2 else "PENDING") for i in range(5)]
+             + [("legacy", "unknown.type", "RUNNING")])
+        writer = CheckpointManager()
+        await writer.save_checkpoint("j1", CheckpointData(step_index=4), force=True)
+
+        seen = {}
+
+        async def handler(job_id, agent_id, params, checkpoint=None):
+            seen[job_id] = (params["target"], checkpoint.step_index if checkpoint else None)
+            return {"ok": True}
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.register_job_handler("scan", handler)
+        stats = await orchestrator.restore_universe(ramp_batch=2, ramp_interval=0.01)
+
+        assert (stats["jobs"], stats["resumed"], stats["unrunnable"], stats["checkpoints_loaded"]) == (6, 5, 1, 1)
+        for _ in range(100):
+            if stats["time_to_restore_ms"] is not None and len(seen) == 5:
+                break
+            await asyncio.sleep(0.01)
+        assert seen["j1"] == ("j1", 4)
+        assert seen["j0"] == ("j0", None)
+        assert stats["dispatched"] == 5
+        assert stats["time_to_restore_ms"] >= stats["load_ms"]
+
+        await asyncio.sleep(0.05)
+        rows = await db.fetch_all("SELECT job_id, status FROM jobs")
+        assert {r["job_id"]: r["status"] for r in rows}["legacy"] == "RUNNING"
+        assert {r["status"] for r in rows if r["job_id"] != "legacy"} == {"COMPLETED"}
+
+    @pytest.mark.asyncio
+    async def test_paused_jobs_wait_for_resume_outside_the_pool(self, db):
+        seed(db, [("paused", "scan", "PAUSED"), ("gone", "scan", "PAUSED")], agent_state="PAUSED")
+        ran = asyncio.Event()
+
+        async def handler(job_id, agent_id, params, checkpoint=None):
+            ran.set()
+            return {"job": job_id}
+
+        orchestrator = AgentOrchestrator()
+        orchestrator.register_job_handler("scan", handler)
+        stats = await orchestrator.restore_universe()
+
+        assert (stats["resumed"], stats["deferred_paused"]) == (0, 2)
+        assert stats["time_to_restore_ms"] is not None
+        await asyncio.sleep(0.01)
+        assert orchestrator.scheduler.stats()["queued"] == 0
+        assert not ran.is_set()
+
+        await orchestrator.job_manager.set_status("gone", "CANCELLED")
+        await orchestrator.resume_agent("hunter-1")
+        await asyncio.wait_for(ran.wait(), timeout=1)
+        await asyncio.sleep(0.05)
+        assert not orchestrator._restore_waiters
+        row = await db.fetch_one("SELECT status FROM jobs WHERE job_id = 'paused'")
+        assert row["status"] == "COMPLETED"
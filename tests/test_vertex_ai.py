@@ -154,3 +154,20 @@ class TestVertexAIIntegration:
         contents = call_args.kwargs['contents']
         assert len(contents) == 1
         assert len(contents[0].parts) == 2 # Text + Image
+
+    @pytest.mark.asyncio
+    async def test_stream_analysis_propagates_deadline(self, vertex_ai):
+        """A deadline hit between chunks is raised, not streamed as a failure."""
+        from core.deadline import DeadlineExceeded, deadline
+
+        async def chunks():
+            yield MagicMock(text="first")
+            yield MagicMock(text="second")
+
+        vertex_ai.client.aio.models.generate_content_stream = AsyncMock(return_value=chunks())
+
+        received = []
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            async for chunk in vertex_ai.stream_analysis("threat", {}):
+                received.append(chunk)
+        assert received == []
@@ -0,0 +1,164 @@
+"""
+Tests for the startup warm-up and shared dataset loads.
+
+Run with: pytest tests/test_warmup.py -v
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.warmup import SharedLoad, Warmup
+from tools.mitre_client import MITREAttackAPI
+
+
+class TestSharedLoad:
+    """Test suite for SharedLoad."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_load(self):
+        load = SharedLoad()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(load.run(loader) for _ in range(5)))
+        assert calls == 1
+        assert not load.in_flight
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_retried(self):
+        load = SharedLoad()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("cache unreadable")
+
+        with pytest.raises(RuntimeError):
+            await load.run(flaky)
+        await load.run(flaky)
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_abort_load(self):
+        load = SharedLoad()
+        finished = asyncio.Event()
+
+        async def loader():
+            await asyncio.sleep(0.02)
+            finished.set()
+
+        waiter = asyncio.create_task(load.run(loader))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await load.run(loader)
+        assert finished.is_set()
+
+    @pytest.mark.asyncio
+    async def test_mitre_client_loads_once_under_concurrency(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        client = MITREAttackAPI()
+        calls = 0
+
+        async def fake_initialize():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            client._techniques = {"T1": object()}
+
+        monkeypatch.setattr(client, "_initialize_data", fake_initialize)
+        await asyncio.gather(*(client._ensure_data_loaded() for _ in range(10)))
+        assert calls == 1
+
+
+class TestWarmup:
+    """Test suite for Warmup."""
+
+    @pytest.mark.asyncio
+    async def test_steps_run_concurrently_and_report_status(self):
+        warmup = Warmup()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        async def broken():
+            raise ValueError("no credentials")
+
+        warmup.register("a", slow)
+        warmup.register("b", slow)
+        warmup.register("c", broken)
+
+        started = time.perf_counter()
+        warmup.start()
+        assert not warmup.ready
+        assert await warmup.wait(timeout=1)
+        assert time.perf_counter() - started < 0.09
+
+        status = warmup.status()
+        assert status["ready"] is True
+        assert status["steps"]["a"]["state"] == "done"
+        assert status["steps"]["c"] == {
+            "state": "failed",
+            "duration_ms": status["steps"]["c"]["duration_ms"],
+            "error": "no credentials",
+        }
+
+    @pytest.mark.asyncio
+    async def test_wait_without_start_is_false(self):
+        assert await Warmup().wait(timeout=0.01) is False
+
+
+class TestReadinessEndpoint:
+    """Test suite for /ready on the bridge."""
+
+    def test_ready_after_warmup(self, monkeypatch):
+        import mcp_http_bridge
+
+        gate = asyncio.Event()
+
+        def fake_build_warmup(preload_tools=None, datasets=True):
+            warmup = Warmup()
+            warmup.register("datasets", gate.wait)
+            return warmup
+
+        monkeypatch.setattr(mcp_http_bridge, "build_warmup", fake_build_warmup)
+
+        with TestClient(mcp_http_bridge.app) as client:
+            pending = client.get("/ready")
+            assert pending.status_code == 503
+            assert pending.json()["steps"]["datasets"]["state"] == "running"
+
+            client.portal.call(gate.set)
+            for _ in range(50):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.01)
+
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+    def test_tools_preload_without_dataset_warmup(self, monkeypatch):
+        import mcp_http_bridge
+        from core.settings import get_settings
+
+        preloaded = []
+        monkeypatch.setattr(get_settings().bridge, "warmup", False)
+        monkeypatch.setattr(mcp_http_bridge, "preload_tools", lambda: preloaded.append(1))
+
+        with TestClient(mcp_http_bridge.app) as client:
+            for _ in range(50):
+                response = client.get("/ready")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.01)
+
+        assert list(response.json()["steps"]) == ["tools"]
+        assert preloaded == [1]
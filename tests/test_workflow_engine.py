@@ -0,0 +1,237 @@
+"""
+Tests for the DAG workflow engine.
+
+Run with: pytest tests/test_workflow_engine.py -v
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import core.database as database
+import core.events.event_bus as event_bus
+import core.jobs.signals as signals
+import core.state.versioning as versioning
+import core.workflows as workflows
+from core.jobs.job_manager import JobManager
+from core.jobs.signals import JobSignals
+from core.state.orchestrator import AgentOrchestrator
+from core.workflows import Step, Workflow, WorkflowStop
+from core.serialization import loads
+
+
+@pytest.fixture(autouse=True)
+def db(tmp_path, monkeypatch):
+    instance = database.Database(str(tmp_path / "workflows.db"))
+    monkeypatch.setattr(database, "_db", instance)
+    monkeypatch.setattr(event_bus, "_event_bus", None)
+    monkeypatch.setattr(versioning, "_tracker", None)
+    monkeypatch.setattr(signals, "_signals", JobSignals())
+    return instance
+
+
+def report(values):
+    return {k: v for k, v in values.items() if k != "target"}
+
+
+def diamond(calls, fail_merge=False):
+    """target -> (left, right) -> merge"""
+    left_started, right_started = asyncio.Event(), asyncio.Event()
+
+    async def left(target):
+        calls.append("left")
+        left_started.set()
+        # Only finishes if ``right`` runs at the same time
+        await asyncio.wait_for(right_started.wait(), timeout=1)
+        return f"L:{target}"
+
+    async def right(target):
+        calls.append("right")
+        right_started.set()
+        await asyncio.wait_for(left_started.wait(), timeout=1)
+        return f"R:{target}"
+
+    async def merge(left, right):
+        calls.append("merge")
+        if fail_merge:
+            raise RuntimeError("provider down")
+        return [left, right]
+
+    return Workflow(
+        workflow_id="wf-test",
+        name="Test",
+        description="diamond",
+        inputs=("target",),
+        steps=[
+            Step("merge", merge, ("left", "right")),
+            Step("left", left, ("target",)),
+            Step("right", right, ("target",)),
+        ],
+        report=report,
+    )
+
+
+class TestWorkflowEngine:
+    """Test suite for Workflow."""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        calls = []
+        result = await diamond(calls).run({"target": "x"})
+        assert result["status"] == "completed"
+        assert result["merge"] == ["L:x", "R:x"]
+        assert calls[-1] == "merge"
+        assert set(result["step_timings_ms"]) == {"left", "right", "merge"}
+
+    def test_invalid_graphs_are_rejected(self):
+        async def noop(**_):
+            return None
+
+        with pytest.raises(ValueError):
+            Workflow("wf", "n", "d", ("a",), [Step("s", noop, ("missing",))], report)
+        with pytest.raises(ValueError):
+            Workflow("wf", "n", "d", (), [Step("s", noop, ("t",)), Step("t", noop, ("s",))], report)
+
+    @pytest.mark.asyncio
+    async def test_stop_ends_run_and_cancels_siblings(self):
+        slow_cancelled = asyncio.Event()
+
+        async def gate(target):
+            raise WorkflowStop("blocked", block_reason="no")
+
+        async def slow(target):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                slow_cancelled.set()
+                raise
+
+        async def after(gate):
+            return "never"
+
+        workflow = Workflow(
+            "wf-stop", "n", "d", ("target",),
+            [Step("gate", gate, ("target",)), Step("slow", slow, ("target",)), Step("after", after, ("gate",))],
+            report,
+        )
+        result = await workflow.run({"target": "x"})
+        assert (result["status"], result["block_reason"]) == ("blocked", "no")
+        assert "after" not in result
+        assert slow_cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_resumed_run_skips_checkpointed_steps(self, db):
+        manager = JobManager()
+        job_id = await manager.create_job("workflow-engine", "workflow.run")
+        calls = []
+
+        with pytest.raises(RuntimeError):
+            await diamond(calls, fail_merge=True).run({"target": "x"}, job_id=job_id, job_manager=manager)
+        checkpoint = await JobManager().load_checkpoint(job_id)
+        assert checkpoint.accumulated_results == {"left": "L:x", "right": "R:x"}
+
+        calls.clear()
+        workflow = diamond(calls)
+        result = await workflow.run({"target": "x"}, job_id=job_id, job_manager=manager, checkpoint=checkpoint)
+        assert calls == ["merge"]
+        assert result["merge"] == ["L:x", "R:x"]
+
+        events = await db.fetch_all(
+            "SELECT event_type, payload FROM events WHERE event_type LIKE 'workflow.%' ORDER BY rowid"
+        )
+        types = [e["event_type"] for e in events]
+        assert types.count("workflow.step.failed") == 1
+        assert loads(events[-1]["payload"])["status"] == "completed"
+        assert all("duration_ms" in loads(e["payload"]) for e in events if e["event_type"] == "workflow.step.completed")
+
+
+class TestWorkflowJobs:
+    """Workflows run as scheduler jobs and through the bridge."""
+
+    @pytest.mark.asyncio
+    async def test_workflow_runs_as_scheduled_job(self, db, monkeypatch):
+        monkeypatch.setitem(workflows.WORKFLOWS, "wf-test", diamond([]))
+        orchestrator = AgentOrchestrator()
+        await orchestrator.ensure_agent("workflow-engine", "workflow_engine")
+        await orchestrator.ensure_agent("workflow-engine", "workflow_engine")
+
+        job_id = await orchestrator.start_job(
+            "workflow-engine", "workflow.run", {"workflow_id": "wf-test", "inputs": {"target": "y"}}
+        )
+        for _ in range(100):
+            row = await db.fetch_one("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
+            if row["status"] == "COMPLETED":
+                break
+            await asyncio.sleep(0.01)
+        assert row["status"] == "COMPLETED"
+        assert (await orchestrator.job_manager.get_result(job_id))["merge"] == ["L:y", "R:y"]
+
+    def test_bridge_lists_and_validates_workflows(self):
+        import mcp_http_bridge
+
+        client = TestClient(mcp_http_bridge.app)
+        listed = {wf["id"]: wf for wf in client.get("/api/v1/workflows").json()["workflows"]}
+        assert listed["wf-insider-threat-hunter"]["inputs"] == [{"name": "employee_email", "type": "string"}]
+        assert set(listed) == set(workflows.WORKFLOWS)
+
+        assert client.post("/api/v1/workflows/run", json={"workflow_id": "nope"}).status_code == 404
+        missing = client.post("/api/v1/workflows/run", json={"workflow_id": "wf-red-team-autopilot", "inputs": {}})
+        assert missing.status_code == 400
+
+    def test_ported_workflows_keep_their_dag_shape(self):
+        insider = workflows.WORKFLOWS["wf-insider-threat-hunter"]
+        steps = {s.name: s.inputs for s in insider.steps}
+        # The breach check runs alongside the privacy gate; threat analysis waits for the gate
+        assert steps["breach_count"] == ("employee_email",)
+        assert "masked_data_sample" in steps["threat_risk"]
+        assert insider.order()[-1] == "anomaly_score"
+
+    @pytest.mark.asyncio
+    async def test_steps_can_report_to_the_mcp_context(self):
+        class Ctx:
+            def __init__(self):
+                self.messages = []
+
+            async def warning(self, message):
+                self.messages.append(message)
+
+        async def check(target, ctx):
+            if ctx:
+                await ctx.warning(f"checked {target}")
+            return True
+
+        workflow = Workflow("wf-ctx", "n", "d", ("target",), [Step("check", check, ("target", "ctx"))], report)
+        ctx = Ctx()
+        assert (await workflow.run({"target": "x"}, ctx=ctx))["check"] is True
+        assert ctx.messages == ["checked x"]
+        assert (await workflow.run({"target": "y"}))["check"] is True
+        assert workflow.describe()["steps"] == [{"name": "check", "inputs": ["target"]}]
+
+    @pytest.mark.asyncio
+    async def test_denied_privacy_check_skips_threat_analysis(self, monkeypatch):
+        from types import SimpleNamespace
+
+        import core.workflows.insider as insider
+
+        analyzed = []
+
+        class Magistrate:
+            async def validate(self, action, context):
+                return SimpleNamespace(is_approved=False)
+
+        class Hunter:
+            async def check_breach(self, email):
+                return ["breach"]
+
+        class Prophet:
+            async def analyze_threats(self, target):
+                analyzed.append(target)
+                return SimpleNamespace(overall_risk_score=10.0)
+
+        monkeypatch.setattr(insider, "get_magistrate", Magistrate)
+        monkeypatch.setattr(insider, "get_osint_hunter", Hunter)
+        monkeypatch.setattr(insider, "get_threat_prophet", Prophet)
+
+        result = await insider.INSIDER_WORKFLOW.run({"employee_email": "a@b.c"})
+        assert result["status"] == "blocked" and analyzed == []
@@ -12,6 +12,7 @@ from pathlib import Path
 import aiofiles
 
 from core.settings import get_settings
+from core.warmup import SharedLoad
 from .data import FRAMEWORK_REGISTRY
 from .models import ComplianceControl, ComplianceFrameworkData
 
@@ -48,7 +49,9 @@ class ComplianceFrameworksAPI:
         self._last_update: Optional[datetime] = None
 
         # Inicializar dados
-        # Data will be initialized lazily on first access
+        # Data will be initialized lazily on first access (or by the startup
+        # warm-up); concurrent callers share one load
+        self._load = SharedLoad()
 
     @property
     def cache_file(self) -> Path:
@@ -241,7 +244,7 @@ class ComplianceFrameworksAPI:
         if not self._frameworks:
             # Initialize data synchronously to avoid async issues in tests
             try:
-                await self._initialize_data()
+                await self._load.run(self._initialize_data)
             except Exception:
                 # In test environments, just initialize with empty data
                 self._frameworks = {}
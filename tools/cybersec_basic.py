@@ -10,10 +10,10 @@ import socket
 import time
 from typing import Any, Dict, List, Optional
 
-import httpx
 from fastmcp import Context
 from pydantic import BaseModel, Field
 
+from core.http_clients import get_http_clients
 from core.settings import get_settings
 from core.event_bus import get_event_bus, EventType
 from core.memory import get_agent_memory
@@ -159,35 +159,36 @@ class CyberSecAgent:
         url = target if target.startswith("http") else f"https://{target}"
 
         try:
-            async with httpx.AsyncClient(verify=False, timeout=5.0) as client:
-                response = await client.get(url)
-
-                # Armazena headers
-                result.http_headers = dict(response.headers)
-
-                # Security Headers Checks
-                missing_headers = []
-                security_headers = [
-                    "Strict-Transport-Security",
-                    "Content-Security-Policy",
-                    "X-Frame-Options",
-                    "X-Content-Type-Options",
-                ]
-
-                for header in security_headers:
-                    if header not in response.headers:
-                        missing_headers.append(header)
-
-                if missing_headers:
-                    result.security_issues.append(
-                        f"Missing security headers: {', '.join(missing_headers)}"
-                    )
-
-                # Server leakage
-                if "Server" in response.headers:
-                    result.security_issues.append(
-                        f"Server header exposed: {response.headers['Server']}"
-                    )
+            # Recon targets arbitrary hosts, often with self-signed certificates
+            client = get_http_clients().get("web-recon", verify=False)
+            response = await client.get(url, timeout=5.0)
+
+            # Armazena headers
+            result.http_headers = dict(response.headers)
+
+            # Security Headers Checks
+            missing_headers = []
+            security_headers = [
+                "Strict-Transport-Security",
+                "Content-Security-Policy",
+                "X-Frame-Options",
+                "X-Content-Type-Options",
+            ]
+
+            for header in security_headers:
+                if header not in response.headers:
+                    missing_headers.append(header)
+
+            if missing_headers:
+                result.security_issues.append(
+                    f"Missing security headers: {', '.join(missing_headers)}"
+                )
+
+            # Server leakage
+            if "Server" in response.headers:
+                result.security_issues.append(
+                    f"Server header exposed: {response.headers['Server']}"
+                )
 
         except Exception as e:
             logger.warning(f"Web analysis failed: {e}")
@@ -369,13 +369,21 @@ class DeepfakeScanner:
                 analyzed_at=""
             )
 
-# Singleton
-_scanner = DeepfakeScanner()
+# Singleton (built on first scan, not at import: the scanner owns a Vertex client)
+_scanner: Optional[DeepfakeScanner] = None
+
+
+def get_deepfake_scanner() -> DeepfakeScanner:
+    global _scanner
+    if _scanner is None:
+        _scanner = DeepfakeScanner()
+    return _scanner
+
 
 async def scan_media(file_b64: str, mime_type: str, filename: str) -> Dict[str, Any]:
     """MCP Tool Entrypoint"""
     import datetime
     
-    result = await _scanner.scan(file_b64, mime_type, filename)
+    result = await get_deepfake_scanner().scan(file_b64, mime_type, filename)
     result.analyzed_at = datetime.datetime.now().isoformat()
     return result.model_dump()
@@ -0,0 +1,387 @@
+"""
+Bulk IOC Enrichment - OTX + VirusTotal em lote.
+
+``ThreatProphet._gather_indicators`` enriquece um alvo por vez; um feed de
+10k IOCs virava 10k tool calls sequenciais disputando os rate limiters.
+``BulkEnricher`` recebe uma lista ou stream (sync/async) de indicadores e:
+
+1. deduplica e classifica cada indicador (ip, domain, url, hash, ...);
+2. resolve primeiro o que já está no cache (fresco ou stale) sem rede;
+3. agenda o restante por provider, cada um na sua "lane" com o próprio
+   paralelismo (``VERTICE_ENRICH_LANE_WORKERS``) — o VT lento não segura
+   o OTX;
+4. emite um resultado por (indicador, provider) assim que fica pronto.
+
+Antes de cada chamada a lane consulta a estimativa de espera do rate
+limiter do provider: se a cota diária só volta depois do deadline, o
+resultado sai como ``quota_exhausted`` (com ``retry_after``) em vez de
+dormir; se for o ritmo por minuto, a execução para e o cursor fica
+antes do indicador, para retomar depois.
+
+No máximo ``window`` indicadores ficam em andamento, e o produtor espera o
+consumidor: a memória não cresce com o tamanho do feed. A deduplicação
+lembra os últimos ``dedup_window`` indicadores distintos (LRU); uma
+repetição mais distante que isso é enriquecida de novo, quase sempre do
+cache. O cursor (posição
+no feed até a qual tudo já foi entregue) é persistido em
+``enrichment_cursors``; repetir a chamada com o mesmo ``run_id`` e o mesmo
+feed retoma dali (entrega at-least-once: resultados posteriores ao cursor
+podem ser repetidos, quase sempre do cache).
+
+Nem a API do OTX nem a do VirusTotal (v3, chave pública) expõem consulta
+de reputação em lote, então cada lane faz uma chamada por indicador.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Set, Union
+
+from core.database import get_db
+from core.deadline import DeadlineExceeded, remaining
+from core.rate_limiter import RateLimiter, get_rate_limiter
+from core.serialization import dumps_str, loads
+from core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+Indicators = Union[Iterable[Any], AsyncIterable[Any]]
+
+_HASH_TYPES = {32: "md5", 40: "sha1", 64: "sha256"}
+_HEX = re.compile(r"^[0-9a-fA-F]+$")
+
+
+def classify_indicator(value: str) -> str:
+    """Tipo do indicador: ip, url, email, md5, sha1, sha256 ou domain."""
+    try:
+        ipaddress.ip_address(value)
+        return "ip"
+    except ValueError:
+        pass
+    if "://" in value:
+        return "url"
+    if "@" in value:
+        return "email"
+    if len(value) in _HASH_TYPES and _HEX.match(value):
+        return _HASH_TYPES[len(value)]
+    return "domain"
+
+
+class Lane:
+    """Chamadas de um provider: tipos suportados, paralelismo e rate limiter."""
+
+    def __init__(
+        self,
+        name: str,
+        provider: Any,
+        types: Dict[str, str],
+        workers: int = 1,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.name = name
+        self.provider = provider
+        # Tipo do indicador -> tipo na API do provider
+        self.types = types
+        self.workers = max(workers, 1)
+        self.limiter = limiter
+
+    def supports(self, indicator_type: str) -> bool:
+        return indicator_type in self.types
+
+
+def default_lanes() -> List[Lane]:
+    """Lanes de OTX e VirusTotal (chains cache-first) com os limites configurados."""
+    from tools.providers.otx import get_otx_provider
+    from tools.providers.virustotal import get_vt_provider
+
+    settings = get_settings().enrichment
+    return [
+        Lane(
+            "otx",
+            get_otx_provider(),
+            {"ip": "ip", "domain": "domain", "md5": "md5", "sha256": "sha256"},
+            workers=settings.lane_workers.get("otx", 1),
+            limiter=get_rate_limiter("otx"),
+        ),
+        Lane(
+            "virustotal",
+            get_vt_provider(),
+            {
+                "ip": "ip",
+                "domain": "domain",
+                "url": "url",
+                "md5": "file",
+                "sha1": "file",
+                "sha256": "file",
+            },
+            workers=settings.lane_workers.get("virustotal", 1),
+            limiter=get_rate_limiter("virustotal"),
+        ),
+    ]
+
+
+async def _enumerate(indicators: Indicators) -> AsyncIterator[Any]:
+    if hasattr(indicators, "__aiter__"):
+        async for item in indicators:
+            yield item
+    else:
+        for item in indicators:
+            yield item
+
+
+class BulkEnricher:
+    """Enriquecimento em lote com cursor retomável."""
+
+    def __init__(self, lanes: Optional[List[Lane]] = None):
+        self.settings = get_settings().enrichment
+        self.lanes = lanes if lanes is not None else default_lanes()
+        self.db = get_db()
+
+    async def load_cursor(self, run_id: str) -> Dict[str, Any]:
+        row = await self.db.fetch_one(
+            "SELECT * FROM enrichment_cursors WHERE run_id = ?", (run_id,)
+        )
+        if row is None:
+            return {"run_id": run_id, "position": 0, "stats": {}, "complete": False}
+        return {
+            "run_id": run_id,
+            "position": row["position"],
+            "stats": loads(row["stats"]) if row["stats"] else {},
+            "complete": bool(row["complete"]),
+        }
+
+    async def _save_cursor(
+        self, run_id: str, position: int, stats: Dict[str, int], complete: bool
+    ) -> None:
+        await self.db.execute(
+            """
+            INSERT INTO enrichment_cursors (run_id, position, stats, complete, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(run_id) DO UPDATE SET
+                position = excluded.position, stats = excluded.stats,
+                complete = excluded.complete, updated_at = excluded.updated_at
+            """,
+            (run_id, position, dumps_str(stats), int(complete), time.time()),
+        )
+
+    async def run(
+        self, indicators: Indicators, run_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Enriquece ``indicators``, produzindo um resultado por (indicador, provider).
+
+        O último item é o resumo (``event == "summary"``) com o cursor; se
+        o deadline do request acabar antes, ``complete`` é False e a mesma
+        chamada com ``run_id`` retoma do cursor.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        cursor = await self.load_cursor(run_id)
+        start = cursor["position"]
+        stats: Dict[str, int] = {
+            "results": 0, "cache_hits": 0, "fetched": 0, "duplicates": 0,
+            "unavailable": 0, "unsupported": 0, "quota_exhausted": 0, "errors": 0,
+            **cursor["stats"],
+        }
+
+        # (posição, resultado ou None) — None só conclui a posição
+        out: asyncio.Queue = asyncio.Queue(maxsize=self.settings.window)
+        window = asyncio.Semaphore(self.settings.window)
+        slots = {lane.name: asyncio.Semaphore(lane.workers) for lane in self.lanes}
+        pending: Dict[int, int] = {}
+        done: Set[int] = set()
+        tasks: Set[asyncio.Task] = set()
+        stopped = asyncio.Event()
+
+        def result(position, value, itype, lane, status, data=None):
+            return {
+                "event": "result", "position": position, "indicator": value,
+                "type": itype, "provider": lane, "status": status, "data": data,
+            }
+
+        async def lookup(lane: Lane, position: int, value: str, itype: str) -> None:
+            async with slots[lane.name]:
+                waits = await lane.limiter.await_estimates() if lane.limiter else {}
+                left = remaining()
+                if left is not None and waits and max(waits.values()) >= left:
+                    if waits.get("day", 0) < left:
+                        # Só o ritmo curto estoura o deadline: retoma depois
+                        stopped.set()
+                        return
+                    stats["quota_exhausted"] += 1
+                    retry = {"retry_after": round(waits["day"], 1)}
+                    frame = result(position, value, itype, lane.name, "quota_exhausted", retry)
+                else:
+                    try:
+                        data = await lane.provider.execute_with_fallback(
+                            value, type=lane.types[itype]
+                        )
+                        # A chain caiu no cache provider sem dados (API indisponível)
+                        missing = isinstance(data, dict) and data.get("source") == "cache_miss"
+                        status = "unavailable" if missing else "fetched"
+                        stats[status] += 1
+                        frame = result(position, value, itype, lane.name, status, data)
+                    except DeadlineExceeded:
+                        # Posição fica pendente: o cursor não passa dela
+                        stopped.set()
+                        return
+                    except Exception as e:
+                        stats["errors"] += 1
+                        frame = result(position, value, itype, lane.name, "error", str(e))
+            await out.put((position, frame))
+
+        def spawn(coro) -> None:
+            task = asyncio.create_task(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def produce() -> None:
+            # LRU dos indicadores já vistos: a memória não cresce com o feed
+            seen: "OrderedDict[str, None]" = OrderedDict()
+            position = -1
+            async for item in _enumerate(indicators):
+                position += 1
+                if position < start:
+                    continue
+                await window.acquire()
+                value = str(item.get("value") if isinstance(item, dict) else item).strip()
+                if value.lower() in seen:
+                    seen.move_to_end(value.lower())
+                    stats["duplicates"] += 1
+                    pending[position] = 1
+                    await out.put((position, None))
+                    continue
+                seen[value.lower()] = None
+                if len(seen) > self.settings.dedup_window:
+                    seen.popitem(last=False)
+                itype = item.get("type") if isinstance(item, dict) else None
+                itype = itype or classify_indicator(value)
+                lanes = [lane for lane in self.lanes if lane.supports(itype)]
+                if not lanes:
+                    stats["unsupported"] += 1
+                    pending[position] = 1
+                    frame = result(position, value, itype, None, "unsupported")
+                    await out.put((position, frame))
+                    continue
+
+                pending[position] = len(lanes)
+                for lane in lanes:
+                    entry = await lane.provider.peek(value, type=lane.types[itype])
+                    if entry is not None:
+                        stats["cache_hits"] += 1
+                        status = "hit" if entry.fresh else "stale"
+                        frame = result(position, value, itype, lane.name, status, entry.value)
+                        await out.put((position, frame))
+                    else:
+                        spawn(lookup(lane, position, value, itype))
+
+        producer = asyncio.create_task(produce())
+        stop = asyncio.ensure_future(stopped.wait())
+        watermark = start
+        completed_since_save = 0
+        complete = False
+        try:
+            while True:
+                if out.empty():
+                    if producer.done() and not pending:
+                        producer.result()  # propaga falha do feed
+                        complete = True
+                        break
+                    getter = asyncio.ensure_future(out.get())
+                    waiters = {getter, stop}
+                    if not producer.done():
+                        waiters.add(producer)
+                    await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+                        if stopped.is_set():
+                            break
+                        continue
+                    position, frame = getter.result()
+                else:
+                    position, frame = out.get_nowait()
+
+                if frame is not None:
+                    stats["results"] += 1
+                    yield frame
+                pending[position] -= 1
+                if pending[position] == 0:
+                    del pending[position]
+                    done.add(position)
+                    window.release()
+                    while watermark in done:
+                        done.discard(watermark)
+                        watermark += 1
+                        completed_since_save += 1
+                if completed_since_save >= self.settings.checkpoint_every:
+                    await self._save_cursor(run_id, watermark, stats, False)
+                    completed_since_save = 0
+        finally:
+            stop.cancel()
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+            await self._save_cursor(run_id, watermark, stats, complete)
+
+        yield {
+            "event": "summary",
+            "run_id": run_id,
+            "cursor": watermark,
+            "complete": complete,
+            "stats": stats,
+            "rate_limits": {
+                lane.name: await lane.limiter.await_estimates()
+                for lane in self.lanes
+                if lane.limiter
+            },
+        }
+
+
+# =============================================================================
+# MCP TOOL FUNCTIONS
+# =============================================================================
+
+
+async def threat_enrich_bulk_chunks(
+    ctx, indicators: List[Any], run_id: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Enriquecimento em lote em streaming: um chunk por resultado, depois o resumo.
+
+    Usado pelo endpoint de streaming do bridge; threat_enrich_bulk consome
+    o mesmo gerador para quem precisa da resposta completa.
+    """
+    await ctx.info(f"Bulk enrichment of {len(indicators)} indicators")
+    async for frame in BulkEnricher().run(indicators, run_id=run_id):
+        if frame["event"] == "summary":
+            await ctx.info(
+                f"Bulk enrichment {frame['run_id']}: cursor {frame['cursor']}, "
+                f"complete={frame['complete']}"
+            )
+        yield frame
+
+
+async def threat_enrich_bulk(
+    ctx, indicators: List[Any], run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Enriquece uma lista de IOCs com OTX e VirusTotal.
+
+    Args:
+        indicators: Valores (IP, domínio, URL, hash) ou {"value", "type"}
+        run_id: Execução a retomar (mesmo feed) a partir do cursor salvo
+
+    Returns:
+        Resultados por (indicador, provider) e o resumo da execução
+    """
+    results = []
+    summary: Dict[str, Any] = {}
+    async for frame in threat_enrich_bulk_chunks(ctx, indicators, run_id=run_id):
+        if frame["event"] == "summary":
+            summary = frame
+        else:
+            results.append(frame)
+    return {**summary, "results": results}
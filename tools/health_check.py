@@ -91,23 +91,24 @@ async def _check_hibp() -> ProviderHealth:
         )
 
     try:
-        import httpx
-
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            # Apenas verifica se API responde (endpoint público ou teste simples)
-            resp = await client.get(
-                "https://haveibeenpwned.com/api/v3/breaches",
-                headers={"hibp-api-key": api_key},
-            )
-            latency = (time.perf_counter() - start) * 1000
+        from core.http_clients import get_http_clients
+
+        client = get_http_clients().get("hibp")
+        # Apenas verifica se API responde (endpoint público ou teste simples)
+        resp = await client.get(
+            "https://haveibeenpwned.com/api/v3/breaches",
+            headers={"hibp-api-key": api_key},
+            timeout=5.0,
+        )
+        latency = (time.perf_counter() - start) * 1000
 
-            return ProviderHealth(
-                name="hibp",
-                status="healthy" if resp.status_code == 200 else "degraded",
-                latency_ms=round(latency, 2),
-                last_check=datetime.utcnow().isoformat(),
-                error=None if resp.status_code == 200 else f"HTTP {resp.status_code}",
-            )
+        return ProviderHealth(
+            name="hibp",
+            status="healthy" if resp.status_code == 200 else "degraded",
+            latency_ms=round(latency, 2),
+            last_check=datetime.utcnow().isoformat(),
+            error=None if resp.status_code == 200 else f"HTTP {resp.status_code}",
+        )
     except Exception as e:
         return ProviderHealth(
             name="hibp",
@@ -131,20 +132,21 @@ async def _check_otx() -> ProviderHealth:
             error="OTX_API_KEY not set",
         )
     try:
-        import httpx
+        from core.http_clients import get_http_clients
 
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                "https://otx.alienvault.com/api/v1/indicators/IPv4/8.8.8.8/general",
-                headers={"X-OTX-API-KEY": api_key},
-            )
-            latency = (time.perf_counter() - start) * 1000
-            return ProviderHealth(
-                name="otx",
-                status="healthy" if resp.status_code == 200 else "degraded",
-                latency_ms=round(latency, 2),
-                last_check=datetime.utcnow().isoformat(),
-            )
+        client = get_http_clients().get("otx")
+        resp = await client.get(
+            "https://otx.alienvault.com/api/v1/indicators/IPv4/8.8.8.8/general",
+            headers={"X-OTX-API-KEY": api_key},
+            timeout=5.0,
+        )
+        latency = (time.perf_counter() - start) * 1000
+        return ProviderHealth(
+            name="otx",
+            status="healthy" if resp.status_code == 200 else "degraded",
+            latency_ms=round(latency, 2),
+            last_check=datetime.utcnow().isoformat(),
+        )
     except Exception as e:
         return ProviderHealth(
             name="otx",
@@ -168,20 +170,21 @@ async def _check_vt() -> ProviderHealth:
             error="VT_API_KEY not set",
         )
     try:
-        import httpx
+        from core.http_clients import get_http_clients
 
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            resp = await client.get(
-                "https://www.virustotal.com/api/v3/ip_addresses/8.8.8.8",
-                headers={"x-apikey": api_key},
-            )
-            latency = (time.perf_counter() - start) * 1000
-            return ProviderHealth(
-                name="virustotal",
-                status="healthy" if resp.status_code == 200 else "degraded",
-                latency_ms=round(latency, 2),
-                last_check=datetime.utcnow().isoformat(),
-            )
+        client = get_http_clients().get("virustotal")
+        resp = await client.get(
+            "https://www.virustotal.com/api/v3/ip_addresses/8.8.8.8",
+            headers={"x-apikey": api_key},
+            timeout=5.0,
+        )
+        latency = (time.perf_counter() - start) * 1000
+        return ProviderHealth(
+            name="virustotal",
+            status="healthy" if resp.status_code == 200 else "degraded",
+            latency_ms=round(latency, 2),
+            last_check=datetime.utcnow().isoformat(),
+        )
     except Exception as e:
         return ProviderHealth(
             name="virustotal",
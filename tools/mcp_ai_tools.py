@@ -3,7 +3,7 @@ Vertex AI MCP Tools
 Ferramentas MCP específicas para integração com Vertex AI.
 """
 
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 from fastmcp import Context
 
 from tools.vertex_ai import get_vertex_ai
@@ -100,22 +100,17 @@ async def ai_osint_analysis(
     return result
 
 
-async def ai_stream_analysis(
+async def ai_stream_analysis_chunks(
     ctx: Context,
     analysis_type: str,
     data: Dict[str, Any],
     stream_format: str = "markdown",
-) -> str:
+) -> AsyncIterator[str]:
     """
-    Análise em streaming em tempo real usando Vertex AI.
-
-    Args:
-        analysis_type: Tipo de análise ("threat", "compliance", "osint", "forensic")
-        data: Dados para análise
-        stream_format: Formato de saída ("markdown", "json", "text")
+    Análise em streaming: produz os chunks do Vertex AI conforme chegam.
 
-    Returns:
-        Análise completa em formato streaming
+    Usado pelo endpoint de streaming do bridge; ai_stream_analysis consome
+    o mesmo gerador para quem precisa da resposta completa.
     """
     vertex_ai = get_vertex_ai()
 
@@ -126,14 +121,35 @@ async def ai_stream_analysis(
         f"Provide a {analysis_type} analysis in {stream_format} format"
     )
 
-    full_response = ""
     async for chunk in vertex_ai.stream_analysis(analysis_type, formatted_data):
-        full_response += chunk
-        # In a real streaming implementation, you'd yield chunks here
-        # For now, we accumulate and return complete response
+        yield chunk
 
     await ctx.info(f"AI Stream Analysis completed: {analysis_type} analysis generated")
-    return full_response
+
+
+async def ai_stream_analysis(
+    ctx: Context,
+    analysis_type: str,
+    data: Dict[str, Any],
+    stream_format: str = "markdown",
+) -> str:
+    """
+    Análise em streaming em tempo real usando Vertex AI.
+
+    Args:
+        analysis_type: Tipo de análise ("threat", "compliance", "osint", "forensic")
+        data: Dados para análise
+        stream_format: Formato de saída ("markdown", "json", "text")
+
+    Returns:
+        Análise completa (chunks agregados em buffer)
+    """
+    chunks: List[str] = []
+    async for chunk in ai_stream_analysis_chunks(
+        ctx, analysis_type, data, stream_format
+    ):
+        chunks.append(chunk)
+    return "".join(chunks)
 
 
 async def ai_integrated_assessment(
@@ -15,6 +15,7 @@ from .mitre_models import (
     ComplianceFrameworkData,
 )
 from .mitre_cache import MITRECache
+from core.warmup import SharedLoad
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +61,8 @@ class MITREAttackAPI:
         self._actors: Dict[str, MITREActor] = {}
         self._frameworks: Dict[str, ComplianceFrameworkData] = {}
         self._last_update: Optional[datetime] = None
+        # Concurrent first calls (and the startup warm-up) share one load
+        self._load = SharedLoad()
 
     @property
     def collection_url(self) -> str:
@@ -78,7 +81,7 @@ class MITREAttackAPI:
     async def _ensure_data_loaded(self) -> None:
         """Garante que os dados foram carregados."""
         if not self._techniques:
-            await self._initialize_data()
+            await self._load.run(self._initialize_data)
 
     async def _initialize_data(self) -> None:
         """Inicializa dados - carrega do cache ou busca da API."""
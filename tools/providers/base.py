@@ -11,6 +11,9 @@ from abc import ABC, abstractmethod
 from typing import Any, TypeVar, Generic, Optional
 import logging
 
+from core.deadline import DeadlineExceeded, check
+from core.tracing import span
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -38,6 +41,8 @@ class BaseProvider(ABC, Generic[T]):
 
     name: str = "base"
     fallback: Optional["BaseProvider[T]"] = None
+    # Providers locais (cache) respondem mesmo depois do deadline
+    needs_network: bool = True
 
     @abstractmethod
     def is_available(self) -> bool:
@@ -58,7 +63,18 @@ class BaseProvider(ABC, Generic[T]):
 
         Raises:
             ProviderError: Se todos os providers falharem
+            DeadlineExceeded: Se o deadline do request passou antes de um resultado
         """
+        # No network call is started once the caller's deadline passed; the
+        # chain still falls through to its local (cache) providers
+        if self.needs_network:
+            try:
+                check(f"provider {self.name}")
+            except DeadlineExceeded:
+                if self.fallback:
+                    logger.info(f"Deadline passed, skipping {self.name} for {self.fallback.name}")
+                    return await self.fallback.execute_with_fallback(*args, **kwargs)
+                raise
         if not self.is_available():
             logger.info(f"Provider {self.name} not available, trying fallback")
             if self.fallback:
@@ -68,7 +84,8 @@ class BaseProvider(ABC, Generic[T]):
             )
 
         try:
-            result = await self.execute(*args, **kwargs)
+            with span(f"provider.{self.name}.execute", {"provider.name": self.name}):
+                result = await self.execute(*args, **kwargs)
             logger.debug(f"Provider {self.name} succeeded")
             return result
         except Exception as e:
@@ -76,4 +93,6 @@ class BaseProvider(ABC, Generic[T]):
             if self.fallback:
                 logger.info(f"Falling back to {self.fallback.name}")
                 return await self.fallback.execute_with_fallback(*args, **kwargs)
+            if isinstance(e, DeadlineExceeded):
+                raise
             raise ProviderError(f"All providers failed. Last error: {e}") from e
@@ -1,13 +1,28 @@
-"""Cache Provider com Redis e JSON fallback."""
+"""
+Cache Provider com Redis e SQLite fallback.
 
+Entradas são gravadas com o instante da escrita e o TTL "fresco". O
+backend as mantém por ``ttl + stale_ttl``: passado o TTL a entrada fica
+*stale* — ainda servível enquanto o provider revalida em background
+(ver ``tools.providers.cached``).
+
+Os backends são síncronos (sqlite3, redis-py): código async usa
+``aget``/``alookup``/``astore``, que rodam a I/O numa thread em vez de
+bloquear o event loop.
+"""
+
+import asyncio
 import os
 import json
 import logging
+import sqlite3
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, NamedTuple, Optional, Tuple
 from datetime import datetime
 
 from core.feature_flags import get_feature_flags
+from core.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -51,69 +66,140 @@ class RedisBackend:
                 self._available = False
 
 
-class JSONFileBackend:
-    """Backend JSON file."""
+class SQLiteBackend:
+    """
+    Backend SQLite local.
+
+    Compartilhado por todos os processos do host (workers do bridge),
+    ao contrário de um dict em memória regravado inteiro a cada set.
+    """
 
-    CACHE_FILE = Path.home() / ".vertice" / "cache.json"
+    CACHE_FILE = Path.home() / ".vertice" / "cache.db"
+    # Intervalo (s) entre limpezas das entradas expiradas, feitas na escrita
+    PURGE_INTERVAL = 300.0
 
     def __init__(self):
+        self._purged_at = 0.0
         self.CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        self._cache = self._load()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.CACHE_FILE, timeout=10.0)
 
-    def _load(self) -> Dict:
-        if self.CACHE_FILE.exists():
-            try:
-                return json.loads(self.CACHE_FILE.read_text())
-            except Exception:
-                return {}
-        return {}
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                    (key, datetime.utcnow().timestamp()),
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Cache read failed: {e}")
+            return None
 
-    def _save(self) -> None:
+    def set(self, key: str, value: str, ttl: int) -> None:
+        now = datetime.utcnow().timestamp()
         try:
-            self.CACHE_FILE.write_text(json.dumps(self._cache, indent=2))
-        except Exception as e:
-            logger.error(f"Failed to save cache file: {e}")
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, now + ttl),
+                )
+                if time.monotonic() - self._purged_at >= self.PURGE_INTERVAL:
+                    self._purged_at = time.monotonic()
+                    conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save cache entry: {e}")
 
-    def get(self, key: str) -> Optional[str]:
-        entry = self._cache.get(key)
-        if entry and entry.get("expires_at", 0) > datetime.utcnow().timestamp():
-            return entry.get("value")
-        return None
 
-    def set(self, key: str, value: str, ttl: int) -> None:
-        self._cache[key] = {
-            "value": value,
-            "expires_at": datetime.utcnow().timestamp() + ttl,
-        }
-        self._save()
+class CacheEntry(NamedTuple):
+    """Valor em cache e se ainda está dentro do TTL fresco."""
+
+    value: Any
+    fresh: bool
+    age: float
+
+
+# Marca do envelope {valor, gravado_em, ttl} (entradas antigas são o valor puro)
+_ENVELOPE = "__vertice_cache__"
+
+
+def provider_ttls(provider: str) -> Tuple[int, int]:
+    """(TTL fresco, janela stale) em segundos configurados para ``provider``."""
+    settings = get_settings().provider_cache
+    ttl = settings.ttls.get(provider) or get_feature_flags().osint_cache_ttl_seconds
+    return ttl, settings.stale_ttls.get(provider, settings.default_stale_ttl)
 
 
 class SmartCache:
-    """Cache inteligente: Redis se disponível, senão JSON."""
+    """Cache inteligente: Redis se disponível, senão SQLite local."""
 
     def __init__(self):
         self.flags = get_feature_flags()
         self._redis = RedisBackend()
-        self._json = JSONFileBackend()
+        self._local = SQLiteBackend()
         # Seleciona backend dinamicamente
 
     @property
     def _backend(self):
         if self._redis.is_available:
             return self._redis
-        return self._json
+        return self._local
 
     def get(self, key: str) -> Optional[Any]:
-        raw = self._backend.get(key)
-        return json.loads(raw) if raw else None
+        entry = self.lookup(key)
+        return entry.value if entry else None
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Entrada de ``key`` (fresca ou stale), ou None se não existe."""
+        raw = self._backend.get(key)
+        if not raw:
+            return None
+        data = json.loads(raw)
+        if not isinstance(data, dict) or _ENVELOPE not in data:
+            # Gravada antes do envelope: sem idade conhecida, revalida
+            return CacheEntry(data, False, float("inf"))
+        age = time.time() - data["stored_at"]
+        return CacheEntry(data[_ENVELOPE], age < data["ttl"], age)
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[int] = None, stale_ttl: int = 0
+    ) -> None:
         ttl = ttl or self.flags.osint_cache_ttl_seconds
+        envelope = {_ENVELOPE: value, "stored_at": time.time(), "ttl": ttl}
         try:
-            self._backend.set(key, json.dumps(value), ttl)
+            self._backend.set(key, json.dumps(envelope), ttl + stale_ttl)
         except Exception as e:
             logger.error(f"Cache set failed: {e}")
 
+    def store(self, provider: str, key: str, value: Any) -> None:
+        """Grava a resposta de ``provider`` com os TTLs configurados para ele."""
+        ttl, stale_ttl = provider_ttls(provider)
+        self.set(key, value, ttl=ttl, stale_ttl=stale_ttl)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """``get`` fora do event loop."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def alookup(self, key: str) -> Optional[CacheEntry]:
+        """``lookup`` fora do event loop."""
+        return await asyncio.to_thread(self.lookup, key)
+
+    async def astore(self, provider: str, key: str, value: Any) -> None:
+        """``store`` fora do event loop."""
+        await asyncio.to_thread(self.store, provider, key, value)
+
 
 _cache: Optional[SmartCache] = None
 
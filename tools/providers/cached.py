@@ -0,0 +1,157 @@
+"""
+Cache-first na frente de uma chain de providers (stale-while-revalidate).
+
+As chains montadas pelos factories começam pela API real: com uma resposta
+fresca no ``SmartCache`` ainda assim gastavam a chamada rate-limited, e o
+cache só era lido depois de uma falha. ``CachedProvider`` consulta o cache
+antes de ``execute_with_fallback`` da chain:
+
+- fresco → retorna sem tocar a rede;
+- stale (passou o TTL, dentro da janela stale) → retorna já e agenda uma
+  única revalidação em background;
+- miss → paga a chamada da chain.
+
+Quem grava o cache continua sendo o provider real, e só no sucesso, com os
+TTLs de ``VERTICE_PROVIDER_CACHE_*`` (respostas de fallback/IA nunca são
+cacheadas).
+
+Misses e revalidações idênticos em andamento compartilham uma única chamada
+da chain (singleflight por provider + chave, i.e. provider, indicador e
+tipo): investigações correlacionadas sobre o mesmo IP/domínio não enfileiram
+chamadas duplicadas atrás do rate limit.
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.settings import get_settings
+from core.singleflight import SingleFlight
+from tools.providers.base import BaseProvider, T
+from tools.providers.cache import CacheEntry, get_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats:
+    """Contadores do cache-first de um provider."""
+
+    __slots__ = ("hits", "stale_hits", "misses", "refreshes", "upstream_calls", "coalesced")
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Compartilhados pelas chains (os factories montam uma chain por chamada)
+_stats: Dict[str, CacheStats] = {}
+_refreshing: Dict[Tuple[str, str], asyncio.Task] = {}
+_flights = SingleFlight()
+
+
+class CachedProvider(BaseProvider[T]):
+    """Serve ``chain`` a partir do cache, revalidando entradas stale."""
+
+    # Hits não tocam a rede; misses passam pela chain, que checa o deadline
+    needs_network = False
+
+    def __init__(
+        self,
+        provider: str,
+        chain: BaseProvider[T],
+        key: Callable[..., str],
+        decode: Optional[Callable[[Any], T]] = None,
+    ):
+        self.provider = provider
+        self.name = f"{provider}_cache_first"
+        self.chain = chain
+        self.key = key
+        self.decode = decode or (lambda value: value)
+        self.fallback = None
+        self.stats = _stats.setdefault(provider, CacheStats())
+        self.cache = get_cache()
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, *args: Any, **kwargs: Any) -> T:
+        key = self.key(*args, **kwargs)
+        if not get_settings().provider_cache.enabled:
+            return await self._upstream(key, args, kwargs)
+
+        entry = await self.cache.alookup(key)
+        if entry is None:
+            self.stats.misses += 1
+            return await self._upstream(key, args, kwargs)
+
+        if entry.fresh:
+            self.stats.hits += 1
+        else:
+            self.stats.stale_hits += 1
+            self._revalidate(key, args, kwargs)
+        return self.decode(entry.value)
+
+    async def peek(self, *args: Any, **kwargs: Any) -> Optional[CacheEntry]:
+        """Entrada em cache (fresca ou stale, já decodificada), sem chamar a chain."""
+        if not get_settings().provider_cache.enabled:
+            return None
+        entry = await self.cache.alookup(self.key(*args, **kwargs))
+        if entry is None:
+            return None
+        if entry.fresh:
+            self.stats.hits += 1
+        else:
+            self.stats.stale_hits += 1
+        return entry._replace(value=self.decode(entry.value))
+
+    async def _upstream(self, key: str, args: tuple, kwargs: Dict[str, Any]) -> T:
+        """Chamada da chain, compartilhada com chamadas idênticas em andamento."""
+        result, shared = await _flights.do(
+            (self.provider, key), lambda: self.chain.execute_with_fallback(*args, **kwargs)
+        )
+        if shared:
+            self.stats.coalesced += 1
+        else:
+            self.stats.upstream_calls += 1
+        return result
+
+    def _revalidate(self, key: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        flight = (self.provider, key)
+        if _flights.inflight(flight):
+            return
+        running = _refreshing.get(flight)
+        if running is not None and not running.done():
+            if running.get_loop() is asyncio.get_running_loop():
+                return
+        self.stats.refreshes += 1
+        # Contexto limpo: a revalidação não herda o deadline de quem a disparou
+        task = asyncio.create_task(
+            self._refresh(key, args, kwargs), context=contextvars.Context()
+        )
+        _refreshing[flight] = task
+        task.add_done_callback(
+            lambda done: _refreshing.pop(flight) if _refreshing.get(flight) is done else None
+        )
+
+    async def _refresh(self, key: str, args: tuple, kwargs: Dict[str, Any]) -> None:
+        try:
+            await self._upstream(key, args, kwargs)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {e}")
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Contadores por provider, revalidações e chamadas em andamento."""
+    return {
+        "providers": {name: stats.snapshot() for name, stats in _stats.items()},
+        "refreshing": sum(1 for task in _refreshing.values() if not task.done()),
+        "singleflight": _flights.stats(),
+    }
@@ -14,8 +14,11 @@ from pydantic import BaseModel
 
 from core.feature_flags import get_feature_flags
 from core.circuit_breaker import api_circuit_breaker
+from core.deadline import budget
+from core.http_clients import get_http_clients
 from core.rate_limiter import rate_limit
 from tools.providers.base import BaseProvider, ProviderNotConfiguredError
+from tools.providers.cached import CachedProvider
 
 logger = logging.getLogger(__name__)
 
@@ -78,46 +81,48 @@ class HIBPProvider(BaseProvider[List[BreachData]]):
                 "Get key at: https://haveibeenpwned.com/API/Key ($3.50/mo)"
             )
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{self.base_url}/breachedaccount/{email}",
-                headers={
-                    "hibp-api-key": self.api_key,
-                    "user-agent": "Vertice-Cyber-OSINT-Agent/1.0",
-                },
-                params={"truncateResponse": "false"},
-            )
+        client = get_http_clients().get("hibp")
+        response = await client.get(
+            f"{self.base_url}/breachedaccount/{email}",
+            headers={
+                "hibp-api-key": self.api_key,
+                "user-agent": "Vertice-Cyber-OSINT-Agent/1.0",
+            },
+            params={"truncateResponse": "false"},
+            timeout=budget(10.0),
+        )
 
-            if response.status_code == 404:
-                # Email não encontrado em breaches (bom!)
-                return []
+        if response.status_code == 404:
+            # Email não encontrado em breaches (bom!)
+            return []
 
-            if response.status_code == 429:
-                # Rate limited
-                logger.warning("HIBP rate limited, retrying later")
-                raise httpx.HTTPError("Rate limited")
+        if response.status_code == 429:
+            # Rate limited
+            logger.warning("HIBP rate limited, retrying later")
+            raise httpx.HTTPError("Rate limited")
 
-            response.raise_for_status()
+        response.raise_for_status()
 
-            data = response.json()
-            breaches = [BreachData(**b) for b in data]
+        data = response.json()
+        breaches = [BreachData(**b) for b in data]
 
-            # Salva no cache para uso futuro
-            try:
-                from tools.providers.cache import get_cache
+        # Salva no cache para uso futuro
+        try:
+            from tools.providers.cache import get_cache
 
-                get_cache().set(f"hibp:{email}", data)
-            except Exception as e:
-                logger.error(f"Failed to cache HIBP result: {e}")
+            await get_cache().astore("hibp", f"hibp:{email}", data)
+        except Exception as e:
+            logger.error(f"Failed to cache HIBP result: {e}")
 
-            logger.info(f"HIBP found {len(breaches)} breaches for {email}")
-            return breaches
+        logger.info(f"HIBP found {len(breaches)} breaches for {email}")
+        return breaches
 
 
 class HIBPCacheProvider(BaseProvider[List[BreachData]]):
     """Provider que usa cache local de breaches conhecidos."""
 
     name = "hibp_cache"
+    needs_network = False
 
     def __init__(self, fallback: Optional[BaseProvider] = None):
         self.fallback = fallback
@@ -131,7 +136,7 @@ class HIBPCacheProvider(BaseProvider[List[BreachData]]):
 
     async def execute(self, email: str, **kwargs: Any) -> List[BreachData]:
         """Consulta cache local."""
-        cached_data = self.cache.get(f"hibp:{email}")
+        cached_data = await self.cache.aget(f"hibp:{email}")
         if cached_data is not None:
             logger.debug(f"Cache hit for {email}")
             return [BreachData(**b) for b in cached_data]
@@ -179,10 +184,15 @@ def get_hibp_provider() -> BaseProvider[List[BreachData]]:
     """
     Factory que retorna chain de providers HIBP.
 
-    Chain: Real HIBP → Cache → AI Fallback
+    Chain: Cache-first → Real HIBP → Cache → AI Fallback
     """
     ai_fallback = HIBPAIFallback()
     cache = HIBPCacheProvider(fallback=ai_fallback)
     real = HIBPProvider(fallback=cache)
 
-    return real
+    return CachedProvider(
+        "hibp",
+        real,
+        key=lambda email, **_: f"hibp:{email}",
+        decode=lambda data: [BreachData(**b) for b in data],
+    )
@@ -8,13 +8,15 @@ import os
 import logging
 from typing import Dict, List, Optional, Any
 
-import httpx
 from pydantic import BaseModel
 
 from core.feature_flags import get_feature_flags
 from core.circuit_breaker import api_circuit_breaker
+from core.deadline import budget
+from core.http_clients import get_http_clients
 from core.rate_limiter import rate_limit
 from tools.providers.base import BaseProvider, ProviderNotConfiguredError
+from tools.providers.cached import CachedProvider
 
 logger = logging.getLogger(__name__)
 
@@ -72,33 +74,35 @@ class OTXProvider(BaseProvider[Dict[str, Any]]):
 
         path = type_map.get(type.lower(), f"IPv4/{indicator}")
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{self.base_url}/indicators/{path}/general",
-                headers={"X-OTX-API-KEY": self.api_key},
-            )
+        client = get_http_clients().get("otx")
+        response = await client.get(
+            f"{self.base_url}/indicators/{path}/general",
+            headers={"X-OTX-API-KEY": self.api_key},
+            timeout=budget(10.0),
+        )
 
-            if response.status_code == 404:
-                return {"status": "clean", "pulse_count": 0}
+        if response.status_code == 404:
+            return {"status": "clean", "pulse_count": 0}
 
-            response.raise_for_status()
-            data = response.json()
+        response.raise_for_status()
+        data = response.json()
 
-            # Caching do sucesso
-            try:
-                from tools.providers.cache import get_cache
+        # Caching do sucesso
+        try:
+            from tools.providers.cache import get_cache
 
-                get_cache().set(f"otx:{type}:{indicator}", data)
-            except Exception as e:
-                logger.error(f"Failed to cache OTX result: {e}")
+            await get_cache().astore("otx", f"otx:{type}:{indicator}", data)
+        except Exception as e:
+            logger.error(f"Failed to cache OTX result: {e}")
 
-            return data
+        return data
 
 
 class OTXCacheProvider(BaseProvider[Dict[str, Any]]):
     """Provider que usa cache local para OTX."""
 
     name = "otx_cache"
+    needs_network = False
 
     def __init__(self, fallback: Optional[BaseProvider] = None):
         self.fallback = fallback
@@ -112,7 +116,7 @@ class OTXCacheProvider(BaseProvider[Dict[str, Any]]):
     async def execute(
         self, indicator: str, type: str = "ip", **kwargs: Any
     ) -> Dict[str, Any]:
-        cached_data = self.cache.get(f"otx:{type}:{indicator}")
+        cached_data = await self.cache.aget(f"otx:{type}:{indicator}")
         if cached_data:
             logger.debug(f"Cache hit for OTX:{indicator}")
             return cached_data
@@ -126,7 +130,11 @@ class OTXCacheProvider(BaseProvider[Dict[str, Any]]):
 
 
 def get_otx_provider() -> BaseProvider[Dict[str, Any]]:
-    """Chain: Real → Cache"""
+    """Chain: Cache-first → Real → Cache"""
     cache = OTXCacheProvider()
     real = OTXProvider(fallback=cache)
-    return real
+    return CachedProvider(
+        "otx",
+        real,
+        key=lambda indicator, type="ip", **_: f"otx:{type}:{indicator}",
+    )
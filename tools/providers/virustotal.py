@@ -12,8 +12,11 @@ import httpx
 
 from core.feature_flags import get_feature_flags
 from core.circuit_breaker import api_circuit_breaker
+from core.deadline import budget
+from core.http_clients import get_http_clients
 from core.rate_limiter import rate_limit
 from tools.providers.base import BaseProvider, ProviderNotConfiguredError
+from tools.providers.cached import CachedProvider
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +39,8 @@ class VTProvider(BaseProvider[Dict[str, Any]]):
         flags = get_feature_flags()
         return bool(self.api_key) and flags.threat_use_real_virustotal
 
-    @rate_limit(
-        "virustotal", rps=0.05
-    )  # ~1 request a cada 20s para respeitar free tier
+    # Free tier: rajada de 4, 4/min e 500/dia
+    @rate_limit("virustotal", rps=4 / 60, burst=4, per_day=500)
     @api_circuit_breaker(
         failure_threshold=2,
         recovery_timeout=300,  # 5 minutos se bloquear
@@ -66,36 +68,39 @@ class VTProvider(BaseProvider[Dict[str, Any]]):
 
         endpoint = endpoint_map.get(type.lower(), f"files/{resource}")
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                f"{self.base_url}/{endpoint}", headers={"x-apikey": self.api_key}
-            )
+        client = get_http_clients().get("virustotal")
+        response = await client.get(
+            f"{self.base_url}/{endpoint}",
+            headers={"x-apikey": self.api_key},
+            timeout=budget(15.0),
+        )
 
-            if response.status_code == 404:
-                return {"status": "not_found", "last_analysis_stats": {}}
+        if response.status_code == 404:
+            return {"status": "not_found", "last_analysis_stats": {}}
 
-            if response.status_code == 429:
-                logger.warning("VirusTotal Rate Limit Exceeded (429)")
-                raise httpx.HTTPError("Rate limited")
+        if response.status_code == 429:
+            logger.warning("VirusTotal Rate Limit Exceeded (429)")
+            raise httpx.HTTPError("Rate limited")
 
-            response.raise_for_status()
-            data = response.json()
+        response.raise_for_status()
+        data = response.json()
 
-            # Caching
-            try:
-                from tools.providers.cache import get_cache
+        # Caching
+        try:
+            from tools.providers.cache import get_cache
 
-                get_cache().set(f"vt:{type}:{resource}", data)
-            except Exception as e:
-                logger.error(f"Failed to cache VT result: {e}")
+            await get_cache().astore("virustotal", f"vt:{type}:{resource}", data)
+        except Exception as e:
+            logger.error(f"Failed to cache VT result: {e}")
 
-            return data
+        return data
 
 
 class VTCacheProvider(BaseProvider[Dict[str, Any]]):
     """Provider que usa cache local para VirusTotal."""
 
     name = "virustotal_cache"
+    needs_network = False
 
     def __init__(self, fallback: Optional[BaseProvider] = None):
         self.fallback = fallback
@@ -109,7 +114,7 @@ class VTCacheProvider(BaseProvider[Dict[str, Any]]):
     async def execute(
         self, resource: str, type: str = "file", **kwargs: Any
     ) -> Dict[str, Any]:
-        cached_data = self.cache.get(f"vt:{type}:{resource}")
+        cached_data = await self.cache.aget(f"vt:{type}:{resource}")
         if cached_data:
             logger.debug(f"Cache hit for VT:{resource}")
             return cached_data
@@ -123,7 +128,11 @@ class VTCacheProvider(BaseProvider[Dict[str, Any]]):
 
 
 def get_vt_provider() -> BaseProvider[Dict[str, Any]]:
-    """Chain: Real → Cache"""
+    """Chain: Cache-first → Real → Cache"""
     cache = VTCacheProvider()
     real = VTProvider(fallback=cache)
-    return real
+    return CachedProvider(
+        "virustotal",
+        real,
+        key=lambda resource, type="file", **_: f"vt:{type}:{resource}",
+    )
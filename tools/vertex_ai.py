@@ -15,7 +15,9 @@ from datetime import datetime
 from google import genai
 from google.genai import types
 
+from core.deadline import DeadlineExceeded, check, remaining
 from core.settings import get_settings
+from core.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -107,7 +109,8 @@ class VertexAIIntegration:
         """
 
         try:
-            response = self.client.models.generate_content(
+            response = self._generate(
+                "threat_intelligence",
                 model=model,
                 contents=prompt,
                 config=types.GenerateContentConfig(
@@ -173,7 +176,8 @@ class VertexAIIntegration:
         """
 
         try:
-            response = self.client.models.generate_content(
+            response = self._generate(
+                "compliance_report",
                 model=model,
                 contents=prompt,
                 config=types.GenerateContentConfig(
@@ -237,7 +241,8 @@ class VertexAIIntegration:
         """
 
         try:
-            response = self.client.models.generate_content(
+            response = self._generate(
+                "osint_findings",
                 model=model,
                 contents=prompt,
                 config=types.GenerateContentConfig(
@@ -289,19 +294,29 @@ class VertexAIIntegration:
         """
 
         try:
-            # Use streaming
-            for chunk in self.client.models.generate_content_stream(
-                model=model,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.3,
-                    top_p=0.9,
-                    max_output_tokens=4096,
-                ),
+            # Async stream: chunks are yielded as they arrive without
+            # blocking the event loop between network reads.
+            with span(
+                "vertex.generate_content_stream",
+                {"ai.model": model, "ai.operation": "stream_analysis"},
             ):
-                if chunk.text:
-                    yield chunk.text
-
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=model,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        temperature=0.3,
+                        top_p=0.9,
+                        max_output_tokens=4096,
+                    ),
+                )
+                async for chunk in stream:
+                    check("vertex stream_analysis chunk")
+                    if chunk.text:
+                        yield chunk.text
+
+        except DeadlineExceeded:
+            # Not a model failure: the caller decides how a timeout is reported
+            raise
         except Exception as e:
             logger.error(f"Streaming analysis failed: {e}")
             yield f"Analysis failed: {str(e)}"
@@ -351,7 +366,8 @@ class VertexAIIntegration:
                 return f"Error processing media: {str(e)}"
 
         try:
-            response = self.client.models.generate_content(
+            response = self._generate(
+                "multimodal",
                 model=model,
                 contents=contents,
                 config=types.GenerateContentConfig(
@@ -366,6 +382,18 @@ class VertexAIIntegration:
             logger.error(f"Multimodal generation failed: {e}")
             return f"Error: {str(e)}"
 
+    def _generate(self, operation: str, **kwargs: Any) -> Any:
+        """generate_content wrapped in a tracing span, bounded by the request deadline."""
+        check(f"vertex {operation}")
+        left = remaining()
+        if left is not None and kwargs.get("config") is not None:
+            kwargs["config"].http_options = types.HttpOptions(timeout=max(int(left * 1000), 1))
+        with span(
+            "vertex.generate_content",
+            {"ai.model": kwargs.get("model"), "ai.operation": operation},
+        ):
+            return self.client.models.generate_content(**kwargs)
+
     def _parse_json_response(self, text: str) -> Dict[str, Any]:
         """Parse JSON from response, handling markdown code blocks."""
         result_text = text.strip()
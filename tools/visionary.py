@@ -12,10 +12,10 @@ import base64
 import mimetypes
 from typing import Dict, Any, Optional
 from enum import Enum
-import httpx
 from google import genai
 from google.genai import types
 
+from core.http_clients import get_http_clients
 from core.settings import get_settings
 from core.event_bus import get_event_bus, EventType
 
@@ -59,18 +59,18 @@ class VisionarySentinel:
     async def _fetch_url(self, url: str) -> tuple[str, str]:
         """Baixa o conteúdo da URL e retorna (base64_data, mime_type)."""
         headers = {"User-Agent": "Vertice-Cyber/2.0 (Bot)"}
-        async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            data = resp.content
-            b64_data = base64.b64encode(data).decode("utf-8")
-
-            # Tentar pegar o mime do header ou da extensão
-            mime_type = resp.headers.get("content-type", mimetypes.guess_type(url)[0])
-            if not mime_type:
-                mime_type = "application/octet-stream"
-
-            return b64_data, mime_type
+        client = get_http_clients().get("visionary-fetch")
+        resp = await client.get(url, headers=headers, timeout=30.0)
+        resp.raise_for_status()
+        data = resp.content
+        b64_data = base64.b64encode(data).decode("utf-8")
+
+        # Tentar pegar o mime do header ou da extensão
+        mime_type = resp.headers.get("content-type", mimetypes.guess_type(url)[0])
+        if not mime_type:
+            mime_type = "application/octet-stream"
+
+        return b64_data, mime_type
 
     async def analyze(
         self,